@@ -50,6 +50,8 @@ class AnalystAgent:
             temperature=cfg.temperature,
             max_tokens=cfg.max_tokens,
             json_mode=json_mode,
+            phase="analyst",
+            stream_to=self.name,
             tier="tier_1_rules" # Analyst calls always contain the massive Tier 1 Golden Rules
         )
         
@@ -59,7 +59,9 @@ class ArchitectAgent:
             temperature=config.temperature,
             max_tokens=config.max_tokens,
             json_mode=json_mode,
-            tier="tier_1_rules"
+            tier="tier_1_rules",
+            phase="architect",
+            stream_to=self.name
         )
         
         parsed_output = self._parse_json(response.content)
@@ -135,7 +137,8 @@ class ArchitectAgent:
             model=synthesis_model,
             temperature=0.0,
             json_mode=True,
-            tier="tier_1_rules"
+            tier="tier_1_rules",
+            phase="architect"
         )
         
         parsed_output = self._parse_json(synthesis_response.content)
@@ -157,7 +160,8 @@ class ArchitectAgent:
             model=config.model,
             temperature=config.temperature,
             max_tokens=config.max_tokens,
-            tier="tier_1_rules"
+            tier="tier_1_rules",
+            phase="architect"
         )
 
     def _build_prompt_content(self, context: Dict[str, Any], rag_context: List[Dict[str, Any]]) -> str:
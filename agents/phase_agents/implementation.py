@@ -13,6 +13,8 @@ import asyncio
 import logging
 import json
 
+from api.event_bus import EventType
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,7 +73,10 @@ class ImplementationAgent:
             model=backend_cfg.model,
             temperature=backend_cfg.temperature,
             json_mode=True,
-            tier="tier_1_rules"
+            tier="tier_1_rules",
+            phase="implementation",
+            stream_to="Backend Developer",
+            stream_event=EventType.ARTIFACT
         )
 
         msg_fe = "Generating Frontend (React)..."
@@ -85,7 +90,10 @@ class ImplementationAgent:
             model=frontend_cfg.model,
             temperature=frontend_cfg.temperature,
             json_mode=True,
-            tier="tier_2_tokens"
+            tier="tier_2_tokens",
+            phase="implementation",
+            stream_to="Frontend Developer",
+            stream_event=EventType.ARTIFACT
         )
 
         results = await asyncio.gather(backend_task, frontend_task, return_exceptions=True)
@@ -22,11 +22,12 @@ from pathlib import Path
 from dataclasses import asdict
 
 from rag.vector_store import ChromaVectorStore, Document
+from rag.chroma_pool import chroma_pool
 from domain_knowledge.ingestion.database_schema_ingester import DatabaseSchemaIngester
 from domain_knowledge.ingestion.component_library_ingester import ComponentLibraryIngester
 from core.chunking.engine import ChunkingEngine
 from core.graph.schema import KnowledgeGraph
-from core.graph.ingester import GraphIngester
+from core.graph.builder import GraphBuilder
 from domain_knowledge.ingestion.database_content_ingester import DatabaseContentIngester
 from core.external_integration import ExternalIntegration
 from api.shared import orchestrator_instance
@@ -39,8 +40,13 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 CONFIG_DIR = Path("config")
 PROJECT_ROOT = Path(".")
 
-# Global Knowledge Graph Instance (In-Memory MVP)
-knowledge_graph = KnowledgeGraph()
+# Global Knowledge Graph Instance (In-Memory MVP), replaced by each graph build
+def _swap_knowledge_graph(graph: KnowledgeGraph):
+    global knowledge_graph
+    knowledge_graph = graph
+
+graph_builder = GraphBuilder(cache_dir="outputs/graph", on_swap=_swap_knowledge_graph)
+knowledge_graph = graph_builder.graph
 
 from core.cascade_metrics import CascadeMetrics
 
@@ -67,6 +73,44 @@ async def get_supported_models():
         "pricing": {k: asdict(v) for k, v in CostManager.PRICING.items()}
     }
 
+@router.get("/cost-history", summary="Get daily LLM spend")
+async def get_cost_history(days: int = Query(7, ge=1, le=366)):
+    """
+    Returns per-day totals and per-model spend from the usage history store.
+    """
+    from datetime import date, timedelta
+    from core.usage_ledger import get_usage_history
+    history = get_usage_history()
+    start, end = (date.today() - timedelta(days=days - 1)).isoformat(), date.today().isoformat()
+    return {
+        "days": history.daily(start, end),
+        "by_model": history.daily(start, end, dimension="model"),
+        "write_errors": history.write_errors,
+    }
+
+
+@router.get("/local-models", summary="Get loaded embedding/reranker models")
+async def get_local_models():
+    """
+    Returns the shared transformer models with load time, use count and resident
+    memory, plus queue depth and batch sizes of the embedding micro-batchers.
+    """
+    from rag.model_registry import model_registry
+    from rag.embedding_batcher import batcher_stats
+    return {
+        "models": model_registry.stats(),
+        "idle_timeout_seconds": model_registry.idle_timeout,
+        "batchers": batcher_stats(),
+    }
+
+@router.post("/local-models/unload", summary="Unload shared embedding/reranker models")
+async def unload_local_models(name: Optional[str] = None, kind: Optional[str] = None):
+    """
+    Unloads matching models (all when no filter is given). They reload on next use.
+    """
+    from rag.model_registry import model_registry
+    return {"unloaded": model_registry.unload(kind=kind, name=name)}
+
 
 # ============== Pydantic Models ==============
 
@@ -196,8 +240,7 @@ async def list_collections():
     List all ChromaDB collections with basic stats.
     """
     try:
-        import chromadb
-        client = chromadb.PersistentClient(path="rag/chroma_db")
+        client = chroma_pool.get_client("rag/chroma_db")
         collections = client.list_collections()
         
         result = []
@@ -618,50 +661,44 @@ async def browse_files(
 # ============== Knowledge Graph Endpoints (Phase 12) ==============
 
 @router.post("/graph/build")
-async def build_knowledge_graph(path: str = ".", background_tasks: BackgroundTasks = None):
-    """
-    Trigger a full rebuild of the Knowledge Graph.
-    """
-    try:
-        # In a real app, use background tasks for large codebases
-        # For MVP, we do it synchronously or via simple background task
-        
-        target_path = Path(path).resolve()
-        if not target_path.exists():
-            raise HTTPException(status_code=404, detail="Path not found")
-
-        # Reset graph
-        global knowledge_graph
-        knowledge_graph = KnowledgeGraph()
-        ingester = GraphIngester(knowledge_graph)
-
-        logger.info(f"Building Knowledge Graph from {target_path}...")
-        
-        # Simple recursive walk
-        count = 0
-        for file_path in target_path.rglob("*"):
-            if file_path.is_file() and file_path.suffix in [".py", ".cs", ".ts", ".js"]:
-                if "node_modules" in str(file_path) or "__pycache__" in str(file_path):
-                    continue
-                    
-                try:
-                    content = file_path.read_text(encoding="utf-8", errors="ignore")
-                    ingester.process_file(str(file_path), content)
-                    count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to ingest {file_path}: {e}")
-        
+async def build_knowledge_graph(path: str = ".", wait: bool = False):
+    """
+    Trigger an incremental Knowledge Graph build in the background.
+
+    Only files whose content changed since the last build are re-parsed.
+    The previous graph keeps being served until the new one is swapped in.
+    Pass ``wait=true`` to block until the build finishes.
+    """
+    target_path = Path(path).resolve()
+    if not target_path.exists():
+        raise HTTPException(status_code=404, detail="Path not found")
+
+    logger.info(f"Building Knowledge Graph from {target_path}...")
+    started = graph_builder.start(str(target_path))
+    if wait:
+        if not started and graph_builder.status.get("root") != str(target_path):
+            # Waiting would report another root's build as this one
+            raise HTTPException(
+                status_code=409,
+                detail=f"A build of {graph_builder.status.get('root')} is already running"
+            )
+        status = await graph_builder.wait()
+        if status["state"] == "failed":
+            raise HTTPException(status_code=500, detail=status.get("error"))
         return {
             "status": "success",
-            "message": f"Graph built from {count} files.",
-            "stats": {
-                "nodes": len(knowledge_graph.nodes),
-                "edges": len(knowledge_graph.edges)
-            }
+            "message": f"Graph updated: {status['files_changed']} of {status['files_total']} files re-ingested.",
+            "stats": {"nodes": status["nodes"], "edges": status["edges"]},
+            "build": status
         }
-    except Exception as e:
-        logger.error(f"Graph build failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"status": "started" if started else "already_running", "build": graph_builder.status}
+
+@router.get("/graph/build")
+async def get_graph_build_status():
+    """
+    Get the state and progress of the latest Knowledge Graph build.
+    """
+    return graph_builder.status
 
 @router.get("/graph")
 async def get_knowledge_graph_data():
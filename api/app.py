@@ -7,13 +7,23 @@ from typing import Optional, Dict, Any, List
 import asyncio
 import logging
 import json
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
 from core.lifecycle_orchestrator import LifecycleOrchestrator
 from rag.domain_aware_retriever import DomainAwareRetriever
 from domain_knowledge.ingestion.database_schema_ingester import DatabaseSchemaIngester
 from domain_knowledge.ingestion.component_library_ingester import ComponentLibraryIngester
 from rag.vector_store import ChromaVectorStore
+from rag.chroma_pool import chroma_pool
+from rag.async_retrieval import retrieval_executor
+from rag.model_registry import model_registry, load_model_config
+from rag.embedding_batcher import batcher_stats
+from core.cache_manager import CacheManager
+from core.semantic_cache import current_semantic_cache
+from core.http_pool import http_pool
+from core.request_coalescer import llm_coalescer
+from core.rate_limiter import rate_limiter
+from core.latency import latency_tracker, hedge_policy
 from api.admin_routes import router as admin_router
 from api.vision_routes import router as vision_router
 from api.ide_routes import router as ide_router
@@ -63,10 +73,69 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def warm_local_models():
+    # In the background: startup is not delayed, and a request needing a
+    # model that is still loading waits on the registry's per-model lock
+    specs = load_model_config().get("warm_on_startup") or []
+    if specs:
+        asyncio.get_running_loop().run_in_executor(None, model_registry.warm, specs)
+    model_registry.start_reaper()
+
+
+@app.on_event("shutdown")
+async def close_provider_pools():
+    await http_pool.aclose()
+    model_registry.stop_reaper()
+
+
 # Metrics
 REQS = Counter("aio_requests_total", "Total API requests", ["path", "method", "status"])
 LAT = Histogram("aio_request_seconds", "Request latency seconds", ["path", "method"])
 
+CHROMA_POOL = Gauge("aio_chroma_pool_entries", "Pooled Chroma clients/collections", ["kind"])
+for _kind in ("clients", "collections", "active_references"):
+    CHROMA_POOL.labels(kind=_kind).set_function(lambda k=_kind: chroma_pool.stats()[k])
+
+RETRIEVAL_POOL = Gauge("aio_retrieval_pool", "Retrieval worker pool concurrency", ["state"])
+for _state in ("max_workers", "in_flight", "queued"):
+    RETRIEVAL_POOL.labels(state=_state).set_function(lambda k=_state: retrieval_executor.stats()[k])
+
+LLM_CACHE = Gauge("aio_llm_cache", "LLM response cache counters and sizes", ["stat"])
+for _stat in ("hits", "misses", "evictions", "expirations", "memory_entries", "pending_writes", "disk_entries", "disk_bytes"):
+    LLM_CACHE.labels(stat=_stat).set_function(lambda k=_stat: CacheManager().stats()[k])
+
+SEMANTIC_CACHE = Gauge("aio_llm_semantic_cache", "Semantic LLM cache counters (0 when disabled)", ["stat"])
+for _stat in ("hits", "misses", "entries"):
+    SEMANTIC_CACHE.labels(stat=_stat).set_function(
+        lambda k=_stat: current_semantic_cache().stats()[k] if current_semantic_cache() else 0
+    )
+
+PROVIDER_POOL = Gauge("aio_llm_http_pool", "LLM provider HTTP pool size and utilization", ["provider", "stat"])
+for _provider in ("openai", "anthropic", "google", "perplexity"):
+    for _stat in ("max_connections", "in_flight", "peak_in_flight", "utilization"):
+        PROVIDER_POOL.labels(provider=_provider, stat=_stat).set_function(
+            lambda p=_provider, k=_stat: http_pool.stats().get(p, {}).get(k, 0)
+        )
+
+LLM_COALESCING = Gauge("aio_llm_coalescing", "Identical in-flight LLM calls served by one upstream request", ["stat"])
+for _stat in ("in_flight", "leaders", "coalesced", "saved_tokens", "saved_cost_usd"):
+    LLM_COALESCING.labels(stat=_stat).set_function(lambda k=_stat: llm_coalescer.stats()[k])
+
+# Limiters are created per model on first use, so this one is refreshed on scrape
+RATE_LIMITS = Gauge("aio_llm_rate_limit", "Adaptive LLM rate limiter state per provider/model", ["limiter", "stat"])
+LLM_LATENCY = Gauge("aio_llm_latency_seconds", "Rolling LLM latency percentiles per provider/model", ["series", "quantile"])
+
+EMBEDDING_BATCHER = Gauge("aio_embedding_batcher", "Embedding micro-batcher queue and throughput per model", ["batcher", "stat"])
+EMBEDDING_BATCH_SIZE = Gauge(
+    "aio_embedding_batch_size_bucket", "Encode calls with at most `le` texts (cumulative)", ["batcher", "le"]
+)
+LOCAL_MODELS = Gauge("aio_local_model_resident_bytes", "Resident memory of shared embedding/reranker models", ["model"])
+
+LLM_HEDGING = Gauge("aio_llm_hedging", "Hedged LLM request counters", ["stat"])
+for _stat in ("calls", "hedges", "hedge_wins", "skipped_budget", "extra_cost_usd"):
+    LLM_HEDGING.labels(stat=_stat).set_function(lambda k=_stat: hedge_policy.stats()[k])
+
 
 class ExecutionRequest(BaseModel):
     request: str
@@ -97,6 +166,24 @@ def health():
 
 @app.get("/metrics")
 def metrics():
+    for limiter, stats in rate_limiter.stats().items():
+        for stat, value in stats.items():
+            RATE_LIMITS.labels(limiter=limiter, stat=stat).set(value)
+    for series, stats in latency_tracker.snapshot().items():
+        for quantile in ("p50", "p95"):
+            if stats[quantile] is not None:
+                LLM_LATENCY.labels(series=series, quantile=quantile).set(stats[quantile])
+    for batcher, stats in batcher_stats().items():
+        for stat in ("queue_depth", "pending_texts", "batches", "avg_batch_size", "avg_queue_wait_ms"):
+            EMBEDDING_BATCHER.labels(batcher=batcher, stat=stat).set(stats[stat])
+        cumulative = 0
+        for bound, count in stats["batch_size_histogram"].items():
+            cumulative += count
+            EMBEDDING_BATCH_SIZE.labels(batcher=batcher, le=str(bound)).set(cumulative)
+    LOCAL_MODELS.clear()
+    for model, stats in model_registry.stats().items():
+        if stats.get("resident_bytes") is not None:
+            LOCAL_MODELS.labels(model=model).set(stats["resident_bytes"])
     return (generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST})
 
 
@@ -1,5 +1,6 @@
 
 import asyncio
+import contextvars
 import logging
 import json
 from enum import Enum
@@ -9,6 +10,10 @@ from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
+# Task currently executing in this asyncio context. Set by the lifecycle
+# scheduler so events from concurrently running tasks can be told apart.
+current_task_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_task_id", default=None)
+
 class EventType(str, Enum):
     LOG = "log"
     THOUGHT = "thought"
@@ -27,10 +32,16 @@ class Event:
     content: Any
     agent: str = "System"
     timestamp: str = ""
+    task_id: Optional[str] = None
+    # Set on incremental chunks of one streamed LLM completion; clients
+    # append chunks that share an id instead of showing each separately.
+    stream_id: Optional[str] = None
 
     def __post_init__(self):
         if not self.timestamp:
             self.timestamp = datetime.now().isoformat()
+        if self.task_id is None:
+            self.task_id = current_task_id.get()
     
     def to_json(self) -> str:
         return json.dumps(asdict(self))
@@ -55,7 +66,9 @@ class EventBus:
             self.history.pop(0)
             
         # Log to console as well for debugging
-        if event.type == EventType.ERROR:
+        if event.stream_id:
+            logger.debug(f"[{event.agent}] {event.content}")
+        elif event.type == EventType.ERROR:
             logger.error(f"[{event.agent}] {event.content}")
         elif event.type == EventType.THOUGHT:
             logger.info(f"[{event.agent}] 🤔 {event.content}")
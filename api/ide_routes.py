@@ -6,6 +6,7 @@ from pathlib import Path
 
 from core.llm_client_v2 import LLMClientV2
 from core.cost_manager import CostManager
+from api.event_bus import EventType
 
 router = APIRouter(prefix="/ide", tags=["ide"])
 logger = logging.getLogger(__name__)
@@ -15,6 +16,8 @@ class IDEActionRequest(BaseModel):
     selection: str
     action: str # EXPLAIN, FIX, REFACTOR, DOCSTRING, TEST
     context: Optional[str] = None
+    # Publish the answer on /stream/logs as it is generated
+    stream: bool = True
 
 class IDEActionResponse(BaseModel):
     success: bool
@@ -67,8 +70,14 @@ async def context_action(req: IDEActionRequest):
             {"role": "user", "content": user_prompt}
         ]
         
-        # Use gpt-4o for quality
-        response = await llm_client.complete(messages, model="gpt-4o", temperature=0.2)
+        # Use gpt-4o for quality. Explanations stream as thoughts, code as artifacts.
+        response = await llm_client.complete(
+            messages,
+            model="gpt-4o",
+            temperature=0.2,
+            stream_to="IDE" if req.stream else None,
+            stream_event=EventType.THOUGHT if req.action.upper() == "EXPLAIN" else EventType.ARTIFACT
+        )
         
         return IDEActionResponse(success=True, result=response.content)
 
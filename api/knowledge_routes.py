@@ -3,11 +3,14 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict
 import logging
 from pathlib import Path
+import asyncio
 import hashlib
-import glob
 
 from rag.domain_aware_retriever import DomainAwareRetriever
-from rag.vector_store import ChromaVectorStore
+from rag.vector_store import ChromaVectorStore, Document
+from rag.ingest_pipeline import IngestJob, ingestion_pipeline
+from rag.chroma_pool import chroma_pool
+from rag.async_retrieval import retrieval_executor
 from core.chunking.engine import ChunkingEngine
 
 # Legacy Ingesters (Optional: Keep if still needed for specialized logic)
@@ -37,6 +40,9 @@ class IngestRequest(BaseModel):
     extract_options: Dict[str, bool] = {}
     
     models_dir: Optional[str] = None
+    
+    # Block until a file/directory ingestion job finishes
+    wait: bool = False
 
 
 class QueryRequest(BaseModel):
@@ -49,13 +55,7 @@ class QueryRequest(BaseModel):
 async def list_collections():
     """List all available knowledge collections."""
     try:
-        import chromadb
-        from chromadb.config import Settings
-
-        client = chromadb.PersistentClient(
-            path="rag/chroma_db",
-            settings=Settings(anonymized_telemetry=False),
-        )
+        client = chroma_pool.get_client("rag/chroma_db")
         collections = []
         for c in client.list_collections():
             collections.append({
@@ -84,6 +84,7 @@ async def delete_collection(name: str):
     try:
         store = ChromaVectorStore(collection_name=name)
         store.delete_collection()
+        ingestion_pipeline.forget(name)
         return {"status": "success", "message": f"Collection '{name}' deleted"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -93,13 +94,7 @@ async def delete_collection(name: str):
 async def get_collection_documents(name: str, limit: int = 100):
     """Get all documents from a specific collection."""
     try:
-        import chromadb
-        from chromadb.config import Settings
-
-        client = chromadb.PersistentClient(
-            path="rag/chroma_db",
-            settings=Settings(anonymized_telemetry=False),
-        )
+        client = chroma_pool.get_client("rag/chroma_db")
         
         collection = client.get_collection(name=name)
         results = collection.get(limit=limit, include=["documents", "metadatas"])
@@ -169,11 +164,21 @@ async def validate_knowledge(req: IngestRequest):
         return {"valid": False, "error": str(e)}
 
 
+def _job_response(job: IngestJob) -> Dict:
+    return {"job_id": job.id, "collection": job.collection, **job.status}
+
+
 @router.post("/ingest")
 async def ingest_knowledge(req: IngestRequest):
-    """Ingest data into the knowledge base using universal logic."""
+    """
+    Ingest data into the knowledge base using universal logic.
+
+    Files and directories are ingested by a background job (see
+    ``rag.ingest_pipeline``) that only re-processes files whose content
+    changed since the last run. Poll ``GET /knowledge/ingest/{job_id}`` or
+    pass ``wait=true`` to block until it finishes.
+    """
     try:
-        documents = []
         collection_name = req.collection
         
         # Determine collection name if not provided
@@ -182,92 +187,39 @@ async def ingest_knowledge(req: IngestRequest):
 
         # --- Universal Ingestion Logic ---
         
-        # 1. Source Type: Directory
-        if req.source_type == "directory":
+        # 1./2. Source Type: Directory or File
+        if req.source_type in ("directory", "file"):
             if not req.path:
-                raise HTTPException(status_code=400, detail="Path is required for directory ingestion")
+                raise HTTPException(status_code=400, detail=f"Path is required for {req.source_type} ingestion")
             
             source_path = Path(req.path)
-            if not source_path.exists() or not source_path.is_dir():
+            if req.source_type == "directory" and not source_path.is_dir():
                 raise HTTPException(status_code=400, detail=f"Directory not found: {req.path}")
-                
-            # Use glob to find files matching the pattern
-            # Search recursively if pattern includes **
-            pattern = req.file_filter or "*.*"
-            if "**" in pattern:
-                files = list(source_path.glob(pattern))
-            else:
-                # Default recursive search for code/docs if simple pattern
-                # If specific file pattern provided (e.g. DOCS.md), search recursively
-                files = list(source_path.rglob(pattern))
-            
-            ignore_patterns = ["node_modules", "__pycache__", "dist", ".git", ".venv", "bin", "obj"]
-            
-            chunker = ChunkingEngine()
-            
-            for file_path in files:
-                if any(p in str(file_path) for p in ignore_patterns):
-                    continue
-                if not file_path.is_file():
-                    continue
-                    
-                try:
-                    content = file_path.read_text(encoding="utf-8", errors="ignore")
-                    if not content.strip():
-                        continue
-                        
-                    chunks = chunker.chunk_content(content, file_path=str(file_path))
-                    
-                    for chunk in chunks:
-                        doc_id = f"tier{req.tier}_{req.category}_{hashlib.md5(chunk.content.encode()).hexdigest()}"
-                        documents.append({
-                            "id": doc_id,
-                            "text": chunk.content,
-                            "metadata": {
-                                **chunk.metadata,
-                                "tier": req.tier,
-                                "category": req.category,
-                                "tags": ",".join(req.tags),
-                                "source_type": "directory",
-                                "file": str(file_path.relative_to(source_path)),
-                                "full_path": str(file_path)
-                            }
-                        })
-                except Exception as ex:
-                    logging.warning(f"Failed to process file {file_path}: {ex}")
-                    continue
-
-        # 2. Source Type: File
-        elif req.source_type == "file":
-            if not req.path:
-                raise HTTPException(status_code=400, detail="Path is required for file ingestion")
-            
-            file_path = Path(req.path)
-            if not file_path.exists() or not file_path.is_file():
+            if req.source_type == "file" and not source_path.is_file():
                 raise HTTPException(status_code=400, detail=f"File not found: {req.path}")
-                
-            chunker = ChunkingEngine()
-            try:
-                content = file_path.read_text(encoding="utf-8", errors="ignore")
-                chunks = chunker.chunk_content(content, file_path=str(file_path))
-                
-                for chunk in chunks:
-                    doc_id = f"tier{req.tier}_{req.category}_{hashlib.md5(chunk.content.encode()).hexdigest()}"
-                    documents.append({
-                        "id": doc_id,
-                        "text": chunk.content,
-                        "metadata": {
-                            **chunk.metadata,
-                            "tier": req.tier,
-                            "category": req.category,
-                            "tags": ",".join(req.tags),
-                            "source_type": "file",
-                            "file": file_path.name,
-                            "full_path": str(file_path)
-                        }
-                    })
-            except Exception as ex:
-                raise HTTPException(status_code=500, detail=f"Failed to process file: {ex}")
+
+            job = ingestion_pipeline.start(IngestJob(
+                collection=collection_name,
+                path=str(source_path),
+                file_filter=req.file_filter or "*.*",
+                source_type=req.source_type,
+                tier=req.tier,
+                category=req.category,
+                tags=req.tags,
+                chunk_size=req.chunk_size,
+                chunk_overlap=req.chunk_overlap,
+            ))
+            if not req.wait:
+                return {"status": "started", **_job_response(job)}
+
+            status = await ingestion_pipeline.wait(job.id)
+            if status["state"] == "failed":
+                raise HTTPException(status_code=500, detail=status.get("error"))
+            return {
+                **_job_response(job),
+                "status": "success" if status["state"] == "completed" else status["state"],
+                "documents_ingested": status.get("chunks_upserted", 0),
+            }
 
         # 3. Source Type: Text
         elif req.source_type == "text":
@@ -275,14 +227,15 @@ async def ingest_knowledge(req: IngestRequest):
                 raise HTTPException(status_code=400, detail="Content is required for text ingestion")
             
             chunker = ChunkingEngine()
-            chunks = chunker.chunk_content(req.content, file_path="manual_input")
+            chunks = chunker.chunk_content(
+                req.content, file_path="manual_input", chunk_size=req.chunk_size, overlap=req.chunk_overlap
+            )
             
-            for chunk in chunks:
-                doc_id = f"tier{req.tier}_{req.category}_{hashlib.md5(chunk.content.encode()).hexdigest()}"
-                documents.append({
-                    "id": doc_id,
-                    "text": chunk.content,
-                    "metadata": {
+            documents = [
+                Document(
+                    id=f"tier{req.tier}_{req.category}_{hashlib.md5(chunk.content.encode()).hexdigest()}",
+                    text=chunk.content,
+                    metadata={
                         **chunk.metadata,
                         "tier": req.tier,
                         "category": req.category,
@@ -290,69 +243,66 @@ async def ingest_knowledge(req: IngestRequest):
                         "source_type": "text",
                         "file": "manual_input"
                     }
-                })
+                )
+                for chunk in chunks
+            ]
+            if not documents:
+                return {
+                    "status": "warning",
+                    "message": "No documents found or processed.",
+                    "documents_ingested": 0,
+                    "collection": collection_name
+                }
 
-        # 4. Fallback / Legacy (Database/ComponentLibrary specific ingesters)
-        elif req.type == "database":
-             # Invoke legacy logic if needed, or reimplement here
-             # For now, let's just support universal
-             pass 
-        
-        else:
-            # Try legacy logic if type is set but source_type is default
-            if req.type == "component_library":
-                ingester = ComponentLibraryIngester(req.path)
-                # Adapter needed because legacy ingester returns list of dicts or objects?
-                # Looking at original code: documents = ingester.ingest(), assuming standard format
-                # But we want to standardize everything. 
-                # Let's trust the Directory walker above for component library too if the user selected it via new UI.
-                pass
-
-        if not documents:
+            store = ChromaVectorStore(collection_name=collection_name)
+            await asyncio.to_thread(store.upsert_documents, documents)
             return {
-                "status": "warning",
-                "message": "No documents found or processed.",
-                "documents_ingested": 0,
-                "collection": collection_name
+                "status": "success",
+                "documents_ingested": len(documents),
+                "collection": collection_name,
             }
 
-        store = ChromaVectorStore(collection_name=collection_name)
-        # ChromaVectorStore expects objects or dicts? 
-        # Original code: store.add_documents(documents) where documents was a list of objects or dicts.
-        # Let's ensure format. ChromaVectorStore usually takes text, metadata, ids.
-        # Let's look at `store.add_documents`.
-        # Assuming it handles list of dicts with 'id', 'text', 'metadata'.
-        
-        # Reformulate for store.add_documents if it expects a specific class
-        # But wait, original code used `Document` class?
-        # No, I see `documents.append({ "id": ..., "text": ..., "metadata": ... })` in my snippet above.
-        # But simpler previous code used `Document` class in `project_codebase` section: `documents.append(Document(...))`
-        # I need to know if `store.add_documents` expects dicts or objects.
-        # `ingest_knowledge` line 165: `store.add_documents(documents)`.
-        # DatabaseSchemaIngester returns dicts?
-        
-        # Let's try to assume dicts are fine or use a simple Document class if defined.
-        from rag.vector_store import Document
-        final_docs = []
-        for d in documents:
-            if isinstance(d, dict):
-                 final_docs.append(Document(id=d['id'], text=d['text'], metadata=d['metadata']))
-            else:
-                 final_docs.append(d)
-                 
-        store.add_documents(final_docs)
-
+        # 4. Legacy types (database / component_library) are handled by the
+        # directory walker above when the UI sends source_type="directory"
         return {
-            "status": "success",
-            "documents_ingested": len(documents),
-            "collection": collection_name,
+            "status": "warning",
+            "message": "No documents found or processed.",
+            "documents_ingested": 0,
+            "collection": collection_name
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error ingesting: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/ingest")
+async def list_ingest_jobs():
+    """List recent ingestion jobs, newest last."""
+    return {"jobs": [_job_response(job) for job in ingestion_pipeline.jobs.values()]}
+
+
+@router.get("/ingest/{job_id}")
+async def get_ingest_job(job_id: str):
+    """Get the state, progress and ETA of an ingestion job."""
+    job = ingestion_pipeline.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingest job not found: {job_id}")
+    return _job_response(job)
+
+
+@router.post("/ingest/{job_id}/cancel")
+async def cancel_ingest_job(job_id: str):
+    """Cancel a running ingestion job. Files already stored are kept and skipped next time."""
+    job = ingestion_pipeline.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingest job not found: {job_id}")
+    cancelled = ingestion_pipeline.cancel(job_id)
+    return {"status": "cancelling" if cancelled else "not_running", **_job_response(job)}
+
+
 @router.post("/query")
 async def query_knowledge(req: QueryRequest):
     """Query the knowledge base."""
@@ -360,11 +310,11 @@ async def query_knowledge(req: QueryRequest):
         # If collection is specified, use specific store, otherwise generic retriever
         if req.collection:
             store = ChromaVectorStore(collection_name=req.collection)
-            results = store.search(req.query, top_k=req.top_k)
+            results = await retrieval_executor.run(store.search, req.query, top_k=req.top_k)
         else:
             # Use the existing domain-aware retriever which might query multiple
             retriever = DomainAwareRetriever()
-            raw_results = retriever.retrieve(req.query, top_k=req.top_k)
+            raw_results = await retriever.aretrieve(req.query, top_k=req.top_k)
             results = [
                 {
                     "text": item.get("text") or item.get("content") or "",
@@ -48,13 +48,17 @@ class RepairAgent:
         logger.info(f"Investigation Findings: {findings[:200]}")
         
         # Prepare Prompt with Experience
-        past_fixes = self.experience_db.find_similar_error(error_log[:500]) # truncated for search key efficiency
+        # The full log is fine here: it is reduced to a normalized signature before matching
+        past_fixes = self.experience_db.find_similar_error(error_log, top_k=3)
         
         experience_context = ""
         if past_fixes:
             experience_context = "\n\n[PAST SUCCESSFUL FIXES FOR SIMILAR ERRORS]:\n"
             for exp in past_fixes:
-                experience_context += f"- Error: {exp['error_pattern'][:100]}...\n  Fix Strategy: {exp['fix_strategy']}\n"
+                experience_context += (
+                    f"- Error: {exp['signature'][:100]}... (similarity {exp['similarity']:.2f}, "
+                    f"worked {exp['success_count']}x)\n  Fix Strategy: {exp['fix_strategy']}\n"
+                )
 
         fix_prompt = f"""
         }}
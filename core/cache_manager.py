@@ -1,22 +1,377 @@
 """
 Cache Manager
 -------------
-Simple file-based caching for LLM responses to reduce costs and latency.
+Tiered caching for LLM responses to reduce costs and latency.
+
+Layers:
+- In-memory LRU of hot entries (plus writes not yet flushed to disk).
+- A pluggable on-disk backend (SQLite by default) holding every entry with
+  its tier, creation time, last access time and size.
+
+Writes and access-time updates go through a write-behind queue drained by a
+background thread, so ``LLMClientV2.complete`` never waits on disk writes.
+The same thread periodically sweeps entries past their tier TTL and evicts
+least-recently-used entries beyond the configured entry-count / byte limits.
 """
 
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import atexit
 import hashlib
 import json
 import logging
+import queue
+import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 
 CACHE_DIR = Path("outputs/cache")
 CACHE_FILE = CACHE_DIR / "llm_response_cache.json"
+CACHE_DB = CACHE_DIR / "llm_response_cache.sqlite3"
+
+# (content, created timestamp, tier)
+CacheEntry = Tuple[Any, float, str]
+
+
+class CacheBackend(ABC):
+    """Persistent storage for cache entries."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the stored entry for ``key`` or None."""
+        pass
+
+    @abstractmethod
+    def apply(self, ops: List[Tuple]) -> None:
+        """
+        Apply queued write operations in order, in one transaction.
+        Ops: ("put", key, entry), ("touch", key, ts), ("delete", key), ("clear",).
+        """
+        pass
+
+    @abstractmethod
+    def delete_expired(self, tier_ttls: Dict[str, float], default_ttl: float, now: float) -> int:
+        """Delete entries older than their tier TTL; return the count."""
+        pass
+
+    @abstractmethod
+    def evict_lru(self, max_entries: int, max_bytes: int) -> int:
+        """Delete least-recently-used entries until within limits; return the count."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Return ``{"entries": ..., "bytes": ...}``."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite (WAL mode) storage. Separate reader / writer connections let
+    lookups proceed while the write-behind thread commits.
+    """
+
+    def __init__(self, path: str = str(CACHE_DB)) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+
+        self._writer = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                tier TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+            CREATE INDEX IF NOT EXISTS idx_entries_tier_created ON entries(tier, created);
+        """)
+        self._writer.commit()
+        self._reader = sqlite3.connect(str(self.path), check_same_thread=False)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._read_lock:
+            row = self._reader.execute(
+                "SELECT content, created, tier FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def apply(self, ops: List[Tuple]) -> None:
+        with self._write_lock, self._writer:
+            for op in ops:
+                kind = op[0]
+                if kind == "put":
+                    _, key, (content, created, tier) = op
+                    payload = json.dumps(content, default=str)
+                    self._writer.execute(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, tier, payload, created, created, len(payload))
+                    )
+                elif kind == "touch":
+                    self._writer.execute(
+                        "UPDATE entries SET last_access = ? WHERE key = ?", (op[2], op[1])
+                    )
+                elif kind == "delete":
+                    self._writer.execute("DELETE FROM entries WHERE key = ?", (op[1],))
+                elif kind == "clear":
+                    self._writer.execute("DELETE FROM entries")
+
+    def delete_expired(self, tier_ttls: Dict[str, float], default_ttl: float, now: float) -> int:
+        deleted = 0
+        with self._write_lock, self._writer:
+            for tier, ttl in tier_ttls.items():
+                deleted += self._writer.execute(
+                    "DELETE FROM entries WHERE tier = ? AND created < ?", (tier, now - ttl)
+                ).rowcount
+            placeholders = ",".join("?" * len(tier_ttls))
+            deleted += self._writer.execute(
+                f"DELETE FROM entries WHERE tier NOT IN ({placeholders}) AND created < ?",
+                (*tier_ttls, now - default_ttl)
+            ).rowcount
+        return deleted
+
+    def evict_lru(self, max_entries: int, max_bytes: int) -> int:
+        with self._write_lock, self._writer:
+            count, total = self._writer.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            if count <= max_entries and total <= max_bytes:
+                return 0
+
+            victims = []
+            for key, size in self._writer.execute(
+                "SELECT key, size FROM entries ORDER BY last_access"
+            ):
+                if count <= max_entries and total <= max_bytes:
+                    break
+                victims.append((key,))
+                count -= 1
+                total -= size
+            self._writer.executemany("DELETE FROM entries WHERE key = ?", victims)
+        return len(victims)
+
+    def stats(self) -> Dict[str, int]:
+        with self._read_lock:
+            count, total = self._reader.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"entries": count, "bytes": total}
+
+    def close(self) -> None:
+        with self._write_lock, self._read_lock:
+            self._writer.close()
+            self._reader.close()
+
+
+class TieredResponseCache:
+    """
+    Memory LRU in front of a persistent backend, with write-behind and sweeping.
+
+    Parameters
+    ----------
+    backend : CacheBackend
+        Persistent store.
+    tier_ttls : dict
+        TTL in seconds per tier; ``"default"`` applies to unknown tiers.
+    max_entries, max_bytes : int
+        Limits on the persistent store, enforced by LRU eviction.
+    memory_entries : int
+        Capacity of the in-memory LRU layer.
+    sweep_interval : float
+        Seconds between TTL sweeps.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        tier_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 10_000,
+        max_bytes: int = 256 * 1024 * 1024,
+        memory_entries: int = 1_000,
+        sweep_interval: float = 300.0
+    ) -> None:
+        self.backend = backend
+        self.tier_config: Dict[str, float] = {"default": 86400}
+        self.tier_config.update(tier_ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.sweep_interval = sweep_interval
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._pending: Dict[str, CacheEntry] = {}
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.write_errors = 0
+
+        self._writer = threading.Thread(target=self._write_loop, name="llm-cache-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _generate_key(self, prompt: str, model: str, temperature: float, tier: str = "default") -> str:
+        """Create a unique hash for the request, including tier for isolation."""
+        raw = f"{tier}:{model}:{temperature}:{prompt}"
+        return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+    def _ttl(self, tier: str) -> float:
+        return self.tier_config.get(tier, self.tier_config["default"])
+
+    def get(self, prompt: str, model: str, temperature: float = 0.0, tier: str = "default") -> Optional[Any]:
+        """Retrieve cached response if valid for the specific tier and TTL."""
+        key = self._generate_key(prompt, model, temperature, tier)
+        with self._lock:
+            entry = self._memory.get(key) or self._pending.get(key)
+        if entry is None:
+            try:
+                entry = self.backend.get(key)
+            except Exception as e:
+                logger.error(f"Cache lookup failed: {e}")
+                entry = None
+
+        now = time.time()
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+
+            content, created, entry_tier = entry
+            if now - created > self._ttl(entry_tier):
+                self.misses += 1
+                self.expirations += 1
+                self._memory.pop(key, None)
+                self._queue.put(("delete", key))
+                return None
+
+            self.hits += 1
+            self._remember(key, entry)
+        self._queue.put(("touch", key, now))
+        return content
+
+    def set(self, prompt: str, model: str, content: Any, temperature: float = 0.0, tier: str = "default"):
+        """Store response in cache; persisted asynchronously."""
+        key = self._generate_key(prompt, model, temperature, tier)
+        entry = (content, time.time(), tier)
+        with self._lock:
+            self._remember(key, entry)
+            self._pending[key] = entry
+        self._queue.put(("put", key, entry))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._pending.clear()
+        self._queue.put(("clear",))
+
+    def flush(self) -> None:
+        """Block until every queued write has been applied."""
+        self._queue.join()
+
+    def sweep(self) -> None:
+        """Drop expired entries and enforce size limits (runs on the writer thread)."""
+        expired = self.backend.delete_expired(
+            {t: ttl for t, ttl in self.tier_config.items() if t != "default"},
+            self.tier_config["default"],
+            time.time()
+        )
+        evicted = self.backend.evict_lru(self.max_entries, self.max_bytes)
+        with self._lock:
+            self.expirations += expired
+            self.evictions += evicted
+        if expired or evicted:
+            logger.info(f"Cache sweep: {expired} expired, {evicted} evicted")
+
+    def stats(self) -> Dict[str, Any]:
+        disk = self.backend.stats()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "write_errors": self.write_errors,
+                "memory_entries": len(self._memory),
+                "pending_writes": self._queue.qsize(),
+                "disk_entries": disk["entries"],
+                "disk_bytes": disk["bytes"],
+            }
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(("stop",))
+            self._writer.join()
+            self.backend.close()
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _write_loop(self) -> None:
+        next_sweep = time.monotonic() + self.sweep_interval
+        while True:
+            timeout = max(next_sweep - time.monotonic(), 0.0)
+            try:
+                ops = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                ops = []
+            while ops and len(ops) < 500:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(op[0] == "stop" for op in ops)
+            writes = [op for op in ops if op[0] != "stop"]
+            try:
+                if writes:
+                    self.backend.apply(writes)
+                    if any(op[0] == "put" for op in writes):
+                        evicted = self.backend.evict_lru(self.max_entries, self.max_bytes)
+                        with self._lock:
+                            self.evictions += evicted
+                if time.monotonic() >= next_sweep:
+                    self.sweep()
+                    next_sweep = time.monotonic() + self.sweep_interval
+            except Exception as e:
+                logger.error(f"Cache write failed: {e}")
+                with self._lock:
+                    self.write_errors += 1
+            finally:
+                with self._lock:
+                    for op in writes:
+                        if op[0] == "put" and self._pending.get(op[1]) is op[2]:
+                            del self._pending[op[1]]
+                for _ in ops:
+                    self._queue.task_done()
+            if stop:
+                return
+
+
+class CacheManager(TieredResponseCache):
+    """Process-wide LLM response cache configured from model_mapping_v2.yaml."""
 
-class CacheManager:
     _instance = None
 
     def __new__(cls):
@@ -25,18 +380,40 @@ class CacheManager:
             cls._instance._init_cache()
         return cls._instance
 
+    def __init__(self):
+        # Configured once in _init_cache
+        pass
+
     def _init_cache(self):
-        self.cache: Dict[str, Any] = {}
-        self.tier_config = {
+        tier_config = {
             "tier_1_rules": 3600,
             "tier_2_tokens": 3600,
             "tier_3_catalog": 1800,
             "default": 86400
         }
-        self._load_config()
-        self.load()
+        c_cfg = self._load_config()
+        self.config = c_cfg
+        for tier in ("tier_1_rules", "tier_2_tokens", "tier_3_catalog"):
+            tier_config[tier] = c_cfg.get(tier, {}).get("ttl_seconds", tier_config[tier])
+
+        backend_name = c_cfg.get("backend", "sqlite")
+        if backend_name != "sqlite":
+            logger.warning(f"Unknown cache backend '{backend_name}', using sqlite")
+        db_path = Path(c_cfg.get("path", CACHE_DB))
+        is_new = not db_path.exists()
 
-    def _load_config(self):
+        super().__init__(
+            backend=SQLiteCacheBackend(str(db_path)),
+            tier_ttls=tier_config,
+            max_entries=int(c_cfg.get("max_entries", 10_000)),
+            max_bytes=int(c_cfg.get("max_size_mb", 256) * 1024 * 1024),
+            memory_entries=int(c_cfg.get("memory_entries", 1_000)),
+            sweep_interval=float(c_cfg.get("sweep_interval_seconds", 300))
+        )
+        if is_new and CACHE_FILE.exists():
+            self._migrate_json(CACHE_FILE)
+
+    def _load_config(self) -> Dict[str, Any]:
         """Load caching configuration from model_mapping_v2.yaml if exists."""
         try:
             import yaml
@@ -45,61 +422,22 @@ class CacheManager:
                 with open(config_path, "r", encoding="utf-8") as f:
                     config = yaml.safe_load(f)
                     if config and "caching" in config:
-                        c_cfg = config["caching"]
-                        self.tier_config["tier_1_rules"] = c_cfg.get("tier_1_rules", {}).get("ttl_seconds", 3600)
-                        self.tier_config["tier_2_tokens"] = c_cfg.get("tier_2_tokens", {}).get("ttl_seconds", 3600)
-                        self.tier_config["tier_3_catalog"] = c_cfg.get("tier_3_catalog", {}).get("ttl_seconds", 1800)
                         logger.info("Loaded tiered caching config from model_mapping_v2.yaml")
+                        return config["caching"] or {}
         except Exception as e:
             logger.warning(f"Could not load caching config: {e}")
+        return {}
 
-    def load(self):
-        if CACHE_FILE.exists():
-            try:
-                with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                    self.cache = json.load(f)
-            except Exception as e:
-                logger.error(f"Failed to load cache: {e}")
-
-    def save(self):
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    def _migrate_json(self, json_path: Path) -> None:
+        """Import the legacy whole-file JSON cache once, then set it aside."""
         try:
-            with open(CACHE_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.cache, f, indent=2)
+            with open(json_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+            self.backend.apply([
+                ("put", key, (entry["content"], entry["timestamp"], entry.get("tier", "default")))
+                for key, entry in legacy.items()
+            ])
+            json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+            logger.info(f"Migrated {len(legacy)} cache entries from {json_path}")
         except Exception as e:
-            logger.error(f"Failed to save cache: {e}")
-
-    def _generate_key(self, prompt: str, model: str, temperature: float, tier: str = "default") -> str:
-        """Create a unique hash for the request, including tier for isolation."""
-        raw = f"{tier}:{model}:{temperature}:{prompt}"
-        return hashlib.md5(raw.encode("utf-8")).hexdigest()
-
-    def get(self, prompt: str, model: str, temperature: float = 0.0, tier: str = "default") -> Optional[Any]:
-        """Retrieve cached response if valid for the specific tier and TTL."""
-        key = self._generate_key(prompt, model, temperature, tier)
-        entry = self.cache.get(key)
-        
-        if not entry:
-            return None
-            
-        # Check TTL specific to the tier
-        ttl = self.tier_config.get(tier, self.tier_config["default"])
-        if time.time() - entry["timestamp"] > ttl:
-            del self.cache[key]
-            return None
-            
-        return entry["content"]
-
-    def set(self, prompt: str, model: str, content: Any, temperature: float = 0.0, tier: str = "default"):
-        """Store response in cache with metadata."""
-        key = self._generate_key(prompt, model, temperature, tier)
-        self.cache[key] = {
-            "content": content,
-            "timestamp": time.time(),
-            "tier": tier
-        }
-        self.save()
-
-    def clear(self):
-        self.cache = {}
-        self.save()
+            logger.error(f"Failed to migrate legacy cache: {e}")
@@ -13,6 +13,7 @@ import json
 import yaml
 
 from rag.domain_aware_retriever import DomainAwareRetriever, DomainContext
+from rag.async_retrieval import retrieval_executor
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +96,25 @@ class ContextManagerV3:
             formatted_prompt_context=formatted_context
         )
 
+    async def abuild_context(
+        self,
+        phase: str,
+        user_requirement: str,
+        specialty: str | None = None,
+        project_config: Dict[str, Any] | None = None,
+    ) -> EnrichedContextV3:
+        """
+        Async version of :meth:`build_context`.
+        Retrieval and the project scan run on the shared retrieval pool.
+        """
+        return await retrieval_executor.run(
+            self.build_context,
+            phase=phase,
+            user_requirement=user_requirement,
+            specialty=specialty,
+            project_config=project_config,
+        )
+
     def _get_project_structure(self) -> str:
         """Scan key directories to provide structural context."""
         try:
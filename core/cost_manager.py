@@ -24,7 +24,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from collections import defaultdict
+
+from core.usage_ledger import UsageLedger, aggregate, get_usage_history
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +77,8 @@ class CostReport:
     by_phase: Dict[str, Dict[str, float]]  # phase -> {cost, tokens}
     num_calls: int
     alerts: List[CostAlert]
+    # The window reaches past the buffered records and no history was available
+    truncated: bool = False
 
 
 class CostManager:
@@ -140,7 +143,8 @@ class CostManager:
         local_task_budget: Optional[float] = None, # Client/Session Local Limit
         alert_threshold: float = 0.8,  # Alert at 80%
         enable_history: bool = True,
-        history_dir: Optional[str] = None
+        history_dir: Optional[str] = None,
+        ledger_size: int = 10_000
     ):
         """
         Initialize cost manager.
@@ -159,7 +163,8 @@ class CostManager:
         self.alert_threshold = alert_threshold
         
         # Tracking
-        self.usage_records: List[UsageRecord] = []
+        self.ledger = UsageLedger(ledger_size)
+        self.usage_records = self.ledger.records  # most recent ledger_size records
         self.alerts: List[CostAlert] = []
         self.current_task_cost = 0.0
         self.current_task_id: Optional[str] = None
@@ -183,24 +188,15 @@ class CostManager:
         if enable_history:
             self.history_dir = Path(history_dir or "./cost_history")
             self.history_dir.mkdir(exist_ok=True)
+            self.history = get_usage_history(str(self.history_dir))
             self._load_todays_usage() # Sync state from persistent storage
 
     def _load_todays_usage(self):
         """Load today's usage from history to enforce global daily limits across processes."""
         try:
             today_str = datetime.now().strftime("%Y-%m-%d")
-            history_file = self.history_dir / f"usage_{today_str}.jsonl"
-            
-            if history_file.exists():
-                total_today = 0.0
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.strip():
-                            try:
-                                record = json.loads(line)
-                                total_today += record.get("cost_usd", 0.0)
-                            except: pass
-                
+            total_today, _, calls = self.history.day_total(today_str)
+            if calls:
                 self.day_cost = total_today
                 self.total_cost = total_today # Assumes process lifecycle usually matches day or is irrelevant for total lifetime in this context
                 logger.info(f"Loaded existing daily usage: ${self.day_cost:.4f}")
@@ -249,7 +245,7 @@ class CostManager:
             task_id=task_id or self.current_task_id
         )
         
-        self.usage_records.append(record)
+        self.ledger.add(record)
         
         # Update running totals
         self.current_task_cost += cost
@@ -338,10 +334,7 @@ class CostManager:
     
     def get_cost_breakdown(self) -> Dict[str, float]:
         """Get cost breakdown by model."""
-        breakdown = defaultdict(float)
-        for r in self.usage_records:
-            breakdown[r.model] += r.cost_usd
-        return dict(breakdown)
+        return {model: totals["cost"] for model, totals in self.ledger.rollups["model"].items()}
     
     def generate_report(
         self,
@@ -350,54 +343,69 @@ class CostManager:
         """
         Generate comprehensive cost report.
         """
-        # Filter records
-        records = self.usage_records
-        if since:
-            records = [r for r in records if r.timestamp >= since]
-        
-        if not records:
+        ledger = self.ledger
+        if ledger.covers(since):
+            # Whole-lifetime report straight from the incremental rollups
+            if not ledger.calls:
+                return self._empty_report()
             return CostReport(
-                start_time=time.time(),
-                end_time=time.time(),
-                total_cost=0.0,
-                total_tokens=0,
-                by_model={},
-                by_provider={},
-                by_phase={},
-                num_calls=0,
+                start_time=ledger.first_timestamp,
+                end_time=ledger.last_timestamp,
+                total_cost=ledger.total_cost,
+                total_tokens=ledger.total_tokens,
+                by_model=ledger.breakdown("model"),
+                by_provider=ledger.breakdown("provider"),
+                by_phase=ledger.breakdown("phase"),
+                num_calls=ledger.calls,
                 alerts=self.alerts
             )
-        
-        # Aggregate by model
-        by_model = defaultdict(lambda: {"cost": 0.0, "tokens": 0})
-        for r in records:
-            by_model[r.model]["cost"] += r.cost_usd
-            by_model[r.model]["tokens"] += r.tokens_total
-        
-        # Aggregate by provider
-        by_provider = defaultdict(lambda: {"cost": 0.0, "tokens": 0})
-        for r in records:
-            by_provider[r.provider]["cost"] += r.cost_usd
-            by_provider[r.provider]["tokens"] += r.tokens_total
-        
-        # Aggregate by phase
-        by_phase = defaultdict(lambda: {"cost": 0.0, "tokens": 0})
-        for r in records:
-            by_phase[r.phase]["cost"] += r.cost_usd
-            by_phase[r.phase]["tokens"] += r.tokens_total
-        
-        total_cost = sum(r.cost_usd for r in records)
-        total_tokens = sum(r.tokens_total for r in records)
-        
+
+        if not ledger.holds(since) and self.enable_history:
+            # The ring has evicted part of the window: answer from the shared history
+            window = self.history.window(since)
+            if not window["calls"]:
+                return self._empty_report()
+            return CostReport(
+                start_time=window["start"],
+                end_time=window["end"],
+                total_cost=window["cost"],
+                total_tokens=window["tokens"],
+                by_model=window["model"],
+                by_provider=window["provider"],
+                by_phase=window["phase"],
+                num_calls=window["calls"],
+                alerts=self.alerts
+            )
+
+        # Windowed report over the records still in the ring buffer
+        records = ledger.since(since)
+        if not records:
+            return self._empty_report()
+
         return CostReport(
             start_time=records[0].timestamp,
             end_time=records[-1].timestamp,
-            total_cost=total_cost,
-            total_tokens=total_tokens,
-            by_model=dict(by_model),
-            by_provider=dict(by_provider),
-            by_phase=dict(by_phase),
+            total_cost=sum(r.cost_usd for r in records),
+            total_tokens=sum(r.tokens_total for r in records),
+            by_model=aggregate(records, "model"),
+            by_provider=aggregate(records, "provider"),
+            by_phase=aggregate(records, "phase"),
             num_calls=len(records),
+            alerts=self.alerts,
+            truncated=not ledger.holds(since)
+        )
+
+    def _empty_report(self) -> CostReport:
+        now = time.time()
+        return CostReport(
+            start_time=now,
+            end_time=now,
+            total_cost=0.0,
+            total_tokens=0,
+            by_model={},
+            by_provider={},
+            by_phase={},
+            num_calls=0,
             alerts=self.alerts
         )
     
@@ -527,10 +535,5 @@ class CostManager:
             pass
     
     def _append_to_history(self, record: UsageRecord):
-        """Append usage record to history file."""
-        # Create daily history file
-        date_str = datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d")
-        history_file = self.history_dir / f"usage_{date_str}.jsonl"
-        
-        with open(history_file, "a") as f:
-            f.write(json.dumps(asdict(record)) + "\n")
+        """Queue usage record for the batched history writer."""
+        self.history.record(asdict(record))
@@ -24,7 +24,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from collections import defaultdict
+
+from core.usage_ledger import UsageLedger, aggregate, get_usage_history
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +77,8 @@ class CostReport:
     by_phase: Dict[str, Dict[str, float]]  # phase -> {cost, tokens}
     num_calls: int
     alerts: List[CostAlert]
+    # The window reaches past the buffered records and no history was available
+    truncated: bool = False
 
 
 class CostManagerV2:
@@ -136,7 +139,8 @@ class CostManagerV2:
         per_day_budget: float = 40.0,
         alert_threshold: float = 0.8,  # Alert at 80%
         enable_history: bool = True,
-        history_dir: Optional[str] = None
+        history_dir: Optional[str] = None,
+        ledger_size: int = 10_000
     ):
         """
         Initialize cost manager.
@@ -163,7 +167,8 @@ class CostManagerV2:
         self.alert_threshold = alert_threshold
         
         # Tracking
-        self.usage_records: List[UsageRecord] = []
+        self.ledger = UsageLedger(ledger_size)
+        self.usage_records = self.ledger.records  # most recent ledger_size records
         self.alerts: List[CostAlert] = []
         self.current_task_cost = 0.0
         self.current_task_id: Optional[str] = None
@@ -185,6 +190,16 @@ class CostManagerV2:
         if enable_history:
             self.history_dir = Path(history_dir or "./cost_history")
             self.history_dir.mkdir(exist_ok=True)
+            self.history = get_usage_history(str(self.history_dir))
+            self._load_todays_usage()
+    
+    def _load_todays_usage(self):
+        """Seed the daily budget with today's spend from the shared history."""
+        try:
+            today_str = datetime.now().strftime("%Y-%m-%d")
+            self.day_cost, _, _ = self.history.day_total(today_str)
+        except Exception as e:
+            logger.error(f"Failed to load cost history: {e}")
     
     def track_usage(
         self,
@@ -246,7 +261,7 @@ class CostManagerV2:
             task_id=task_id or self.current_task_id
         )
         
-        self.usage_records.append(record)
+        self.ledger.add(record)
         
         # Update running totals
         self.current_task_cost += cost
@@ -301,13 +316,13 @@ class CostManagerV2:
         """End current task and return its cost."""
         cost = self.current_task_cost
         logger.info(f"Task {self.current_task_id} completed. Cost: ${cost:.4f}")
-        self.current_task_id = None\
+        self.current_task_id = None
         self.current_task_cost = 0.0
         return cost
     
     def get_cumulative_cost(self) -> float:
         """Get cumulative cost across all usage."""
-        return sum(r.cost_usd for r in self.usage_records)
+        return self.ledger.total_cost
     
     def generate_report(
         self,
@@ -326,54 +341,69 @@ class CostManagerV2:
         CostReport
             Detailed breakdown of costs.
         """
-        # Filter records
-        records = self.usage_records
-        if since:
-            records = [r for r in records if r.timestamp >= since]
-        
-        if not records:
+        ledger = self.ledger
+        if ledger.covers(since):
+            # Whole-lifetime report straight from the incremental rollups
+            if not ledger.calls:
+                return self._empty_report()
             return CostReport(
-                start_time=time.time(),
-                end_time=time.time(),
-                total_cost=0.0,
-                total_tokens=0,
-                by_model={},
-                by_provider={},
-                by_phase={},
-                num_calls=0,
+                start_time=ledger.first_timestamp,
+                end_time=ledger.last_timestamp,
+                total_cost=ledger.total_cost,
+                total_tokens=ledger.total_tokens,
+                by_model=ledger.breakdown("model"),
+                by_provider=ledger.breakdown("provider"),
+                by_phase=ledger.breakdown("phase"),
+                num_calls=ledger.calls,
                 alerts=self.alerts
             )
-        
-        # Aggregate by model
-        by_model = defaultdict(lambda: {"cost": 0.0, "tokens": 0})
-        for r in records:
-            by_model[r.model]["cost"] += r.cost_usd
-            by_model[r.model]["tokens"] += r.tokens_total
-        
-        # Aggregate by provider
-        by_provider = defaultdict(lambda: {"cost": 0.0, "tokens": 0})
-        for r in records:
-            by_provider[r.provider]["cost"] += r.cost_usd
-            by_provider[r.provider]["tokens"] += r.tokens_total
-        
-        # Aggregate by phase
-        by_phase = defaultdict(lambda: {"cost": 0.0, "tokens": 0})
-        for r in records:
-            by_phase[r.phase]["cost"] += r.cost_usd
-            by_phase[r.phase]["tokens"] += r.tokens_total
-        
-        total_cost = sum(r.cost_usd for r in records)
-        total_tokens = sum(r.tokens_total for r in records)
-        
+
+        if not ledger.holds(since) and self.enable_history:
+            # The ring has evicted part of the window: answer from the shared history
+            window = self.history.window(since)
+            if not window["calls"]:
+                return self._empty_report()
+            return CostReport(
+                start_time=window["start"],
+                end_time=window["end"],
+                total_cost=window["cost"],
+                total_tokens=window["tokens"],
+                by_model=window["model"],
+                by_provider=window["provider"],
+                by_phase=window["phase"],
+                num_calls=window["calls"],
+                alerts=self.alerts
+            )
+
+        # Windowed report over the records still in the ring buffer
+        records = ledger.since(since)
+        if not records:
+            return self._empty_report()
+
         return CostReport(
             start_time=records[0].timestamp,
             end_time=records[-1].timestamp,
-            total_cost=total_cost,
-            total_tokens=total_tokens,
-            by_model=dict(by_model),
-            by_provider=dict(by_provider),
-            by_phase=dict(by_phase),
+            total_cost=sum(r.cost_usd for r in records),
+            total_tokens=sum(r.tokens_total for r in records),
+            by_model=aggregate(records, "model"),
+            by_provider=aggregate(records, "provider"),
+            by_phase=aggregate(records, "phase"),
             num_calls=len(records),
+            alerts=self.alerts,
+            truncated=not ledger.holds(since)
+        )
+
+    def _empty_report(self) -> CostReport:
+        now = time.time()
+        return CostReport(
+            start_time=now,
+            end_time=now,
+            total_cost=0.0,
+            total_tokens=0,
+            by_model={},
+            by_provider={},
+            by_phase={},
+            num_calls=0,
             alerts=self.alerts
         )
     
@@ -490,10 +520,5 @@ class CostManagerV2:
             pass
     
     def _append_to_history(self, record: UsageRecord):
-        """Append usage record to history file."""
-        # Create daily history file
-        date_str = datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d")
-        history_file = self.history_dir / f"usage_{date_str}.jsonl"
-        
-        with open(history_file, "a") as f:
-            f.write(json.dumps(asdict(record)) + "\\n")
+        """Queue usage record for the batched history writer."""
+        self.history.record(asdict(record))
@@ -0,0 +1,278 @@
+"""
+Incremental, parallel Knowledge Graph builds.
+
+``GraphBuilder`` keeps a content hash per source file and on each build
+re-ingests only files that were added or changed, and drops the nodes of
+deleted ones. Changed files are parsed by ``GraphIngester`` in a process
+pool. The merge happens on a copy of the current graph, which is swapped
+in only when the build finishes, so readers keep seeing the previous
+snapshot meanwhile. Progress is published on the event bus.
+
+After merging, symbols are resolved across files (see ``resolver``) for
+the changed files and the files that import them.
+
+With a ``cache_dir`` the snapshot, hashes and symbols survive restarts, so
+the first build after a restart is incremental too.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.event_bus import bus, Event, EventType
+from .ingester import GraphIngester
+from .resolver import FileSymbols, SymbolIndex
+from .schema import KnowledgeGraph, GraphNode, GraphEdge
+
+logger = logging.getLogger(__name__)
+
+SOURCE_EXTENSIONS = (".py", ".cs", ".ts", ".js")
+SKIP_PARTS = ("node_modules", "__pycache__")
+
+# (mtime_ns, size, sha256) per file path
+FileState = Tuple[int, int, str]
+ParsedFile = Tuple[str, str, List[GraphNode], List[GraphEdge], Optional[FileSymbols]]
+
+
+def parse_file(file_path: str) -> ParsedFile:
+    """Ingest one file into a fresh graph. Runs in pool workers, so it must stay top-level."""
+    data = Path(file_path).read_bytes()
+    graph = KnowledgeGraph()
+    ingester = GraphIngester(graph)
+    ingester.process_file(file_path, data.decode("utf-8", errors="ignore"))
+    return (
+        file_path, hashlib.sha256(data).hexdigest(), list(graph.nodes.values()), graph.edges,
+        ingester.symbols.get(file_path)
+    )
+
+
+class GraphBuilder:
+    """
+    Serves the current graph snapshot and rebuilds it incrementally in the background.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Parser processes (default: CPU count).
+    inline_threshold : int
+        Builds with at most this many changed files are parsed in a thread
+        instead of paying the process pool start-up cost.
+    cache_dir : str, optional
+        Where to persist the snapshot and file hashes between runs.
+    on_swap : callable, optional
+        Called with the new graph each time a build is swapped in.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        inline_threshold: int = 8,
+        cache_dir: Optional[str] = None,
+        on_swap: Optional[Callable[[KnowledgeGraph], None]] = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.inline_threshold = inline_threshold
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.on_swap = on_swap
+        self.graph = KnowledgeGraph()
+        self.root: Optional[str] = None
+        self.files: Dict[str, FileState] = {}
+        self.symbols: Dict[str, FileSymbols] = {}
+        self.status: Dict[str, Any] = {"state": "idle"}
+        self._task: Optional[asyncio.Task] = None
+        self._load_cache()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, root: str) -> bool:
+        """Start a background build of ``root``; False if one is already running."""
+        if self.running:
+            return False
+        # Visible as running immediately, before the task gets scheduled
+        self.status = {"state": "running", "root": root, "started_at": time.time(), "parsed": 0}
+        self._task = asyncio.get_running_loop().create_task(self.build(root))
+        return True
+
+    async def wait(self) -> Dict[str, Any]:
+        """Wait for the running build (if any) and return the build status."""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+        return dict(self.status)
+
+    async def build(self, root: str) -> Dict[str, Any]:
+        """Bring the snapshot up to date with the files under ``root`` and swap it in."""
+        started = time.time()
+        self.status = {"state": "running", "root": root, "started_at": started, "parsed": 0}
+        try:
+            # A different root starts from scratch, matching a full rebuild
+            same_root = root == self.root
+            base_files = self.files if same_root else {}
+            base_graph = self.graph if same_root else KnowledgeGraph()
+            symbols = dict(self.symbols) if same_root else {}
+
+            files, changed, deleted = await asyncio.to_thread(self._scan, root, base_files)
+            self.status.update(files_total=len(files), files_changed=len(changed), files_deleted=len(deleted))
+            await self._publish(
+                EventType.LOG,
+                f"Graph build: {len(changed)} changed, {len(deleted)} deleted of {len(files)} files"
+            )
+
+            parsed = await self._parse(changed)
+            for file_path in changed + deleted:
+                symbols.pop(file_path, None)
+            for file_path, digest, _, _, file_symbols in parsed:
+                mtime_ns, size, _ = files[file_path]
+                files[file_path] = (mtime_ns, size, digest)
+                if file_symbols is not None:
+                    symbols[file_path] = file_symbols
+            graph, resolved = await asyncio.to_thread(
+                self._merge, base_graph, changed, deleted, parsed, symbols
+            )
+            # Forget files that failed to parse so the next build retries them
+            for file_path in set(changed) - {result[0] for result in parsed}:
+                files.pop(file_path, None)
+
+            # Atomic swap: readers see either the old snapshot or the new one
+            self.graph, self.files, self.symbols, self.root = graph, files, symbols, root
+            if self.on_swap:
+                self.on_swap(graph)
+            if self.cache_dir and (changed or deleted):
+                await asyncio.to_thread(self._save_cache)
+
+            self.status.update(
+                state="completed",
+                duration=time.time() - started,
+                nodes=len(graph.nodes),
+                edges=len(graph.edges),
+                resolved_edges=resolved
+            )
+            await self._publish(
+                EventType.INFO,
+                f"Graph build complete: {len(graph.nodes)} nodes, {len(graph.edges)} edges "
+                f"({len(changed)} files re-ingested in {self.status['duration']:.1f}s)"
+            )
+        except Exception as e:
+            logger.error(f"Graph build failed: {e}", exc_info=True)
+            self.status.update(state="failed", error=str(e), duration=time.time() - started)
+            await self._publish(EventType.ERROR, f"Graph build failed: {e}")
+        return dict(self.status)
+
+    def _scan(self, root: str, known: Dict[str, FileState]) -> Tuple[Dict[str, FileState], List[str], List[str]]:
+        """Current file states plus changed/added and deleted paths."""
+        files: Dict[str, FileState] = {}
+        changed: List[str] = []
+        for path in Path(root).resolve().rglob("*"):
+            if path.suffix not in SOURCE_EXTENSIONS or any(part in str(path) for part in SKIP_PARTS):
+                continue
+            try:
+                if not path.is_file():
+                    continue
+                stat = path.stat()
+                file_path = str(path)
+                previous = known.get(file_path)
+                if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                    files[file_path] = previous  # untouched, skip hashing
+                    continue
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError as e:
+                logger.warning(f"Failed to read {path}: {e}")
+                continue
+            files[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+            if not previous or previous[2] != digest:
+                changed.append(file_path)
+        deleted = [file_path for file_path in known if file_path not in files]
+        return files, changed, deleted
+
+    async def _parse(self, paths: List[str]) -> List[ParsedFile]:
+        """Parse files, in a process pool when there are enough of them."""
+        if not paths:
+            return []
+        loop = asyncio.get_running_loop()
+        pool = None
+        if len(paths) > self.inline_threshold and self.max_workers > 1:
+            # spawn: forking the threaded API process is not safe
+            pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            if pool:
+                futures = [loop.run_in_executor(pool, parse_file, path) for path in paths]
+            else:
+                futures = [asyncio.ensure_future(asyncio.to_thread(parse_file, path)) for path in paths]
+            results = []
+            step = max(1, len(paths) // 20)
+            for future in asyncio.as_completed(futures):
+                try:
+                    results.append(await future)
+                except Exception as e:
+                    logger.warning(f"Failed to ingest file: {e}")
+                self.status["parsed"] = len(results)
+                if len(results) % step == 0:
+                    await self._publish(EventType.LOG, f"Graph build: parsed {len(results)}/{len(paths)} files")
+            return results
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _merge(
+        base: KnowledgeGraph,
+        changed: List[str],
+        deleted: List[str],
+        parsed: List[ParsedFile],
+        symbols: Dict[str, FileSymbols]
+    ) -> Tuple[KnowledgeGraph, int]:
+        graph = base.copy()
+        graph.remove_files(changed + deleted)
+        for _, _, nodes, edges, _ in parsed:
+            for node in nodes:
+                graph.add_node(node)
+            for edge in edges:
+                graph.add_edge(edge)
+
+        # Re-link the changed files and everything that may import them
+        index = SymbolIndex()
+        for file_symbols in symbols.values():
+            index.update(file_symbols)
+        affected = set(changed) | index.dependents(changed + deleted)
+        return graph, index.resolve(graph, affected)
+
+    async def _publish(self, event_type: EventType, content: str):
+        await bus.publish(Event(type=event_type, agent="GraphBuilder", content=content))
+
+    def _save_cache(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        graph_path = self.cache_dir / "graph.kg"
+        self.graph.save(str(graph_path.with_suffix(".tmp")))
+        os.replace(graph_path.with_suffix(".tmp"), graph_path)
+        state = {
+            "root": self.root,
+            "files": self.files,
+            "symbols": {path: asdict(file_symbols) for path, file_symbols in self.symbols.items()},
+        }
+        (self.cache_dir / "files.json").write_text(json.dumps(state), encoding="utf-8")
+
+    def _load_cache(self):
+        if not self.cache_dir:
+            return
+        graph_path, state_path = self.cache_dir / "graph.kg", self.cache_dir / "files.json"
+        if not (graph_path.exists() and state_path.exists()):
+            return
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+            self.graph = KnowledgeGraph.load(str(graph_path))
+            self.root = state["root"]
+            self.files = {path: tuple(value) for path, value in state["files"].items()}
+            self.symbols = {path: FileSymbols.from_dict(data) for path, data in state.get("symbols", {}).items()}
+            logger.info(f"Loaded graph snapshot: {len(self.graph.nodes)} nodes, {len(self.files)} files")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable graph cache: {e}")
+            self.graph, self.root, self.files, self.symbols = KnowledgeGraph(), None, {}, {}
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import List, Dict, Set, Optional
 
 from .schema import KnowledgeGraph, GraphNode, GraphEdge, NodeType, EdgeType
+from .resolver import FileSymbols, SymbolIndex
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,19 @@ class GraphIngester:
 
     def __init__(self, graph: KnowledgeGraph):
         self.graph = graph
+        # Per-file definitions and references for the cross-file resolution pass
+        self.symbols: Dict[str, FileSymbols] = {}
+
+    def resolve(self, index: Optional[SymbolIndex] = None) -> int:
+        """
+        Link symbols across every file processed so far: imports to files,
+        base classes, calls and instantiations to their definitions.
+        Returns the number of resolved edges added.
+        """
+        index = index or SymbolIndex()
+        for symbols in self.symbols.values():
+            index.update(symbols)
+        return index.resolve(self.graph)
 
     def process_file(self, file_path: str, content: str):
         """
@@ -45,6 +59,12 @@ class GraphIngester:
     def _process_python(self, file_id: str, file_path: str, content: str):
         try:
             tree = ast.parse(content)
+            symbols = self.symbols[file_path] = FileSymbols(file_path)
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    symbols.definitions[node.name] = f"class:{node.name}:{file_path}"
+                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    symbols.definitions[node.name] = f"func:{node.name}:{file_path}"
             
             # Walk the AST
             for node in ast.walk(tree):
@@ -65,21 +85,14 @@ class GraphIngester:
                         type=EdgeType.DEFINES
                     ))
                     
-                    # Inheritance
+                    # Inheritance, linked to the base class by the resolution pass
                     for base in node.bases:
-                        if isinstance(base, ast.Name):
-                            # We assume the base class is in the graph or will be.
-                            # Since we don't know the file of the base class yet, 
-                            # we face a linking challenge. 
-                            # For MVP, we'll store the edge target as "fuzzy" and resolve later?
-                            # Or just create a placeholder semantic node.
-                            base_id_fuzzy = f"class:{base.id}:?" 
-                            # Actually, for visualization, just linking to the name is often enough for top-level view
-                            # or we leave it for now.
-                            pass
+                        base_name = _dotted_name(base)
+                        if base_name:
+                            symbols.bases.append((class_id, base_name))
 
                 # Function Def
-                elif isinstance(node, ast.FunctionDef):
+                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                     func_id = f"func:{node.name}:{file_path}"
                     self.graph.add_node(GraphNode(
                         id=func_id,
@@ -94,12 +107,25 @@ class GraphIngester:
                         target_id=func_id,
                         type=EdgeType.DEFINES
                     ))
+                    # Call sites, resolved to CALLS / INSTANTIATES later
+                    for inner in ast.walk(node):
+                        if isinstance(inner, ast.Call):
+                            callee = _dotted_name(inner.func)
+                            if callee:
+                                symbols.calls.append((func_id, callee))
                     
                 # Imports
                 elif isinstance(node, ast.Import):
                     for alias in node.names:
                         # Edge: File imports Module
                         module_name = alias.name
+                        if alias.asname:
+                            symbols.imports[alias.asname] = (module_name, None, 0)
+                        else:
+                            # "import a.b" binds "a"; the dotted key keeps a.b for the IMPORTS edge
+                            top = module_name.split(".")[0]
+                            symbols.imports[top] = (top, None, 0)
+                            symbols.imports[module_name] = (module_name, None, 0)
                         # Create pseudo-node for external module
                         mod_id = f"module:{module_name}" 
                         self.graph.add_node(GraphNode(
@@ -116,6 +142,9 @@ class GraphIngester:
                         ))
                 
                 elif isinstance(node, ast.ImportFrom):
+                    for alias in node.names:
+                        if alias.name != "*":
+                            symbols.imports[alias.asname or alias.name] = (node.module or "", alias.name, node.level)
                     if node.module:
                         mod_id = f"module:{node.module}"
                         self.graph.add_node(GraphNode(
@@ -180,3 +209,15 @@ class GraphIngester:
                 target_id=func_id,
                 type=EdgeType.DEFINES
             ))
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """``a.b.c`` for Name/Attribute chains, None for anything else (calls, subscripts)."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
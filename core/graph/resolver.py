@@ -0,0 +1,225 @@
+"""
+Cross-file symbol resolution for the Knowledge Graph.
+
+``GraphIngester`` parses each file on its own, so it cannot tell which
+file ``from core.graph.schema import KnowledgeGraph`` refers to.
+Alongside the per-file nodes it records a ``FileSymbols`` summary:
+top-level definitions, import aliases, class bases and call sites.
+``SymbolIndex`` is the second pass. It keeps a global table of module
+paths and exported names and turns those references into concrete
+IMPORTS, INHERITS, CALLS and INSTANTIATES edges.
+
+Resolution is a dictionary lookup per reference, so a full pass is
+linear in the size of the symbol table. When files change, only they
+and the files that may import them are re-resolved.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .schema import KnowledgeGraph, GraphEdge, EdgeType, NodeType
+
+logger = logging.getLogger(__name__)
+
+# Marks edges produced by resolution so they can be recomputed on their own
+RESOLVED = "resolved"
+MAX_REEXPORT_DEPTH = 5
+
+
+@dataclass
+class FileSymbols:
+    """What one Python file defines and references."""
+    file_path: str
+    definitions: Dict[str, str] = field(default_factory=dict)  # top-level name -> node ID
+    imports: Dict[str, Tuple[str, Optional[str], int]] = field(default_factory=dict)  # alias -> (module, name, level)
+    bases: List[Tuple[str, str]] = field(default_factory=list)  # (class node ID, dotted base)
+    calls: List[Tuple[str, str]] = field(default_factory=list)  # (function node ID, dotted callee)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FileSymbols':
+        return cls(
+            file_path=data["file_path"],
+            definitions=data["definitions"],
+            imports={alias: tuple(value) for alias, value in data["imports"].items()},
+            bases=[tuple(b) for b in data["bases"]],
+            calls=[tuple(c) for c in data["calls"]],
+        )
+
+
+def _module_key(file_path: str) -> Tuple[str, ...]:
+    """Path components naming the module a file provides (``pkg/__init__.py`` -> ``pkg``)."""
+    path = Path(file_path)
+    parts = path.with_suffix("").parts
+    return parts[:-1] if path.stem == "__init__" else parts
+
+
+class SymbolIndex:
+    """Global symbol table over the ingested Python files."""
+
+    def __init__(self):
+        self.files: Dict[str, FileSymbols] = {}
+        self._modules: Dict[str, Set[str]] = {}  # dotted module suffix -> file paths
+        self._by_path: Dict[Tuple[str, ...], str] = {}  # module key -> file path
+        self._importers: Dict[str, Set[str]] = {}  # imported stem -> importing files
+
+    def update(self, symbols: FileSymbols):
+        """Add or replace one file's symbols."""
+        self.remove(symbols.file_path)
+        self.files[symbols.file_path] = symbols
+        key = _module_key(symbols.file_path)
+        self._by_path[key] = symbols.file_path
+        for i in range(len(key)):
+            self._modules.setdefault(".".join(key[i:]), set()).add(symbols.file_path)
+        for stem in self._imported_stems(symbols):
+            self._importers.setdefault(stem, set()).add(symbols.file_path)
+
+    def remove(self, file_path: str):
+        symbols = self.files.pop(file_path, None)
+        if symbols is None:
+            return
+        key = _module_key(file_path)
+        self._by_path.pop(key, None)
+        for i in range(len(key)):
+            self._modules.get(".".join(key[i:]), set()).discard(file_path)
+        for stem in self._imported_stems(symbols):
+            self._importers.get(stem, set()).discard(file_path)
+
+    def dependents(self, file_paths: Iterable[str]) -> Set[str]:
+        """Files whose imports may refer to any of ``file_paths`` (a superset)."""
+        found: Set[str] = set()
+        frontier = list(file_paths)
+        # Transitive, so re-exports through a package __init__ are covered
+        while frontier:
+            key = _module_key(frontier.pop())
+            for importer in self._importers.get(key[-1], ()) if key else ():
+                if importer not in found:
+                    found.add(importer)
+                    frontier.append(importer)
+        return found
+
+    def resolve(self, graph: KnowledgeGraph, file_paths: Optional[Iterable[str]] = None) -> int:
+        """
+        Add resolved edges for ``file_paths`` (default: every file) to ``graph``.
+        Previously resolved edges of those files are replaced. Returns the
+        number of edges added.
+        """
+        targets = set(self.files if file_paths is None else file_paths) & set(self.files)
+        if not targets:
+            return 0
+        graph.remove_edges(
+            lambda e: e.metadata.get(RESOLVED) and graph.nodes.get(e.source_id) is not None
+            and graph.nodes[e.source_id].file_path in targets
+        )
+
+        added = 0
+        for file_path in targets:
+            symbols = self.files[file_path]
+            edges: Set[Tuple[str, str, EdgeType]] = set()
+
+            for alias, (module, name, level) in symbols.imports.items():
+                target = self._module_file(file_path, module, level)
+                if target is None and name is not None:
+                    # from pkg import submodule
+                    target = self._module_file(file_path, f"{module}.{name}" if module else name, level)
+                if target is not None and target != file_path:
+                    edges.add((f"file:{file_path}", f"file:{target}", EdgeType.IMPORTS))
+
+            for class_id, base in symbols.bases:
+                target_id = self.lookup(file_path, base)
+                if target_id and self._node_type(graph, target_id) == NodeType.CLASS:
+                    edges.add((class_id, target_id, EdgeType.INHERITS))
+
+            for func_id, callee in symbols.calls:
+                target_id = self.lookup(file_path, callee)
+                node_type = self._node_type(graph, target_id) if target_id else None
+                if node_type == NodeType.CLASS:
+                    edges.add((func_id, target_id, EdgeType.INSTANTIATES))
+                elif node_type == NodeType.FUNCTION and target_id != func_id:
+                    edges.add((func_id, target_id, EdgeType.CALLS))
+
+            for source_id, target_id, edge_type in edges:
+                graph.add_edge(GraphEdge(source_id, target_id, edge_type, {RESOLVED: True}))
+            added += len(edges)
+        return added
+
+    def lookup(self, file_path: str, dotted: str, depth: int = 0) -> Optional[str]:
+        """Node ID that ``dotted`` (as written in ``file_path``) refers to, if known."""
+        symbols = self.files.get(file_path)
+        if symbols is None or depth > MAX_REEXPORT_DEPTH:
+            return None
+        head, _, rest = dotted.partition(".")
+        if head in symbols.definitions:
+            return symbols.definitions[head] if not rest else None
+        if head not in symbols.imports:
+            return None
+
+        module, name, level = symbols.imports[head]
+        if name is None:
+            # import pkg.mod as alias -> alias.Name
+            return self._lookup_in_module(file_path, module, rest, level, depth)
+        if not rest:
+            # from mod import Name
+            found = self._lookup_in_module(file_path, module, name, level, depth)
+            if found:
+                return found
+        # from pkg import mod -> mod.Name
+        submodule = f"{module}.{name}" if module else name
+        return self._lookup_in_module(file_path, submodule, rest, level, depth) if rest else None
+
+    def _lookup_in_module(self, file_path: str, module: str, dotted: str, level: int, depth: int) -> Optional[str]:
+        if not dotted:
+            return None
+        # Longest module prefix wins: mod.sub.Name -> (mod.sub, Name)
+        parts = dotted.split(".")
+        for split in range(len(parts) - 1, -1, -1):
+            prefix = ".".join(p for p in [module] + parts[:split] if p)
+            target = self._module_file(file_path, prefix, level)
+            if target is not None:
+                # Follows re-exports such as names imported into a package __init__
+                return self.lookup(target, ".".join(parts[split:]), depth + 1)
+        return None
+
+    def _module_file(self, importer: str, module: str, level: int) -> Optional[str]:
+        """File providing ``module`` as imported from ``importer``."""
+        if level:
+            base = _module_key(importer)
+            # A module's own package is one level up; a package __init__ is its own package
+            keep = len(base) - level + (1 if Path(importer).stem == "__init__" else 0)
+            base = base[:max(keep, 0)]
+            key = base + tuple(p for p in module.split(".") if p)
+            return self._by_path.get(key)
+
+        candidates = self._modules.get(module)
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return next(iter(candidates))
+        # Ambiguous suffix: prefer the candidate sharing the longest path with the importer
+        importer_parts = Path(importer).parts
+        return max(sorted(candidates), key=lambda c: _common_prefix(importer_parts, Path(c).parts))
+
+    @staticmethod
+    def _node_type(graph: KnowledgeGraph, node_id: str) -> Optional[NodeType]:
+        node = graph.nodes.get(node_id)
+        return node.type if node else None
+
+    @staticmethod
+    def _imported_stems(symbols: FileSymbols) -> Set[str]:
+        stems = set()
+        for module, name, _ in symbols.imports.values():
+            if module:
+                stems.add(module.rsplit(".", 1)[-1])
+            if name:
+                stems.add(name)
+        return stems
+
+
+def _common_prefix(a: Tuple[str, ...], b: Tuple[str, ...]) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
@@ -15,28 +15,18 @@ class GraphRetriever:
     def __init__(self, graph: KnowledgeGraph):
         self.graph = graph
 
-    def expand_context(self, node_ids: List[str], hops: int = 1) -> List[GraphNode]:
+    def expand_context(self, node_ids: List[str], hops: int = 1, max_nodes: int = 200) -> List[GraphNode]:
         """
-        Get 1-hop neighbors for a list of nodes to provide structural context.
+        Get neighbors up to ``hops`` edges away for a list of nodes to provide structural context.
         useful for answering "What does this class inherit from?" or "What does this function call?"
+        Expansion stops after ``max_nodes`` nodes so dense hubs don't flood the prompt.
         """
-        all_nodes = set()
-        
-        # 1. Add original nodes
         for nid in node_ids:
-            if nid in self.graph.nodes:
-                all_nodes.add(self.graph.nodes[nid])
-            else:
+            if nid not in self.graph.nodes:
                 logger.warning(f"Node ID {nid} not found in graph")
 
-        # 2. Expand neighbors
-        if hops > 0:
-            for nid in node_ids:
-                neighbors = self.graph.get_neighbors(nid)
-                for neighbor in neighbors:
-                    all_nodes.add(neighbor)
-        
-        return list(all_nodes)
+        reached = self.graph.k_hop(node_ids, hops=max(hops, 0), max_nodes=max_nodes)
+        return [self.graph.nodes[nid] for nid in reached if nid in self.graph.nodes]
 
     def format_context(self, nodes: List[GraphNode]) -> str:
         """
@@ -1,12 +1,18 @@
 
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Set, Optional, Any
+from typing import List, Dict, Set, Optional, Any, Iterable, Callable
 import json
 import logging
+import struct
+import sys
 
 logger = logging.getLogger(__name__)
 
+# First bytes of a binary graph file written by KnowledgeGraph.save
+_BINARY_MAGIC = b"KGRAPH\x00\x01"
+
 class NodeType(Enum):
     FILE = "file"
     CLASS = "class"
@@ -64,16 +70,41 @@ class KnowledgeGraph:
     """
     In-memory representation of the code knowledge graph.
     Can be serialized to JSON/GEXF or pushed to Neo4j.
+
+    Node IDs are interned to integer handles, and forward and reverse
+    adjacency are indexed by edge type, so neighbor and k-hop queries only
+    touch the edges they return. ``save`` writes a compact binary file;
+    ``load`` also reads the older JSON dumps.
     """
     def __init__(self):
         self.nodes: Dict[str, GraphNode] = {}
         self.edges: List[GraphEdge] = []
-        self.adjacency: Dict[str, Set[str]] = {} # source -> set of targets
+        self._handles: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._forward: Dict[EdgeType, Dict[int, Set[int]]] = {t: {} for t in EdgeType}
+        self._reverse: Dict[EdgeType, Dict[int, Set[int]]] = {t: {} for t in EdgeType}
+
+    def intern(self, node_id: str) -> int:
+        """Integer handle for a node ID (allocated on first use)."""
+        handle = self._handles.get(node_id)
+        if handle is None:
+            handle = self._handles[node_id] = len(self._ids)
+            self._ids.append(node_id)
+        return handle
+
+    @property
+    def adjacency(self) -> Dict[str, Set[str]]:
+        """source -> set of targets over all edge types (built on demand)."""
+        result: Dict[str, Set[str]] = {node_id: set() for node_id in self.nodes}
+        for index in self._forward.values():
+            for source, targets in index.items():
+                result.setdefault(self._ids[source], set()).update(self._ids[t] for t in targets)
+        return result
 
     def add_node(self, node: GraphNode):
         if node.id not in self.nodes:
             self.nodes[node.id] = node
-            self.adjacency[node.id] = set()
+            self.intern(node.id)
 
     def add_edge(self, edge: GraphEdge):
         if edge.source_id not in self.nodes:
@@ -88,23 +119,130 @@ class KnowledgeGraph:
             pass
 
         self.edges.append(edge)
-        self.adjacency[edge.source_id].add(edge.target_id)
+        self._index(self.intern(edge.source_id), self.intern(edge.target_id), edge.type)
+
+    def remove_files(self, file_paths: Iterable[str]) -> int:
+        """
+        Drop the nodes defined in ``file_paths`` and every edge leaving them.
+        Edges from other files into those nodes are kept, like edges to
+        external targets, so they reconnect when a file is re-ingested.
+        Returns the number of nodes removed.
+        """
+        paths = set(file_paths)
+        removed = {node_id for node_id, node in self.nodes.items() if node.file_path in paths}
+        for node_id in removed:
+            del self.nodes[node_id]
+        self.remove_edges(lambda edge: edge.source_id in removed)
+        return len(removed)
+
+    def remove_edges(self, predicate: Callable[[GraphEdge], bool]) -> int:
+        """Drop every edge matching ``predicate``; returns how many were removed."""
+        kept = []
+        for edge in self.edges:
+            if predicate(edge):
+                source, target = self._handles[edge.source_id], self._handles[edge.target_id]
+                self._forward[edge.type][source].discard(target)
+                self._reverse[edge.type][target].discard(source)
+            else:
+                kept.append(edge)
+        removed = len(self.edges) - len(kept)
+        self.edges = kept
+        return removed
+
+    def copy(self) -> 'KnowledgeGraph':
+        """Independent copy; node and edge objects are shared, not cloned."""
+        kg = KnowledgeGraph()
+        kg.nodes = dict(self.nodes)
+        kg.edges = list(self.edges)
+        kg._handles = dict(self._handles)
+        kg._ids = list(self._ids)
+        kg._forward = {t: {h: set(v) for h, v in index.items()} for t, index in self._forward.items()}
+        kg._reverse = {t: {h: set(v) for h, v in index.items()} for t, index in self._reverse.items()}
+        return kg
+
+    def _index(self, source: int, target: int, edge_type: EdgeType):
+        self._forward[edge_type].setdefault(source, set()).add(target)
+        self._reverse[edge_type].setdefault(target, set()).add(source)
+
+    def _indexes(self, edge_types: Optional[Iterable[EdgeType]], direction: str) -> List[Dict[int, Set[int]]]:
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction: {direction}")
+        types = list(EdgeType) if edge_types is None else list(edge_types)
+        indexes = []
+        if direction in ("out", "both"):
+            indexes.extend(self._forward[t] for t in types)
+        if direction in ("in", "both"):
+            indexes.extend(self._reverse[t] for t in types)
+        return indexes
+
+    def neighbor_ids(
+        self,
+        node_id: str,
+        edge_type: Optional[EdgeType] = None,
+        direction: str = "out"
+    ) -> Set[str]:
+        """
+        IDs linked to ``node_id``. ``direction`` is ``"out"`` (edges from the
+        node), ``"in"`` (edges to it, e.g. "who inherits from X") or ``"both"``.
+        """
+        handle = self._handles.get(node_id)
+        if handle is None:
+            return set()
+        edge_types = None if edge_type is None else [edge_type]
+        found: Set[int] = set()
+        for index in self._indexes(edge_types, direction):
+            found.update(index.get(handle, ()))
+        return {self._ids[h] for h in found}
 
-    def get_neighbors(self, node_id: str, edge_type: Optional[EdgeType] = None) -> List[GraphNode]:
+    def get_neighbors(
+        self,
+        node_id: str,
+        edge_type: Optional[EdgeType] = None,
+        direction: str = "out"
+    ) -> List[GraphNode]:
         """Get connected nodes."""
-        if node_id not in self.adjacency:
+        if node_id not in self.nodes:
             return []
-        
-        target_ids = self.adjacency[node_id]
-        if edge_type:
-            # Filter by edge type
-            filtered_targets = {
-                e.target_id for e in self.edges 
-                if e.source_id == node_id and e.type == edge_type
-            }
-            target_ids = target_ids.intersection(filtered_targets)
-            
-        return [self.nodes[tid] for tid in target_ids if tid in self.nodes]
+        return [self.nodes[nid] for nid in self.neighbor_ids(node_id, edge_type, direction) if nid in self.nodes]
+
+    def k_hop(
+        self,
+        node_ids: Iterable[str],
+        hops: int = 1,
+        edge_types: Optional[Iterable[EdgeType]] = None,
+        direction: str = "out",
+        max_nodes: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Breadth-first expansion from ``node_ids`` up to ``hops`` edges away.
+
+        Returns ``{node_id: distance}`` in BFS order, seeds first at
+        distance 0. Expansion stops once ``max_nodes`` IDs are collected.
+        """
+        indexes = self._indexes(edge_types, direction)
+        reached: Dict[int, int] = {}
+        frontier: List[int] = []
+        for node_id in node_ids:
+            handle = self._handles.get(node_id)
+            if handle is not None and handle not in reached:
+                reached[handle] = 0
+                frontier.append(handle)
+
+        for depth in range(1, hops + 1):
+            next_frontier: List[int] = []
+            for handle in frontier:
+                for index in indexes:
+                    for neighbor in index.get(handle, ()):
+                        if neighbor in reached:
+                            continue
+                        if max_nodes is not None and len(reached) >= max_nodes:
+                            return {self._ids[h]: d for h, d in reached.items()}
+                        reached[neighbor] = depth
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return {self._ids[h]: d for h, d in reached.items()}
 
     def to_json(self) -> Dict[str, Any]:
         return {
@@ -113,15 +251,85 @@ class KnowledgeGraph:
         }
     
     def save(self, path: str):
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_json(), f, indent=2)
+        """
+        Write the graph in the binary format: magic, section lengths, a
+        compact JSON header (interned IDs, nodes, edge metadata) and the
+        edges as little-endian uint32 (source, target, type) triples.
+        """
+        types = list(EdgeType)
+        type_index = {t: i for i, t in enumerate(types)}
+        header = {
+            "ids": self._ids,
+            "edge_types": [t.value for t in types],
+            "nodes": [
+                [self._handles[n.id], n.type.value, n.name, n.file_path, n.metadata]
+                for n in self.nodes.values()
+            ],
+            "edge_metadata": {str(i): e.metadata for i, e in enumerate(self.edges) if e.metadata},
+        }
+        edges = array("I")
+        for e in self.edges:
+            edges.extend((self._handles[e.source_id], self._handles[e.target_id], type_index[e.type]))
+        if sys.byteorder == "big":
+            edges.byteswap()
+
+        blob = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        with open(path, 'wb') as f:
+            f.write(_BINARY_MAGIC)
+            f.write(struct.pack("<QQ", len(blob), len(self.edges)))
+            f.write(blob)
+            f.write(edges.tobytes())
 
     @classmethod
     def load(cls, path: str) -> 'KnowledgeGraph':
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data.startswith(_BINARY_MAGIC):
+            return cls._load_binary(data)
+        return cls._load_json(json.loads(data.decode('utf-8')))
+
+    @classmethod
+    def _load_binary(cls, data: bytes) -> 'KnowledgeGraph':
+        offset = len(_BINARY_MAGIC)
+        header_len, edge_count = struct.unpack_from("<QQ", data, offset)
+        offset += struct.calcsize("<QQ")
+        header = json.loads(data[offset:offset + header_len].decode('utf-8'))
+        offset += header_len
+        edges = array("I")
+        edges.frombytes(data[offset:offset + edge_count * 3 * edges.itemsize])
+        if sys.byteorder == "big":
+            edges.byteswap()
+
+        kg = cls()
+        ids = header["ids"]
+        kg._ids = list(ids)
+        kg._handles = {node_id: i for i, node_id in enumerate(ids)}
+        for handle, node_type, name, file_path, metadata in header["nodes"]:
+            node_id = ids[handle]
+            kg.nodes[node_id] = GraphNode(
+                id=node_id,
+                type=NodeType(node_type),
+                name=name,
+                file_path=file_path,
+                metadata=metadata
+            )
+
+        types = [EdgeType(t) for t in header["edge_types"]]
+        edge_metadata = header["edge_metadata"]
+        for i in range(edge_count):
+            source, target, edge_type = edges[3 * i], edges[3 * i + 1], types[edges[3 * i + 2]]
+            kg.edges.append(GraphEdge(
+                source_id=ids[source],
+                target_id=ids[target],
+                type=edge_type,
+                metadata=edge_metadata.get(str(i), {})
+            ))
+            kg._index(source, target, edge_type)
+        return kg
+
+    @classmethod
+    def _load_json(cls, data: Dict[str, Any]) -> 'KnowledgeGraph':
         kg = cls()
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
         for n_data in data['nodes']:
             kg.add_node(GraphNode(
                 id=n_data['id'],
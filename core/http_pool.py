@@ -0,0 +1,186 @@
+"""
+Shared HTTP connection pools for LLM providers.
+
+The OpenAI / Anthropic / Perplexity SDK clients were constructed inside every
+``complete`` call, so each request paid a fresh TLS handshake and parallel
+phases never reused keep-alive connections. ``http_pool`` keeps one
+``httpx.AsyncClient`` per provider (and per event loop, since httpx
+connections cannot move between loops) with a configurable pool size and
+optional HTTP/2. It also counts in-flight requests so pool utilization can be
+exported on ``/metrics``.
+
+Configuration lives under ``http_pool`` in ``config/model_mapping_v2.yaml``::
+
+    http_pool:
+      max_connections: 20
+      max_keepalive_connections: 10
+      keepalive_expiry_seconds: 30
+      http2: true            # needs the optional ``h2`` package
+      providers:
+        openai: { max_connections: 40 }
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONFIG: Dict[str, Any] = {
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry_seconds": 30,
+    "http2": True,
+}
+
+
+@dataclass
+class _ProviderStats:
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    requests: int = 0
+    clients_created: int = 0
+
+
+def load_pool_config(path: str = "config/model_mapping_v2.yaml") -> Dict[str, Any]:
+    """Read the ``http_pool`` section of the model mapping config."""
+    try:
+        import yaml
+        config_path = Path(path)
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            return config.get("http_pool") or {}
+    except Exception as e:
+        logger.warning(f"Could not load http_pool config: {e}")
+    return {}
+
+
+class HTTPClientPool:
+    """
+    Per-provider ``httpx.AsyncClient`` registry.
+
+    Parameters
+    ----------
+    config : dict, optional
+        ``http_pool`` settings; loaded from the model mapping when omitted.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        self.config = load_pool_config() if config is None else config
+        self._lock = threading.Lock()
+        # provider -> (event loop, client)
+        self._clients: Dict[str, Tuple[asyncio.AbstractEventLoop, Any]] = {}
+        self._stats: Dict[str, _ProviderStats] = {}
+        self._http2_available = importlib.util.find_spec("h2") is not None
+
+    def settings(self, provider: str) -> Dict[str, Any]:
+        """Effective pool settings for a provider."""
+        merged = dict(DEFAULT_POOL_CONFIG)
+        merged.update({k: v for k, v in self.config.items() if k != "providers"})
+        merged.update((self.config.get("providers") or {}).get(provider, {}))
+        return merged
+
+    def client(self, provider: str, client_cls: Optional[type] = None) -> Any:
+        """
+        Shared async HTTP client for ``provider`` on the running loop.
+
+        ``client_cls`` is the SDK's own client class (e.g.
+        ``openai.DefaultAsyncHttpxClient``) so the SDK keeps its default
+        timeouts and socket options; plain ``httpx.AsyncClient`` otherwise.
+        """
+        if client_cls is None:
+            import httpx
+            client_cls = httpx.AsyncClient
+        http_lib = _http_module(client_cls)
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._clients.get(provider)
+            if entry is not None and entry[0] is loop and not entry[1].is_closed:
+                return entry[1]
+
+            cfg = self.settings(provider)
+            http2 = bool(cfg["http2"]) and self._http2_available
+            if cfg["http2"] and not self._http2_available:
+                logger.debug("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+
+            client = client_cls(
+                http2=http2,
+                limits=http_lib.Limits(
+                    max_connections=int(cfg["max_connections"]),
+                    max_keepalive_connections=int(cfg["max_keepalive_connections"]),
+                    keepalive_expiry=float(cfg["keepalive_expiry_seconds"]),
+                ),
+            )
+            # A client bound to a finished loop can't be closed from here;
+            # dropping it lets its sockets be collected.
+            self._clients[provider] = (loop, client)
+            self._stat(provider).clients_created += 1
+            logger.info(f"Opened HTTP pool for {provider} (http2={http2}, max={cfg['max_connections']})")
+            return client
+
+    @contextmanager
+    def track(self, provider: str) -> Iterator[None]:
+        """Count a request as in flight for utilization metrics."""
+        with self._lock:
+            stats = self._stat(provider)
+            stats.in_flight += 1
+            stats.requests += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                stats.in_flight -= 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider pool size and utilization."""
+        with self._lock:
+            out = {}
+            for provider, stats in self._stats.items():
+                max_connections = int(self.settings(provider)["max_connections"])
+                out[provider] = {
+                    "max_connections": max_connections,
+                    "in_flight": stats.in_flight,
+                    "peak_in_flight": stats.peak_in_flight,
+                    "utilization": stats.in_flight / max_connections if max_connections else 0.0,
+                    "requests": stats.requests,
+                    "clients_created": stats.clients_created,
+                }
+            return out
+
+    async def aclose(self) -> None:
+        """Close clients owned by the running loop (e.g. on API shutdown)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            owned = [p for p, (l, _) in self._clients.items() if l is loop]
+            clients = [self._clients.pop(p)[1] for p in owned]
+        for client in clients:
+            await client.aclose()
+        if clients:
+            logger.info(f"Closed {len(clients)} provider HTTP pools")
+
+    def _stat(self, provider: str) -> _ProviderStats:
+        return self._stats.setdefault(provider, _ProviderStats())
+
+
+def _http_module(client_cls: type) -> Any:
+    """The httpx-compatible package ``client_cls`` is built on (SDKs may vendor a fork)."""
+    for cls in client_cls.__mro__:
+        root = (getattr(cls, "__module__", "") or "").partition(".")[0]
+        if root.startswith("httpx"):
+            return importlib.import_module(root)
+    import httpx
+    return httpx
+
+
+# Process-wide pool shared by every LLMClientV2
+http_pool = HTTPClientPool()
@@ -0,0 +1,267 @@
+"""
+Latency tracking and hedged requests for LLM calls.
+
+``latency_tracker`` keeps a rolling window of call latencies per provider and
+model (full-call duration and, for streams, time to first token). The
+cascade router reads it to route around models whose p95 has degraded, and
+``hedge_policy`` uses it to decide when a call is slow enough that a
+duplicate request to the next model in the cascade is worth sending.
+
+Hedging is bounded two ways so tail latency drops without runaway spend:
+at most ``max_hedge_ratio`` of calls may be hedged, and the estimated
+cost of hedge requests in each budget window may not exceed
+``max_extra_cost_usd``.
+
+Configuration lives under ``latency`` in ``config/model_mapping_v2.yaml``::
+
+    latency:
+      window_size: 200
+      failover_p95_seconds: 120
+      hedging:
+        enabled: true
+        percentile: 95
+        max_hedge_ratio: 0.1
+        max_extra_cost_usd: 2.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_HEDGING: Dict[str, Any] = {
+    "enabled": False,
+    "percentile": 95,
+    "min_samples": 20,
+    "default_delay_seconds": None,
+    "max_hedge_ratio": 0.1,
+    "max_extra_cost_usd": 2.0,
+    "budget_window_seconds": 3600,
+}
+
+
+def load_latency_config(path: str = "config/model_mapping_v2.yaml") -> Dict[str, Any]:
+    """Read the ``latency`` section of the model mapping config."""
+    try:
+        import yaml
+        config_path = Path(path)
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            return config.get("latency") or {}
+    except Exception as e:
+        logger.warning(f"Could not load latency config: {e}")
+    return {}
+
+
+class LatencyTracker:
+    """Rolling latency samples per (provider, model, kind)."""
+
+    def __init__(self, window_size: int = 200) -> None:
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._samples: Dict[Tuple[str, str, str], Deque[float]] = {}
+
+    def record(self, provider: str, model: str, seconds: float, kind: str = "total") -> None:
+        """Add a sample; ``kind`` is ``"total"`` or ``"ttft"`` (time to first token)."""
+        with self._lock:
+            key = (provider, model, kind)
+            if key not in self._samples:
+                self._samples[key] = deque(maxlen=self.window_size)
+            self._samples[key].append(seconds)
+
+    def percentile(
+        self, provider: str, model: str, q: float, kind: str = "total", min_samples: int = 1
+    ) -> Optional[float]:
+        """``q``-th percentile (0-100) of recent samples; None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get((provider, model, kind), ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        index = min(len(samples) - 1, int(round(q / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95 and sample count for every tracked series."""
+        with self._lock:
+            keys = list(self._samples)
+        out = {}
+        for provider, model, kind in keys:
+            out[f"{provider}/{model}/{kind}"] = {
+                "p50": self.percentile(provider, model, 50, kind),
+                "p95": self.percentile(provider, model, 95, kind),
+                "samples": len(self._samples[(provider, model, kind)]),
+            }
+        return out
+
+
+class HedgePolicy:
+    """
+    Decides when to hedge and races the original call against the hedge.
+
+    Parameters
+    ----------
+    config : dict
+        ``latency.hedging`` settings.
+    tracker : LatencyTracker
+        Source of the percentile delays.
+    """
+
+    def __init__(self, config: Dict[str, Any], tracker: LatencyTracker) -> None:
+        self.config = dict(DEFAULT_HEDGING)
+        self.config.update(config or {})
+        self.enabled = bool(self.config["enabled"])
+        self.tracker = tracker
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self.window_cost = 0.0
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.skipped_budget = 0
+        self.extra_cost_usd = 0.0
+
+    def delay_for(self, provider: str, model: str, kind: str = "total") -> Optional[float]:
+        """Seconds to wait before hedging a call to ``model``; None to not hedge."""
+        delay = self.tracker.percentile(
+            provider, model, float(self.config["percentile"]), kind, int(self.config["min_samples"])
+        )
+        if delay is None:
+            delay = self.config["default_delay_seconds"]
+        return float(delay) if delay is not None else None
+
+    async def race(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        backup: Callable[[], Awaitable[T]],
+        delay: float,
+        estimated_cost: float = 0.0
+    ) -> T:
+        """
+        Run ``primary``; if it hasn't finished after ``delay`` seconds and the
+        budget allows, start ``backup`` and return whichever succeeds first.
+        The other one is cancelled.
+        """
+        self._count_call()
+        first = asyncio.ensure_future(primary())
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._admit(estimated_cost):
+                return await first
+
+            second = asyncio.ensure_future(backup())
+            tasks.add(second)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self._record_win()
+                        return task.result()
+            # Both failed: surface the original call's error
+            return first.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def race_stream(
+        self,
+        primary: AsyncIterator[T],
+        backup: Callable[[], AsyncIterator[T]],
+        delay: float,
+        estimated_cost: float = 0.0
+    ) -> AsyncIterator[T]:
+        """
+        Streaming ``race``: the stream whose first item arrives first wins and
+        is relayed; the other is cancelled before anything of it is yielded.
+        """
+        self._count_call()
+        streams = {"primary": primary.__aiter__()}
+        heads = {"primary": asyncio.ensure_future(streams["primary"].__anext__())}
+        winner = None
+        try:
+            done, _ = await asyncio.wait(set(heads.values()), timeout=delay)
+            if not done and self._admit(estimated_cost):
+                streams["backup"] = backup().__aiter__()
+                heads["backup"] = asyncio.ensure_future(streams["backup"].__anext__())
+                name = await self._first_success(heads)
+            else:
+                name = "primary"
+            first_item = await heads[name]
+            winner = name
+        finally:
+            # On failure or cancellation nothing wins and every stream is closed
+            for name, head in heads.items():
+                if name != winner:
+                    head.cancel()
+                    await asyncio.gather(head, return_exceptions=True)
+                    await streams[name].aclose()
+
+        yield first_item
+        async for item in streams[winner]:
+            yield item
+
+    async def _first_success(self, heads: Dict[str, asyncio.Future]) -> str:
+        pending = set(heads.values())
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for name, head in heads.items():
+                if head in done and head.exception() is None:
+                    if name == "backup":
+                        self._record_win()
+                    return name
+        return "primary"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "skipped_budget": self.skipped_budget,
+                "extra_cost_usd": round(self.extra_cost_usd, 6),
+            }
+
+    def _count_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def _admit(self, estimated_cost: float) -> bool:
+        """Reserve budget for one hedge, or refuse if ratio or spend is exhausted."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= float(self.config["budget_window_seconds"]):
+                self._window_start = now
+                self.window_cost = 0.0
+            over_ratio = self.hedges + 1 > float(self.config["max_hedge_ratio"]) * self.calls + 1
+            over_cost = self.window_cost + estimated_cost > float(self.config["max_extra_cost_usd"])
+            if over_ratio or over_cost:
+                self.skipped_budget += 1
+                return False
+            self.hedges += 1
+            self.window_cost += estimated_cost
+            self.extra_cost_usd += estimated_cost
+            return True
+
+    def _record_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+
+_config = load_latency_config()
+
+# Process-wide tracker and policy shared by LLMClientV2 and the cascade router
+latency_tracker = LatencyTracker(int(_config.get("window_size", 200)))
+hedge_policy = HedgePolicy(_config.get("hedging") or {}, latency_tracker)
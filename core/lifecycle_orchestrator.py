@@ -23,12 +23,17 @@ from core.error_tracker import ErrorTracker
 from core.guardrails import GuardrailMonitor, Action
 from agents.specialist_agents.test_generator import TestGeneratorAgent
 from core.agents.specialist_agents.repair_agent import RepairAgent
-from api.event_bus import bus, Event, EventType
+from api.event_bus import bus, Event, EventType, current_task_id
 from core.memory.experience_db import ExperienceDB
 from core.vision_manager import VisionManager
+from core.parallel_executor import ParallelExecutor, Task as ExecutorTask, TaskStatus
+from core.settings import load_limits
 
 logger = logging.getLogger(__name__)
 
+# Pipeline order used to infer dependencies when a plan doesn't declare them
+PHASE_ORDER = ["analyst", "architect", "implementation", "testing"]
+
 @dataclass
 class Task:
     id: str
@@ -56,9 +61,12 @@ class LifecycleOrchestrator:
     def __init__(
         self, 
         domain_retriever: Optional[DomainAwareRetriever] = None,
-        simulation_mode: bool = False
+        simulation_mode: bool = False,
+        max_parallel_tasks: Optional[int] = None
     ):
         self.state = {}
+        # Tasks of one milestone that may run at once (limits.yaml concurrency.max_workers)
+        self.max_parallel_tasks = max_parallel_tasks or load_limits().concurrency
         self.original_request = ""
         self.domain_retriever = domain_retriever or DomainAwareRetriever()
         self.simulation_mode = simulation_mode
@@ -122,7 +130,7 @@ class LifecycleOrchestrator:
         # We use the 'analyst' phase of the underlying orchestrator for this
         await bus.publish(Event(type=EventType.THOUGHT, agent="Analyst", content="Analyzing requirements and domain context..."))
         
-        planning_context = self.context_manager.build_context(
+        planning_context = await self.context_manager.abuild_context(
             phase="planning",
             user_requirement=user_request
         )
@@ -254,33 +262,110 @@ class LifecycleOrchestrator:
         logger.info(f"Executing milestone: {milestone.name}")
         milestone.status = "running"
         
-        results = {}
-        # Simple sequential execution for now
-        # TODO: Implement DAG topological sort for parallel execution
+        task_map = {task.id: task for task in milestone.tasks}
+        dependencies = self._resolve_dependencies(milestone)
+        # Upstream state each task sees: earlier milestones plus its own ancestors
+        base_state = dict(self.state)
+        results: Dict[str, Any] = {}
+
+        def upstream_state(task_id: str) -> Dict[str, Any]:
+            ancestors, stack = set(), list(dependencies[task_id])
+            while stack:
+                dep = stack.pop()
+                if dep not in ancestors:
+                    ancestors.add(dep)
+                    stack.extend(dependencies[dep])
+            state = dict(base_state)
+            for other in milestone.tasks:  # plan order, so later phases win as before
+                if other.id in ancestors and other.status == "completed":
+                    state[other.phase] = other.result
+            return state
+
+        def make_runner(task: Task):
+            async def run(**_dependency_results):
+                current_task_id.set(task.id)
+                results[task.id] = await self.execute_task(
+                    task,
+                    milestone,
+                    auto_fix=auto_fix,
+                    budget_limit=budget_limit,
+                    consensus_mode=consensus_mode,
+                    review_strategy=review_strategy,
+                    model=model,
+                    state=upstream_state(task.id)
+                )
+                if task.status == "failed":
+                    raise RuntimeError(f"Task {task.id} failed")
+                return results[task.id]
+            return run
+
+        executor = ParallelExecutor(max_concurrent=self.max_parallel_tasks)
+        execution = await executor.execute(
+            [
+                ExecutorTask(
+                    id=task.id,
+                    name=task.description[:60],
+                    executor=make_runner(task),
+                    dependencies=dependencies[task.id],
+                    timeout=None
+                )
+                for task in milestone.tasks
+            ],
+            fail_fast=True
+        )
+
+        # Merge completed outputs in plan order, matching sequential semantics
         for task in milestone.tasks:
-            task_result = await self.execute_task(
-                task, 
-                milestone,
-                auto_fix=auto_fix,
-                budget_limit=budget_limit,
-                consensus_mode=consensus_mode,
-                review_strategy=review_strategy,
-                model=model
+            if task.status == "completed":
+                self.state[task.phase] = task.result
+
+        failed = [
+            task for task in milestone.tasks
+            if execution.task_results[task.id].status == TaskStatus.FAILED
+        ]
+        if failed:
+            task = failed[0]
+            milestone.status = "failed"
+            error_msg = f"Task {task.id} failed"
+            self.error_tracker.log_error(
+                phase="execution",
+                error=error_msg,
+                context={"task_id": task.id, "milestone_id": milestone.id}
             )
-            results[task.id] = task_result
-            if task.status == "failed":
-                milestone.status = "failed"
-                error_msg = f"Task {task.id} failed"
-                self.error_tracker.log_error(
-                    phase="execution",
-                    error=error_msg,
-                    context={"task_id": task.id, "milestone_id": milestone.id}
-                )
-                await bus.publish(Event(type=EventType.ERROR, agent="Orchestrator", content=f"Milestone {milestone.id} failed at task {task.id}"))
-                return {"error": error_msg, "details": task_result}
-                
+            await bus.publish(Event(type=EventType.ERROR, agent="Orchestrator", content=f"Milestone {milestone.id} failed at task {task.id}"))
+            details = results.get(task.id) or {"error": execution.task_results[task.id].error}
+            return {"error": error_msg, "details": details}
+
+        logger.info(
+            f"Milestone {milestone.id}: {len(milestone.tasks)} tasks in "
+            f"{execution.total_duration:.1f}s (speedup {execution.speedup_factor:.2f}x, "
+            f"critical path {' -> '.join(execution.critical_path)} {execution.critical_path_duration:.1f}s, "
+            f"idle {execution.idle_time:.1f}s)"
+        )
         milestone.status = "completed"
-        return results
+        return {task.id: results[task.id] for task in milestone.tasks}
+
+    def _resolve_dependencies(self, milestone: Milestone) -> Dict[str, List[str]]:
+        """
+        Dependencies per task ID. Declared dependencies are kept when they
+        reference tasks in this milestone. Tasks without any depend on every
+        earlier task of an earlier pipeline phase, so e.g. backend and
+        frontend implementation tasks run concurrently after the architect.
+        """
+        ids = {task.id for task in milestone.tasks}
+        rank = {phase: i for i, phase in enumerate(PHASE_ORDER)}
+        resolved: Dict[str, List[str]] = {}
+        for i, task in enumerate(milestone.tasks):
+            declared = [dep for dep in task.dependencies if dep in ids and dep != task.id]
+            if task.dependencies:
+                resolved[task.id] = declared
+            else:
+                own_rank = rank.get(task.phase, len(PHASE_ORDER))
+                resolved[task.id] = [
+                    earlier.id for earlier in milestone.tasks[:i]
+                    if rank.get(earlier.phase, len(PHASE_ORDER)) < own_rank
+                ]
+        return resolved
 
     async def execute_task(
         self, 
@@ -290,10 +375,15 @@ class LifecycleOrchestrator:
         budget_limit: Optional[float] = None,
         consensus_mode: bool = False,
         review_strategy: str = "basic",
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        state: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Execute a single task with domain context.
+
+        ``state`` is the upstream phase output visible to this task. When
+        omitted, ``self.state`` is read and updated directly; otherwise the
+        caller merges the result.
         """
         logger.info(f"Executing task: {task.description}")
         task.status = "running"
@@ -301,7 +391,7 @@ class LifecycleOrchestrator:
         
         # 1. Build Task Context
         await bus.publish(Event(type=EventType.THOUGHT, agent="ContextManager", content="Building task-specific context..."))
-        context = self.context_manager.build_context(
+        context = await self.context_manager.abuild_context(
             phase=task.phase,
             user_requirement=task.description,
             # Pass results from dependencies if needed
@@ -327,7 +417,8 @@ class LifecycleOrchestrator:
         }
         
         # Inject previous phase results into context
-        for phase, phase_res in self.state.items():
+        upstream = self.state if state is None else state
+        for phase, phase_res in upstream.items():
             task_context[phase] = phase_res
 
         if task.phase in ["architect", "implementation"]: # Phases suitable for review
@@ -356,7 +447,8 @@ class LifecycleOrchestrator:
         
         if phase_result.status == PhaseStatus.COMPLETED:
             # Update state with successful result for downstream tasks
-            self.state[task.phase] = phase_result.output
+            if state is None:
+                self.state[task.phase] = phase_result.output
             task.result = phase_result.output
             # 3. Guardrail Check (Hallucinations)
             if task.phase == "implementation" and phase_result.output:
@@ -541,7 +633,12 @@ class LifecycleOrchestrator:
                                 elif any(k in desc_lower for k in testing_keywords): t_phase = "testing"
                                 else: t_phase = "implementation"
                                 
-                            tasks.append(Task(id=t_id, description=t_desc, phase=t_phase))
+                            deps = t_data.get("dependencies", t_data.get("depends_on", []))
+                            if isinstance(deps, str):
+                                deps = [deps]
+                            deps = [str(d) for d in deps] if isinstance(deps, list) else []
+
+                            tasks.append(Task(id=t_id, description=t_desc, phase=t_phase, dependencies=deps))
                 
                 if tasks:
                     milestones_list.append(Milestone(id=m_id, name=m_name, tasks=tasks))
@@ -10,14 +10,21 @@ import asyncio
 import logging
 import json
 import time
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, AsyncIterator, Awaitable, Callable, Tuple
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
+from api.event_bus import bus, Event, EventType
 from core.cost_manager import CostManager
 from core.memory.user_prefs import UserPreferences
 from core.cache_manager import CacheManager
+from core.semantic_cache import get_semantic_cache
+from core.http_pool import http_pool
+from core.request_coalescer import llm_coalescer
+from core.rate_limiter import rate_limiter, is_rate_limited
+from core.latency import latency_tracker, hedge_policy
 
 logger = logging.getLogger(__name__)
 
@@ -38,22 +45,74 @@ class LLMResponse:
     thinking: Optional[str] = None
 
 
+@dataclass
+class LLMStreamEvent:
+    """
+    One increment of a streamed completion.
+
+    ``kind`` is ``"text"`` or ``"thinking"``. The last event of a stream has
+    no delta and carries the assembled ``response``.
+    """
+    delta: str = ""
+    kind: str = "text"
+    response: Optional[LLMResponse] = None
+
+
 class LLMProvider(ABC):
+    name = "openai"
+
     def __init__(self, api_key: str, cost_manager: CostManager):
         self.api_key = api_key
         self.cost_manager = cost_manager
+        self._sdk_client = None
+        self._sdk_http_client = None
     
     @abstractmethod
     async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
         pass
 
+    async def stream(self, messages: List[Dict], model: str, **kwargs) -> AsyncIterator[LLMStreamEvent]:
+        """
+        Yield deltas as the provider produces them, then the final response.
+        Providers without a streaming API emit the whole completion at once.
+        """
+        response = await self.complete(messages, model, **kwargs)
+        if response.thinking:
+            yield LLMStreamEvent(delta=response.thinking, kind="thinking")
+        if response.content:
+            yield LLMStreamEvent(delta=response.content)
+        yield LLMStreamEvent(response=response)
+
+    def _client(self):
+        """Long-lived SDK client on the provider's shared HTTP pool."""
+        http_client = http_pool.client(self.name, self._http_client_cls())
+        if self._sdk_client is None or self._sdk_http_client is not http_client:
+            self._sdk_client = self._create_client(http_client)
+            self._sdk_http_client = http_client
+        return self._sdk_client
+
+    def _create_client(self, http_client):
+        raise NotImplementedError
+
+    def _http_client_cls(self):
+        """HTTP client class the SDK expects (its own defaults and httpx flavour)."""
+        return None
+
 
 class OpenAIProvider(LLMProvider):
-    async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+    name = "openai"
+    # Ask for a trailing usage chunk so streamed calls can still be costed
+    stream_usage = True
+
+    def _create_client(self, http_client):
         from openai import AsyncOpenAI
-        client = AsyncOpenAI(api_key=self.api_key)
-        
-        # Prepare params
+        return AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+
+    def _http_client_cls(self):
+        from openai import DefaultAsyncHttpxClient
+        return DefaultAsyncHttpxClient
+
+    def _params(self, messages: List[Dict], model: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         params = {
             "model": model,
             "messages": messages,
@@ -62,6 +121,13 @@ class OpenAIProvider(LLMProvider):
         }
         if kwargs.get("json_mode"):
             params["response_format"] = {"type": "json_object"}
+        return params
+
+    async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+        client = self._client()
+        
+        # Prepare params
+        params = self._params(messages, model, kwargs)
 
         response = await client.chat.completions.create(**params)
         
@@ -81,12 +147,57 @@ class OpenAIProvider(LLMProvider):
             metadata={"id": response.id}
         )
 
+    async def stream(self, messages: List[Dict], model: str, **kwargs) -> AsyncIterator[LLMStreamEvent]:
+        client = self._client()
+
+        params = self._params(messages, model, kwargs)
+        params["stream"] = True
+        if self.stream_usage:
+            params["stream_options"] = {"include_usage": True}
+
+        parts: List[str] = []
+        response_id, finish_reason, usage = None, None, None
+        async for chunk in await client.chat.completions.create(**params):
+            response_id = response_id or chunk.id
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            for choice in chunk.choices:
+                if choice.delta and choice.delta.content:
+                    parts.append(choice.delta.content)
+                    yield LLMStreamEvent(delta=choice.delta.content)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+        tokens = {"prompt": 0, "completion": 0, "total": 0}
+        if usage:
+            tokens = {
+                "prompt": usage.prompt_tokens,
+                "completion": usage.completion_tokens,
+                "total": usage.total_tokens
+            }
+
+        yield LLMStreamEvent(response=LLMResponse(
+            content="".join(parts),
+            model=model,
+            provider=self.name,
+            tokens_used=tokens,
+            finish_reason=finish_reason or "stop",
+            metadata={"id": response_id}
+        ))
+
 
 class AnthropicProvider(LLMProvider):
-    async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+    name = "anthropic"
+
+    def _create_client(self, http_client):
         from anthropic import AsyncAnthropic
-        client = AsyncAnthropic(api_key=self.api_key)
-        
+        return AsyncAnthropic(api_key=self.api_key, http_client=http_client)
+
+    def _http_client_cls(self):
+        from anthropic import DefaultAsyncHttpxClient
+        return DefaultAsyncHttpxClient
+
+    def _request(self, messages: List[Dict], model: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         sys_msg = next((m["content"] for m in messages if m["role"] == "system"), "")
         user_msgs = [m for m in messages if m["role"] != "system"]
         
@@ -108,14 +219,33 @@ class AnthropicProvider(LLMProvider):
                 }
             ]
 
-        response = await client.messages.create(
-            model=model,
-            system=anthropic_system,
-            messages=user_msgs,
-            temperature=kwargs.get("temperature", 0.0),
-            max_tokens=kwargs.get("max_tokens", 4000)
-        )
-        
+        return {
+            "model": model,
+            "system": anthropic_system,
+            "messages": user_msgs,
+            "temperature": kwargs.get("temperature", 0.0),
+            "max_tokens": kwargs.get("max_tokens", 4000),
+        }
+
+    async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+        client = self._client()
+        response = await client.messages.create(**self._request(messages, model, kwargs))
+        return self._to_response(response, model)
+
+    async def stream(self, messages: List[Dict], model: str, **kwargs) -> AsyncIterator[LLMStreamEvent]:
+        client = self._client()
+        async with client.messages.stream(**self._request(messages, model, kwargs)) as stream:
+            async for event in stream:
+                if event.type != "content_block_delta":
+                    continue
+                if event.delta.type == "text_delta":
+                    yield LLMStreamEvent(delta=event.delta.text)
+                elif event.delta.type == "thinking_delta":
+                    yield LLMStreamEvent(delta=event.delta.thinking, kind="thinking")
+            final = await stream.get_final_message()
+        yield LLMStreamEvent(response=self._to_response(final, model))
+
+    def _to_response(self, response, model: str) -> LLMResponse:
         tokens = {
             "prompt": response.usage.input_tokens,
             "completion": response.usage.output_tokens,
@@ -159,17 +289,30 @@ class AnthropicProvider(LLMProvider):
 
 # Update Google provider to support JSON mode via generation_config
 class GoogleProvider(LLMProvider):
-    async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+    # The Gemini SDK talks gRPC over its own channel, which is reused once
+    # configured; we keep one configured module and one model object per name.
+    name = "google"
+
+    def __init__(self, api_key: str, cost_manager: CostManager):
+        super().__init__(api_key, cost_manager)
+        self._models: Dict[str, Any] = {}
+
+    def _gemini(self, model: str):
+        import google.generativeai as genai
+        if not self._models:
+            genai.configure(api_key=self.api_key)
+        if model not in self._models:
+            self._models[model] = genai.GenerativeModel(model)
+        return self._models[model]
+
+    def _request(self, messages: List[Dict], kwargs: Dict[str, Any]):
         import google.generativeai as genai
-        genai.configure(api_key=self.api_key)
         
         # Configure generation config for JSON if requested
         safe_config = {}
         if kwargs.get("json_mode"):
             safe_config = {"response_mime_type": "application/json"}
 
-        gemini = genai.GenerativeModel(model)
-        
         # Format messages for Gemini
         prompt_parts = []
         for m in messages:
@@ -180,17 +323,56 @@ class GoogleProvider(LLMProvider):
                 prompt_parts.append({"role": role, "parts": [text_content]})
             else:
                 prompt_parts.append({"role": role, "parts": [str(content)]})
-                
+
+        generation_config = genai.types.GenerationConfig(
+            temperature=kwargs.get("temperature", 0.0),
+            max_output_tokens=kwargs.get("max_tokens", 4000),
+            **safe_config
+        )
+        return prompt_parts, generation_config
+
+    async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+        prompt_parts, generation_config = self._request(messages, kwargs)
+
         # Send
-        response = await gemini.generate_content_async(
+        response = await self._gemini(model).generate_content_async(
             prompt_parts,
-            generation_config=genai.types.GenerationConfig(
-                temperature=kwargs.get("temperature", 0.0),
-                max_output_tokens=kwargs.get("max_tokens", 4000),
-                **safe_config
-            )
+            generation_config=generation_config
         )
         
+        return LLMResponse(
+            content=response.text,
+            model=model,
+            provider="google",
+            tokens_used=self._tokens(response),
+            finish_reason="stop",
+            metadata={}
+        )
+
+    async def stream(self, messages: List[Dict], model: str, **kwargs) -> AsyncIterator[LLMStreamEvent]:
+        prompt_parts, generation_config = self._request(messages, kwargs)
+
+        response = await self._gemini(model).generate_content_async(
+            prompt_parts,
+            generation_config=generation_config,
+            stream=True
+        )
+        parts: List[str] = []
+        async for chunk in response:
+            if chunk.text:
+                parts.append(chunk.text)
+                yield LLMStreamEvent(delta=chunk.text)
+
+        yield LLMStreamEvent(response=LLMResponse(
+            content="".join(parts),
+            model=model,
+            provider="google",
+            tokens_used=self._tokens(response),
+            finish_reason="stop",
+            metadata={}
+        ))
+
+    def _tokens(self, response) -> Dict[str, int]:
         tokens = {
             "prompt": 0, # Placeholder until usage metadata is parsed from response object
             "completion": 0,
@@ -205,21 +387,20 @@ class GoogleProvider(LLMProvider):
                  tokens["total"] = response.usage_metadata.total_token_count
         except:
              pass
-        
-        return LLMResponse(
-            content=response.text,
-            model=model,
-            provider="google",
-            tokens_used=tokens,
-            finish_reason="stop",
-            metadata={}
-        )
+        return tokens
 
 
 class PerplexityProvider(OpenAIProvider):
-    async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+    name = "perplexity"
+    # Sonar already reports usage on streamed chunks without ``stream_options``
+    stream_usage = False
+
+    def _create_client(self, http_client):
         from openai import AsyncOpenAI
-        client = AsyncOpenAI(api_key=self.api_key, base_url="https://api.perplexity.ai")
+        return AsyncOpenAI(api_key=self.api_key, base_url="https://api.perplexity.ai", http_client=http_client)
+
+    async def complete(self, messages: List[Dict], model: str, **kwargs) -> LLMResponse:
+        client = self._client()
         
         # Prepare params
         params = {
@@ -253,12 +434,32 @@ class PerplexityProvider(OpenAIProvider):
         )
 
 
+@dataclass
+class _PreparedCall:
+    """State a ``complete``/``stream`` call carries from cache lookup to bookkeeping."""
+    messages: List[Dict]
+    final_messages: List[Dict]
+    model: str
+    temperature: float
+    tier: str
+    provider_name: str
+    provider: LLMProvider
+    cache_key: str
+    start_time: float
+    semantic_query: Optional[Any] = None
+    cached: Optional[LLMResponse] = None
+
+
 class LLMClientV2:
     def __init__(self, cost_manager: CostManager):
         self.cost_manager = cost_manager
         self.providers: Dict[str, LLMProvider] = {}
         self.user_prefs = UserPreferences()
         self.cache_manager = CacheManager()
+        self.semantic_cache = get_semantic_cache(
+            self.cache_manager.config.get("semantic", {}),
+            self.cache_manager.tier_config
+        )
         
         # Init Providers
         if os.getenv("OPENAI_API_KEY"):
@@ -288,8 +489,262 @@ class LLMClientV2:
         json_mode: bool = False,
         bypass_cache: bool = False,
         tier: str = "default",
+        phase: Optional[str] = None,
+        stream_to: Optional[str] = None,
+        stream_event: EventType = EventType.THOUGHT,
+        hedge_model: Optional[str] = None,
         **kwargs
     ) -> LLMResponse:
+        """
+        Run a completion and return the full response.
+
+        With ``stream_to`` set to an agent name, the completion is streamed
+        and its deltas are published on the event bus as ``stream_event``
+        chunks while it is generated (see ``forward_stream``).
+
+        Deterministic calls that are identical to one already in flight
+        await that call instead of sending their own (see ``llm_coalescer``).
+
+        When hedging is enabled (or ``hedge_model`` is given), a call still
+        running after the model's percentile latency is duplicated to the
+        next model in the phase's cascade; the first answer wins.
+        """
+        call = await self._prepare_call(messages, model, temperature, json_mode, bypass_cache, tier, phase)
+        provider_kwargs = dict(temperature=temperature, max_tokens=max_tokens, json_mode=json_mode, **kwargs)
+        hedge = self._hedge_plan(call, phase, hedge_model, provider_kwargs, "ttft" if stream_to else "total")
+        prepare_backup = lambda backup: self._prepare_call(
+            messages, backup, temperature, json_mode, bypass_cache, tier, phase
+        )
+
+        if stream_to:
+            events = self._events(call, provider_kwargs, hedge, prepare_backup)
+            run = lambda: forward_stream(events, agent=stream_to, event_type=stream_event)
+        elif call.cached:
+            return call.cached
+        elif hedge:
+            backup_model, delay, hedge_cost = hedge
+
+            async def backup_run() -> LLMResponse:
+                backup_call = await prepare_backup(backup_model)
+                return backup_call.cached or await self._complete_call(backup_call, provider_kwargs)
+
+            run = lambda: hedge_policy.race(
+                lambda: self._complete_call(call, provider_kwargs), backup_run, delay, hedge_cost
+            )
+        else:
+            run = lambda: self._complete_call(call, provider_kwargs)
+
+        if call.cached or bypass_cache or temperature != 0.0:
+            return await run()
+
+        key = (call.cache_key, model, temperature, tier, json.dumps(provider_kwargs, sort_keys=True, default=str))
+        response, shared = await llm_coalescer.run(key, run)
+        if not shared:
+            return response
+
+        logger.info(f"Coalesced identical in-flight call to {model} (Tier: {tier})")
+        tokens = response.tokens_used
+        llm_coalescer.record_saving(
+            tokens.get("total", tokens.get("prompt", 0) + tokens.get("completion", 0)),
+            _estimate_cost(model, tokens)
+        )
+        cache_info = {"type": "coalesced", "id": (response.metadata or {}).get("id")}
+        # Callers may annotate their response; don't share the leader's object
+        shared_response = replace(response, metadata={**(response.metadata or {}), "cache": cache_info})
+        self._log_audit(
+            messages=messages,
+            response=shared_response,
+            duration=time.time() - call.start_time,
+            cache=cache_info
+        )
+        return shared_response
+
+    async def stream(
+        self,
+        messages: List[Dict[str, Union[str, List[Dict]]]],
+        model: str,
+        temperature: float = 0.0,
+        max_tokens: int = 4000,
+        json_mode: bool = False,
+        bypass_cache: bool = False,
+        tier: str = "default",
+        phase: Optional[str] = None,
+        hedge_model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """
+        Stream a completion as ``LLMStreamEvent`` deltas.
+
+        Takes the same arguments as ``complete``. Cost accounting, audit
+        logging and caching run once the provider's stream has ended; the
+        final event carries the assembled ``LLMResponse``. Cache hits are
+        replayed as a single delta. Hedged streams race on time to first token.
+        """
+        call = await self._prepare_call(messages, model, temperature, json_mode, bypass_cache, tier, phase)
+        provider_kwargs = dict(temperature=temperature, max_tokens=max_tokens, json_mode=json_mode, **kwargs)
+        hedge = self._hedge_plan(call, phase, hedge_model, provider_kwargs, "ttft")
+        prepare_backup = lambda backup: self._prepare_call(
+            messages, backup, temperature, json_mode, bypass_cache, tier, phase
+        )
+        async for event in self._events(call, provider_kwargs, hedge, prepare_backup):
+            yield event
+
+    def _events(
+        self,
+        call: _PreparedCall,
+        provider_kwargs: Dict[str, Any],
+        hedge: Optional[Tuple[str, float, float]],
+        prepare_backup: Callable[[str], Awaitable[_PreparedCall]]
+    ) -> AsyncIterator[LLMStreamEvent]:
+        events = _replay(call.cached) if call.cached else self._stream_call(call, provider_kwargs)
+        if not hedge:
+            return events
+        backup_model, delay, hedge_cost = hedge
+
+        async def backup_events() -> AsyncIterator[LLMStreamEvent]:
+            backup_call = await prepare_backup(backup_model)
+            backup_stream = _replay(backup_call.cached) if backup_call.cached else self._stream_call(backup_call, provider_kwargs)
+            async for event in backup_stream:
+                yield event
+
+        return hedge_policy.race_stream(events, backup_events, delay, hedge_cost)
+
+    def _hedge_plan(
+        self,
+        call: _PreparedCall,
+        phase: Optional[str],
+        hedge_model: Optional[str],
+        provider_kwargs: Dict[str, Any],
+        kind: str
+    ) -> Optional[Tuple[str, float, float]]:
+        """(backup model, delay, estimated backup cost) if this call should be hedged."""
+        if call.cached or not (hedge_model or (hedge_policy.enabled and phase)):
+            return None
+        backup_model = hedge_model or self._hedge_target(call.model, phase)
+        if not backup_model:
+            return None
+        delay = hedge_policy.delay_for(call.provider_name, call.model, kind)
+        if delay is None:
+            return None
+        max_tokens = int(provider_kwargs.get("max_tokens") or 0)
+        estimated = _estimate_tokens(call.final_messages, provider_kwargs)
+        cost = _estimate_cost(backup_model, {"prompt": estimated - max_tokens, "completion": max_tokens})
+        return backup_model, delay, cost
+
+    def _hedge_target(self, model: str, phase: str) -> Optional[str]:
+        """Next model after ``model`` in the phase's cascade chain whose provider is configured."""
+        chain = [cfg.model for cfg in _cascade_router().get_cascade_chain(phase)]
+        candidates = chain[chain.index(model) + 1:] if model in chain else chain
+        for candidate in candidates:
+            if candidate != model and self._get_provider_name(candidate) in self.providers:
+                return candidate
+        return None
+
+    async def _complete_call(self, call: _PreparedCall, provider_kwargs: Dict[str, Any]) -> LLMResponse:
+        # Multi-modal handling happened before validation, but we can do it here/provider level.
+        # But wait, Provider impls take `messages`. We should pass `final_messages`.
+        
+        estimated_tokens = _estimate_tokens(call.final_messages, provider_kwargs)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    async with rate_limiter.slot(call.provider_name, call.model, estimated_tokens) as permit:
+                        try:
+                            # Tracked only once admitted: calls queued in the limiter aren't on the wire
+                            with http_pool.track(call.provider_name):
+                                response = await call.provider.complete(
+                                    messages=call.final_messages,
+                                    model=call.model,
+                                    **provider_kwargs
+                                )
+                        except asyncio.CancelledError:
+                            # Cancelled by a winning hedge: the elapsed time is a lower bound,
+                            # without it the p95 would lose exactly the slow calls
+                            latency_tracker.record(call.provider_name, call.model, permit.latency)
+                            raise
+                        permit.record_usage(response.tokens_used)
+                        latency_tracker.record(call.provider_name, call.model, permit.latency)
+                    break
+                except Exception as e:
+                    # The limiter has already paused the model's queue for Retry-After
+                    if not is_rate_limited(e) or attempt >= rate_limiter.max_retries:
+                        raise
+                    attempt += 1
+                    logger.warning(f"{call.model} rate limited, retry {attempt}/{rate_limiter.max_retries}")
+            await self._finish_call(call, response)
+            return response
+            
+        except Exception as e:
+            self._fail_call(call, e)
+            raise
+
+    async def _stream_call(self, call: _PreparedCall, provider_kwargs: Dict[str, Any]) -> AsyncIterator[LLMStreamEvent]:
+        response = None
+        first_token_at = None
+        estimated_tokens = _estimate_tokens(call.final_messages, provider_kwargs)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    async with rate_limiter.slot(call.provider_name, call.model, estimated_tokens) as permit:
+                        try:
+                            with http_pool.track(call.provider_name):
+                                async for event in call.provider.stream(
+                                    messages=call.final_messages,
+                                    model=call.model,
+                                    **provider_kwargs
+                                ):
+                                    if event.response is not None:
+                                        response = event.response
+                                        permit.record_usage(response.tokens_used)
+                                        continue
+                                    if first_token_at is None:
+                                        first_token_at = time.time()
+                                        permit.first_token()
+                                        latency_tracker.record(
+                                            call.provider_name, call.model, permit.latency, kind="ttft"
+                                        )
+                                    yield event
+                        except (asyncio.CancelledError, GeneratorExit):
+                            # Abandoned before the first token (e.g. a hedge won): lower-bound sample
+                            if first_token_at is None:
+                                latency_tracker.record(call.provider_name, call.model, permit.latency, kind="ttft")
+                            raise
+                    break
+                except Exception as e:
+                    # Only retry before anything reached the caller
+                    if not is_rate_limited(e) or first_token_at is not None or attempt >= rate_limiter.max_retries:
+                        raise
+                    attempt += 1
+                    logger.warning(f"{call.model} rate limited, retry {attempt}/{rate_limiter.max_retries}")
+
+            if response is None:
+                raise RuntimeError(f"{call.provider_name} stream ended without a final response")
+            if first_token_at is not None:
+                response.metadata = {
+                    **(response.metadata or {}),
+                    "time_to_first_token_sec": round(first_token_at - call.start_time, 3)
+                }
+            await self._finish_call(call, response)
+
+        except Exception as e:
+            self._fail_call(call, e)
+            raise
+
+        yield LLMStreamEvent(response=response)
+
+    async def _prepare_call(
+        self,
+        messages: List[Dict[str, Union[str, List[Dict]]]],
+        model: str,
+        temperature: float,
+        json_mode: bool,
+        bypass_cache: bool,
+        tier: str,
+        phase: Optional[str]
+    ) -> _PreparedCall:
+        """Resolve the provider, build the final messages and consult the caches."""
         provider_name = self._get_provider_name(model)
         provider = self.providers.get(provider_name)
         
@@ -331,66 +786,93 @@ class LLMClientV2:
                  final_messages = [{"role": "system", "content": system_content}] + messages
         else:
                   final_messages = messages
+
+        call = _PreparedCall(
+            messages=messages,
+            final_messages=final_messages,
+            model=model,
+            temperature=temperature,
+            tier=tier,
+            provider_name=provider_name,
+            provider=provider,
+            cache_key=json.dumps(final_messages, sort_keys=True, default=str),
+            start_time=start_time
+        )
         
         # 2. Check Cache
         # Only cache deterministic calls (temp=0)
-        cache_key_prompt = json.dumps(final_messages, sort_keys=True, default=str)
         if not bypass_cache and temperature == 0.0:
-            cached_data = self.cache_manager.get(cache_key_prompt, model, temperature, tier)
+            cached_data = self.cache_manager.get(call.cache_key, model, temperature, tier)
             if cached_data:
                 logger.info(f"Cache Hit for {model} (Tier: {tier})")
-                return LLMResponse(**cached_data)
+                call.cached = LLMResponse(**cached_data)
+                return call
 
+        # 2b. Semantic cache: near-identical prompts under the same system prompt
+        if self.semantic_cache and not bypass_cache and temperature == 0.0:
+            call.semantic_query = self.semantic_cache.prepare(final_messages, model, tier, phase, json_mode)
+            if call.semantic_query:
+                hit = await self.semantic_cache.lookup(call.semantic_query)
+                if hit:
+                    logger.info(f"Semantic Cache Hit for {model} (Tier: {tier}, similarity {hit.similarity:.3f})")
+                    response = LLMResponse(**hit.response)
+                    cache_info = {
+                        "type": "semantic",
+                        "similarity": round(hit.similarity, 4),
+                        "threshold": call.semantic_query.threshold,
+                        "matched_id": hit.matched_id,
+                    }
+                    response.metadata = {**(response.metadata or {}), "cache": cache_info}
+                    self._log_audit(
+                        messages=messages,
+                        response=response,
+                        duration=time.time() - start_time,
+                        cache=cache_info
+                    )
+                    call.cached = response
 
-        # Multi-modal handling happened before validation, but we can do it here/provider level.
-        # But wait, Provider impls take `messages`. We should pass `final_messages`.
+        return call
+
+    async def _finish_call(self, call: _PreparedCall, response: LLMResponse) -> None:
+        """Cost accounting, audit logging and caching for a completed call."""
+        # 3. Cost Update
+        cost_info = self.cost_manager.check_and_update(
+            call.model, 
+            response.tokens_used["prompt"], 
+            response.tokens_used["completion"]
+        )
         
-        try:
-            response = await provider.complete(
-                messages=final_messages,
-                model=model, 
-                temperature=temperature, 
-                max_tokens=max_tokens, 
-                json_mode=json_mode, 
-                **kwargs
-            )
-            
-            # 3. Cost Update
-            cost_info = self.cost_manager.check_and_update(
-                model, 
-                response.tokens_used["prompt"], 
-                response.tokens_used["completion"]
-            )
-            
-            # 4. Audit Logging
-            self._log_audit(
-                messages=messages,
-                response=response,
-                duration=time.time() - start_time,
-                cost=cost_info.get("cost_increment", 0.0) if isinstance(cost_info, dict) else 0.0
-            )
-            
-            # Cache the response result if deterministic
-            if temperature == 0.0:
-                self.cache_manager.set(
-                    cache_key_prompt, 
-                    model, 
-                    asdict(response), 
-                    temperature,
-                    tier
-                )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"LLM Call Failed: {e}")
-            self._log_audit(
-                messages=messages, 
-                response=None, 
-                duration=time.time() - start_time, 
-                error=str(e)
+        # 4. Audit Logging
+        self._log_audit(
+            messages=call.messages,
+            response=response,
+            duration=time.time() - call.start_time,
+            cost=cost_info.get("cost_increment", 0.0) if isinstance(cost_info, dict) else 0.0
+        )
+        
+        # Cache the response result if deterministic
+        if call.temperature == 0.0:
+            self.cache_manager.set(
+                call.cache_key, 
+                call.model, 
+                asdict(response), 
+                call.temperature,
+                call.tier
             )
-            raise
+            if call.semantic_query:
+                try:
+                    await self.semantic_cache.store_response(call.semantic_query, asdict(response))
+                except Exception as e:
+                    logger.warning(f"Semantic cache store failed: {e}")
+
+    def _fail_call(self, call: _PreparedCall, error: Exception) -> None:
+        logger.error(f"LLM Call Failed: {error}")
+        self._log_audit(
+            messages=call.messages, 
+            response=None, 
+            duration=time.time() - call.start_time, 
+            error=str(error)
+        )
 
     def _log_audit(
         self, 
@@ -398,7 +880,8 @@ class LLMClientV2:
         response: Optional[LLMResponse], 
         duration: float, 
         cost: float = 0.0, 
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        cache: Optional[Dict[str, Any]] = None
     ):
         """Append interaction details to the audit log."""
         entry = {
@@ -416,9 +899,97 @@ class LLMClientV2:
             "response_content": response.content if response else None,
             "thinking_record": response.thinking if response else None
         }
+        if cache:
+            entry["cache"] = cache
         
         try:
             with open(AUDIT_LOG_FILE, "a", encoding="utf-8") as f:
                 f.write(json.dumps(entry) + "\n")
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}")
+
+
+_router = None
+
+
+def _cascade_router():
+    """Cascade router used to pick hedge targets (built on first use)."""
+    global _router
+    if _router is None:
+        from core.model_cascade_router import ModelCascadeRouter
+        _router = ModelCascadeRouter()
+    return _router
+
+
+async def _replay(response: LLMResponse) -> AsyncIterator[LLMStreamEvent]:
+    """A cached response as a one-delta stream."""
+    if response.thinking:
+        yield LLMStreamEvent(delta=response.thinking, kind="thinking")
+    yield LLMStreamEvent(delta=response.content or "")
+    yield LLMStreamEvent(response=response)
+
+
+def _estimate_tokens(messages: List[Dict], provider_kwargs: Dict[str, Any]) -> int:
+    """Rough token cost of a request for rate limiting (~4 chars per token plus the output cap)."""
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return prompt_chars // 4 + int(provider_kwargs.get("max_tokens") or 0)
+
+
+def _estimate_cost(model: str, tokens: Dict[str, int]) -> float:
+    """List-price cost of ``tokens`` on ``model`` (0 for unknown models)."""
+    pricing = CostManager.PRICING.get(model.lower())
+    if pricing is None:
+        return 0.0
+    return (
+        tokens.get("prompt", 0) / 1_000_000 * pricing.input_per_million +
+        tokens.get("completion", 0) / 1_000_000 * pricing.output_per_million
+    )
+
+
+async def forward_stream(
+    events: AsyncIterator[LLMStreamEvent],
+    agent: str,
+    event_type: EventType = EventType.THOUGHT,
+    flush_interval: float = 0.05
+) -> LLMResponse:
+    """
+    Publish a completion stream on the event bus and return its final response.
+
+    Deltas are coalesced into chunks at most every ``flush_interval`` seconds
+    (the first one goes out immediately) so a long answer doesn't flood the
+    bus history with single tokens. All chunks of one completion share a
+    ``stream_id`` so SSE clients can append them to the same entry. Thinking
+    deltas always go out as ``THOUGHT``; text deltas use ``event_type``.
+    """
+    stream_id = uuid.uuid4().hex
+    pending: Dict[str, List[str]] = {"text": [], "thinking": []}
+    last_flush = 0.0
+    response = None
+
+    async def flush() -> None:
+        for kind, parts in pending.items():
+            if parts:
+                await bus.publish(Event(
+                    type=EventType.THOUGHT if kind == "thinking" else event_type,
+                    content="".join(parts),
+                    agent=agent,
+                    stream_id=f"{stream_id}:{kind}"
+                ))
+                parts.clear()
+
+    async for event in events:
+        if event.response is not None:
+            response = event.response
+            continue
+        if not event.delta:
+            continue
+        pending[event.kind].append(event.delta)
+        now = time.monotonic()
+        if now - last_flush >= flush_interval:
+            await flush()
+            last_flush = now
+
+    await flush()
+    if response is None:
+        raise RuntimeError("LLM stream ended without a final response")
+    return response
@@ -1,124 +1,349 @@
 """
 Experience Database ("Self-Correction Memory")
 Stores successful error fixes to avoid repeating mistakes.
+
+Each fix is keyed by a normalized error signature (paths, line numbers,
+addresses and literal values stripped) so the same failure in a
+different file or run maps to the same row. Signatures are embedded and
+kept in an in-memory matrix, so a lookup is one matrix-vector product
+over every experience instead of a scan of the top rows. An FTS5 index
+over the signatures is the fallback when no embedding clears the
+similarity threshold.
 """
 
 import sqlite3
 import logging
+import math
+import re
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
 from datetime import datetime
 import hashlib
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+EMBEDDING_DIM = 256
+MAX_SIGNATURE_CHARS = 500
+
+_NORMALIZERS = [
+    (re.compile(r"(\"[^\"\n]*\"|'[^'\n]*')"), "<str>"),
+    (re.compile(r"(?:[A-Za-z]:)?(?:[\w.\-~]*[/\\])+[\w.\-]+"), "<path>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<addr>"),
+    (re.compile(r"\b\d+(\.\d+)?\b"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+_EXCEPTION_LINE = re.compile(r"^\s*([\w.]+(?:Error|Exception|Warning|Exit|Interrupt)\b.*)$", re.MULTILINE)
+_TOKEN = re.compile(r"[a-z_][a-z0-9_]+")
+
+Embedder = Callable[[List[str]], List[List[float]]]
+
+
+def normalize_error(error_text: str) -> str:
+    """
+    Reduce an error message or traceback to a stable signature.
+
+    The exception lines are kept when present (the frames above them
+    mostly vary by path); volatile details are replaced by placeholders.
+    """
+    lines = _EXCEPTION_LINE.findall(error_text)
+    text = "\n".join(lines) if lines else error_text
+    for pattern, placeholder in _NORMALIZERS:
+        text = pattern.sub(placeholder, text)
+    return text.strip()[:MAX_SIGNATURE_CHARS]
+
+
+def embed_signature(signature: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """
+    Hashed bag-of-features embedding: words, word pairs and identifier
+    trigrams. Deterministic and local, so recording a fix never costs an
+    API call; error signatures are short and keyword-heavy enough for it.
+    """
+    tokens = _TOKEN.findall(signature.lower())
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for token in tokens:
+        features.extend(token[i:i + 3] for i in range(len(token) - 2))
+    vector = [0.0] * dim
+    for feature in features:
+        digest = hashlib.md5(feature.encode()).digest()
+        vector[int.from_bytes(digest[:4], "little") % dim] += 1.0 if digest[4] & 1 else -1.0
+    return vector
+
+
 class ExperienceDB:
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ExperienceDB, cls).__new__(cls)
-            cls._instance._init()
-        return cls._instance
-
-    def _init(self):
-        self.db_path = Path("experience.db")
+    """
+    One shared instance per database file.
+
+    The embedder is fixed when a file is first opened; asking for the
+    same file with a different embedder raises instead of silently
+    handing back vectors from the first one. Close it to switch.
+    """
+    _instances: Dict[Path, 'ExperienceDB'] = {}
+    _instances_lock = threading.Lock()
+
+    def __new__(cls, db_path: str = "experience.db", embedder: Optional[Embedder] = None):
+        path = Path(db_path).resolve()
+        with cls._instances_lock:
+            if path not in cls._instances:
+                instance = super(ExperienceDB, cls).__new__(cls)
+                instance._init(path, embedder)
+                cls._instances[path] = instance
+            instance = cls._instances[path]
+            if embedder is not None and embedder is not instance.embedder:
+                raise ValueError(
+                    f"ExperienceDB at {path} is already open with a different embedder; close it first"
+                )
+            return instance
+
+    def _init(self, db_path: Path, embedder: Optional[Embedder]):
+        self.db_path = db_path
+        self.embedder = embedder
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.fts_enabled = False
+        # Matrix index: row i of _matrix is the unit embedding of experience _ids[i]
+        self._ids: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self._matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._counts = np.zeros(0, dtype=np.float32)
         self._init_db()
 
     def _init_db(self):
-        """Initialize SQLite table."""
+        """Open the persistent connection, migrate the schema and load the index."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS experiences (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    error_pattern TEXT NOT NULL,
-                    fix_strategy TEXT NOT NULL,
-                    context_hash TEXT,
-                    timestamp TEXT,
-                    success_count INTEGER DEFAULT 1
-                )
-            """)
-            conn.commit()
-            conn.close()
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._lock, self._conn:
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS experiences (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        error_pattern TEXT NOT NULL,
+                        fix_strategy TEXT NOT NULL,
+                        context_hash TEXT,
+                        timestamp TEXT,
+                        success_count INTEGER DEFAULT 1
+                    )
+                """)
+                self._migrate()
+            self._load_index()
         except Exception as e:
             logger.error(f"Failed to init ExperienceDB: {e}")
 
+    def _migrate(self):
+        """Add signature/embedding columns to databases created before they existed."""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(experiences)")}
+        if "signature" not in columns:
+            self._conn.execute("ALTER TABLE experiences ADD COLUMN signature TEXT")
+        if "embedding" not in columns:
+            self._conn.execute("ALTER TABLE experiences ADD COLUMN embedding BLOB")
+
+        for row in self._conn.execute(
+            "SELECT id, error_pattern FROM experiences WHERE signature IS NULL"
+        ).fetchall():
+            self._conn.execute(
+                "UPDATE experiences SET signature = ? WHERE id = ?",
+                (normalize_error(row["error_pattern"]), row["id"])
+            )
+        # Old rows that normalize to the same (signature, fix) are merged into the oldest
+        for row in self._conn.execute("""
+            SELECT MIN(id) AS keep, SUM(success_count) AS total FROM experiences
+            GROUP BY signature, fix_strategy HAVING COUNT(*) > 1
+        """).fetchall():
+            self._conn.execute("UPDATE experiences SET success_count = ? WHERE id = ?", (row["total"], row["keep"]))
+            self._conn.execute("""
+                DELETE FROM experiences WHERE id != ? AND (signature, fix_strategy) =
+                    (SELECT signature, fix_strategy FROM experiences WHERE id = ?)
+            """, (row["keep"], row["keep"]))
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_experiences_signature_fix "
+            "ON experiences(signature, fix_strategy)"
+        )
+
+        try:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'experiences_fts'"
+            ).fetchone()
+            self._conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS experiences_fts USING fts5(
+                    signature, content='experiences', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS experiences_fts_insert AFTER INSERT ON experiences BEGIN
+                    INSERT INTO experiences_fts(rowid, signature) VALUES (new.id, new.signature);
+                END;
+                CREATE TRIGGER IF NOT EXISTS experiences_fts_delete AFTER DELETE ON experiences BEGIN
+                    INSERT INTO experiences_fts(experiences_fts, rowid, signature) VALUES ('delete', old.id, old.signature);
+                END;
+            """)
+            if not exists:
+                self._conn.execute("INSERT INTO experiences_fts(experiences_fts) VALUES ('rebuild')")
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: vector search still works
+            logger.warning(f"FTS5 unavailable for ExperienceDB: {e}")
+
+    def _embed(self, signatures: List[str]) -> List[List[float]]:
+        if self.embedder is not None:
+            return self.embedder(signatures)
+        return [embed_signature(s) for s in signatures]
+
+    def _load_index(self):
+        """Build the matrix from stored embeddings, embedding rows that have none yet."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, signature, embedding, success_count FROM experiences ORDER BY id"
+            ).fetchall()
+            vectors = [
+                np.frombuffer(row["embedding"], dtype=np.float32) if row["embedding"] else None
+                for row in rows
+            ]
+            dim = len(self._embed(["probe"])[0])
+            missing = [i for i, v in enumerate(vectors) if v is None or len(v) != dim]
+            if missing:
+                embedded = self._embed([rows[i]["signature"] for i in missing])
+                with self._conn:
+                    for i, vector in zip(missing, embedded):
+                        vectors[i] = self._unit(vector)
+                        self._conn.execute(
+                            "UPDATE experiences SET embedding = ? WHERE id = ?",
+                            (vectors[i].tobytes(), rows[i]["id"])
+                        )
+
+            self._ids = [row["id"] for row in rows]
+            self._positions = {id_: i for i, id_ in enumerate(self._ids)}
+            self._matrix = np.vstack(vectors) if vectors else np.zeros((0, dim), dtype=np.float32)
+            self._counts = np.array([row["success_count"] for row in rows], dtype=np.float32)
+
+    @staticmethod
+    def _unit(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
     def record_fix(self, error_pattern: str, fix_strategy: str, context: str = ""):
         """Record a successful fix."""
         try:
             # Create a simple hash of context to avoid duplicates
             ctx_hash = hashlib.md5(context.encode()).hexdigest() if context else ""
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if exists
-            cursor.execute(
-                "SELECT id, success_count FROM experiences WHERE error_pattern = ? AND fix_strategy = ?", 
-                (error_pattern, fix_strategy)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                # Increment count
-                new_count = row[1] + 1
-                cursor.execute("UPDATE experiences SET success_count = ? WHERE id = ?", (new_count, row[0]))
-                logger.info(f"Updated experience count for pattern: {error_pattern[:30]}...")
-            else:
-                # Insert new
-                cursor.execute(
-                    "INSERT INTO experiences (error_pattern, fix_strategy, context_hash, timestamp) VALUES (?, ?, ?, ?)",
-                    (error_pattern, fix_strategy, ctx_hash, datetime.now().isoformat())
+            signature = normalize_error(error_pattern)
+
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT id, success_count FROM experiences WHERE signature = ? AND fix_strategy = ?",
+                    (signature, fix_strategy)
+                ).fetchone()
+
+                if row:
+                    # Increment count
+                    new_count = row["success_count"] + 1
+                    self._conn.execute(
+                        "UPDATE experiences SET success_count = ?, timestamp = ? WHERE id = ?",
+                        (new_count, datetime.now().isoformat(), row["id"])
+                    )
+                    self._counts[self._positions[row["id"]]] = new_count
+                    logger.info(f"Updated experience count for pattern: {signature[:30]}...")
+                    return
+
+                vector = self._unit(self._embed([signature])[0])
+                cursor = self._conn.execute(
+                    "INSERT INTO experiences (error_pattern, fix_strategy, context_hash, timestamp, signature, embedding) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (error_pattern, fix_strategy, ctx_hash, datetime.now().isoformat(), signature, vector.tobytes())
                 )
-                logger.info(f"Recorded new experience: {error_pattern[:30]}...")
-                
-            conn.commit()
-            conn.close()
+                self._positions[cursor.lastrowid] = len(self._ids)
+                self._ids.append(cursor.lastrowid)
+                self._matrix = np.vstack([self._matrix, vector[None, :]])
+                self._counts = np.append(self._counts, np.float32(1))
+                logger.info(f"Recorded new experience: {signature[:30]}...")
         except Exception as e:
             logger.error(f"Failed to record experience: {e}")
 
-    def find_similar_error(self, error_pattern: str) -> List[Dict[str, Any]]:
+    def find_similar_error(self, error_pattern: str, top_k: int = 5,
+                           min_similarity: float = 0.5) -> List[Dict[str, Any]]:
         """
         Find potential fixes for a given error pattern.
-        Uses simple text matching for now.
+
+        Experiences are matched on cosine similarity of their signatures
+        and ranked by ``similarity * (1 + ln(success_count))``. Falls back
+        to FTS5 keyword search when nothing clears ``min_similarity``.
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Simple keyword matching logic or Exact match
-            # "Select * from exp where error_pattern LIKE %...%"
-            # For robustness, we might want to search for substrings of the error.
-            
-            # For V1, let's try to match substantial parts or just exact.
-            # Or retrieve all and filter in python (if small DB).
-            
-            cursor.execute("SELECT * FROM experiences ORDER BY success_count DESC LIMIT 5")
-            rows = cursor.fetchall()
-            conn.close()
-            
-            matching_experiences = []
-            words = set(error_pattern.lower().split())
-            
-            for row in rows:
-                db_pattern = row["error_pattern"].lower()
-                # Jaccard similarity or overlap?
-                db_words = set(db_pattern.split())
-                overlap = len(words.intersection(db_words))
-                
-                # If significant overlap or substring match
-                if overlap > 2 or db_pattern in error_pattern.lower() or error_pattern.lower() in db_pattern:
-                    matching_experiences.append({
-                        "error_pattern": row["error_pattern"],
-                        "fix_strategy": row["fix_strategy"],
-                        "success_count": row["success_count"]
-                    })
-            
-            return matching_experiences
-            
+            signature = normalize_error(error_pattern)
+            matches = []
+            try:
+                matches = self._vector_search(signature, top_k, min_similarity)
+            except Exception as e:
+                logger.warning(f"Experience vector search failed, using keyword search: {e}")
+            if not matches and self.fts_enabled:
+                matches = self._keyword_search(signature, top_k)
+            return self._fetch(matches)
         except Exception as e:
             logger.error(f"Failed to search experiences: {e}")
             return []
+
+    def _vector_search(self, signature: str, top_k: int, min_similarity: float) -> List[tuple]:
+        query = self._unit(self._embed([signature])[0])
+        with self._lock:
+            if not self._ids or top_k <= 0:
+                return []
+            similarities = self._matrix @ query
+            scores = np.where(similarities >= min_similarity, similarities * (1 + np.log(np.maximum(self._counts, 1))), -1.0)
+            k = min(top_k, len(scores))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [
+                (self._ids[i], float(similarities[i]), float(scores[i]))
+                for i in best if scores[i] >= 0
+            ]
+
+    def _keyword_search(self, signature: str, top_k: int) -> List[tuple]:
+        terms = set(_TOKEN.findall(signature.lower()))
+        if not terms:
+            return []
+        query = " OR ".join(f'"{term}"' for term in sorted(terms))
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT e.id, e.signature, e.success_count FROM experiences_fts f
+                JOIN experiences e ON e.id = f.rowid
+                WHERE experiences_fts MATCH ? ORDER BY f.rank LIMIT ?
+            """, (query, top_k * 4)).fetchall()
+        matches = []
+        for row in rows:
+            # Term overlap stands in for cosine similarity here
+            found = set(_TOKEN.findall(row["signature"].lower()))
+            similarity = len(terms & found) / len(terms | found)
+            matches.append((row["id"], similarity, similarity * (1 + math.log(max(row["success_count"], 1)))))
+        return sorted(matches, key=lambda m: -m[2])[:top_k]
+
+    def _fetch(self, matches: List[tuple]) -> List[Dict[str, Any]]:
+        if not matches:
+            return []
+        with self._lock:
+            rows = {
+                row["id"]: row for row in self._conn.execute(
+                    f"SELECT * FROM experiences WHERE id IN ({','.join('?' * len(matches))})",
+                    [m[0] for m in matches]
+                )
+            }
+        return [
+            {
+                "error_pattern": rows[id_]["error_pattern"],
+                "fix_strategy": rows[id_]["fix_strategy"],
+                "success_count": rows[id_]["success_count"],
+                "signature": rows[id_]["signature"],
+                "similarity": round(similarity, 4),
+                "score": round(score, 4),
+            }
+            for id_, similarity, score in matches if id_ in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        with self._instances_lock:
+            self._instances.pop(self.db_path, None)
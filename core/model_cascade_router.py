@@ -14,6 +14,7 @@ from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass, field
 from .model_router_v2 import ModelRouterV2, ModelConfig, ConsensusConfig
 from .cascade_metrics import CascadeMetrics
+from .latency import latency_tracker, load_latency_config
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,8 @@ class ModelCascadeRouter:
             "google": True,
             "perplexity": True
         }
+        self.latency = latency_tracker
+        self.failover_p95_seconds = load_latency_config(config_path).get("failover_p95_seconds")
         logger.info("ModelCascadeRouter initialized with 5-tier hierarchy and centralized metrics.")
 
     def get_model_for_phase(self, phase: str) -> ModelConfig:
@@ -58,15 +61,18 @@ class ModelCascadeRouter:
         primary = self.base_router.get_model_for_phase(phase)
         
         # Check if phase has specific cascade config in raw yaml
-        phase_conf = self.base_router.config.get("routing", {}).get("phase", {}).get(phase, {})
-        cascade_list = phase_conf.get("cascade", [])
+        routing = self.base_router.config.get("routing", {})
+        phase_conf = routing.get("phases", {}).get(phase) or routing.get("phase", {}).get(phase) or {}
+        cascade_list = phase_conf.get("cascade") or phase_conf.get("fallback") or []
         
         chain = [primary]
         
         for item in cascade_list:
-            # Parse cascade item into ModelConfig
+            # Parse cascade item into ModelConfig; entries are model names or {model, provider}
+            if isinstance(item, str):
+                item = {"model": item}
             model_name = item.get("model")
-            provider = item.get("provider")
+            provider = item.get("provider") or self._provider_for(model_name)
             # Create config inheriting basic properties
             fallback_cfg = ModelConfig(
                 model=model_name,
@@ -113,12 +119,14 @@ class ModelCascadeRouter:
             if len(chain) > 1:
                 return self._record_usage(chain[1])
 
-        # Default: Return primary checked for availability
-
-        # Default: Return primary checked for availability
-        for cfg in chain:
-            if self.is_provider_available(cfg.provider):
+        # Default: Return primary checked for availability and latency;
+        # a healthy but slow model is skipped while a faster fallback exists
+        available = [cfg for cfg in chain if self.is_provider_available(cfg.provider)]
+        for cfg in available:
+            if not self.is_slow(cfg):
                 return self._record_usage(cfg)
+        if available:
+            return self._record_usage(available[0])
                 
         # If all fail, return primary and hope for best (or raise error)
         logger.warning(f"All providers validation failed for phase {phase}. Returning primary.")
@@ -157,6 +165,30 @@ class ModelCascadeRouter:
         """
         return self.provider_status.get(provider, True)
 
+    def latency_stats(self, provider: str, model: str) -> Dict[str, Optional[float]]:
+        """Rolling p50/p95 call latency (seconds) for a model, None until observed."""
+        return {
+            "p50": self.latency.percentile(provider, model, 50),
+            "p95": self.latency.percentile(provider, model, 95),
+        }
+
+    def is_slow(self, config: ModelConfig) -> bool:
+        """True when the model's recent p95 exceeds ``latency.failover_p95_seconds``."""
+        if not self.failover_p95_seconds:
+            return False
+        p95 = self.latency.percentile(config.provider, config.model, 95, min_samples=5)
+        if p95 is not None and p95 > float(self.failover_p95_seconds):
+            logger.warning(f"{config.provider}/{config.model} p95 latency {p95:.1f}s over failover threshold")
+            return True
+        return False
+
+    def _provider_for(self, model: str) -> str:
+        model_lower = (model or "").lower()
+        if "claude" in model_lower: return "anthropic"
+        if "gemini" in model_lower: return "google"
+        if "sonar" in model_lower: return "perplexity"
+        return "openai"
+
     def mark_provider_failure(self, provider: str):
         """Temporarily mark provider as down."""
         logger.warning(f"Marking provider {provider} as DOWN.")
@@ -26,6 +26,7 @@ from .cost_manager import CostManager
 from .validator import OutputValidator
 from .tracer import TracingService
 from rag.domain_aware_retriever import DomainAwareRetriever as RAGRetriever
+from rag.async_retrieval import retrieval_executor
 from .self_healing_manager import SelfHealingManager
 from .prompt_gate import PromptGate
 from core.agents.specialist_agents.retrieval_agent import RetrievalAgent
@@ -166,6 +167,25 @@ class OrchestratorV2:
             }
         return self._phase_agents
 
+    async def _aretrieve(
+        self,
+        question: str,
+        top_k: int,
+        tier_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve RAG context without blocking the event loop.
+        Uses the retriever's async API when present, otherwise runs the
+        sync method on the shared retrieval pool.
+        """
+        if tier_id and hasattr(self.retriever, "retrieve_tier"):
+            if hasattr(self.retriever, "aretrieve_tier"):
+                return await self.retriever.aretrieve_tier(tier_id, question, top_k=top_k)
+            return await retrieval_executor.run(self.retriever.retrieve_tier, tier_id, question, top_k=top_k)
+        if hasattr(self.retriever, "aretrieve"):
+            return await self.retriever.aretrieve(question, top_k=top_k)
+        return await retrieval_executor.run(self.retriever.retrieve, question, top_k=top_k)
+
     async def run_phase_with_retry(
         self,
         phase: str,
@@ -292,7 +312,7 @@ class OrchestratorV2:
              print(f":::STEP:{{\"type\": \"analyzing\", \"text\": \"{msg}\"}}:::", flush=True)
              
              # Preliminary RAG for planning
-             rag_context = self.retriever.retrieve(question, top_k=top_k)
+             rag_context = await self._aretrieve(question, top_k=top_k)
              
              initial_plan = None
         
@@ -320,12 +340,9 @@ class OrchestratorV2:
              tier_id = context.get("rag_tier") if context else None
              if tier_id:
                   logger.info(f"Performing Tier-Based RAG retrieval for Tier {tier_id}")
-                  if hasattr(self.retriever, "retrieve_tier"):
-                      rag_context = self.retriever.retrieve_tier(tier_id, question, top_k=top_k)
-                  else:
-                      rag_context = self.retriever.retrieve(question, top_k=top_k)
+                  rag_context = await self._aretrieve(question, top_k=top_k, tier_id=tier_id)
              else:
-                  rag_context = self.retriever.retrieve(question, top_k=top_k)
+                  rag_context = await self._aretrieve(question, top_k=top_k)
         
         # Estimate context size for routing
         # Rough calc: 1 token ~= 4 chars
@@ -6,11 +6,12 @@ end-to-end latency. For example, backend and frontend implementation
 can run concurrently, reducing total pipeline time by ~40%.
 
 Features:
-- Task dependency resolution
-- Concurrent execution with asyncio.gather
+- Task dependency resolution with cycle detection
+- Streaming ready-queue scheduling: a task starts as soon as its own
+  dependencies finish, highest priority first
 - Resource pooling and limits
-- Error handling with partial results
-- Progress tracking
+- Per-task retries, cancellation and error handling with partial results
+- Progress tracking, critical-path and idle-time metrics
 
 Version: 2.0.0
 """
@@ -18,12 +19,16 @@ Version: 2.0.0
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import logging
 import time
-from typing import List, Dict, Any, Optional, Callable, Set
+from typing import List, Dict, Any, Optional, Callable, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from core.rate_limiter import rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +39,11 @@ class TaskStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+
+
+class DependencyCycleError(ValueError):
+    """Raised when task dependencies form a cycle or name unknown tasks."""
 
 
 @dataclass
@@ -54,7 +64,11 @@ class Task:
     priority : int
         Execution priority (higher = sooner).
     timeout : int
-        Maximum execution time in seconds.
+        Maximum execution time in seconds (per attempt).
+    max_retries : int
+        Extra attempts after a failure or timeout.
+    retry_backoff : float
+        Seconds before the first retry; doubled for each further retry.
     """
     id: str
     name: str
@@ -64,6 +78,8 @@ class Task:
     priority: int = 0
     timeout: int = 300  # 5 minutes default
     allow_failure: bool = False
+    max_retries: int = 0
+    retry_backoff: float = 1.0
 
 
 @dataclass
@@ -79,6 +95,7 @@ class TaskResult:
     duration: float
     tokens_used: int = 0
     cost: float = 0.0
+    attempts: int = 1
 
 
 @dataclass
@@ -104,6 +121,16 @@ class ExecutionResult:
     total_tokens: int
     total_cost: float
     speedup_factor: float  # Compared to sequential execution
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_duration: float = 0.0  # Lower bound on total_duration
+    idle_time: float = 0.0  # Wall time with no task running
+
+
+@dataclass
+class _SchedulerRun:
+    """In-flight state of one streaming ``execute`` call."""
+    running: Dict[asyncio.Future, str] = field(default_factory=dict)
+    cancelled: bool = False
 
 
 class ParallelExecutor:
@@ -111,11 +138,16 @@ class ParallelExecutor:
     Execute tasks in parallel with dependency resolution.
     
     The executor:
-    1. Resolves task dependencies
-    2. Groups tasks into parallel batches
-    3. Executes each batch concurrently
+    1. Resolves task dependencies (cycles raise ``DependencyCycleError``)
+    2. Releases each task as soon as its dependencies complete, up to
+       ``max_concurrent`` at a time, by priority and then by the length
+       of the dependency chain waiting on it
+    3. Retries, skips or cancels tasks according to their settings
     4. Handles errors and collects results
     5. Tracks metrics and progress
+
+    ``scheduler="batched"`` keeps the older mode that runs topological
+    batches one after another with a barrier between them.
     
     Example
     -------
@@ -151,11 +183,23 @@ class ParallelExecutor:
     def __init__(
         self,
         max_concurrent: int = 5,
-        cost_manager: Optional[Any] = None
+        cost_manager: Optional[Any] = None,
+        scheduler: str = "streaming"
     ):
+        if scheduler not in ("streaming", "batched"):
+            raise ValueError(f"Unknown scheduler: {scheduler}")
         self.max_concurrent = max_concurrent
         self.cost_manager = cost_manager
+        self.scheduler = scheduler
         self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._runs: List[_SchedulerRun] = []
+    
+    def cancel(self) -> None:
+        """Cancel running tasks of every active execution; pending tasks are not started."""
+        for run in self._runs:
+            run.cancelled = True
+            for future in run.running:
+                future.cancel()
     
     async def execute(
         self,
@@ -170,17 +214,147 @@ class ParallelExecutor:
         tasks : list
             List of Task objects to execute.
         fail_fast : bool
-            If True, stop execution on first failure.
+            If True, stop execution on first failure. The streaming
+            scheduler also cancels tasks that are still running.
         
         Returns
         -------
         ExecutionResult
             Aggregated results from all tasks.
+        
+        Raises
+        ------
+        DependencyCycleError
+            If dependencies form a cycle or reference unknown tasks.
         """
-        logger.info(f"Starting parallel execution of {len(tasks)} tasks")
+        logger.info(f"Starting parallel execution of {len(tasks)} tasks ({self.scheduler} scheduler)")
         start_time = time.time()
         
-        # Build execution plan
+        if self.scheduler == "batched":
+            task_results = await self._execute_batched(tasks, fail_fast)
+        else:
+            task_results = await self._execute_streaming(tasks, fail_fast)
+        
+        # Aggregate results
+        total_duration = time.time() - start_time
+        
+        successful = sum(
+            1 for r in task_results.values()
+            if r.status == TaskStatus.COMPLETED
+        )
+        failed = sum(
+            1 for r in task_results.values()
+            if r.status == TaskStatus.FAILED
+        )
+        
+        total_tokens = sum(r.tokens_used for r in task_results.values())
+        total_cost = sum(r.cost for r in task_results.values())
+        
+        # Calculate speedup (sequential time vs parallel time). Durations
+        # exclude time spent waiting for a concurrency slot.
+        sequential_duration = sum(r.duration for r in task_results.values())
+        speedup = sequential_duration / total_duration if total_duration > 0 else 1.0
+        critical_path, critical_duration = self._critical_path(tasks, task_results)
+        idle_time = self._idle_time(task_results, start_time, start_time + total_duration)
+        
+        logger.info(
+            f"Execution complete: {successful}/{len(tasks)} successful, "
+            f"speedup: {speedup:.2f}x, duration: {total_duration:.1f}s, "
+            f"critical path: {critical_duration:.1f}s, idle: {idle_time:.1f}s"
+        )
+        
+        return ExecutionResult(
+            task_results=task_results,
+            total_duration=total_duration,
+            successful_tasks=successful,
+            failed_tasks=failed,
+            total_tokens=total_tokens,
+            total_cost=total_cost,
+            speedup_factor=speedup,
+            critical_path=critical_path,
+            critical_path_duration=critical_duration,
+            idle_time=idle_time
+        )
+    
+    async def _execute_streaming(
+        self,
+        tasks: List[Task],
+        fail_fast: bool
+    ) -> Dict[str, TaskResult]:
+        """Run tasks from a ready queue as their dependencies complete."""
+        task_map, dependents, order = self._dependency_graph(tasks)
+        # Longest chain of tasks waiting on each task, itself included
+        chain: Dict[str, int] = {}
+        for task_id in reversed(order):
+            chain[task_id] = 1 + max((chain[child] for child in dependents[task_id]), default=0)
+        waiting = {task.id: len(set(task.dependencies)) for task in tasks}
+        sequence = itertools.count()
+        ready: List[Tuple[int, int, int, str]] = []
+        
+        def release(task_id: str):
+            task = task_map[task_id]
+            heapq.heappush(ready, (-task.priority, -chain[task_id], next(sequence), task_id))
+        
+        for task in tasks:
+            if waiting[task.id] == 0:
+                release(task.id)
+        
+        task_results: Dict[str, TaskResult] = {}
+        run = _SchedulerRun()
+        stop_reason: Optional[str] = None
+        self._runs.append(run)
+        try:
+            while ready or run.running:
+                while ready and len(run.running) < self.max_concurrent and not (stop_reason or run.cancelled):
+                    task_id = heapq.heappop(ready)[3]
+                    future = asyncio.ensure_future(self._execute_task(task_map[task_id], task_results))
+                    run.running[future] = task_id
+                if not run.running:
+                    break
+                
+                done, _ = await asyncio.wait(run.running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = task_map[run.running.pop(future)]
+                    result = self._collect(task, future, stop_reason)
+                    task_results[task.id] = result
+                    
+                    if result.status == TaskStatus.COMPLETED or task.allow_failure:
+                        for child in dependents[task.id]:
+                            waiting[child] -= 1
+                            if waiting[child] == 0:
+                                release(child)
+                    elif result.status == TaskStatus.FAILED and fail_fast and not stop_reason:
+                        logger.error(f"Fail-fast triggered by task {task.id}")
+                        stop_reason = "Cancelled due to fail-fast"
+                        for other in run.running:
+                            other.cancel()
+        finally:
+            self._runs.remove(run)
+            for future in run.running:
+                future.cancel()
+            if run.running:
+                await asyncio.gather(*run.running, return_exceptions=True)
+        
+        # Whatever never started was blocked by a failure or stopped early
+        for task in tasks:
+            if task.id not in task_results:
+                if stop_reason or run.cancelled:
+                    error = "Skipped due to fail-fast" if stop_reason else "Cancelled"
+                else:
+                    blocked = [
+                        dep for dep in task.dependencies
+                        if dep not in task_results or task_results[dep].status != TaskStatus.COMPLETED
+                    ]
+                    error = f"Dependency not completed: {', '.join(blocked)}"
+                task_results[task.id] = self._placeholder(task, TaskStatus.SKIPPED, error)
+        return task_results
+    
+    async def _execute_batched(
+        self,
+        tasks: List[Task],
+        fail_fast: bool
+    ) -> Dict[str, TaskResult]:
+        """Run topological batches one after another."""
         plan = self._build_execution_plan(tasks)
         logger.info(
             f"Execution plan: {len(plan.batches)} batches, "
@@ -215,50 +389,119 @@ class ParallelExecutor:
                     # Mark remaining tasks as skipped
                     for task in tasks:
                         if task.id not in task_results:
-                            task_results[task.id] = TaskResult(
-                                task_id=task.id,
-                                task_name=task.name,
-                                status=TaskStatus.SKIPPED,
-                                output=None,
-                                error="Skipped due to fail-fast",
-                                start_time=time.time(),
-                                end_time=time.time(),
-                                duration=0.0
+                            task_results[task.id] = self._placeholder(
+                                task, TaskStatus.SKIPPED, "Skipped due to fail-fast"
                             )
                     break
         
-        # Aggregate results
-        total_duration = time.time() - start_time
-        
-        successful = sum(
-            1 for r in task_results.values()
-            if r.status == TaskStatus.COMPLETED
-        )
-        failed = sum(
-            1 for r in task_results.values()
-            if r.status == TaskStatus.FAILED
-        )
+        return task_results
+    
+    def _dependency_graph(
+        self,
+        tasks: List[Task]
+    ) -> Tuple[Dict[str, Task], Dict[str, List[str]], List[str]]:
+        """
+        Task map, dependents per task ID and a topological order
+        (dependencies first).
         
-        total_tokens = sum(r.tokens_used for r in task_results.values())
-        total_cost = sum(r.cost for r in task_results.values())
+        Raises ``DependencyCycleError`` for unknown dependencies or cycles,
+        naming the tasks involved.
+        """
+        task_map = {task.id: task for task in tasks}
+        dependents: Dict[str, List[str]] = {task.id: [] for task in tasks}
+        for task in tasks:
+            for dep in set(task.dependencies):
+                if dep not in task_map:
+                    raise DependencyCycleError(f"Task {task.id} depends on unknown task {dep}")
+                dependents[dep].append(task.id)
         
-        # Calculate speedup (sequential time vs parallel time)
-        sequential_duration = sum(r.duration for r in task_results.values())
-        speedup = sequential_duration / total_duration if total_duration > 0 else 1.0
+        # Iterative DFS; a back edge to a task on the current path is a cycle
+        state: Dict[str, int] = {}  # 1 = on path, 2 = done
+        order: List[str] = []
+        for root in task_map:
+            if root in state:
+                continue
+            path = [root]
+            stack = [iter(task_map[root].dependencies)]
+            state[root] = 1
+            while stack:
+                dep = next(stack[-1], None)
+                if dep is None:
+                    done = path.pop()
+                    state[done] = 2
+                    order.append(done)
+                    stack.pop()
+                elif state.get(dep) == 1:
+                    cycle = path[path.index(dep):] + [dep]
+                    raise DependencyCycleError(f"Dependency cycle: {' -> '.join(cycle)}")
+                elif dep not in state:
+                    state[dep] = 1
+                    path.append(dep)
+                    stack.append(iter(task_map[dep].dependencies))
         
-        logger.info(
-            f"Execution complete: {successful}/{len(tasks)} successful, "
-            f"speedup: {speedup:.2f}x, duration: {total_duration:.1f}s"
-        )
+        return task_map, dependents, order
+    
+    def _critical_path(
+        self,
+        tasks: List[Task],
+        task_results: Dict[str, TaskResult]
+    ) -> Tuple[List[str], float]:
+        """Longest chain of measured task durations through the dependency graph."""
+        task_map, _, order = self._dependency_graph(tasks)
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for task_id in order:
+            best = max(set(task_map[task_id].dependencies), key=finish.get, default=None)
+            result = task_results.get(task_id)
+            previous[task_id] = best
+            finish[task_id] = (finish[best] if best else 0.0) + (result.duration if result else 0.0)
+        if not finish:
+            return [], 0.0
         
-        return ExecutionResult(
-            task_results=task_results,
-            total_duration=total_duration,
-            successful_tasks=successful,
-            failed_tasks=failed,
-            total_tokens=total_tokens,
-            total_cost=total_cost,
-            speedup_factor=speedup
+        node: Optional[str] = max(finish, key=finish.get)
+        total = finish[node]
+        path = []
+        while node:
+            path.append(node)
+            node = previous[node]
+        return path[::-1], total
+    
+    @staticmethod
+    def _idle_time(task_results: Dict[str, TaskResult], start: float, end: float) -> float:
+        """Wall time between ``start`` and ``end`` when no task was running."""
+        busy = 0.0
+        cursor = start
+        for r in sorted(task_results.values(), key=lambda r: r.start_time):
+            if r.duration <= 0:
+                continue
+            task_start, task_end = max(r.start_time, cursor), min(r.end_time, end)
+            if task_end > task_start:
+                busy += task_end - task_start
+                cursor = task_end
+        return max(0.0, (end - start) - busy)
+    
+    def _collect(self, task: Task, future: asyncio.Future, stop_reason: Optional[str]) -> TaskResult:
+        """Turn a finished task future into its ``TaskResult``."""
+        if future.cancelled():
+            logger.warning(f"Task cancelled: {task.name}")
+            return self._placeholder(task, TaskStatus.CANCELLED, stop_reason or "Cancelled")
+        if future.exception() is not None:
+            return self._placeholder(task, TaskStatus.FAILED, str(future.exception()))
+        return future.result()
+    
+    @staticmethod
+    def _placeholder(task: Task, status: TaskStatus, error: str) -> TaskResult:
+        """Result for a task that did not produce output."""
+        now = time.time()
+        return TaskResult(
+            task_id=task.id,
+            task_name=task.name,
+            status=status,
+            output=None,
+            error=error,
+            start_time=now,
+            end_time=now,
+            duration=0.0
         )
     
     def _build_execution_plan(self, tasks: List[Task]) -> ExecutionPlan:
@@ -280,10 +523,9 @@ class ParallelExecutor:
             ]
             
             if not ready:
-                # Circular dependency or orphaned tasks
-                logger.error(f"Cannot resolve dependencies for: {remaining}")
-                # Add them anyway to avoid infinite loop
-                ready = list(remaining)
+                # Raises with the offending cycle or unknown dependency
+                self._dependency_graph(tasks)
+                raise DependencyCycleError(f"Cannot resolve dependencies for: {sorted(remaining)}")
             
             # Sort by priority
             ready.sort(key=lambda tid: task_map[tid].priority, reverse=True)
@@ -323,16 +565,7 @@ class ParallelExecutor:
         for task, result in zip(batch, results):
             if isinstance(result, Exception):
                 # Execution raised an exception
-                batch_results[task.id] = TaskResult(
-                    task_id=task.id,
-                    task_name=task.name,
-                    status=TaskStatus.FAILED,
-                    output=None,
-                    error=str(result),
-                    start_time=time.time(),
-                    end_time=time.time(),
-                    duration=0.0
-                )
+                batch_results[task.id] = self._placeholder(task, TaskStatus.FAILED, str(result))
             else:
                 batch_results[task.id] = result
         
@@ -343,12 +576,40 @@ class ParallelExecutor:
         task: Task,
         all_results: Dict[str, TaskResult]
     ) -> TaskResult:
-        """Execute a single task with timeout and error handling."""
+        """Execute a single task, retrying failures up to ``task.max_retries`` times."""
         logger.info(f"Starting task: {task.name} (ID: {task.id})\n")
-        start_time = time.time()
+        first_start = None
+        for attempt in range(1, task.max_retries + 2):
+            result = await self._attempt_task(task, all_results)
+            first_start = first_start if first_start is not None else result.start_time
+            if (
+                result.status == TaskStatus.COMPLETED
+                or attempt > task.max_retries
+                or (self.cost_manager and not self.cost_manager.can_proceed())
+            ):
+                break
+            delay = task.retry_backoff * 2 ** (attempt - 1)
+            logger.warning(
+                f"Retrying task {task.name} in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{task.max_retries + 1}): {result.error}"
+            )
+            await asyncio.sleep(delay)
         
+        # Report the whole span, retries included, so metrics see the real cost
+        result.attempts = attempt
+        result.start_time = first_start
+        result.duration = result.end_time - first_start
+        return result
+    
+    async def _attempt_task(
+        self,
+        task: Task,
+        all_results: Dict[str, TaskResult]
+    ) -> TaskResult:
+        """Run one attempt of a task with timeout and error handling."""
         # Acquire semaphore to limit concurrency
         async with self._semaphore:
+            start_time = time.time()
             try:
                 # Check cost budget if cost manager available
                 if self.cost_manager and not self.cost_manager.can_proceed():
@@ -442,6 +703,9 @@ class ParallelExecutor:
             "success_rate": result.successful_tasks / len(result.task_results) if result.task_results else 0,
             "total_duration_seconds": result.total_duration,
             "speedup_factor": result.speedup_factor,
+            "critical_path": result.critical_path,
+            "critical_path_seconds": result.critical_path_duration,
+            "idle_seconds": result.idle_time,
             "total_tokens": result.total_tokens,
             "total_cost_usd": result.total_cost,
             "avg_task_duration": sum(
@@ -454,15 +718,24 @@ class BatchLLMProcessor:
     """
     Specialized processor for batch LLM operations using ParallelExecutor.
     Optimized for bulk content generation using cost-effective models (e.g. Haiku).
+
+    Provider quotas are enforced by LLMClientV2's shared rate limiter, so by
+    default the batch fans out up to the limiter's concurrency ceiling and
+    lets it pace the calls. Items are started in order as slots free up, and
+    a failed call is retried ``max_retries`` times before its output is None.
     """
     def __init__(
         self, 
         llm_client: Any, 
         model: str = "claude-3-5-haiku",
-        max_concurrent: int = 10
+        max_concurrent: Optional[int] = None,
+        max_retries: int = 1
     ):
         self.llm_client = llm_client
         self.model = model
+        self.max_retries = max_retries
+        if max_concurrent is None:
+            max_concurrent = rate_limiter.concurrency_ceiling()
         self.executor = ParallelExecutor(max_concurrent=max_concurrent)
 
     async def process_batch(
@@ -509,6 +782,7 @@ class BatchLLMProcessor:
                     id=f"{id_prefix}_{i}",
                     name=f"Batch {id_prefix} #{i}",
                     executor=self._safe_llm_call,
+                    max_retries=self.max_retries,
                     kwargs={
                         "messages": final_messages,
                         "model": self.model,
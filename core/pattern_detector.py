@@ -17,13 +17,15 @@ from collections import Counter
 from pathlib import Path
 
 try:
-    from sentence_transformers import SentenceTransformer
+    import sentence_transformers  # noqa: F401
     from sklearn.cluster import DBSCAN
     from sklearn.preprocessing import StandardScaler
     HAS_ML_DEPS = True
 except ImportError:
     HAS_ML_DEPS = False
 
+from rag.model_registry import model_registry
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -45,11 +47,10 @@ class PatternDetector:
     def __init__(self, use_ml: bool = True):
         self.known_patterns = {}
         self.use_ml = use_ml and HAS_ML_DEPS
-        self.encoder = None
         if self.use_ml:
             try:
-                # Use a lightweight model for speed
-                self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+                # Use a lightweight model for speed (shared with the RAG embeddings)
+                model_registry.sentence_transformer('all-MiniLM-L6-v2')
                 logger.info("PatternDetector initialized with ML support.")
             except Exception as e:
                 logger.warning(f"Failed to load sentence-transformer: {e}")
@@ -64,6 +65,10 @@ class PatternDetector:
             "broad_exception": r"Broad exception catch found", # From static analysis
         }
 
+    @property
+    def encoder(self):
+        return model_registry.sentence_transformer('all-MiniLM-L6-v2') if self.use_ml else None
+
     def analyze_errors(self, error_logs: List[Dict[str, Any]]) -> List[ErrorPattern]:
         """
         Analyze a list of error logs to find patterns.
@@ -0,0 +1,360 @@
+"""
+Adaptive per-provider rate limiting for LLM calls.
+
+Executors used to fan out with fixed semaphores that knew nothing about
+provider quotas, so bursts hit 429s and callers backed off blindly.
+``rate_limiter`` sits in front of every provider call made by
+``LLMClientV2``. Each (provider, model) pair gets:
+
+* token buckets for its requests-per-minute and tokens-per-minute budgets,
+  so calls are paced to the quota instead of bursting past it;
+* an AIMD concurrency governor, which adds roughly one slot per window of
+  successful calls and halves the limit when the provider answers 429 or
+  latency climbs past the target;
+* a shared pause when a 429 arrives, honouring ``Retry-After``, so queued
+  callers wait once instead of each sleeping on its own schedule.
+
+Configuration lives under ``rate_limits`` in ``config/model_mapping_v2.yaml``::
+
+    rate_limits:
+      enabled: true
+      max_retries: 3
+      aimd: { initial_concurrency: 8, max_concurrency: 64 }
+      providers:
+        openai:
+          requests_per_minute: 5000
+          tokens_per_minute: 800000
+          models:
+            gpt-4o-mini: { tokens_per_minute: 4000000 }
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AIMD: Dict[str, Any] = {
+    "initial_concurrency": 8,
+    "min_concurrency": 1,
+    "max_concurrency": 64,
+    "additive_increase": 1.0,
+    "multiplicative_decrease": 0.5,
+    "decrease_cooldown_seconds": 2.0,
+    "latency_target_seconds": None,
+    "latency_decrease": 0.9,
+}
+
+# Retry-After fallback when a 429 carries no hint
+DEFAULT_THROTTLE_PAUSE = 1.0
+
+
+def load_rate_limit_config(path: str = "config/model_mapping_v2.yaml") -> Dict[str, Any]:
+    """Read the ``rate_limits`` section of the model mapping config."""
+    try:
+        import yaml
+        config_path = Path(path)
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            return config.get("rate_limits") or {}
+    except Exception as e:
+        logger.warning(f"Could not load rate_limits config: {e}")
+    return {}
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True for provider 429 / quota-exhausted errors across SDKs."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return type(error).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait, if it said."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class TokenBucket:
+    """
+    Pacing bucket refilled at ``per_minute / 60`` units per second.
+
+    Callers reserve units up front and sleep for the returned delay, so
+    waiters are served in arrival order from any event loop.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` units; return how long to wait before using them."""
+        with self._lock:
+            now = self._refill()
+            self.tokens -= min(amount, self.capacity)
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def refund(self, amount: float) -> None:
+        """Return over-reserved units (negative to charge an under-estimate)."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every new reservation for ``seconds``."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+
+class ConcurrencyGovernor:
+    """Concurrency gate whose limit follows additive-increase / multiplicative-decrease."""
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        self.limit = float(config["initial_concurrency"])
+        self.active = 0
+        self.throttles = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._granted: Set[asyncio.Future] = set()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if self.active < int(self.limit) and not self._waiters:
+                self.active += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._granted:
+                    self._granted.discard(waiter)
+                    self.active -= 1
+                    self._wake()
+                else:
+                    self._waiters = deque(w for w in self._waiters if w[1] is not waiter)
+            raise
+        with self._lock:
+            self._granted.discard(waiter)
+
+    def release(self) -> None:
+        with self._lock:
+            self.active -= 1
+            self._wake()
+
+    def on_success(self, latency: float) -> None:
+        target = self.config.get("latency_target_seconds")
+        with self._lock:
+            if target and latency > float(target):
+                self._decrease(float(self.config["latency_decrease"]))
+            else:
+                # ~additive_increase more slots per full window of successes
+                self.limit = min(
+                    float(self.config["max_concurrency"]),
+                    self.limit + float(self.config["additive_increase"]) / max(self.limit, 1.0)
+                )
+            self._wake()
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.throttles += 1
+            self._decrease(float(self.config["multiplicative_decrease"]))
+
+    def _decrease(self, factor: float) -> None:
+        # One burst of 429s reflects one overload; don't collapse to the floor
+        now = time.monotonic()
+        if now - self._last_decrease < float(self.config["decrease_cooldown_seconds"]):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.config["min_concurrency"]), self.limit * factor)
+
+    def _wake(self) -> None:
+        while self._waiters and self.active < int(self.limit):
+            loop, waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.active += 1
+            self._granted.add(waiter)
+            loop.call_soon_threadsafe(_grant, waiter)
+
+
+def _grant(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class Permit:
+    """Handle for one admitted call; report usage and first-token time on it."""
+
+    def __init__(self, estimated_tokens: int) -> None:
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+        self.started = time.monotonic()
+        self.first_token_at: Optional[float] = None
+
+    def record_usage(self, tokens_used: Dict[str, int]) -> None:
+        total = tokens_used.get("total") or tokens_used.get("prompt", 0) + tokens_used.get("completion", 0)
+        # Some providers report 0 when usage is unavailable; keep the estimate then
+        self.actual_tokens = total or None
+
+    def first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+    @property
+    def latency(self) -> float:
+        # Streams are judged on time to first token, not on answer length
+        return (self.first_token_at or time.monotonic()) - self.started
+
+
+class ModelLimiter:
+    """Budgets and adaptive concurrency for one (provider, model) pair."""
+
+    def __init__(self, key: str, budget: Dict[str, Any], aimd: Dict[str, Any]) -> None:
+        self.key = key
+        rpm, tpm = budget.get("requests_per_minute"), budget.get("tokens_per_minute")
+        burst = float(budget.get("burst_seconds", 10.0))
+        self.requests = TokenBucket(float(rpm), burst) if rpm else None
+        self.tokens = TokenBucket(float(tpm), burst) if tpm else None
+        self.governor = ConcurrencyGovernor(aimd)
+        self.calls = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[Permit]:
+        wait = max(
+            self.requests.reserve(1) if self.requests else 0.0,
+            self.tokens.reserve(estimated_tokens) if self.tokens else 0.0,
+        )
+        if wait > 0:
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+
+        await self.governor.acquire()
+        permit = Permit(estimated_tokens)
+        try:
+            self.calls += 1
+            try:
+                yield permit
+            except Exception as e:
+                if is_rate_limited(e):
+                    self.on_throttle(retry_after(e))
+                raise
+            self.governor.on_success(permit.latency)
+            if self.tokens and permit.actual_tokens is not None:
+                self.tokens.refund(estimated_tokens - permit.actual_tokens)
+        finally:
+            self.governor.release()
+
+    def on_throttle(self, pause: Optional[float] = None) -> None:
+        self.throttled += 1
+        self.governor.on_throttle()
+        pause = pause if pause is not None else DEFAULT_THROTTLE_PAUSE
+        for bucket in (self.requests, self.tokens):
+            if bucket:
+                bucket.pause(pause)
+        logger.warning(
+            f"{self.key} rate limited; pausing {pause:.1f}s, concurrency now {int(self.governor.limit)}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": int(self.governor.limit),
+            "active": self.governor.active,
+            "queued": len(self.governor._waiters),
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+class RateLimiter:
+    """
+    Registry of ``ModelLimiter`` objects built from the ``rate_limits`` config.
+
+    Parameters
+    ----------
+    config : dict, optional
+        ``rate_limits`` settings; loaded from the model mapping when omitted.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        self.config = load_rate_limit_config() if config is None else config
+        self.enabled = bool(self.config.get("enabled", True))
+        self.max_retries = int(self.config.get("max_retries", 3))
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, ModelLimiter] = {}
+
+    def budget(self, provider: str) -> Dict[str, Any]:
+        return (self.config.get("providers") or {}).get(provider) or {}
+
+    def limiter(self, provider: str, model: str) -> ModelLimiter:
+        key = f"{provider}/{model}"
+        with self._lock:
+            if key not in self._limiters:
+                provider_cfg = self.budget(provider)
+                budget = {k: v for k, v in provider_cfg.items() if k != "models"}
+                budget.update((provider_cfg.get("models") or {}).get(model) or {})
+                aimd = dict(DEFAULT_AIMD)
+                aimd.update(self.config.get("aimd") or {})
+                aimd.update({k: v for k, v in budget.items() if k in DEFAULT_AIMD})
+                self._limiters[key] = ModelLimiter(key, budget, aimd)
+            return self._limiters[key]
+
+    @asynccontextmanager
+    async def slot(self, provider: str, model: str, estimated_tokens: int) -> AsyncIterator[Permit]:
+        """Admit one call to ``model`` once its budgets and concurrency allow."""
+        if not self.enabled:
+            yield Permit(estimated_tokens)
+            return
+        async with self.limiter(provider, model).slot(estimated_tokens) as permit:
+            yield permit
+
+    def concurrency_ceiling(self) -> int:
+        """Upper bound any governor can reach; a sensible fan-out for batch callers."""
+        aimd = dict(DEFAULT_AIMD)
+        aimd.update(self.config.get("aimd") or {})
+        return int(aimd["max_concurrency"])
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {key: limiter.stats() for key, limiter in limiters.items()}
+
+
+# Process-wide limiter shared by every LLMClientV2
+rate_limiter = RateLimiter()
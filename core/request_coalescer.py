@@ -0,0 +1,81 @@
+"""
+Single-flight coalescing for identical in-flight LLM calls.
+
+Swarm tasks, consensus proposals and retried phases often send the same
+deterministic prompt at the same moment. They all miss ``CacheManager``
+(nothing has been written yet) and each pays for its own upstream call.
+``llm_coalescer`` lets the first caller for a key run the request while
+later callers with the same key await that call and share its result.
+
+The upstream call runs in its own task, so a cancelled caller doesn't
+cancel it for the others. Keys are scoped to the running event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestCoalescer:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.saved_tokens = 0
+        self.saved_cost_usd = 0.0
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await ``fn()`` once per key among concurrent callers.
+
+        Returns ``(result, shared)``; ``shared`` is True for callers that
+        joined a call already in flight. Exceptions reach every caller.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            task = self._inflight.get(flight_key)
+            shared = task is not None
+            if shared:
+                self.coalesced += 1
+            else:
+                task = loop.create_task(fn())
+                self._inflight[flight_key] = task
+                self.leaders += 1
+                task.add_done_callback(lambda t: self._done(flight_key, t))
+        return await asyncio.shield(task), shared
+
+    def record_saving(self, tokens: int, cost_usd: float) -> None:
+        """Account the upstream usage a coalesced caller didn't pay for."""
+        with self._lock:
+            self.saved_tokens += tokens
+            self.saved_cost_usd += cost_usd
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": len(self._inflight),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "saved_tokens": self.saved_tokens,
+                "saved_cost_usd": round(self.saved_cost_usd, 6),
+            }
+
+    def _done(self, flight_key, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._inflight.get(flight_key) is task:
+                del self._inflight[flight_key]
+        # Mark the exception retrieved if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+# Process-wide coalescer shared by every LLMClientV2
+llm_coalescer = RequestCoalescer()
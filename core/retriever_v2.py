@@ -5,6 +5,7 @@ Enhanced RAG Retriever with Hybrid Search (Semantic + Keyword) per ADVANCED_RAG_
 from __future__ import annotations
 
 import logging
+import weakref
 from uuid import uuid4
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Literal
@@ -19,6 +20,7 @@ except ImportError:
     chromadb = None
 
 from utils.document_chunker import DocumentChunker, Chunk
+from rag.chroma_pool import chroma_pool
 
 logger = logging.getLogger(__name__)
 
@@ -50,8 +52,8 @@ class EnhancedRAGRetriever:
         self.persist_path = Path(persist_directory)
         self.persist_path.mkdir(parents=True, exist_ok=True)
         
-        # Initialize Chroma
-        self.client = chromadb.PersistentClient(path=str(self.persist_path))
+        # Initialize Chroma (client shared process-wide per persist directory)
+        self.client = chroma_pool.get_client(str(self.persist_path))
         
         # Embedding function
         self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
@@ -64,6 +66,12 @@ class EnhancedRAGRetriever:
             metadata={"hnsw:space": "cosine"}
         )
         
+        # BM25 inverted index, persisted next to the Chroma data and shared
+        # with every ChromaVectorStore on the same collection via the pool
+        self._pooled = chroma_pool.acquire_collection(str(self.persist_path), collection_name)
+        self._release = weakref.finalize(self, chroma_pool.release_collection, self._pooled)
+        self.keyword_index = self._pooled.keyword_index
+
         # Smart Chunker
         self.chunker = DocumentChunker(chunk_size, chunk_overlap)
         
@@ -92,6 +100,7 @@ class EnhancedRAGRetriever:
             documents=[c.content for c in chunks],
             metadatas=[c.metadata for c in chunks]
         )
+        self.keyword_index.add((c.chunk_id, c.content) for c in chunks)
         return len(chunks)
 
     def add_documents_batch(self, documents: List[Dict[str, Any]], chunking_strategy: Literal["code", "markdown", "text"] = "text") -> int:
@@ -122,6 +131,7 @@ class EnhancedRAGRetriever:
         results = self.collection.get()
         if results['ids']:
             self.collection.delete(ids=results['ids'])
+        self.keyword_index.clear()
         logger.info(f"Reset collection {self.collection.name}")
 
     def retrieve(
@@ -138,67 +148,73 @@ class EnhancedRAGRetriever:
         )
         return self._parse_chroma_results(results)
 
+    def keyword_retrieve(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[RetrievalResult]:
+        """BM25 keyword search only. Scores are raw BM25 scores."""
+        self._pooled.ensure_keyword_index()
+        # Over-fetch when filtering, since metadata lives in Chroma
+        limit = top_k * 10 if filter_metadata else top_k
+        hits = self.keyword_index.search(query, top_k=limit)
+        if not hits:
+            return []
+
+        results = self.collection.get(
+            ids=[chunk_id for chunk_id, _ in hits],
+            where=filter_metadata,
+            include=["documents", "metadatas"]
+        )
+        found = {
+            chunk_id: (doc, meta)
+            for chunk_id, doc, meta in zip(results["ids"], results["documents"], results["metadatas"])
+        }
+        return [
+            RetrievalResult(
+                chunk_id=chunk_id,
+                content=found[chunk_id][0],
+                metadata=found[chunk_id][1] or {},
+                score=score
+            )
+            for chunk_id, score in hits
+            if chunk_id in found
+        ][:top_k]
+
     def hybrid_retrieve(
         self,
         query: str,
         top_k: int = 5,
         semantic_weight: float = 0.7,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        rrf_k: int = 60
     ) -> List[RetrievalResult]:
         """
-        Hybrid search combining Semantic (Vector) and Keyword (BM25-like) scores.
-        Implemented via Reciprocal Rank Fusion (RRF).
+        Hybrid search combining Semantic (Vector) and Keyword (BM25) rankings.
+        Implemented via weighted Reciprocal Rank Fusion (RRF):
+        score = w / (rrf_k + semantic_rank) + (1 - w) / (rrf_k + keyword_rank).
         """
-        # 1. Semantic Search (fetch 2x candidates)
-        semantic_candidates = self.retrieve(query, top_k=top_k*2, filter_metadata=filter_metadata)
-        
-        # 2. Keyword Search (fetch 2x candidates) - Simplified in-memory implementation for now
-        # In a generic setup, we'd use a real inverted index or sparse vector.
-        # Here we scan the semantic candidates + some random sample? 
-        # Actually, Chroma doesn't support BM25 natively efficiently without plugins.
-        # For this logic to work 'true' hybrid, we need to query ALL docs matching filter, then score.
-        # Capturing "all" is expensive. 
-        # STRATEGY: We will re-score the top semantic candidates with keyword matching 
-        # AND perform a separate "contains" query if possible, but Chroma 'where_document' is limited using $contains.
-        
-        # Let's rely on re-ranking top semantic results + exact phrase matches if supported.
-        # Better approach for this scope: "Pseudo-Hybrid"
-        # 1. Get semantic results.
-        # 2. Boost scores where keywords appear exactly.
-        
-        # To strictly follow RRF, we need two ranked lists. 
-        # List A: Semantic (already have)
-        
-        # List B: Keyword Match
-        # We can simulate this by querying with where_document={"$contains": keyword} for each keyword?
-        # That's too many queries.
-        
-        # Fallback: We will return semantic results re-ranked by keyword density for now, 
-        # as a full BM25 valid implementation requires a separate index (like Tantivy or Whoosh).
-        # Given constraints, we will honor the method signature but implement "Semantic with Keyword Boosting".
-        
-        keywords = set(query.lower().split())
-        
-        for res in semantic_candidates:
-            # Simple term frequency in content
-            text_lower = res.content.lower()
-            match_count = sum(1 for kw in keywords if kw in text_lower)
-            
-            # Simple linear combination for now as we don't have 2 independent lists
-            # Normalized score boosting
-            keyword_score = min(match_count / len(keywords), 1.0) if keywords else 0
-            
-            # Blend: weighted average
-            # res.score is cosine distance (0..2), convert to similarity 0..1 first if needed
-            # Chroma returns distance. retrieval() already converts to similarity? 
-            # Let's check _parse_chroma_results.
-            
-            final_score = (res.score * semantic_weight) + (keyword_score * (1 - semantic_weight))
-            res.score = final_score
-
-        # Re-sort
-        semantic_candidates.sort(key=lambda x: x.score, reverse=True)
-        return semantic_candidates[:top_k]
+        semantic = self.retrieve(query, top_k=top_k, filter_metadata=filter_metadata)
+        keyword = self.keyword_retrieve(query, top_k=top_k, filter_metadata=filter_metadata)
+
+        fused: Dict[str, float] = {}
+        by_id: Dict[str, RetrievalResult] = {}
+        for results, weight in ((semantic, semantic_weight), (keyword, 1.0 - semantic_weight)):
+            for rank, res in enumerate(results, start=1):
+                fused[res.chunk_id] = fused.get(res.chunk_id, 0.0) + weight / (rrf_k + rank)
+                by_id.setdefault(res.chunk_id, res)
+
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [
+            RetrievalResult(
+                chunk_id=chunk_id,
+                content=by_id[chunk_id].content,
+                metadata=by_id[chunk_id].metadata,
+                score=score
+            )
+            for chunk_id, score in ranked
+        ]
 
     def _parse_chroma_results(self, results: Dict[str, Any]) -> List[RetrievalResult]:
         out = []
@@ -0,0 +1,266 @@
+"""
+Semantic LLM Response Cache
+---------------------------
+Embedding-similarity layer behind the exact-match ``CacheManager``.
+
+Near-identical prompts (repeated form generations, IDE "explain this"
+actions, retried phases) hash differently and miss the exact cache. This
+layer embeds the non-system part of the conversation with the shared
+embeddings provider and looks up the nearest cached prompt in a
+``SimplePersistentVectorStore``. A hit is served when the cosine
+similarity reaches the threshold for the call's phase (falling back to its
+tier, then the global default).
+
+Candidates must match exactly on model, tier, phase, json_mode and a hash of
+the system prompt, so only the user-facing wording can vary. Dialogs longer
+than the embedding model's input window are not cached: the model embeds
+only their start, which is usually shared context, so two different
+requests would look identical. Embedding and
+search run on the shared retrieval pool to keep the event loop free.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from rag.async_retrieval import retrieval_executor
+from rag.vector_store import Document, SimplePersistentVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SemanticQuery:
+    """A prepared lookup: text to embed, exact-match filter and threshold."""
+    text: str
+    filter: Dict[str, Any]
+    threshold: float
+    embedding: Optional[List[float]] = None
+    oversized: Optional[bool] = None
+
+
+@dataclass
+class SemanticHit:
+    """A cached response whose prompt was similar enough."""
+    response: Dict[str, Any]
+    similarity: float
+    matched_id: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class SemanticCache:
+    """
+    Similarity-keyed LLM response cache.
+
+    Parameters
+    ----------
+    persist_directory : str
+        Where the vector store keeps its files.
+    similarity_threshold : float
+        Default minimum cosine similarity for a hit.
+    tier_thresholds, phase_thresholds : dict
+        Overrides by cache tier and by orchestrator phase (phase wins).
+    tier_ttls : dict
+        TTL in seconds per tier (``"default"`` for unknown tiers).
+    max_entries : int
+        Oldest entries are dropped beyond this count.
+    embedding_provider : optional
+        Object with ``embed_texts``; defaults to the shared local provider.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str = "outputs/cache/semantic",
+        similarity_threshold: float = 0.95,
+        tier_thresholds: Optional[Dict[str, float]] = None,
+        phase_thresholds: Optional[Dict[str, float]] = None,
+        tier_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 5_000,
+        embedding_provider: Optional[Any] = None
+    ) -> None:
+        if embedding_provider is None:
+            from rag.embeddings_provider import create_embeddings_provider
+            embedding_provider = create_embeddings_provider(
+                provider_type="huggingface",
+                model="all-MiniLM-L6-v2",
+                use_cache=True
+            )
+        self.embedding_provider = embedding_provider
+        self._truncates = _truncation_check(embedding_provider)
+        self.similarity_threshold = similarity_threshold
+        self.tier_thresholds = tier_thresholds or {}
+        self.phase_thresholds = phase_thresholds or {}
+        self.tier_ttls = {"default": 86400}
+        self.tier_ttls.update(tier_ttls or {})
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self.store = SimplePersistentVectorStore(
+            collection_name="llm_responses",
+            persist_directory=persist_directory,
+            embedding_function=embedding_provider.embed_texts
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def prepare(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tier: str = "default",
+        phase: Optional[str] = None,
+        json_mode: bool = False
+    ) -> Optional[SemanticQuery]:
+        """Build a lookup for ``messages``; None if they can't be cached (e.g. images)."""
+        system_parts, dialog_parts = [], []
+        for m in messages:
+            if not isinstance(m.get("content"), str):
+                return None
+            if m["role"] == "system":
+                system_parts.append(m["content"])
+            else:
+                dialog_parts.append(f"{m['role']}: {m['content']}")
+        if not dialog_parts:
+            return None
+
+        system_hash = hashlib.sha256("\n".join(system_parts).encode("utf-8")).hexdigest()
+        return SemanticQuery(
+            text="\n".join(dialog_parts),
+            filter={
+                "model": model,
+                "tier": tier,
+                "phase": phase or "",
+                "json_mode": json_mode,
+                "system_hash": system_hash,
+            },
+            threshold=self.threshold_for(tier, phase)
+        )
+
+    def threshold_for(self, tier: str, phase: Optional[str] = None) -> float:
+        if phase and phase in self.phase_thresholds:
+            return self.phase_thresholds[phase]
+        return self.tier_thresholds.get(tier, self.similarity_threshold)
+
+    async def lookup(self, query: SemanticQuery) -> Optional[SemanticHit]:
+        """Return the best cached response at or above the threshold."""
+        return await retrieval_executor.run(self._lookup, query)
+
+    async def store_response(self, query: SemanticQuery, response: Dict[str, Any]) -> None:
+        """Cache ``response`` under the query's prompt embedding."""
+        await retrieval_executor.run(self._store, query, response)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "entries": len(self.store.documents),
+            }
+
+    def _embed(self, query: SemanticQuery) -> List[float]:
+        if query.embedding is None:
+            query.embedding = self.embedding_provider.embed_texts([query.text])[0]
+        return query.embedding
+
+    def _oversized(self, query: SemanticQuery) -> bool:
+        if query.oversized is None:
+            query.oversized = bool(self._truncates and self._truncates(query.text))
+        return query.oversized
+
+    def _lookup(self, query: SemanticQuery) -> Optional[SemanticHit]:
+        if self._oversized(query):
+            with self._lock:
+                self.skipped += 1
+            return None
+        embedding = self._embed(query)
+        with self._lock:
+            results = self.store.search_many(
+                [query.text], filters=query.filter, top_k=1, query_embeddings=[embedding]
+            )[0]
+            hit = results[0] if results else None
+            if hit is not None:
+                meta = hit.document.metadata
+                ttl = self.tier_ttls.get(meta["tier"], self.tier_ttls["default"])
+                if time.time() - meta["created"] > ttl:
+                    self.store.delete_document(hit.document.id)
+                    hit = None
+
+            if hit is None or hit.score < query.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return SemanticHit(
+            response=json.loads(hit.document.metadata["response"]),
+            similarity=float(hit.score),
+            matched_id=hit.document.id,
+            metadata=hit.document.metadata
+        )
+
+    def _store(self, query: SemanticQuery, response: Dict[str, Any]) -> None:
+        if self._oversized(query):
+            return
+        embedding = self._embed(query)
+        doc_id = hashlib.sha256(
+            (json.dumps(query.filter, sort_keys=True) + query.text).encode("utf-8")
+        ).hexdigest()
+        metadata = {
+            **query.filter,
+            "created": time.time(),
+            "response": json.dumps(response, default=str),
+        }
+        with self._lock:
+            self.store.delete_document(doc_id)
+            self.store.add_documents([
+                Document(id=doc_id, text=query.text, metadata=metadata, embedding=embedding)
+            ])
+            while len(self.store.documents) > self.max_entries:
+                self.store.delete_document(self.store.documents[0].id)
+
+
+def _truncation_check(provider: Any) -> Optional[Callable[[str], bool]]:
+    """The embedding model's ``truncates`` check, looking through cache/batching wrappers."""
+    while provider is not None:
+        if hasattr(provider, "truncates"):
+            return provider.truncates
+        provider = getattr(provider, "provider", None)
+    return None
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache(config: Dict[str, Any], tier_ttls: Dict[str, float]) -> Optional[SemanticCache]:
+    """
+    Process-wide semantic cache built from the ``caching.semantic`` config
+    section, or None when it is disabled.
+    """
+    global _semantic_cache
+    if not config.get("enabled", False):
+        return None
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache(
+                persist_directory=config.get("path", "outputs/cache/semantic"),
+                similarity_threshold=float(config.get("similarity_threshold", 0.95)),
+                tier_thresholds=config.get("tier_thresholds"),
+                phase_thresholds=config.get("phase_thresholds"),
+                tier_ttls=tier_ttls,
+                max_entries=int(config.get("max_entries", 5_000))
+            )
+        return _semantic_cache
+
+
+def current_semantic_cache() -> Optional[SemanticCache]:
+    """The process-wide semantic cache if one has been created."""
+    return _semantic_cache
@@ -9,6 +9,7 @@ class Limits:
     max_input_tokens: int = 6000
     max_output_tokens: int = 1000
     concurrency: int = 2
+    retrieval_workers: int = 4
 
 def load_limits() -> Limits:
     # from YAML if present
@@ -25,6 +26,7 @@ def load_limits() -> Limits:
         max_input_tokens = int(os.getenv("ACORCH_MAX_INPUT_TOKENS", budgets.get("max_input_tokens", 6000))),
         max_output_tokens = int(os.getenv("ACORCH_MAX_OUTPUT_TOKENS", budgets.get("max_output_tokens", 1000))),
         concurrency = int(os.getenv("ACORCH_CONCURRENCY", conc.get("max_workers", 2))),
+        retrieval_workers = int(os.getenv("ACORCH_RETRIEVAL_WORKERS", conc.get("retrieval_workers", 4))),
     )
 
 def get_dynui_path() -> Path:
@@ -0,0 +1,343 @@
+"""
+Usage Ledger
+------------
+In-memory rollups and batched history storage for LLM cost accounting.
+
+``UsageLedger`` keeps the most recent usage records in a ring buffer and
+maintains per-model / provider / phase / task totals incrementally, so
+reports no longer rescan every record of the process lifetime.
+
+``UsageHistory`` persists records to SQLite from a background writer
+thread. ``track_usage`` only enqueues. Each batch inserts the raw rows
+and upserts per-day rollups in one transaction, so "today's spend" (as
+used by ``CostManager._load_todays_usage``) and dashboard summaries are
+primary-key lookups instead of JSONL scans. Legacy ``usage_*.jsonl`` files
+are imported once and renamed to ``.jsonl.migrated``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rollup dimensions kept in memory (attribute names of UsageRecord)
+LEDGER_DIMENSIONS = ("model", "provider", "phase", "task_id")
+# Dimensions rolled up per day in the history store ("total" has key "")
+HISTORY_DIMENSIONS = ("total", "model", "provider", "phase")
+
+
+def aggregate(records: Iterable[Any], dimension: str) -> Dict[str, Dict[str, float]]:
+    """``{key: {cost, tokens, calls}}`` over ``records`` grouped by ``dimension``."""
+    out: Dict[str, Dict[str, float]] = {}
+    for record in records:
+        key = getattr(record, dimension)
+        if key is None:
+            continue
+        _add(out, key, record)
+    return out
+
+
+def _add(rollup: Dict[str, Dict[str, float]], key: str, record: Any) -> None:
+    bucket = rollup.get(key)
+    if bucket is None:
+        bucket = rollup[key] = {"cost": 0.0, "tokens": 0, "calls": 0}
+    bucket["cost"] += record.cost_usd
+    bucket["tokens"] += record.tokens_total
+    bucket["calls"] += 1
+
+
+class UsageLedger:
+    """
+    Ring buffer of recent usage records plus incrementally maintained rollups.
+
+    Parameters
+    ----------
+    ring_size : int
+        Number of individual records kept for ``since`` queries; rollups
+        and totals cover every record ever added.
+    """
+
+    def __init__(self, ring_size: int = 10_000) -> None:
+        self.records: Deque[Any] = deque(maxlen=ring_size)
+        self.rollups: Dict[str, Dict[str, Dict[str, float]]] = {d: {} for d in LEDGER_DIMENSIONS}
+        self.total_cost = 0.0
+        self.total_tokens = 0
+        self.calls = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+
+    def add(self, record: Any) -> None:
+        self.records.append(record)
+        for dimension in LEDGER_DIMENSIONS:
+            key = getattr(record, dimension)
+            if key is not None:
+                _add(self.rollups[dimension], key, record)
+        self.total_cost += record.cost_usd
+        self.total_tokens += record.tokens_total
+        self.calls += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = record.timestamp
+        self.last_timestamp = record.timestamp
+
+    def breakdown(self, dimension: str) -> Dict[str, Dict[str, float]]:
+        """Copy of the rollup for one dimension."""
+        return {k: dict(v) for k, v in self.rollups[dimension].items()}
+
+    def covers(self, since: Optional[float]) -> bool:
+        """True when the rollups answer a query from ``since`` exactly."""
+        return since is None or self.first_timestamp is None or since <= self.first_timestamp
+
+    def holds(self, since: float) -> bool:
+        """True when the ring still holds every record at or after ``since``."""
+        evicted = len(self.records) < self.calls
+        # Evicted records are no newer than the oldest buffered one
+        return not evicted or (bool(self.records) and since > self.records[0].timestamp)
+
+    def since(self, since: float) -> List[Any]:
+        """Buffered records at or after ``since`` (bounded by the ring size)."""
+        return [r for r in self.records if r.timestamp >= since]
+
+
+class SQLiteUsageStore:
+    """Raw usage rows plus per-day rollups in SQLite (WAL mode)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS usage (
+                timestamp REAL NOT NULL,
+                day TEXT NOT NULL,
+                model TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                phase TEXT,
+                task_id TEXT,
+                tokens_input INTEGER NOT NULL,
+                tokens_output INTEGER NOT NULL,
+                tokens_total INTEGER NOT NULL,
+                cost_usd REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_usage_timestamp ON usage(timestamp);
+            CREATE TABLE IF NOT EXISTS daily_rollups (
+                day TEXT NOT NULL,
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                cost_usd REAL NOT NULL,
+                tokens INTEGER NOT NULL,
+                calls INTEGER NOT NULL,
+                PRIMARY KEY (day, dimension, key)
+            );
+        """)
+        self._conn.commit()
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Insert records (``UsageRecord`` dicts) and fold them into the daily rollups."""
+        rows, rollups = [], {}
+        for r in records:
+            day = datetime.fromtimestamp(r["timestamp"]).strftime("%Y-%m-%d")
+            rows.append((
+                r["timestamp"], day, r["model"], r["provider"], r.get("phase"), r.get("task_id"),
+                r["tokens_input"], r["tokens_output"], r["tokens_total"], r["cost_usd"]
+            ))
+            for dimension in HISTORY_DIMENSIONS:
+                key = "" if dimension == "total" else (r.get(dimension) or "unknown")
+                cost, tokens, calls = rollups.get((day, dimension, key), (0.0, 0, 0))
+                rollups[(day, dimension, key)] = (cost + r["cost_usd"], tokens + r["tokens_total"], calls + 1)
+
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany(
+                """
+                INSERT INTO daily_rollups VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(day, dimension, key) DO UPDATE SET
+                    cost_usd = cost_usd + excluded.cost_usd,
+                    tokens = tokens + excluded.tokens,
+                    calls = calls + excluded.calls
+                """,
+                [(*key, *values) for key, values in rollups.items()]
+            )
+
+    def day_total(self, day: str) -> Tuple[float, int, int]:
+        """(cost, tokens, calls) recorded on ``day`` (``YYYY-MM-DD``)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cost_usd, tokens, calls FROM daily_rollups WHERE day = ? AND dimension = 'total' AND key = ''",
+                (day,)
+            ).fetchone()
+        return tuple(row) if row else (0.0, 0, 0)
+
+    def daily(self, start_day: str, end_day: str, dimension: str = "total") -> List[Dict[str, Any]]:
+        """Per-day rollup rows for ``dimension`` between two days, inclusive."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, key, cost_usd, tokens, calls FROM daily_rollups "
+                "WHERE dimension = ? AND day BETWEEN ? AND ? ORDER BY day, cost_usd DESC",
+                (dimension, start_day, end_day)
+            ).fetchall()
+        return [
+            {"day": day, "key": key, "cost": cost, "tokens": tokens, "calls": calls}
+            for day, key, cost, tokens, calls in rows
+        ]
+
+    def window(self, since: float) -> Dict[str, Any]:
+        """Totals and per-model / provider / phase rollups of the raw rows at or after ``since``."""
+        with self._lock:
+            start, end, cost, tokens, calls = self._conn.execute(
+                "SELECT MIN(timestamp), MAX(timestamp), TOTAL(cost_usd), TOTAL(tokens_total), COUNT(*) "
+                "FROM usage WHERE timestamp >= ?",
+                (since,)
+            ).fetchone()
+            breakdowns = {}
+            for dimension in ("model", "provider", "phase"):
+                rows = self._conn.execute(
+                    f"SELECT {dimension}, TOTAL(cost_usd), TOTAL(tokens_total), COUNT(*) FROM usage "
+                    f"WHERE timestamp >= ? AND {dimension} IS NOT NULL GROUP BY {dimension}",
+                    (since,)
+                ).fetchall()
+                breakdowns[dimension] = {
+                    key: {"cost": c, "tokens": int(t), "calls": n} for key, c, t, n in rows
+                }
+        return {"start": start, "end": end, "cost": cost, "tokens": int(tokens), "calls": calls, **breakdowns}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class UsageHistory:
+    """
+    Write-behind usage history: records are queued by callers and written in
+    batches by a background thread.
+
+    Parameters
+    ----------
+    history_dir : str
+        Directory holding ``usage.sqlite3`` (and any legacy JSONL files).
+    flush_interval : float
+        Maximum seconds a record waits before being written.
+    batch_size : int
+        Records per transaction at most.
+    """
+
+    def __init__(self, history_dir: str, flush_interval: float = 1.0, batch_size: int = 500) -> None:
+        self.history_dir = Path(history_dir)
+        self.store = SQLiteUsageStore(str(self.history_dir / "usage.sqlite3"))
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.write_errors = 0
+        self._queue: "queue.SimpleQueue[Tuple]" = queue.SimpleQueue()
+
+        self._migrate_jsonl()
+        self._writer = threading.Thread(target=self._write_loop, name="usage-history-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def record(self, record: Dict[str, Any]) -> None:
+        """Queue one ``UsageRecord`` dict for persistence."""
+        self._queue.put(("record", record))
+
+    def flush(self) -> None:
+        """Block until everything queued so far has been written."""
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait()
+
+    def day_total(self, day: str) -> Tuple[float, int, int]:
+        self.flush()
+        return self.store.day_total(day)
+
+    def daily(self, start_day: str, end_day: str, dimension: str = "total") -> List[Dict[str, Any]]:
+        self.flush()
+        return self.store.daily(start_day, end_day, dimension)
+
+    def window(self, since: float) -> Dict[str, Any]:
+        self.flush()
+        return self.store.window(since)
+
+    def close(self) -> None:
+        """Write pending records and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(("stop", None))
+            self._writer.join()
+            self.store.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            try:
+                ops = [self._queue.get()]
+            except Exception:
+                return
+            deadline = time.monotonic() + self.flush_interval
+            # Gather a batch until it is full, the interval passes or someone waits on it
+            while ops[-1][0] == "record" and len(ops) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    ops.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            records = [payload for kind, payload in ops if kind == "record"]
+            if records:
+                try:
+                    self.store.write(records)
+                except Exception as e:
+                    self.write_errors += 1
+                    logger.error(f"Failed to write usage history: {e}")
+            for kind, payload in ops:
+                if kind == "flush":
+                    payload.set()
+            if any(kind == "stop" for kind, _ in ops):
+                return
+
+    def _migrate_jsonl(self) -> None:
+        """Import legacy ``usage_*.jsonl`` files once."""
+        for path in sorted(self.history_dir.glob("usage_*.jsonl")):
+            try:
+                # Older writers separated records with a literal backslash-n
+                text = path.read_text(encoding="utf-8").replace("\\n", "\n")
+                records = []
+                for line in text.splitlines():
+                    if line.strip():
+                        try:
+                            records.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            logger.warning(f"Skipping unreadable usage record in {path.name}")
+                if records:
+                    self.store.write(records)
+                path.rename(path.with_name(path.name + ".migrated"))
+                logger.info(f"Migrated {len(records)} usage records from {path.name}")
+            except Exception as e:
+                logger.error(f"Failed to migrate {path}: {e}")
+
+
+_histories: Dict[Path, UsageHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def get_usage_history(history_dir: str = "./cost_history") -> UsageHistory:
+    """Process-wide ``UsageHistory`` for a directory, shared by every cost manager."""
+    key = Path(history_dir).resolve()
+    with _histories_lock:
+        history = _histories.get(key)
+        if history is None or not history._writer.is_alive():
+            history = _histories[key] = UsageHistory(str(key))
+        return history
@@ -150,13 +150,13 @@ class AgenticRetriever:
         all_candidates = []
         seen_ids = set()
         
-        for q in queries:
-            results = self.vector_store.search(
-                query=q,
-                top_k=self.config.initial_k // len(queries),
-                filter_metadata=filter_metadata
-            )
-            
+        batched = self.vector_store.search_many(
+            queries,
+            filters=filter_metadata,
+            top_k=self.config.initial_k // len(queries)
+        )
+
+        for results in batched:
             # Deduplicate
             for result in results:
                 if result.document.id not in seen_ids:
@@ -214,11 +214,21 @@ Sub-questions:"""
         query: str,
         filter_metadata: Optional[Dict[str, Any]] = None
     ) -> List[SearchResult]:
-        """Fallback keyword search for hybrid retrieval."""
-        # Simple keyword matching (can be replaced with BM25)
-        # This is a placeholder - real implementation would use BM25 or similar
-        logger.debug("Keyword search not yet implemented, returning empty")
-        return []
+        """BM25 keyword search for hybrid retrieval."""
+        results = self.vector_store.keyword_search(
+            query,
+            top_k=self.config.initial_k,
+            filter_metadata=filter_metadata
+        )
+        if not results:
+            return []
+
+        # BM25 scores are unbounded; scale to 0..1 against the best hit so
+        # they are comparable with min_relevance_score in the analyze stage
+        best = results[0].score or 1.0
+        for result in results:
+            result.score = result.score / best
+        return results
 
     async def _analyze_candidates(
         self,
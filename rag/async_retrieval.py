@@ -0,0 +1,120 @@
+"""Bounded worker pool that runs blocking retrieval off the asyncio event loop.
+
+Embedding a query and scoring it against a vector store is CPU-bound. Called
+inline from an ``async def`` it stalls every other coroutine on the loop,
+including SSE streaming. ``retrieval_executor.run`` hands the call to a small
+thread pool and awaits the result. numpy and the embedding backends release
+the GIL while they compute, so threads give real parallelism here. The
+retrievers hold memory-mapped matrices and loaded models that cannot be
+pickled, so a process pool is not an option.
+
+The pool size caps how many retrievals run at once. Further calls queue.
+``stats()`` reports both numbers for the ``/metrics`` endpoint.
+
+Usage::
+
+    from rag.async_retrieval import retrieval_executor
+
+    results = await retrieval_executor.run(retriever.retrieve, query, top_k=5)
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+import asyncio
+import functools
+import logging
+import threading
+import time
+
+from core.settings import load_limits
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RetrievalExecutor:
+    """
+    Thread pool with in-flight / queued accounting.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Maximum concurrent retrievals. Defaults to ``concurrency.retrieval_workers``
+        from ``config/limits.yaml`` (env: ``ACORCH_RETRIEVAL_WORKERS``).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max(1, max_workers or load_limits().retrieval_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result."""
+        with self._lock:
+            self.queued += 1
+        future = self._get_executor().submit(functools.partial(self._call, fn, args, kwargs))
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "busy_seconds": round(self.busy_seconds, 3),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads; a later ``run`` starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="retrieval"
+                )
+            return self._executor
+
+    def _call(self, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.busy_seconds += time.perf_counter() - start
+
+    def _on_done(self, future: Future) -> None:
+        # A call cancelled while still queued never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+
+# Process-wide executor shared by retrievers and orchestrators
+retrieval_executor = RetrievalExecutor()
@@ -0,0 +1,218 @@
+"""Inverted-index BM25 keyword search for hybrid retrieval.
+
+Complements vector similarity with exact-term matching, which embeddings are
+weak at: component names (``DynButton``), entity names (``PolicyHolder``),
+error codes (``CS0246``). The tokenizer keeps whole identifiers and also
+splits camelCase / snake_case into their parts, so both ``DynButton`` and
+``button`` hit the same document.
+
+The index can be persisted as an append-only JSONL log of per-document term
+frequencies (plus delete tombstones), stored next to a collection's vector
+data. ``compact()`` rewrites the log from the live index; it also runs by
+itself once superseded and deleted records outnumber a share of the live ones,
+so long-lived collections with frequent upserts don't replay an ever-growing
+log on startup.
+
+One index is shared per collection across retrieval worker threads and
+background ingestion, so every read and write of the postings and the log
+happens under the index's lock.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import json
+import logging
+import math
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+_PART_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased identifier-aware tokens (whole word plus its sub-parts)."""
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(text):
+        tokens.append(word.lower())
+        parts = [p.lower() for piece in word.split("_") for p in _PART_RE.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index keyed by document ID.
+
+    Parameters
+    ----------
+    path : str, optional
+        JSONL log to persist to. Loaded on construction if it exists.
+    k1, b : float
+        Standard BM25 term-frequency saturation and length normalization.
+    """
+
+    # Compact the log once stale records exceed this share of live documents
+    # (and this absolute minimum, so small indexes aren't rewritten constantly)
+    COMPACT_TOMBSTONE_RATIO = 0.5
+    COMPACT_MIN_TOMBSTONES = 1000
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75) -> None:
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+        self._tombstones = 0
+        self._lock = threading.RLock()
+
+        if self.path and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_len
+
+    def add(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Index ``(doc_id, text)`` pairs, replacing existing entries with the same ID."""
+        records = [{"id": doc_id, "tf": Counter(tokenize(text))} for doc_id, text in items]
+        with self._lock:
+            for record in records:
+                if self._index(record["id"], record["tf"]):
+                    self._tombstones += 1  # the previous record is superseded
+            self._write(records)
+            self._maybe_compact()
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document from the index."""
+        with self._lock:
+            if self._unindex(doc_id):
+                self._tombstones += 1
+                self._write([{"op": "delete", "id": doc_id}])
+                self._maybe_compact()
+
+    def clear(self) -> None:
+        """Drop all entries and the persisted log."""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_len.clear()
+            self._total_len = 0
+            self._tombstones = 0
+            if self.path and self.path.exists():
+                self.path.unlink()
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        allow: Optional[Callable[[str], bool]] = None
+    ) -> List[Tuple[str, float]]:
+        """Return up to ``top_k`` ``(doc_id, score)`` pairs, best first."""
+        if top_k <= 0:
+            return []
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = {}
+        with self._lock:
+            n_docs = len(self._doc_len)
+            if not n_docs:
+                return []
+            avg_len = self._total_len / n_docs
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        # The filter may take the store's own lock, so it runs outside ours
+        candidates = scores.items()
+        if allow is not None:
+            candidates = [(doc_id, score) for doc_id, score in candidates if allow(doc_id)]
+        return heapq.nlargest(top_k, candidates, key=lambda item: item[1])
+
+    def compact(self) -> None:
+        """Rewrite the persisted log from the live index."""
+        if not self.path:
+            return
+        with self._lock:
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                for doc_id, terms in self._doc_terms.items():
+                    tf = {term: self._postings[term][doc_id] for term in terms}
+                    f.write(json.dumps({"id": doc_id, "tf": tf}) + "\n")
+            tmp.replace(self.path)
+            self._tombstones = 0
+
+    def _maybe_compact(self) -> None:
+        if self.path and self._tombstones > max(
+            self.COMPACT_MIN_TOMBSTONES, self.COMPACT_TOMBSTONE_RATIO * len(self)
+        ):
+            logger.info(f"Compacting BM25 log {self.path} ({self._tombstones} stale records)")
+            self.compact()
+
+    def _index(self, doc_id: str, tf: Dict[str, int]) -> bool:
+        """Index a document; True if it replaced an existing entry."""
+        replaced = self._unindex(doc_id)
+        for term, count in tf.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+        self._doc_terms[doc_id] = list(tf)
+        length = sum(tf.values())
+        self._doc_len[doc_id] = length
+        self._total_len += length
+        return replaced
+
+    def _unindex(self, doc_id: str) -> bool:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id, 0)
+        return True
+
+    def _write(self, records: List[Dict]) -> None:
+        if not self.path or not records:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write("\n".join(json.dumps(r) for r in records) + "\n")
+
+    def _load(self) -> None:
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt record in {self.path}")
+                    continue
+                if record.get("op") == "delete":
+                    if self._unindex(record["id"]):
+                        self._tombstones += 1
+                elif self._index(record["id"], record["tf"]):
+                    self._tombstones += 1
+        logger.info(f"Loaded BM25 index with {len(self)} documents from {self.path}")
+        self._maybe_compact()
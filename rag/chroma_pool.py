@@ -0,0 +1,186 @@
+"""Process-wide pool of ChromaDB clients, collections and their BM25 indexes.
+
+Creating a ``chromadb.PersistentClient`` and running ``get_or_create_collection``
+on every HTTP request dominates latency and contends on Chroma's SQLite file.
+The pool keeps one client per persist directory and one entry per
+``(persist directory, collection name)``. Entries are reference-counted by the
+``ChromaVectorStore`` instances using them and evicted once idle.
+
+Usage::
+
+    from rag.chroma_pool import chroma_pool
+
+    client = chroma_pool.get_client("rag/chroma_db")
+    entry = chroma_pool.acquire_collection("rag/chroma_db", "code_docs")
+    try:
+        entry.collection.count()
+    finally:
+        chroma_pool.release_collection(entry)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import logging
+import threading
+import time
+
+from .bm25_index import BM25Index
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ClientEntry:
+    client: Any
+    last_used: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class PooledCollection:
+    """A shared Chroma collection handle plus its BM25 keyword index."""
+    key: Tuple[str, str]
+    collection: Any
+    keyword_index: BM25Index
+    refs: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    _backfill_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def ensure_keyword_index(self, page_size: int = 1000) -> None:
+        """Build the BM25 index from the collection if it was created before the index existed."""
+        if len(self.keyword_index):
+            return
+        # Threads retrieving from a cold collection wait for one backfill instead of each running their own
+        with self._backfill_lock:
+            if len(self.keyword_index) or not self.collection.count():
+                return
+            logger.info(f"Building BM25 index for Chroma collection '{self.key[1]}'")
+            offset = 0
+            while True:
+                page = self.collection.get(limit=page_size, offset=offset, include=['documents'])
+                if not page['ids']:
+                    break
+                self.keyword_index.add(zip(page['ids'], page['documents']))
+                offset += len(page['ids'])
+
+
+class ChromaClientPool:
+    """
+    Thread-safe, reference-counted registry of Chroma clients and collections.
+
+    Parameters
+    ----------
+    idle_timeout : float
+        Seconds an unreferenced entry may stay idle before it is evicted.
+    """
+
+    def __init__(self, idle_timeout: float = 300.0) -> None:
+        self.idle_timeout = idle_timeout
+        self._lock = threading.RLock()
+        self._clients: Dict[str, _ClientEntry] = {}
+        self._collections: Dict[Tuple[str, str], PooledCollection] = {}
+        self.client_creations = 0
+        self.collection_creations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _path_key(persist_directory: str) -> str:
+        return str(Path(persist_directory).resolve())
+
+    def get_client(self, persist_directory: str = "rag/chroma_db") -> Any:
+        """Return the shared ``PersistentClient`` for a directory."""
+        try:
+            import chromadb
+            from chromadb.config import Settings
+        except ImportError:
+            raise ImportError(
+                "ChromaDB not installed. Install with: pip install chromadb"
+            )
+
+        path = self._path_key(persist_directory)
+        with self._lock:
+            self._evict_idle()
+            entry = self._clients.get(path)
+            if entry is None:
+                Path(path).mkdir(parents=True, exist_ok=True)
+                client = chromadb.PersistentClient(
+                    path=path,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+                entry = self._clients[path] = _ClientEntry(client)
+                self.client_creations += 1
+                logger.info(f"Opened Chroma client for {path}")
+            entry.last_used = time.monotonic()
+            return entry.client
+
+    def acquire_collection(
+        self,
+        persist_directory: str,
+        name: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> PooledCollection:
+        """Get (or create) a collection entry and take a reference on it."""
+        key = (self._path_key(persist_directory), name)
+        with self._lock:
+            entry = self._collections.get(key)
+            if entry is None:
+                client = self.get_client(persist_directory)
+                collection = client.get_or_create_collection(
+                    name=name,
+                    metadata=metadata or {"hnsw:space": "cosine"}
+                )
+                keyword_index = BM25Index(str(Path(key[0]) / f"{name}.bm25.jsonl"))
+                entry = self._collections[key] = PooledCollection(key, collection, keyword_index)
+                self.collection_creations += 1
+            entry.refs += 1
+            entry.last_used = time.monotonic()
+            return entry
+
+    def release_collection(self, entry: PooledCollection) -> None:
+        """Drop a reference taken by ``acquire_collection``."""
+        with self._lock:
+            entry.refs = max(entry.refs - 1, 0)
+            entry.last_used = time.monotonic()
+
+    def invalidate_collection(self, persist_directory: str, name: str) -> None:
+        """Forget a collection (e.g. after it was deleted)."""
+        with self._lock:
+            self._collections.pop((self._path_key(persist_directory), name), None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "collections": len(self._collections),
+                "active_references": sum(e.refs for e in self._collections.values()),
+                "client_creations": self.client_creations,
+                "collection_creations": self.collection_creations,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        """Drop every pooled client and collection."""
+        with self._lock:
+            self._collections.clear()
+            self._clients.clear()
+
+    def _evict_idle(self) -> None:
+        """Evict unreferenced collections and clients idle past the timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, entry in list(self._collections.items()):
+            if entry.refs == 0 and entry.last_used < cutoff:
+                del self._collections[key]
+                self.evictions += 1
+
+        in_use = {path for path, _ in self._collections}
+        for path, entry in list(self._clients.items()):
+            if path not in in_use and entry.last_used < cutoff:
+                del self._clients[path]
+                self.evictions += 1
+                logger.info(f"Evicted idle Chroma client for {path}")
+
+
+# Process-wide pool shared by route handlers and retrievers
+chroma_pool = ChromaClientPool()
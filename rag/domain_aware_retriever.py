@@ -7,8 +7,9 @@ from typing import List, Dict, Any, Optional
 import json
 import logging
 
-from rag.vector_store import SimplePersistentVectorStore, SearchResult
+from rag.vector_store import SimplePersistentVectorStore, SearchResult, VectorStore, reciprocal_rank_fusion
 from rag.embeddings_provider import create_embeddings_provider
+from rag.async_retrieval import retrieval_executor
 from core.settings import resolve_path
 
 logger = logging.getLogger(__name__)
@@ -41,7 +42,7 @@ class DomainAwareRetriever:
         database_collection: str = "pos_database_schema",
         components_collection: str = "code_docs", # Pointing to the main collection we used in ingestion
         embedding_model: str = "all-MiniLM-L6-v2",
-        persist_dir: str = "rag/store_data", # JSON store directory
+        persist_dir: str = "rag/store_data", # SimplePersistentVectorStore directory
         use_cache: bool = True
     ):
         # Initialize embeddings
@@ -128,56 +129,50 @@ class DomainAwareRetriever:
         token_results = []
         doc_results = []
 
-        # 1. Retrieve database entities (if relevant)
+        # Embed the requirement once and share it across both stores
+        query_embeddings = None
         try:
-            db_results = self.db_store.search(
-                query=user_requirement, 
-                top_k=top_k_entities, 
-                filter_metadata={"type": "database_schema"}
-            )
+            query_embeddings = [self.embedding_provider.embed_query(user_requirement)]
         except Exception as e:
-            logger.warning(f"Database search failed: {e}")
+            logger.warning(f"Query embedding failed: {e}")
 
-        # 2. Retrieve UI Components (using new 'ui_component' type from ingestion)
-        try:
-            component_results = self.code_store.search(
-                query=user_requirement, 
-                top_k=top_k_components, 
-                filter_metadata={"type": "ui_component"}
-            )
-            # Fallback/Additional: Try 'react_component' if using legacy data
-            if not component_results:
-                 component_results = self.code_store.search(
-                    query=user_requirement, 
-                    top_k=top_k_components, 
-                    filter_metadata={"type": "react_component"}
-                )
-        except Exception as e:
-            logger.warning(f"Component search failed: {e}")
+        # 1. Retrieve database entities (if relevant)
+        [db_results] = self._search_categories(
+            self.db_store, [user_requirement], [{"type": "database_schema"}], [top_k_entities], query_embeddings
+        )
 
-        # 3. Retrieve Design Tokens
-        try:
-             token_results = self.code_store.search(
-                query=user_requirement, 
-                top_k=top_k_tokens, 
-                filter_metadata={"type": "design_token"}
-            )
-        except Exception as e:
-            logger.warning(f"Token search failed: {e}")
+        component_type = "ui_component"
 
-        # 4. Retrieve Documentation
-        try:
-             doc_results = self.code_store.search(
-                query=user_requirement, 
-                top_k=top_k_docs, 
-                filter_metadata={"type": "documentation"}
-            )
-        except Exception as e:
-            logger.warning(f"Doc search failed: {e}")
+        # 2-4. UI components, legacy 'react_component' fallback, design tokens
+        # and documentation, scored in one batched pass over the code store
+        component_results, legacy_results, token_results, doc_results = self._search_categories(
+            self.code_store,
+            [user_requirement] * 4,
+            [
+                {"type": "ui_component"},
+                {"type": "react_component"},
+                {"type": "design_token"},
+                {"type": "documentation"}
+            ],
+            [top_k_components, top_k_components, top_k_tokens, top_k_docs],
+            query_embeddings * 4 if query_embeddings else None
+        )
+        if not component_results:
+            component_results = legacy_results
+            component_type = "react_component"
+
+        # Exact identifier matches (entity / component names) via BM25
+        db_results = self._with_keyword_hits(
+            self.db_store, user_requirement, db_results, {"type": "database_schema"}, top_k_entities
+        )
+        component_results = self._with_keyword_hits(
+            self.code_store, user_requirement, component_results,
+            {"type": component_type}, top_k_components
+        )
 
         # 5. Extract relationships for found entities
         relevant_entities = [r.document.metadata.get("entity") for r in db_results if r.document.metadata.get("entity")]
-        relationships = self._get_relationships(relevant_entities)
+        relationships = self._get_relationships(relevant_entities, query_embeddings)
 
         # 6. Global Stats
         total_db = 0
@@ -231,22 +226,80 @@ class DomainAwareRetriever:
         self._context_cache[cache_key] = context
         return context
 
-    def _get_relationships(self, entity_names: List[str]) -> List[Dict[str, Any]]:
+    def _with_keyword_hits(
+        self,
+        store: VectorStore,
+        query: str,
+        results: List[SearchResult],
+        filter_metadata: Dict[str, Any],
+        top_k: int
+    ) -> List[SearchResult]:
+        """Fuse vector results with BM25 hits for the same filter (RRF)."""
+        try:
+            keyword = store.keyword_search(query, top_k=top_k, filter_metadata=filter_metadata)
+        except Exception as e:
+            logger.warning(f"Keyword search failed: {e}")
+            return results
+        if not keyword:
+            return results
+        return reciprocal_rank_fusion([results, keyword])[:top_k]
+
+    def _search_categories(
+        self,
+        store: VectorStore,
+        queries: List[str],
+        filters: List[Dict[str, Any]],
+        top_ks: List[int],
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[SearchResult]]:
+        """
+        One batched ``search_many``; if it fails, each filter is retried on its
+        own so one failing category doesn't drop the others.
+        """
+        try:
+            return store.search_many(queries, filters=filters, top_k=top_ks, query_embeddings=query_embeddings)
+        except Exception as e:
+            logger.warning(f"Batched search failed, retrying per category: {e}")
+
+        results = []
+        for i, (query, filter_metadata, top_k) in enumerate(zip(queries, filters, top_ks)):
+            try:
+                results.append(store.search_many(
+                    [query],
+                    filters=filter_metadata,
+                    top_k=top_k,
+                    query_embeddings=query_embeddings[i:i + 1] if query_embeddings else None
+                )[0])
+            except Exception as e:
+                logger.warning(f"Search for {filter_metadata} failed: {e}")
+                results.append([])
+        return results
+
+    def _get_relationships(
+        self,
+        entity_names: List[str],
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[Dict[str, Any]]:
         relationships: List[Dict[str, Any]] = []
         if not entity_names:
             return []
-            
-        for entity in entity_names:
-            results = self.db_store.search(
-                query=f"relationships involving {entity}", 
-                top_k=3, 
-                filter_metadata={"type": "database_relationship"}
-            )
+
+        # Entity names come from the database hits, so they can't join the requirement's
+        # embedding batch; filter on the relationship's ends and reuse that embedding instead
+        ends = [(end, entity) for end in ("from", "to") for entity in entity_names]
+        filters = [{"type": "database_relationship", end: entity} for end, entity in ends]
+        batched = self._search_categories(
+            self.db_store,
+            [f"relationships involving {entity}" for _, entity in ends],
+            filters,
+            [3] * len(filters),
+            query_embeddings * len(filters) if query_embeddings else None
+        )
+        for results in batched:
             for r in results:
                 rel = r.document.metadata
-                if rel.get("from") in entity_names or rel.get("to") in entity_names:
-                     if rel not in relationships:
-                        relationships.append(rel)
+                if rel not in relationships:
+                    relationships.append(rel)
         return relationships
 
     def format_context_for_prompt(self, context: DomainContext) -> str:
@@ -293,3 +346,18 @@ class DomainAwareRetriever:
                 "score": 1.0
             })
         return results
+
+    # Async variants: run the blocking embedding + search on the shared
+    # retrieval pool so callers on the event loop stay responsive.
+
+    async def aretrieve(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Async version of :meth:`retrieve`."""
+        return await retrieval_executor.run(self.retrieve, query, top_k=top_k)
+
+    async def aretrieve_tier(self, tier_id: int, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Async version of :meth:`retrieve_tier`."""
+        return await retrieval_executor.run(self.retrieve_tier, tier_id, query, top_k=top_k)
+
+    async def aretrieve_domain_context(self, user_requirement: str, **kwargs: Any) -> DomainContext:
+        """Async version of :meth:`retrieve_domain_context`."""
+        return await retrieval_executor.run(self.retrieve_domain_context, user_requirement, **kwargs)
@@ -0,0 +1,220 @@
+"""Micro-batching of embedding calls from concurrent callers.
+
+A retrieval embeds one short query at a time, so ``model.encode`` mostly runs
+on single-item lists and concurrent requests cannot share a forward pass.
+``EmbeddingBatcher`` puts callers' texts on a queue. A worker thread collects
+them for up to ``max_wait_ms`` or until ``max_batch_size`` texts are pending,
+runs one batched ``encode`` and resolves each caller's future with its slice
+of the result. Identical texts in a batch are encoded once.
+
+There is one batcher per model, shared process-wide, so providers constructed
+per request still batch together. The worker is a thread rather than a
+process for the reason given in ``rag.async_retrieval``: models cannot be
+pickled, and the encoders release the GIL while they compute.
+
+Usage::
+
+    from rag.embedding_batcher import get_embedding_batcher
+
+    batcher = get_embedding_batcher("huggingface:all-MiniLM-L6-v2", provider.embed_texts)
+    vectors = batcher.embed(["query"])          # from a worker thread
+    vectors = await batcher.aembed(["query"])   # from a coroutine
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+Encoder = Callable[[List[str]], List[List[float]]]
+
+# Upper bounds of the batch-size histogram buckets (texts per encode call)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+@dataclass
+class _Request:
+    texts: List[str]
+    future: Future = field(default_factory=Future)
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingBatcher:
+    """
+    Queue plus worker thread that coalesces ``encode`` calls for one model.
+
+    Parameters
+    ----------
+    encode : callable
+        Embeds a list of texts, e.g. a provider's ``embed_texts``.
+    max_batch_size : int
+        Texts per encode call. Requests at least this large bypass the queue.
+    max_wait_ms : float
+        How long the first request of a batch waits for company.
+    """
+
+    def __init__(self, encode: Encoder, name: str = "default",
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0) -> None:
+        self.encode = encode
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: "queue.SimpleQueue[Optional[_Request]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+        self.pending_requests = 0
+        self.pending_texts = 0
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.bypassed = 0
+        self.deduplicated = 0
+        self.queue_wait_seconds = 0.0
+        self.encode_seconds = 0.0
+        self.batch_size_histogram = {bound: 0 for bound in BATCH_SIZE_BUCKETS}
+        self.batch_size_histogram["+Inf"] = 0
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue ``texts``; the future resolves to their embeddings, in order."""
+        request = _Request(list(texts))
+        if not request.texts:
+            request.future.set_result([])
+            return request.future
+        if len(request.texts) >= self.max_batch_size:
+            # Already a full batch (e.g. bulk ingestion): waiting would only add latency
+            with self._lock:
+                self.requests += 1
+                self.bypassed += 1
+            self._run([request])
+            return request.future
+
+        with self._lock:
+            self.requests += 1
+            self.pending_requests += 1
+            self.pending_texts += len(request.texts)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._loop, name=f"embedding-batcher-{self.name}", daemon=True
+                )
+                self._worker.start()
+        self._queue.put(request)
+        return request.future
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Blocking call for threads (e.g. the retrieval executor's workers)."""
+        return self.submit(texts).result()
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def close(self) -> None:
+        """Stop the worker after the requests already queued."""
+        self._queue.put(None)
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, size = [first], len(first.texts)
+            deadline = time.perf_counter() + self.max_wait
+            stop = False
+            while size < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    # Requests that queued up during the last encode are taken without waiting
+                    request = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            with self._lock:
+                self.pending_requests -= len(batch)
+                self.pending_texts -= size
+            self._run(batch)
+            if stop:
+                return
+
+    def _run(self, batch: List[_Request]) -> None:
+        start = time.perf_counter()
+        # Callers that gave up (e.g. a cancelled coroutine) are dropped from the batch
+        batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        unique: Dict[str, int] = {}
+        for request in batch:
+            for text in request.texts:
+                unique.setdefault(text, len(unique))
+        total = sum(len(r.texts) for r in batch)
+
+        try:
+            vectors = self.encode(list(unique))
+            if len(vectors) != len(unique):
+                raise ValueError(f"encode returned {len(vectors)} vectors for {len(unique)} texts")
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            logger.warning(f"Embedding batch of {len(unique)} texts failed: {e}")
+        else:
+            for request in batch:
+                request.future.set_result([vectors[unique[text]] for text in request.texts])
+
+        with self._lock:
+            self.batches += 1
+            self.texts += total
+            self.deduplicated += total - len(unique)
+            self.encode_seconds += time.perf_counter() - start
+            self.queue_wait_seconds += sum(start - r.enqueued for r in batch)
+            bucket = next((b for b in BATCH_SIZE_BUCKETS if len(unique) <= b), "+Inf")
+            self.batch_size_histogram[bucket] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self.pending_requests,
+                "pending_texts": self.pending_texts,
+                "requests": self.requests,
+                "texts": self.texts,
+                "batches": self.batches,
+                "bypassed": self.bypassed,
+                "deduplicated": self.deduplicated,
+                "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+                "avg_queue_wait_ms": round(1000 * self.queue_wait_seconds / self.requests, 3) if self.requests else 0.0,
+                "encode_seconds": round(self.encode_seconds, 3),
+                "batch_size_histogram": dict(self.batch_size_histogram),
+            }
+
+
+_batchers: Dict[str, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_embedding_batcher(name: str, encode: Encoder, **settings: Any) -> EmbeddingBatcher:
+    """
+    The shared batcher for model ``name``, created with ``encode`` on first
+    use. Later callers get the existing batcher, so ``encode`` must be
+    interchangeable across providers of the same model.
+    """
+    with _batchers_lock:
+        if name not in _batchers:
+            _batchers[name] = EmbeddingBatcher(encode, name=name, **settings)
+        return _batchers[name]
+
+
+def batcher_stats() -> Dict[str, Dict[str, Any]]:
+    with _batchers_lock:
+        batchers = dict(_batchers)
+    return {name: batcher.stats() for name, batcher in batchers.items()}
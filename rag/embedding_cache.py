@@ -0,0 +1,267 @@
+"""Sharded, append-only on-disk cache for embedding vectors.
+
+Layout under ``cache_dir``::
+
+    shards/<prefix>.bin   one file per SHA-256 hex prefix (256 by default)
+
+Each shard is a sequence of fixed-layout records::
+
+    [32-byte SHA-256 digest][uint32 dimension][dimension x float32]
+
+New entries are appended; existing bytes are never rewritten. Readers keep a
+per-shard offset index and rescan only the tail when a key misses, so entries
+written by other processes (API server, ingestion scripts) become visible
+without reloading. Appends take an exclusive ``flock`` and tail scans a shared
+one where ``fcntl`` is available (POSIX); elsewhere only in-process locking
+applies.
+
+A bounded LRU layer keeps hot vectors in memory in front of the shards.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, IO
+import json
+import logging
+import struct
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<32sI")
+
+
+@contextmanager
+def _locked(f: IO[bytes], exclusive: bool) -> Iterator[None]:
+    """Hold an advisory inter-process lock on ``f`` (no-op without fcntl)."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class ShardedEmbeddingCache:
+    """
+    Process-safe embedding cache keyed by SHA-256 hex digests.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding the shard files.
+    prefix_length : int
+        Number of hex characters of the key used to pick a shard.
+    max_memory_entries : int
+        Capacity of the in-memory LRU front layer.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "rag/embeddings_cache",
+        prefix_length: int = 2,
+        max_memory_entries: int = 50_000
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.shard_dir = self.cache_dir / "shards"
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.prefix_length = prefix_length
+        self.max_memory_entries = max_memory_entries
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # shard prefix -> {key: (record offset, dimension)}
+        self._index: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        # shard prefix -> bytes of the shard already indexed
+        self._scanned: Dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return cached vectors for ``keys`` (``None`` for misses)."""
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                vector = self._get(key)
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                results.append(vector)
+        return results
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        return self.get_many([key])[0]
+
+    def put_many(self, items: Dict[str, Sequence[float]]) -> None:
+        """Append new vectors to their shards and the memory layer."""
+        by_shard: Dict[str, List[Tuple[str, np.ndarray]]] = {}
+        for key, vector in items.items():
+            by_shard.setdefault(self._prefix(key), []).append(
+                (key, np.asarray(vector, dtype=np.float32))
+            )
+
+        with self._lock:
+            for prefix, entries in by_shard.items():
+                for key, vector in self._append(prefix, entries):
+                    self._remember(key, vector)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+            prefix = self._prefix(key)
+            self._refresh(prefix)
+            return key in self._index[prefix]
+
+    def __len__(self) -> int:
+        """Number of entries on disk (scans every shard)."""
+        with self._lock:
+            for path in self.shard_dir.glob("*.bin"):
+                self._refresh(path.stem)
+            return sum(len(entries) for entries in self._index.values())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "indexed_entries": sum(len(entries) for entries in self._index.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def import_json(self, json_path: str) -> int:
+        """
+        Import a legacy ``{sha256: [floats]}`` JSON cache file.
+
+        Keys already present are skipped. Returns the number of imported entries.
+        """
+        data = json.loads(Path(json_path).read_text())
+        new = {key: vector for key, vector in data.items() if key not in self}
+        if new:
+            self.put_many(new)
+        logger.info(f"Imported {len(new)} embeddings from {json_path}")
+        return len(new)
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds self._lock)
+    # ------------------------------------------------------------------
+
+    def _prefix(self, key: str) -> str:
+        return key[:self.prefix_length]
+
+    def _shard_path(self, prefix: str) -> Path:
+        return self.shard_dir / f"{prefix}.bin"
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            return vector
+
+        prefix = self._prefix(key)
+        entry = self._index.get(prefix, {}).get(key)
+        if entry is None:
+            # Pick up entries appended by other processes since the last scan
+            self._refresh(prefix)
+            entry = self._index[prefix].get(key)
+            if entry is None:
+                return None
+
+        offset, dim = entry
+        with self._shard_path(prefix).open("rb") as f:
+            f.seek(offset + _HEADER.size)
+            vector = np.frombuffer(f.read(dim * 4), dtype=np.float32)
+        self._remember(key, vector)
+        return vector
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _refresh(self, prefix: str) -> None:
+        """Index records appended to a shard since it was last scanned."""
+        index = self._index.setdefault(prefix, {})
+        path = self._shard_path(prefix)
+        if not path.exists():
+            return
+
+        start = self._scanned.get(prefix, 0)
+        with path.open("rb") as f:
+            with _locked(f, exclusive=False):
+                f.seek(start)
+                data = f.read()
+        self._scanned[prefix] = start + self._index_records(data, start, index)
+
+    @staticmethod
+    def _index_records(data: bytes, base: int, index: Dict[str, Tuple[int, int]]) -> int:
+        """Index complete records in ``data``; return the bytes consumed."""
+        pos = 0
+        while pos + _HEADER.size <= len(data):
+            digest, dim = _HEADER.unpack_from(data, pos)
+            end = pos + _HEADER.size + dim * 4
+            if end > len(data):
+                # Partial tail record: leave it for the next scan
+                break
+            index[digest.hex()] = (base + pos, dim)
+            pos = end
+        return pos
+
+    def _append(
+        self,
+        prefix: str,
+        entries: List[Tuple[str, np.ndarray]]
+    ) -> List[Tuple[str, np.ndarray]]:
+        """Append entries not yet on disk; return the ones written."""
+        written = []
+        index = self._index.setdefault(prefix, {})
+        path = self._shard_path(prefix)
+
+        with path.open("ab") as f:
+            with _locked(f, exclusive=True):
+                # Index whatever other writers appended before we take our offsets
+                with path.open("rb") as reader:
+                    start = self._scanned.get(prefix, 0)
+                    reader.seek(start)
+                    self._scanned[prefix] = start + self._index_records(reader.read(), start, index)
+
+                offset = f.seek(0, 2)
+                if self._scanned[prefix] < offset:
+                    # A writer died mid-record; drop the torn tail
+                    f.truncate(self._scanned[prefix])
+                    offset = self._scanned[prefix]
+
+                chunks = []
+                for key, vector in entries:
+                    if key in index:
+                        continue
+                    record = _HEADER.pack(bytes.fromhex(key), vector.shape[0]) + vector.tobytes()
+                    index[key] = (offset, vector.shape[0])
+                    offset += len(record)
+                    chunks.append(record)
+                    written.append((key, vector))
+
+                if chunks:
+                    f.write(b"".join(chunks))
+                    f.flush()
+                self._scanned[prefix] = offset
+        return written
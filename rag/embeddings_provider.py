@@ -16,9 +16,12 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 import logging
 import hashlib
-import json
 from pathlib import Path
 
+from rag.embedding_cache import ShardedEmbeddingCache
+from rag.model_registry import model_registry, load_model_config
+from rag.embedding_batcher import get_embedding_batcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -127,43 +130,51 @@ class HuggingFaceEmbeddings(EmbeddingsProvider):
     - sentence-transformers/all-MiniLM-L6-v2: 384 dims, fast
     - sentence-transformers/all-mpnet-base-v2: 768 dims, accurate
     - BAAI/bge-small-en-v1.5: 384 dims, good quality
+
+    ``backend`` selects sentence-transformers ("torch") or ONNX Runtime
+    ("onnx", "onnx-int8"; see ``rag.onnx_backend``). Defaults to
+    ``models.embedding_backend`` in the RAG config. An ONNX backend that
+    cannot load falls back to torch.
     """
 
     def __init__(
         self,
         model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
-        device: str = "cpu"
+        device: str = "cpu",
+        backend: Optional[str] = None
     ) -> None:
-        try:
-            from sentence_transformers import SentenceTransformer
-        except ImportError:
-            raise ImportError(
-                "sentence-transformers not installed. "
-                "Install with: pip install sentence-transformers"
-            )
-
         self.model_name = model_name
         self.device = device
-        
-        # Check for local model first
-        project_root = Path(__file__).parent.parent
-        local_model_path = project_root / "rag" / "models" / "all-MiniLM-L6-v2"
-        
-        if local_model_path.exists():
-            logger.info(f"Loading local model from: {local_model_path}")
-            load_path = str(local_model_path)
-        else:
-            logger.info(f"Loading HuggingFace model: {model_name}")
-            load_path = model_name
-            
-        self.model = SentenceTransformer(load_path, device=device)
-        self._dimension = self.model.get_sentence_embedding_dimension()
-        
+        self.backend = backend or load_model_config().get("embedding_backend", "torch")
+
+        if self.backend != "torch":
+            try:
+                self._dimension = self.model.get_sentence_embedding_dimension()
+            except Exception as e:
+                logger.warning(f"ONNX embeddings ({self.backend}) unavailable, using sentence-transformers: {e}")
+                self.backend = "torch"
+
+        if self.backend == "torch":
+            try:
+                import sentence_transformers  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers not installed. "
+                    "Install with: pip install sentence-transformers"
+                )
+            # Shared with every other user of the same model; loads on first use only
+            self._dimension = self.model.get_sentence_embedding_dimension()
+
         logger.info(
             f"Initialized HuggingFace embeddings "
-            f"(model={load_path}, dim={self._dimension})"
+            f"(model={model_name}, backend={self.backend}, dim={self._dimension})"
         )
 
+    @property
+    def model(self):
+        """The registry's copy, re-fetched so idle unloads can free it."""
+        return model_registry.sentence_transformer(self.model_name, self.device, backend=self.backend)
+
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts."""
         try:
@@ -181,49 +192,110 @@ class HuggingFaceEmbeddings(EmbeddingsProvider):
         """Generate embedding for a single query."""
         return self.embed_texts([query])[0]
 
+    def truncates(self, text: str) -> bool:
+        """True if ``text`` exceeds the model's input window, so only its start would be embedded."""
+        model = self.model
+        if hasattr(model, "max_seq_length"):
+            ids = model.tokenizer(text, add_special_tokens=True, verbose=False)["input_ids"]
+            return len(ids) > model.max_seq_length
+        # ONNX encoders truncate in the tokenizer and keep the remainder as overflow
+        return bool(model.tokenizer.encode(text).overflowing)
+
     @property
     def dimension(self) -> int:
         return self._dimension
 
 
+class BatchedEmbeddings(EmbeddingsProvider):
+    """
+    Wrapper that routes ``embed_texts`` through the model's shared
+    ``EmbeddingBatcher``, so concurrent callers share one ``encode``.
+
+    Works with any provider. Providers of the same model share a batcher
+    even when constructed separately (e.g. one retriever per request).
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingsProvider,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ) -> None:
+        self.provider = provider
+        self.batcher = get_embedding_batcher(
+            self._batcher_name(provider),
+            provider.embed_texts,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
+
+    @staticmethod
+    def _batcher_name(provider: EmbeddingsProvider) -> str:
+        # HuggingFaceEmbeddings.model is the loaded model, so prefer model_name
+        model = getattr(provider, "model_name", None) or getattr(provider, "model", None)
+        name = f"{type(provider).__name__}:{model if isinstance(model, str) else id(provider)}"
+        if getattr(provider, "backend", "torch") != "torch":
+            name = f"{name}:{provider.backend}"
+        device = getattr(provider, "device", None)
+        return f"{name}@{device}" if device else name
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings, batched with concurrent callers."""
+        return self.batcher.embed(texts)
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Awaitable variant for callers on the event loop."""
+        return await self.batcher.aembed(texts)
+
+    def embed_query(self, query: str) -> List[float]:
+        """Generate embedding for a single query."""
+        return self.embed_texts([query])[0]
+
+    @property
+    def dimension(self) -> int:
+        return self.provider.dimension
+
+
 class CachedEmbeddings(EmbeddingsProvider):
     """
     Wrapper that caches embeddings to reduce API costs.
     
     Uses SHA-256 hash of text as cache key.
-    Stores embeddings in JSON file.
+    Stores embeddings as float32 records in a sharded, append-only
+    ``ShardedEmbeddingCache`` that several processes can share.
+    A legacy ``<cache_path>.json`` file is imported once into the
+    sharded directory next to it.
     """
 
     def __init__(
         self,
         provider: EmbeddingsProvider,
-        cache_path: str = "rag/embeddings_cache.json"
+        cache_path: str = "rag/embeddings_cache",
+        max_memory_entries: int = 50_000
     ) -> None:
         self.provider = provider
-        self.cache_path = Path(cache_path)
-        self.cache: Dict[str, List[float]] = {}
-        self._load_cache()
-        
-        logger.info(f"Initialized cached embeddings (cache_path={cache_path})")
+        # "rag/embeddings_cache.json" (legacy) and "rag/embeddings_cache"
+        # both resolve to the sharded directory
+        self.cache_path = Path(cache_path).with_suffix("")
 
-    def _load_cache(self) -> None:
-        """Load cache from disk."""
-        if self.cache_path.exists():
-            try:
-                self.cache = json.loads(self.cache_path.read_text())
-                logger.info(f"Loaded {len(self.cache)} cached embeddings")
-            except Exception as e:
-                logger.warning(f"Failed to load cache: {e}")
-                self.cache = {}
+        self.cache = ShardedEmbeddingCache(
+            str(self.cache_path),
+            max_memory_entries=max_memory_entries
+        )
+        self._import_legacy(self.cache_path.with_suffix(".json"))
+        
+        logger.info(f"Initialized cached embeddings (cache_path={self.cache_path})")
 
-    def _save_cache(self) -> None:
-        """Save cache to disk."""
+    def _import_legacy(self, legacy_path: Path) -> None:
+        """One-shot import of a legacy JSON cache file."""
+        marker = self.cache_path / ".imported_json"
+        if not legacy_path.exists() or marker.exists():
+            return
         try:
-            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-            self.cache_path.write_text(json.dumps(self.cache))
-            logger.debug(f"Saved {len(self.cache)} embeddings to cache")
+            self.cache.import_json(str(legacy_path))
+            marker.write_text(str(legacy_path))
         except Exception as e:
-            logger.warning(f"Failed to save cache: {e}")
+            logger.warning(f"Failed to import legacy cache {legacy_path}: {e}")
 
     def _get_cache_key(self, text: str) -> str:
         """Generate cache key from text."""
@@ -231,35 +303,36 @@ class CachedEmbeddings(EmbeddingsProvider):
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings with caching."""
-        embeddings = []
-        uncached_texts = []
-        uncached_indices = []
-        
+        keys = [self._get_cache_key(text) for text in texts]
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        uncached: Dict[str, List[int]] = {}
+        uncached_texts: List[str] = []
+
         # Check cache
-        for i, text in enumerate(texts):
-            cache_key = self._get_cache_key(text)
-            if cache_key in self.cache:
-                embeddings.append(self.cache[cache_key])
+        for i, (key, cached) in enumerate(zip(keys, self.cache.get_many(keys))):
+            if cached is not None:
+                embeddings[i] = cached.tolist()
             else:
-                embeddings.append(None)
-                uncached_texts.append(text)
-                uncached_indices.append(i)
+                if key not in uncached:
+                    uncached_texts.append(texts[i])
+                uncached.setdefault(key, []).append(i)
         
         # Generate embeddings for uncached texts
         if uncached_texts:
             logger.debug(f"Generating {len(uncached_texts)} new embeddings")
             new_embeddings = self.provider.embed_texts(uncached_texts)
-            
+
             # Update cache and results
-            for text, embedding, idx in zip(
-                uncached_texts, new_embeddings, uncached_indices
-            ):
-                cache_key = self._get_cache_key(text)
-                self.cache[cache_key] = embedding
-                embeddings[idx] = embedding
-            
-            # Save cache
-            self._save_cache()
+            new_entries = {}
+            for key, embedding in zip(uncached, new_embeddings):
+                new_entries[key] = embedding
+                for idx in uncached[key]:
+                    embeddings[idx] = list(embedding)
+
+            try:
+                self.cache.put_many(new_entries)
+            except Exception as e:
+                logger.warning(f"Failed to save cache: {e}")
         else:
             logger.debug(f"All {len(texts)} embeddings from cache")
         
@@ -278,6 +351,7 @@ def create_embeddings_provider(
     provider_type: str = "openai",
     model: Optional[str] = None,
     use_cache: bool = True,
+    batching: Optional[bool] = None,
     **kwargs
 ) -> EmbeddingsProvider:
     """
@@ -293,8 +367,13 @@ def create_embeddings_provider(
         - huggingface: sentence-transformers/all-MiniLM-L6-v2
     use_cache : bool
         Whether to cache embeddings (default: True)
+    batching : bool, optional
+        Micro-batch concurrent calls through a shared ``EmbeddingBatcher``.
+        Defaults to ``models.embedding_batching.enabled`` in
+        ``config/rag_hybrid_config.yaml``.
     **kwargs
-        Additional provider-specific arguments
+        Additional provider-specific arguments, e.g. ``backend="onnx-int8"``
+        for 'huggingface'
     
     Returns
     -------
@@ -302,6 +381,8 @@ def create_embeddings_provider(
         Configured embeddings provider
     """
 
+    cache_path = kwargs.pop("cache_path", "rag/embeddings_cache")
+
     if provider_type == "openai":
         try:
             model = model or "text-embedding-3-small"
@@ -327,9 +408,17 @@ def create_embeddings_provider(
     else:
         raise ValueError(f"Unknown provider type: {provider_type}")
     
+    # Batch below the cache, so only misses reach the model
+    batching_config = load_model_config().get("embedding_batching") or {}
+    if batching if batching is not None else batching_config.get("enabled", False):
+        provider = BatchedEmbeddings(
+            provider,
+            max_batch_size=batching_config.get("max_batch_size", 64),
+            max_wait_ms=batching_config.get("max_wait_ms", 5.0)
+        )
+
     # Wrap with cache if enabled
     if use_cache:
-        cache_path = kwargs.get("cache_path", "rag/embeddings_cache.json")
         provider = CachedEmbeddings(provider, cache_path)
     
     return provider
@@ -0,0 +1,497 @@
+"""
+Streaming, incremental ingestion of files into a vector store collection.
+
+``/knowledge/ingest`` used to read, chunk and hash every file serially in the
+request handler and then embed everything in one ``add_documents`` call.
+``IngestionPipeline`` runs the same work as a background job made of stages:
+
+1. discover: walk the source and ``stat`` every matching file;
+2. read: files whose size or mtime changed are read and hashed in a thread
+   pool, and files whose content hash is unchanged are skipped;
+3. chunk: changed files are chunked in a process pool;
+4. embed + upsert: chunks are written to the store in bounded batches while
+   the next files are still being read and chunked.
+
+At most ``max_in_flight`` files are held in memory between stages.
+
+A manifest per collection records each file's hash and the IDs of its chunks.
+On the next run, unchanged files cost only a ``stat``. The chunks of changed
+files are replaced, and the chunks of deleted files are removed. A file that
+is not in the manifest yet may have been ingested before the pipeline, under
+content-only chunk IDs and the chunker's default sizes; those copies are
+deleted once the file is stored, unless another file owns them.
+A file enters the manifest only after all of its chunks are upserted, so a
+cancelled or failed job resumes where it stopped. Progress and ETA are
+published on the event bus.
+
+Usage::
+
+    from rag.ingest_pipeline import IngestJob, ingestion_pipeline
+
+    job = ingestion_pipeline.start(IngestJob(collection="docs", path="docs", file_filter="*.md"))
+    status = await ingestion_pipeline.wait(job.id)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.event_bus import bus, Event, EventType
+
+logger = logging.getLogger(__name__)
+
+IGNORE_PARTS = ("node_modules", "__pycache__", "dist", ".git", ".venv", "bin", "obj")
+
+# Chunk text and metadata, as returned by pool workers
+ChunkRecord = Tuple[str, Dict[str, Any]]
+
+_engine = None
+
+
+def load_ingestion_config(path: str = "config/rag_hybrid_config.yaml") -> Dict[str, Any]:
+    """Read the ``ingestion`` section of the hybrid RAG config."""
+    try:
+        import yaml
+        config_path = Path(path)
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            return config.get("ingestion") or {}
+    except Exception as e:
+        logger.warning(f"Could not load ingestion config: {e}")
+    return {}
+
+
+def discover_files(root: Path, pattern: str = "*.*") -> List[Path]:
+    """Files under ``root`` matching ``pattern``, recursively, minus build/VCS directories."""
+    if root.is_file():
+        return [root]
+    matches = root.glob(pattern) if "**" in pattern else root.rglob(pattern)
+    return sorted(
+        path for path in matches
+        if not any(part in str(path) for part in IGNORE_PARTS) and path.is_file()
+    )
+
+
+def read_file(file_path: str) -> Tuple[str, str]:
+    """Decoded text and sha256 of a file."""
+    data = Path(file_path).read_bytes()
+    return data.decode("utf-8", errors="ignore"), hashlib.sha256(data).hexdigest()
+
+
+def chunk_file(
+    file_path: str,
+    content: str,
+    chunk_size: int,
+    overlap: int,
+    legacy: bool = False
+) -> Tuple[List[ChunkRecord], List[str]]:
+    """
+    Chunk one file. Runs in pool workers, so it must stay top-level.
+
+    With ``legacy``, also returns the chunk texts the pre-pipeline handler
+    produced, which ignored the requested sizes and used the engine defaults.
+    """
+    global _engine
+    if _engine is None:
+        from core.chunking.engine import ChunkingEngine
+        _engine = ChunkingEngine()
+    if not content.strip():
+        return [], []
+    chunks = _engine.chunk_content(content, file_path=file_path, chunk_size=chunk_size, overlap=overlap)
+    legacy_texts = [chunk.content for chunk in _engine.chunk_content(content, file_path=file_path)] if legacy else []
+    return [(chunk.content, chunk.metadata) for chunk in chunks], legacy_texts
+
+
+@dataclass
+class IngestJob:
+    """One ingestion run of a file or directory into a collection."""
+    collection: str
+    path: str
+    file_filter: str = "*.*"
+    source_type: str = "directory"
+    tier: int = 3
+    category: str = "generic"
+    tags: List[str] = field(default_factory=list)
+    chunk_size: int = 800
+    chunk_overlap: int = 100
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: Dict[str, Any] = field(default_factory=lambda: {"state": "pending"})
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def settings_key(self) -> str:
+        """Fingerprint of everything besides file content that shapes the stored chunks."""
+        settings = [self.source_type, self.tier, self.category, sorted(self.tags), self.chunk_size, self.chunk_overlap]
+        return hashlib.md5(json.dumps(settings).encode()).hexdigest()
+
+    def legacy_id(self, text: str) -> str:
+        """Chunk ID used before the pipeline, content-only and so shared across files."""
+        return f"tier{self.tier}_{self.category}_{hashlib.md5(text.encode()).hexdigest()}"
+
+    def document(self, file_path: Path, root: Path, text: str, metadata: Dict[str, Any]) -> Any:
+        from .vector_store import Document
+        relative = file_path.name if root == file_path else str(file_path.relative_to(root))
+        return Document(
+            id=f"tier{self.tier}_{self.category}_{hashlib.md5(f'{file_path}:{text}'.encode()).hexdigest()}",
+            text=text,
+            metadata={
+                **metadata,
+                "tier": self.tier,
+                "category": self.category,
+                "tags": ",".join(self.tags),
+                "source_type": self.source_type,
+                "file": relative,
+                "full_path": str(file_path),
+            },
+        )
+
+
+class IngestionPipeline:
+    """
+    Runs ingestion jobs in the background, one at a time per collection.
+
+    Parameters
+    ----------
+    store_factory : callable, optional
+        Returns the vector store for a collection name (default: ``ChromaVectorStore``).
+    manifest_dir : str
+        Where the per-collection file manifests are kept.
+    max_workers : int, optional
+        Chunking processes (default: CPU count).
+    read_workers : int
+        Threads reading and hashing files.
+    batch_size : int
+        Chunks per embed + upsert call.
+    max_in_flight : int
+        Files read or chunked but not yet handed to the store.
+    inline_threshold : int
+        Jobs with at most this many changed files are chunked in threads
+        instead of paying the process pool start-up cost.
+    """
+
+    def __init__(
+        self,
+        store_factory: Optional[Callable[[str], Any]] = None,
+        manifest_dir: str = "rag/chroma_db/ingest_manifests",
+        max_workers: Optional[int] = None,
+        read_workers: int = 8,
+        batch_size: int = 128,
+        max_in_flight: int = 64,
+        inline_threshold: int = 8,
+        history: int = 50
+    ):
+        self.store_factory = store_factory or self._chroma_store
+        self.manifest_dir = Path(manifest_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.read_workers = read_workers
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.inline_threshold = inline_threshold
+        self.history = history
+        self.jobs: Dict[str, IngestJob] = {}
+
+    @staticmethod
+    def _chroma_store(collection: str) -> Any:
+        from .vector_store import ChromaVectorStore
+        return ChromaVectorStore(collection_name=collection)
+
+    def start(self, job: IngestJob) -> IngestJob:
+        """Start ``job`` in the background; returns the running job if its collection is busy."""
+        for existing in self.jobs.values():
+            if existing.collection == job.collection and existing.running:
+                return existing
+        # Visible as running immediately, before the task gets scheduled
+        job.status = {"state": "running", "job_id": job.id, "collection": job.collection,
+                      "path": job.path, "phase": "discovering", "started_at": time.time()}
+        job.task = asyncio.get_running_loop().create_task(self.run(job))
+        self.jobs[job.id] = job
+        self._trim_history()
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; False if the job is unknown or already finished."""
+        job = self.jobs.get(job_id)
+        if job is None or not job.running:
+            return False
+        job.task.cancel()
+        return True
+
+    async def wait(self, job_id: str) -> Dict[str, Any]:
+        """Wait for a job to finish and return its status."""
+        job = self.jobs[job_id]
+        if job.task is not None:
+            await asyncio.gather(job.task, return_exceptions=True)
+        return dict(job.status)
+
+    def forget(self, collection: str) -> None:
+        """Drop the manifest of a deleted collection so the next run re-ingests everything."""
+        self._manifest_path(collection).unlink(missing_ok=True)
+
+    async def run(self, job: IngestJob) -> Dict[str, Any]:
+        """Bring ``job.collection`` up to date with the files under ``job.path``."""
+        started = time.time()
+        job.status.update(state="running", job_id=job.id, collection=job.collection, path=job.path,
+                          phase="discovering", started_at=started)
+        manifest: Dict[str, Dict[str, Any]] = {}
+        try:
+            store = await asyncio.to_thread(self.store_factory, job.collection)
+            manifest = await asyncio.to_thread(self._load_manifest, job.collection, store)
+            root = Path(job.path).resolve()
+            candidates, deleted, unchanged = await asyncio.to_thread(self._scan, job, root, manifest)
+            job.status.update(
+                files_total=len(candidates) + unchanged, files_candidates=len(candidates),
+                files_deleted=len(deleted), files_processed=0, files_skipped=unchanged,
+                files_changed=0, chunks_upserted=0, chunks_deleted=0, batches=0
+            )
+            await self._publish(job, EventType.LOG, (
+                f"Ingest '{job.collection}': {len(candidates)} new or modified, {len(deleted)} deleted, "
+                f"{unchanged} unchanged of {len(candidates) + unchanged} files"
+            ))
+
+            stale = [doc_id for file_path in deleted for doc_id in manifest.pop(file_path)["ids"]]
+            if stale:
+                await asyncio.to_thread(store.delete_documents, stale)
+                job.status["chunks_deleted"] += len(stale)
+
+            await self._ingest(job, store, root, candidates, manifest)
+
+            job.status.update(state="completed", phase="done", duration=time.time() - started, eta_seconds=0)
+            await self._publish(job, EventType.INFO, (
+                f"Ingest '{job.collection}' complete: {job.status['files_changed']} files re-ingested, "
+                f"{job.status['chunks_upserted']} chunks upserted, {job.status['files_skipped']} unchanged "
+                f"in {job.status['duration']:.1f}s"
+            ))
+        except asyncio.CancelledError:
+            job.status.update(state="cancelled", duration=time.time() - started, eta_seconds=None)
+            await self._publish(job, EventType.WARNING, (
+                f"Ingest '{job.collection}' cancelled after {job.status.get('files_processed', 0)} files; "
+                "completed files are kept"
+            ))
+        except Exception as e:
+            logger.error(f"Ingest job {job.id} failed: {e}", exc_info=True)
+            job.status.update(state="failed", error=str(e), duration=time.time() - started, eta_seconds=None)
+            await self._publish(job, EventType.ERROR, f"Ingest '{job.collection}' failed: {e}")
+        finally:
+            if manifest or self._manifest_path(job.collection).exists():
+                await asyncio.to_thread(self._save_manifest, job.collection, manifest)
+        return dict(job.status)
+
+    def _scan(
+        self, job: IngestJob, root: Path, manifest: Dict[str, Dict[str, Any]]
+    ) -> Tuple[List[Tuple[str, os.stat_result]], List[str], int]:
+        """Files that need reading, manifest entries whose file is gone, and the unchanged count."""
+        if not root.exists():
+            raise FileNotFoundError(f"Path not found: {job.path}")
+        settings = job.settings_key()
+        candidates, unchanged, seen = [], 0, set()
+        for path in discover_files(root, job.file_filter or "*.*"):
+            try:
+                stat = path.stat()
+            except OSError as e:
+                logger.warning(f"Failed to stat {path}: {e}")
+                continue
+            file_path = str(path)
+            seen.add(file_path)
+            entry = manifest.get(file_path)
+            if (entry and entry["settings"] == settings
+                    and (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size)):
+                unchanged += 1  # untouched, skip reading
+                continue
+            candidates.append((file_path, stat))
+        # Only files under this root can have been deleted by this run's source
+        prefix = str(root) if root.is_file() else str(root) + os.sep
+        deleted = [
+            file_path for file_path in manifest
+            if file_path not in seen and (file_path == prefix or file_path.startswith(prefix))
+            and not os.path.exists(file_path)
+        ]
+        return candidates, deleted, unchanged
+
+    async def _ingest(
+        self,
+        job: IngestJob,
+        store: Any,
+        root: Path,
+        candidates: List[Tuple[str, os.stat_result]],
+        manifest: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Read, chunk and upsert ``candidates``, committing each file to the manifest once stored."""
+        job.status["phase"] = "ingesting"
+        if not candidates:
+            return
+        loop = asyncio.get_running_loop()
+        settings = job.settings_key()
+        readers = ThreadPoolExecutor(self.read_workers, thread_name_prefix="ingest-read")
+        chunkers = None
+        if len(candidates) > self.inline_threshold and self.max_workers > 1:
+            # spawn: forking the threaded API process is not safe
+            chunkers = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        # Bounds files held between stages; a slot is released once its chunks are buffered
+        slots = asyncio.Semaphore(self.max_in_flight)
+
+        async def process(file_path: str, stat: os.stat_result):
+            await slots.acquire()
+            try:
+                content, digest = await loop.run_in_executor(readers, read_file, file_path)
+                entry = manifest.get(file_path)
+                if entry and entry["sha256"] == digest and entry["settings"] == settings:
+                    return file_path, stat, digest, None  # touched but identical
+                # Not in the manifest: the file may still be stored under pre-pipeline IDs
+                args = (chunk_file, file_path, content, job.chunk_size, job.chunk_overlap, file_path not in manifest)
+                chunked = await (loop.run_in_executor(chunkers, *args) if chunkers else asyncio.to_thread(*args))
+                return file_path, stat, digest, chunked
+            except BaseException:
+                slots.release()
+                raise
+
+        buffer: List[Any] = []
+        pending: List[Tuple[str, Dict[str, Any], List[str]]] = []
+
+        async def flush():
+            for start in range(0, len(buffer), self.batch_size):
+                await asyncio.to_thread(store.upsert_documents, buffer[start:start + self.batch_size])
+                job.status["batches"] += 1
+            job.status["chunks_upserted"] += len(buffer)
+            buffer.clear()
+            await self._commit(job, store, manifest, pending)
+
+        tasks = [asyncio.ensure_future(process(file_path, stat)) for file_path, stat in candidates]
+        step = max(1, len(candidates) // 20)
+        ingest_started = time.time()
+        try:
+            for future in asyncio.as_completed(tasks):
+                try:
+                    file_path, stat, digest, chunked = await future
+                except Exception as e:
+                    logger.warning(f"Failed to ingest file: {e}")
+                    job.status["files_failed"] = job.status.get("files_failed", 0) + 1
+                else:
+                    entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest,
+                             "settings": settings, "ids": manifest.get(file_path, {}).get("ids", [])}
+                    if chunked is None:
+                        manifest[file_path] = entry
+                        job.status["files_skipped"] += 1
+                    else:
+                        path = Path(file_path)
+                        records, legacy_texts = chunked
+                        documents = {}
+                        for text, metadata in records:
+                            document = job.document(path, root, text, metadata)
+                            documents[document.id] = document
+                        buffer.extend(documents.values())
+                        legacy = [job.legacy_id(text) for text in legacy_texts]
+                        pending.append((file_path, dict(entry, ids=list(documents)), legacy))
+                        job.status["files_changed"] += 1
+                    slots.release()
+                    if len(buffer) >= self.batch_size:
+                        await flush()
+
+                done = job.status["files_processed"] = job.status["files_processed"] + 1
+                if done % step == 0 or done == len(candidates):
+                    elapsed = time.time() - ingest_started
+                    eta = elapsed / done * (len(candidates) - done)
+                    job.status.update(eta_seconds=round(eta, 1), files_per_second=round(done / max(elapsed, 1e-6), 1))
+                    await self._publish(job, EventType.LOG, (
+                        f"Ingest '{job.collection}': {done}/{len(candidates)} files, "
+                        f"{job.status['chunks_upserted']} chunks upserted, ETA {eta:.0f}s"
+                    ))
+            job.status["phase"] = "finalizing"
+            await flush()
+        finally:
+            for task in tasks:
+                task.cancel()
+            readers.shutdown(wait=False, cancel_futures=True)
+            if chunkers:
+                chunkers.shutdown(wait=False, cancel_futures=True)
+
+    async def _commit(
+        self,
+        job: IngestJob,
+        store: Any,
+        manifest: Dict[str, Dict[str, Any]],
+        pending: List[Tuple[str, Dict[str, Any], List[str]]]
+    ) -> None:
+        """
+        Record stored files in the manifest and delete chunks they no longer
+        produce, including copies stored under pre-pipeline (legacy) IDs.
+        """
+        stale, legacy = [], {}
+        for file_path, entry, legacy_ids in pending:
+            previous = manifest.get(file_path)
+            if previous:
+                stale.extend(set(previous["ids"]) - set(entry["ids"]))
+            for legacy_id in legacy_ids:
+                legacy.setdefault(legacy_id, set()).add(Path(file_path).resolve())
+            manifest[file_path] = entry
+        pending.clear()
+        if stale:
+            await asyncio.to_thread(store.delete_documents, stale)
+            job.status["chunks_deleted"] += len(stale)
+        if legacy:
+            # Legacy IDs are content-only: the same chunk may belong to a file outside this job
+            stored = await asyncio.to_thread(store.get_documents_by_ids, sorted(legacy))
+            owned = [
+                doc.id for doc in stored
+                if doc.metadata.get("full_path") and Path(doc.metadata["full_path"]).resolve() in legacy[doc.id]
+            ]
+            if owned:
+                await asyncio.to_thread(store.delete_documents, owned)
+
+    def _manifest_path(self, collection: str) -> Path:
+        return self.manifest_dir / f"{collection}.json"
+
+    def _load_manifest(self, collection: str, store: Any) -> Dict[str, Dict[str, Any]]:
+        path = self._manifest_path(collection)
+        if not path.exists():
+            return {}
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable ingest manifest {path}: {e}")
+            return {}
+        # The collection was dropped or recreated outside the pipeline: start over
+        if manifest and not store.get_collection_stats().get("count"):
+            return {}
+        return manifest
+
+    def _save_manifest(self, collection: str, manifest: Dict[str, Dict[str, Any]]) -> None:
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        path = self._manifest_path(collection)
+        path.with_suffix(".tmp").write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(path.with_suffix(".tmp"), path)
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if not job.running]
+        for job_id in finished[:max(0, len(self.jobs) - self.history)]:
+            del self.jobs[job_id]
+
+    async def _publish(self, job: IngestJob, event_type: EventType, content: str) -> None:
+        await bus.publish(Event(type=event_type, agent="IngestionPipeline", content=content, task_id=job.id))
+
+
+_config = load_ingestion_config()
+ingestion_pipeline = IngestionPipeline(
+    max_workers=_config.get("max_workers"),
+    read_workers=_config.get("read_workers", 8),
+    batch_size=_config.get("batch_size", 128),
+    max_in_flight=_config.get("max_in_flight", 64),
+    inline_threshold=_config.get("inline_threshold", 8),
+)
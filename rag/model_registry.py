@@ -0,0 +1,341 @@
+"""Process-wide registry of local transformer models.
+
+``HuggingFaceEmbeddings``, ``CrossEncoderReranker`` and ``PatternDetector``
+used to construct their own ``SentenceTransformer`` / ``CrossEncoder``, so
+the same MiniLM weights could sit in memory several times and every new
+retriever paid a multi-second load. The registry loads each
+``(kind, name, device)`` once, on first use. Concurrent first callers wait
+on a per-model lock instead of loading in parallel. Models can be warmed
+at startup and unloaded once idle.
+
+Consumers should fetch the model from the registry on each use instead of
+keeping a reference, so an idle unload actually frees the weights.
+
+Usage::
+
+    from rag.model_registry import model_registry
+
+    encoder = model_registry.sentence_transformer("all-MiniLM-L6-v2")
+    vectors = encoder.encode(texts)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import gc
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_TRANSFORMER = "sentence_transformer"
+CROSS_ENCODER = "cross_encoder"
+
+# "torch" is sentence-transformers; the others run exports under rag/models/<name>/onnx
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+LOCAL_MODELS_DIR = Path(__file__).parent / "models"
+
+Loader = Callable[[str, str], Any]
+ModelKey = Tuple[str, str, str]
+
+
+def load_model_config(path: str = "config/rag_hybrid_config.yaml") -> Dict[str, Any]:
+    """Read the ``models`` section of the hybrid RAG config."""
+    try:
+        import yaml
+        config_path = Path(path)
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            return config.get("models") or {}
+    except Exception as e:
+        logger.warning(f"Could not load models config: {e}")
+    return {}
+
+
+def _local_or_remote(name: str) -> str:
+    """Prefer a copy under ``rag/models/`` (offline installs) over the hub name."""
+    local_path = LOCAL_MODELS_DIR / name.rsplit("/", 1)[-1]
+    if local_path.exists():
+        logger.info(f"Loading local model from: {local_path}")
+        return str(local_path)
+    return name
+
+
+def _load_sentence_transformer(name: str, device: str) -> Any:
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(_local_or_remote(name), device=device)
+
+
+def _load_cross_encoder(name: str, device: str) -> Any:
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(_local_or_remote(name), device=device)
+
+
+def _local_dir(name: str) -> Path:
+    """ONNX models are only read from disk: a path, or a directory under ``rag/models/``."""
+    for candidate in (Path(name), LOCAL_MODELS_DIR / name.rsplit("/", 1)[-1]):
+        if candidate.is_dir():
+            return candidate
+    raise FileNotFoundError(
+        f"No local model directory for {name}. Create it with: python scripts/export_onnx.py --model {name}"
+    )
+
+
+def _onnx_loader(encoder: str, quantized: bool) -> Loader:
+    def load(name: str, device: str) -> Any:
+        from . import onnx_backend
+        cls = getattr(onnx_backend, encoder)
+        threads = int(load_model_config().get("onnx_intra_op_threads") or 0)
+        return cls(_local_dir(name), quantized=quantized, device=device, intra_op_threads=threads)
+    return load
+
+
+def model_kind(kind: str, backend: str = "torch") -> str:
+    """Registry kind for a model kind on a backend (``sentence_transformer:onnx-int8``)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+    return kind if backend == "torch" else f"{kind}:{backend}"
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _parameter_bytes(model: Any) -> Optional[int]:
+    """Size of a torch module's parameters and buffers, if it is one."""
+    for module in (model, getattr(model, "model", None)):
+        if module is not None and hasattr(module, "parameters"):
+            try:
+                tensors = list(module.parameters()) + list(getattr(module, "buffers", list)())
+                return sum(t.numel() * t.element_size() for t in tensors)
+            except Exception:
+                continue
+    return None
+
+
+@dataclass
+class _ModelEntry:
+    model: Any
+    load_seconds: float
+    resident_bytes: Optional[int]
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+
+class ModelRegistry:
+    """
+    Thread-safe, lazily loading registry of shared models.
+
+    Parameters
+    ----------
+    idle_timeout : float, optional
+        Seconds a model may go unused before ``unload_idle`` drops it.
+        ``None`` keeps models until they are unloaded explicitly.
+    """
+
+    def __init__(self, idle_timeout: Optional[float] = None) -> None:
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self._models: Dict[ModelKey, _ModelEntry] = {}
+        # A model that failed to load (missing package, bad name) is not retried on every call
+        self._failures: Dict[ModelKey, Exception] = {}
+        self._loaders: Dict[str, Loader] = {
+            SENTENCE_TRANSFORMER: _load_sentence_transformer,
+            CROSS_ENCODER: _load_cross_encoder,
+        }
+        for backend, quantized in (("onnx", False), ("onnx-int8", True)):
+            self._loaders[model_kind(SENTENCE_TRANSFORMER, backend)] = _onnx_loader("OnnxSentenceEncoder", quantized)
+            self._loaders[model_kind(CROSS_ENCODER, backend)] = _onnx_loader("OnnxCrossEncoder", quantized)
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+        self.loads = 0
+        self.unloads = 0
+
+    def register_loader(self, kind: str, loader: Loader) -> None:
+        """Add or replace how models of ``kind`` are built from ``(name, device)``."""
+        with self._lock:
+            self._loaders[kind] = loader
+
+    @staticmethod
+    def _key(kind: str, name: str, device: str) -> ModelKey:
+        if kind.startswith(SENTENCE_TRANSFORMER) and "/" not in name:
+            # Same resolution SentenceTransformer applies, so both spellings share one copy
+            name = f"sentence-transformers/{name}"
+        return kind, name, device
+
+    def get(self, kind: str, name: str, device: str = "cpu") -> Any:
+        """Return the shared model, loading it on first use."""
+        key = self._key(kind, name, device)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                entry.uses += 1
+                return entry.model
+            if key in self._failures:
+                raise self._failures[key]
+            if kind not in self._loaders:
+                raise KeyError(f"No loader registered for model kind '{kind}'")
+            loader = self._loaders[kind]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is None and key in self._failures:
+                    raise self._failures[key]
+            if entry is None:
+                entry = self._load(key, loader)
+            with self._lock:
+                entry.last_used = time.monotonic()
+                entry.uses += 1
+            return entry.model
+
+    def _load(self, key: ModelKey, loader: Loader) -> _ModelEntry:
+        kind, name, device = key
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        try:
+            model = loader(name, device)
+        except Exception as e:
+            with self._lock:
+                self._failures[key] = e
+            logger.warning(f"Failed to load {kind} model {name}: {e}")
+            raise
+        load_seconds = time.perf_counter() - start
+
+        resident = _parameter_bytes(model)
+        if resident is None and rss_before is not None:
+            # Not a torch module (e.g. an ONNX session): fall back to process growth
+            resident = max((_rss_bytes() or rss_before) - rss_before, 0)
+        entry = _ModelEntry(model, load_seconds, resident)
+        with self._lock:
+            self._models[key] = entry
+            self.loads += 1
+        logger.info(f"Loaded {kind} model {name} on {device} in {load_seconds:.2f}s")
+        return entry
+
+    def sentence_transformer(self, name: str = "all-MiniLM-L6-v2", device: str = "cpu",
+                             backend: str = "torch") -> Any:
+        return self.get(model_kind(SENTENCE_TRANSFORMER, backend), name, device)
+
+    def cross_encoder(self, name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2", device: str = "cpu",
+                      backend: str = "torch") -> Any:
+        return self.get(model_kind(CROSS_ENCODER, backend), name, device)
+
+    def warm(self, specs: Iterable[Dict[str, str]]) -> Dict[str, Optional[str]]:
+        """Load models ahead of the first request. Returns ``{model: error or None}``."""
+        config = load_model_config()
+        # Warm what will actually serve: the configured backend unless the spec names one
+        default_backends = {
+            SENTENCE_TRANSFORMER: config.get("embedding_backend", "torch"),
+            CROSS_ENCODER: config.get("reranker_backend", "torch"),
+        }
+        results: Dict[str, Optional[str]] = {}
+        for spec in specs:
+            base_kind = spec.get("kind", SENTENCE_TRANSFORMER)
+            kind = model_kind(base_kind, spec.get("backend") or default_backends.get(base_kind, "torch"))
+            name, device = spec["name"], spec.get("device", "cpu")
+            label = "{}:{}@{}".format(*self._key(kind, name, device))
+            try:
+                self.get(kind, name, device)
+                results[label] = None
+            except Exception as e:
+                results[label] = str(e)
+        return results
+
+    def unload(self, kind: Optional[str] = None, name: Optional[str] = None, device: Optional[str] = None) -> int:
+        """
+        Drop matching models (all when no filter is given) and forget past
+        load failures for them. Returns the number of models unloaded.
+        """
+        def matches(key: ModelKey) -> bool:
+            key_kind, key_name, key_device = key
+            if kind is not None and key_kind != kind:
+                return False
+            if name is not None and key_name != self._key(key_kind, name, key_device)[1]:
+                return False
+            return device is None or key_device == device
+
+        with self._lock:
+            dropped = [key for key in self._models if matches(key)]
+            for key in dropped:
+                del self._models[key]
+            for key in [k for k in self._failures if matches(k)]:
+                del self._failures[key]
+            self.unloads += len(dropped)
+        if dropped:
+            gc.collect()
+            logger.info(f"Unloaded models: {', '.join(k[1] for k in dropped)}")
+        return len(dropped)
+
+    def unload_idle(self, max_idle: Optional[float] = None) -> List[str]:
+        """Drop models unused for ``max_idle`` seconds (default: ``idle_timeout``)."""
+        max_idle = self.idle_timeout if max_idle is None else max_idle
+        if max_idle is None:
+            return []
+        cutoff = time.monotonic() - max_idle
+        with self._lock:
+            idle = [key for key, entry in self._models.items() if entry.last_used <= cutoff]
+        for key in idle:
+            self.unload(*key)
+        return [key[1] for key in idle]
+
+    def start_reaper(self, interval: Optional[float] = None) -> None:
+        """Run ``unload_idle`` periodically on a daemon thread."""
+        if self.idle_timeout is None or (self._reaper and self._reaper.is_alive()):
+            return
+        interval = interval or max(self.idle_timeout / 4, 1.0)
+        self._reaper_stop.clear()
+
+        def run() -> None:
+            while not self._reaper_stop.wait(interval):
+                try:
+                    self.unload_idle()
+                except Exception as e:
+                    logger.warning(f"Idle model unload failed: {e}")
+
+        self._reaper = threading.Thread(target=run, name="model-registry-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        self._reaper_stop.set()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model load time, use count, idle time and resident memory."""
+        now = time.monotonic()
+        with self._lock:
+            report = {
+                f"{kind}:{name}@{device}": {
+                    "kind": kind,
+                    "name": name,
+                    "device": device,
+                    "resident_bytes": entry.resident_bytes,
+                    "load_seconds": round(entry.load_seconds, 3),
+                    "uses": entry.uses,
+                    "idle_seconds": round(now - entry.last_used, 1),
+                    "loaded_at": entry.loaded_at,
+                }
+                for (kind, name, device), entry in self._models.items()
+            }
+            report.update({
+                f"{kind}:{name}@{device}": {"kind": kind, "name": name, "device": device, "error": str(error)}
+                for (kind, name, device), error in self._failures.items()
+            })
+        return report
+
+
+_config = load_model_config()
+model_registry = ModelRegistry(idle_timeout=_config.get("idle_timeout_seconds"))
@@ -0,0 +1,160 @@
+"""ONNX Runtime inference for the local embedding and reranker models.
+
+PyTorch eager inference is the main cost of ingestion on CPU-only nodes.
+This backend runs an exported model with ONNX Runtime, optionally with
+dynamic int8 weights. It needs only ``onnxruntime`` and ``tokenizers``, not
+torch. The two classes expose the subset of the ``SentenceTransformer`` /
+``CrossEncoder`` interface used in this repo (``encode``, ``predict``,
+``get_sentence_embedding_dimension``), so ``HuggingFaceEmbeddings`` and
+``CrossEncoderReranker`` use them unchanged through ``model_registry``.
+
+Model directories follow the sentence-transformers layout
+(``tokenizer.json``, ``1_Pooling/config.json``, ``modules.json``) with the
+graphs under ``onnx/``. Create them with ``scripts/export_onnx.py``::
+
+    python scripts/export_onnx.py --model all-MiniLM-L6-v2
+    python scripts/export_onnx.py --model cross-encoder/ms-marco-MiniLM-L-6-v2 --kind cross_encoder
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FP32_FILE = "onnx/model.onnx"
+INT8_FILE = "onnx/model_int8.onnx"
+
+_LFS_POINTER = b"version https://git-lfs"
+
+
+def onnx_file(model_dir: Union[str, Path], quantized: bool = False) -> Path:
+    """Path of the exported graph, checked to be a real model and not a git-lfs pointer."""
+    path = Path(model_dir) / (INT8_FILE if quantized else FP32_FILE)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"{path} not found. Create it with: python scripts/export_onnx.py --model {Path(model_dir).name}"
+            + ("" if quantized else " --no-quantize")
+        )
+    with open(path, "rb") as f:
+        if f.read(len(_LFS_POINTER)) == _LFS_POINTER:
+            raise FileNotFoundError(f"{path} is a git-lfs pointer; run `git lfs pull` or re-export it")
+    return path
+
+
+def _session(path: Path, device: str, intra_op_threads: int = 0) -> Any:
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    providers = ["CPUExecutionProvider"]
+    if device.startswith("cuda") and "CUDAExecutionProvider" in ort.get_available_providers():
+        providers.insert(0, "CUDAExecutionProvider")
+    return ort.InferenceSession(str(path), sess_options=options, providers=providers)
+
+
+def _tokenizer(model_dir: Path, max_length: int) -> Any:
+    from tokenizers import Tokenizer
+    tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+    tokenizer.enable_truncation(max_length=max_length)
+    tokenizer.enable_padding()
+    return tokenizer
+
+
+def _read_json(path: Path, default: Dict[str, Any]) -> Dict[str, Any]:
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return default
+
+
+class _OnnxModel:
+    """Shared tokenizer/session plumbing."""
+
+    def __init__(self, model_dir: Union[str, Path], quantized: bool = False, device: str = "cpu",
+                 intra_op_threads: int = 0, session: Any = None, tokenizer: Any = None,
+                 max_length: Optional[int] = None) -> None:
+        self.model_dir = Path(model_dir)
+        self.quantized = quantized
+        self.max_length = max_length or _read_json(
+            self.model_dir / "sentence_bert_config.json", {}
+        ).get("max_seq_length", 512)
+        self.session = session or _session(onnx_file(self.model_dir, quantized), device, intra_op_threads)
+        self.tokenizer = tokenizer or _tokenizer(self.model_dir, self.max_length)
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def _run(self, encodings: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        outputs = self.session.run(None, {k: v for k, v in feeds.items() if k in self._input_names})
+        return outputs[0], feeds["attention_mask"]
+
+
+class OnnxSentenceEncoder(_OnnxModel):
+    """ONNX Runtime stand-in for ``SentenceTransformer`` (pooling and normalization included)."""
+
+    def __init__(self, model_dir: Union[str, Path], **kwargs: Any) -> None:
+        super().__init__(model_dir, **kwargs)
+        pooling = _read_json(self.model_dir / "1_Pooling" / "config.json", {"pooling_mode_mean_tokens": True})
+        self.pooling = "cls" if pooling.get("pooling_mode_cls_token") else "mean"
+        modules = _read_json(self.model_dir / "modules.json", [])
+        self.normalize = any(m.get("type", "").endswith("Normalize") for m in modules)
+        self._dimension = pooling.get("word_embedding_dimension")
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               normalize_embeddings: bool = False, **kwargs: Any) -> np.ndarray:
+        """Embed ``sentences``; extra SentenceTransformer kwargs are accepted and ignored."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            hidden, mask = self._run(self.tokenizer.encode_batch(texts[start:start + batch_size]))
+            if self.pooling == "cls":
+                pooled = hidden[:, 0]
+            else:
+                weights = mask[..., None].astype(hidden.dtype)
+                pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+            batches.append(pooled)
+        embeddings = np.vstack(batches) if batches else np.zeros((0, self._dimension or 0), dtype=np.float32)
+        if self.normalize or normalize_embeddings:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings[0] if single else embeddings
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if self._dimension is None:
+            self._dimension = int(self.encode(["dimension probe"]).shape[1])
+        return self._dimension
+
+
+class OnnxCrossEncoder(_OnnxModel):
+    """ONNX Runtime stand-in for ``CrossEncoder``."""
+
+    def predict(self, sentences: Sequence[Sequence[str]], batch_size: int = 32,
+                apply_sigmoid: Optional[bool] = None, **kwargs: Any) -> np.ndarray:
+        """
+        Score ``(query, document)`` pairs. Single-logit models get a sigmoid,
+        as ``CrossEncoder.predict`` applies by default.
+        """
+        pairs = [tuple(pair) for pair in sentences]
+        scores = []
+        for start in range(0, len(pairs), batch_size):
+            logits, _ = self._run(self.tokenizer.encode_batch(pairs[start:start + batch_size]))
+            scores.append(logits)
+        if not scores:
+            return np.zeros(0, dtype=np.float32)
+        logits = np.vstack(scores)
+        if logits.shape[1] != 1:
+            return logits
+        logits = logits[:, 0]
+        if apply_sigmoid is None or apply_sigmoid:
+            return 1 / (1 + np.exp(-logits))
+        return logits
@@ -9,6 +9,8 @@ import logging
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from .model_registry import model_registry, load_model_config
+
 logger = logging.getLogger(__name__)
 
 # Lazy load to avoid crashes on incompatible environments
@@ -32,20 +34,36 @@ class CrossEncoderReranker:
     than bi-encoder vector similarity.
     """
     
-    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2", device: str = "cpu"):
+    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2", device: str = "cpu",
+                 backend: Optional[str] = None):
         self.model_name = model_name
         self.device = device
-        self.model = None
+        # "torch" (sentence-transformers), "onnx" or "onnx-int8" (ONNX Runtime, see rag.onnx_backend)
+        self.backend = backend or load_model_config().get("reranker_backend", "torch")
+        self._available = False
         
         if HAS_SENTENCE_TRANSFORMERS:
-            try:
-                # Lazy loading to avoid startup overhead if not used
-                from sentence_transformers import CrossEncoder 
-                self.model = CrossEncoder(model_name, device=device)
-                logger.info(f"Loaded Cross-Encoder model: {model_name}")
-            except Exception as e:
-                logger.warning(f"Failed to load Cross-Encoder model (likely environment issue): {e}")
-                self.model = None
+            for candidate in dict.fromkeys([self.backend, "torch"]):
+                try:
+                    # Shared across rerankers; the weights load once per process
+                    model_registry.cross_encoder(model_name, device, backend=candidate)
+                    self.backend = candidate
+                    self._available = True
+                    logger.info(f"Loaded Cross-Encoder model: {model_name} ({candidate})")
+                    break
+                except Exception as e:
+                    logger.warning(f"Failed to load Cross-Encoder model with {candidate} (likely environment issue): {e}")
+
+    @property
+    def model(self):
+        """The registry's copy (reloaded if it was unloaded while idle), or None."""
+        if not self._available:
+            return None
+        try:
+            return model_registry.cross_encoder(self.model_name, self.device, backend=self.backend)
+        except Exception as e:
+            logger.warning(f"Cross-Encoder model unavailable: {e}")
+            return None
         
     def rerank(
         self, 
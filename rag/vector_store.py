@@ -4,6 +4,7 @@ Provides pluggable vector database backends:
 - ChromaDB (default, best for local deployment)
 - Faiss (high performance, CPU-friendly)
 - InMemory (testing, small datasets)
+- SimplePersistent (numpy-only, binary float32 segment on disk)
 
 All stores support:
 - Embedding generation and indexing
@@ -17,11 +18,13 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
 import json
 import numpy as np
 import hashlib
+import weakref
+from .bm25_index import BM25Index
 from .reranker import CrossEncoderReranker
 
 logger = logging.getLogger(__name__)
@@ -63,6 +66,54 @@ class VectorStore(ABC):
         """Search for similar documents."""
         pass
 
+    def search_many(
+        self,
+        queries: List[str],
+        filters: Optional[Union[Dict[str, Any], List[Optional[Dict[str, Any]]]]] = None,
+        top_k: Union[int, List[int]] = 5,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Search several queries in one call.
+
+        ``filters`` and ``top_k`` are either shared by all queries or given
+        per query. ``query_embeddings`` lets callers that already embedded
+        the queries (e.g. for another store) skip the embedding step.
+        Backends override this to embed all queries in one batch and score
+        them in one pass; the default falls back to one ``search`` per query.
+        """
+        filter_list, top_ks = _expand_batch_args(queries, filters, top_k)
+        return [
+            self.search(query=q, top_k=k, filter_metadata=f)
+            for q, f, k in zip(queries, filter_list, top_ks)
+        ]
+
+    def keyword_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """BM25 keyword search. Backends without a keyword index return nothing."""
+        return []
+
+    def hybrid_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        semantic_weight: float = 0.5,
+        rrf_k: int = 60
+    ) -> List[SearchResult]:
+        """Vector and BM25 results combined with weighted Reciprocal Rank Fusion."""
+        semantic = self.search(query, top_k=top_k, filter_metadata=filter_metadata)
+        keyword = self.keyword_search(query, top_k=top_k, filter_metadata=filter_metadata)
+        return reciprocal_rank_fusion(
+            [semantic, keyword],
+            weights=[semantic_weight, 1.0 - semantic_weight],
+            k=rrf_k
+        )[:top_k]
+
     @abstractmethod
     def delete_collection(self) -> None:
         """Delete the entire collection."""
@@ -73,11 +124,33 @@ class VectorStore(ABC):
         """Delete a single document by ID."""
         pass
 
+    def delete_documents(self, document_ids: List[str]) -> None:
+        """Delete several documents by ID."""
+        for document_id in document_ids:
+            self.delete_document(document_id)
+
+    def upsert_documents(self, documents: List[Document]) -> None:
+        """Add documents, replacing any stored documents with the same IDs."""
+        self.delete_documents([doc.id for doc in documents])
+        self.add_documents(documents)
+
     @abstractmethod
     def get_documents(self, limit: int = 10, offset: int = 0) -> List[Document]:
         """Retrieve a list of documents from the store."""
         pass
 
+    def get_documents_by_ids(self, document_ids: List[str]) -> List[Document]:
+        """Retrieve the stored documents among ``document_ids``; missing IDs are skipped."""
+        wanted = set(document_ids)
+        found, offset = [], 0
+        while wanted:
+            page = self.get_documents(limit=1000, offset=offset)
+            if not page:
+                break
+            found.extend(doc for doc in page if doc.id in wanted)
+            offset += len(page)
+        return found
+
     @abstractmethod
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get collection statistics."""
@@ -89,6 +162,98 @@ class VectorStore(ABC):
         pass
 
 
+def reciprocal_rank_fusion(
+    result_lists: List[List[SearchResult]],
+    weights: Optional[List[float]] = None,
+    k: int = 60
+) -> List[SearchResult]:
+    """
+    Fuse ranked result lists with (weighted) Reciprocal Rank Fusion.
+
+    Each document scores ``sum(weight / (k + rank))`` over the lists it
+    appears in; the returned results carry the fused score and new ranks.
+    """
+    weights = weights or [1.0] * len(result_lists)
+    fused: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for results, weight in zip(result_lists, weights):
+        for rank, result in enumerate(results, start=1):
+            doc_id = result.document.id
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+            documents.setdefault(doc_id, result.document)
+
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return [
+        SearchResult(document=documents[doc_id], score=score, rank=rank)
+        for rank, (doc_id, score) in enumerate(ordered, start=1)
+    ]
+
+
+def _matches(metadata: Dict[str, Any], filter_metadata: Optional[Dict[str, Any]]) -> bool:
+    return all(metadata.get(k) == v for k, v in (filter_metadata or {}).items())
+
+
+def _keyword_results(
+    index: BM25Index,
+    lookup: Dict[str, Document],
+    query: str,
+    top_k: int,
+    filter_metadata: Optional[Dict[str, Any]]
+) -> List[SearchResult]:
+    """Run a BM25 query and map hits back to documents."""
+    hits = index.search(
+        query,
+        top_k=top_k,
+        allow=lambda doc_id: doc_id in lookup and _matches(lookup[doc_id].metadata, filter_metadata)
+    )
+    return [
+        SearchResult(document=lookup[doc_id], score=score, rank=rank)
+        for rank, (doc_id, score) in enumerate(hits, start=1)
+    ]
+
+
+def _expand_batch_args(
+    queries: List[str],
+    filters: Optional[Union[Dict[str, Any], List[Optional[Dict[str, Any]]]]],
+    top_k: Union[int, List[int]]
+) -> Tuple[List[Optional[Dict[str, Any]]], List[int]]:
+    """Normalize shared-or-per-query ``search_many`` arguments to lists."""
+    n = len(queries)
+    filter_list = list(filters) if isinstance(filters, list) else [filters] * n
+    top_ks = list(top_k) if isinstance(top_k, list) else [top_k] * n
+    if len(filter_list) != n or len(top_ks) != n:
+        raise ValueError("filters and top_k must match the number of queries")
+    return filter_list, top_ks
+
+
+def _filter_groups(filter_list: List[Optional[Dict[str, Any]]]) -> Dict[str, List[int]]:
+    """Group query positions that share an identical metadata filter."""
+    groups: Dict[str, List[int]] = {}
+    for i, f in enumerate(filter_list):
+        key = json.dumps(f, sort_keys=True, default=str) if f else ""
+        groups.setdefault(key, []).append(i)
+    return groups
+
+
+def _embed_queries(
+    embedding_function: Optional[Any],
+    queries: List[str],
+    query_embeddings: Optional[List[List[float]]] = None
+) -> np.ndarray:
+    """Embed queries in one batch call, de-duplicating repeated texts."""
+    if query_embeddings is not None:
+        if len(query_embeddings) != len(queries):
+            raise ValueError("query_embeddings must match the number of queries")
+        return np.asarray(query_embeddings, dtype=np.float32)
+    if not embedding_function:
+        raise ValueError("Embedding function required for search")
+
+    unique = list(dict.fromkeys(queries))
+    vectors = np.asarray(embedding_function(unique), dtype=np.float32)
+    position = {q: i for i, q in enumerate(unique)}
+    return vectors[[position[q] for q in queries]]
+
+
 class ChromaVectorStore(VectorStore):
     """
     ChromaDB vector store implementation.
@@ -106,38 +271,39 @@ class ChromaVectorStore(VectorStore):
         persist_directory: str = "rag/chroma_db",
         embedding_function: Optional[Any] = None
     ) -> None:
-        try:
-            import chromadb
-            from chromadb.config import Settings
-        except ImportError:
-            raise ImportError(
-                "ChromaDB not installed. Install with: pip install chromadb"
-            )
+        from .chroma_pool import chroma_pool
 
         self.collection_name = collection_name
         self.persist_directory = Path(persist_directory)
-        self.persist_directory.mkdir(parents=True, exist_ok=True)
 
-        # Initialize Chroma client with persistent storage (modern API)
-        self.client = chromadb.PersistentClient(
-            path=str(self.persist_directory),
-            settings=Settings(anonymized_telemetry=False)
-        )
-
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
+        # Client, collection and BM25 index (persisted next to the Chroma
+        # data) are shared process-wide; constructing a store is cheap
+        self.client = chroma_pool.get_client(str(self.persist_directory))
+        self._pooled = chroma_pool.acquire_collection(
+            str(self.persist_directory),
+            collection_name,
             metadata={"hnsw:space": "cosine"}  # Use cosine similarity
         )
+        self._release = weakref.finalize(self, chroma_pool.release_collection, self._pooled)
+        self.collection = self._pooled.collection
+        self.keyword_index = self._pooled.keyword_index
 
         self.embedding_function = embedding_function
-
         
         # Initialize Reranker (lazy loaded by search)
         self.reranker = None
 
     def add_documents(self, documents: List[Document]) -> None:
         """Add documents to Chroma collection."""
+        self._write_documents(documents, self.collection.add)
+        if documents:
+            logger.info(f"Added {len(documents)} documents to Chroma collection")
+
+    def upsert_documents(self, documents: List[Document]) -> None:
+        """Add or replace documents by ID in one Chroma ``upsert``."""
+        self._write_documents(documents, self.collection.upsert)
+
+    def _write_documents(self, documents: List[Document], write: Any) -> None:
         if not documents:
             return
 
@@ -158,9 +324,8 @@ class ChromaVectorStore(VectorStore):
         elif self.embedding_function is not None:
             embeddings = self.embedding_function(texts)
 
-        # Add to collection
         if embeddings:
-            self.collection.add(
+            write(
                 ids=ids,
                 documents=texts,
                 metadatas=metadatas,
@@ -168,13 +333,13 @@ class ChromaVectorStore(VectorStore):
             )
         else:
             # Chroma will use default embedding function
-            self.collection.add(
+            write(
                 ids=ids,
                 documents=texts,
                 metadatas=metadatas
             )
 
-        logger.info(f"Added {len(documents)} documents to Chroma collection")
+        self.keyword_index.add(zip(ids, texts))
 
     def search(
         self,
@@ -198,26 +363,7 @@ class ChromaVectorStore(VectorStore):
         )
 
         # Convert to SearchResult objects
-        search_results = []
-        if results['ids'] and results['ids'][0]:
-            for rank, (doc_id, text, metadata, distance) in enumerate(zip(
-                results['ids'][0],
-                results['documents'][0],
-                results['metadatas'][0],
-                results['distances'][0]
-            )):
-                document = Document(
-                    id=doc_id,
-                    text=text,
-                    metadata=metadata or {}
-                )
-                # Convert distance to similarity score (1 - cosine_distance)
-                score = 1.0 - distance if distance is not None else 0.0
-                search_results.append(SearchResult(
-                    document=document,
-                    score=score,
-                    rank=rank + 1
-                ))
+        search_results = self._to_search_results(results, 0)
 
         # Apply Re-ranking
         if use_reranking and search_results:
@@ -253,16 +399,117 @@ class ChromaVectorStore(VectorStore):
 
         return search_results
 
+    def search_many(
+        self,
+        queries: List[str],
+        filters: Optional[Union[Dict[str, Any], List[Optional[Dict[str, Any]]]]] = None,
+        top_k: Union[int, List[int]] = 5,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[SearchResult]]:
+        """Search several queries with one ``collection.query`` per distinct filter."""
+        if not queries:
+            return []
+        filter_list, top_ks = _expand_batch_args(queries, filters, top_k)
+
+        vectors = None
+        if query_embeddings is not None or self.embedding_function is not None:
+            vectors = _embed_queries(self.embedding_function, queries, query_embeddings)
+
+        batched: List[List[SearchResult]] = [[] for _ in queries]
+        for positions in _filter_groups(filter_list).values():
+            where = filter_list[positions[0]] or None
+            kwargs: Dict[str, Any] = {
+                "n_results": max(top_ks[i] for i in positions),
+                "where": where
+            }
+            if vectors is not None:
+                kwargs["query_embeddings"] = vectors[positions].tolist()
+            else:
+                kwargs["query_texts"] = [queries[i] for i in positions]
+
+            results = self.collection.query(**kwargs)
+            for j, i in enumerate(positions):
+                batched[i] = self._to_search_results(results, j)[:top_ks[i]]
+        return batched
+
+    @staticmethod
+    def _to_search_results(results: Dict[str, Any], query_index: int) -> List[SearchResult]:
+        """Convert one query's slice of a Chroma response to SearchResults."""
+        search_results = []
+        if results['ids'] and results['ids'][query_index]:
+            for rank, (doc_id, text, metadata, distance) in enumerate(zip(
+                results['ids'][query_index],
+                results['documents'][query_index],
+                results['metadatas'][query_index],
+                results['distances'][query_index]
+            )):
+                document = Document(
+                    id=doc_id,
+                    text=text,
+                    metadata=metadata or {}
+                )
+                # Convert distance to similarity score (1 - cosine_distance)
+                score = 1.0 - distance if distance is not None else 0.0
+                search_results.append(SearchResult(
+                    document=document,
+                    score=score,
+                    rank=rank + 1
+                ))
+        return search_results
+
     def delete_collection(self) -> None:
         """Delete the Chroma collection."""
+        from .chroma_pool import chroma_pool
+
         self.client.delete_collection(name=self.collection_name)
+        self.keyword_index.clear()
+        chroma_pool.invalidate_collection(str(self.persist_directory), self.collection_name)
         logger.info(f"Deleted Chroma collection '{self.collection_name}'")
 
     def delete_document(self, document_id: str) -> None:
         """Delete a single document by ID from Chroma."""
         self.collection.delete(ids=[document_id])
+        self.keyword_index.remove(document_id)
         logger.info(f"Deleted document '{document_id}' from Chroma collection '{self.collection_name}'")
 
+    def delete_documents(self, document_ids: List[str]) -> None:
+        """Delete several documents by ID in one Chroma call."""
+        if not document_ids:
+            return
+        self.collection.delete(ids=list(document_ids))
+        for document_id in document_ids:
+            self.keyword_index.remove(document_id)
+
+    def keyword_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """BM25 keyword search; hits are hydrated (and filtered) via ``collection.get``."""
+        self._pooled.ensure_keyword_index()
+
+        # Over-fetch when filtering, since metadata lives in Chroma
+        limit = top_k * 10 if filter_metadata else top_k
+        hits = self.keyword_index.search(query, top_k=limit)
+        if not hits:
+            return []
+
+        results = self.collection.get(
+            ids=[doc_id for doc_id, _ in hits],
+            where=filter_metadata or None,
+            include=['documents', 'metadatas']
+        )
+        found = {
+            doc_id: Document(id=doc_id, text=text, metadata=metadata or {})
+            for doc_id, text, metadata in zip(results['ids'], results['documents'], results['metadatas'])
+        }
+        ranked = [(doc_id, score) for doc_id, score in hits if doc_id in found][:top_k]
+        return [
+            SearchResult(document=found[doc_id], score=score, rank=rank)
+            for rank, (doc_id, score) in enumerate(ranked, start=1)
+        ]
+
     def get_documents(self, limit: int = 10, offset: int = 0) -> List[Document]:
         """Retrieve a list of documents from Chroma."""
         results = self.collection.get(
@@ -281,6 +528,16 @@ class ChromaVectorStore(VectorStore):
                 ))
         return documents
 
+    def get_documents_by_ids(self, document_ids: List[str]) -> List[Document]:
+        """Retrieve documents by ID from Chroma in one call."""
+        if not document_ids:
+            return []
+        results = self.collection.get(ids=list(document_ids), include=['documents', 'metadatas'])
+        return [
+            Document(id=doc_id, text=text, metadata=metadata or {})
+            for doc_id, text, metadata in zip(results['ids'], results['documents'], results['metadatas'])
+        ]
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get Chroma collection statistics."""
         count = self.collection.count()
@@ -302,6 +559,10 @@ class ChromaVectorStore(VectorStore):
         """List all collections in the persistent store."""
         return [c.name for c in self.client.list_collections()]
 
+    def close(self) -> None:
+        """Release the pooled collection (also happens on garbage collection)."""
+        self._release()
+
 
 class FaissVectorStore(VectorStore):
     """
@@ -333,6 +594,9 @@ class FaissVectorStore(VectorStore):
         self.embedding_function = embedding_function
         self.documents: List[Document] = []
         self.doc_id_to_idx: Dict[str, int] = {}
+        self.keyword_index = BM25Index(
+            str(self.persist_path.with_suffix(".bm25.jsonl")) if self.persist_path else None
+        )
 
         # Create Faiss index
         if index_type == "Flat":
@@ -380,6 +644,8 @@ class FaissVectorStore(VectorStore):
             self.documents.append(doc)
             self.doc_id_to_idx[doc.id] = start_idx + i
 
+        self.keyword_index.add((doc.id, doc.text) for doc in documents)
+
         logger.info(f"Added {len(documents)} documents to Faiss index")
 
         # Persist if configured
@@ -408,10 +674,39 @@ class FaissVectorStore(VectorStore):
         # Search index
         distances, indices = self.index.search(query_embedding, top_k)
 
-        # Convert to SearchResult objects
+        return self._to_search_results(indices[0], distances[0], filter_metadata, top_k)
+
+    def search_many(
+        self,
+        queries: List[str],
+        filters: Optional[Union[Dict[str, Any], List[Optional[Dict[str, Any]]]]] = None,
+        top_k: Union[int, List[int]] = 5,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[SearchResult]]:
+        """Search several queries with a single batched ``index.search``."""
+        if not queries:
+            return []
+        filter_list, top_ks = _expand_batch_args(queries, filters, top_k)
+        vectors = _embed_queries(self.embedding_function, queries, query_embeddings)
+
+        distances, indices = self.index.search(vectors, max(top_ks))
+        return [
+            self._to_search_results(indices[i], distances[i], filter_list[i], top_ks[i])
+            for i in range(len(queries))
+        ]
+
+    def _to_search_results(
+        self,
+        indices: np.ndarray,
+        distances: np.ndarray,
+        filter_metadata: Optional[Dict[str, Any]],
+        top_k: int
+    ) -> List[SearchResult]:
+        """Convert one row of Faiss output to filtered SearchResults."""
         search_results = []
-        for rank, (idx, distance) in enumerate(zip(indices[0], distances[0])):
-            if idx < len(self.documents):
+        for rank, (idx, distance) in enumerate(zip(indices, distances)):
+            # Faiss pads missing neighbours with -1; deleted slots are None
+            if 0 <= idx < len(self.documents) and self.documents[idx] is not None:
                 doc = self.documents[idx]
 
                 # Apply metadata filter if provided
@@ -431,13 +726,14 @@ class FaissVectorStore(VectorStore):
                     rank=rank + 1
                 ))
 
-        return search_results
+        return search_results[:top_k]
 
     def delete_collection(self) -> None:
         """Clear Faiss index and documents."""
         self.index.reset()
         self.documents.clear()
         self.doc_id_to_idx.clear()
+        self.keyword_index.clear()
         if self.persist_path and self.persist_path.exists():
             self.persist_path.unlink()
         logger.info("Deleted Faiss index")
@@ -450,14 +746,34 @@ class FaissVectorStore(VectorStore):
             # In a real app, we'd rebuild or use IndexIDMap. 
             # For now, we just remove from our tracking.
             self.documents[idx] = None 
+            self.keyword_index.remove(document_id)
             if self.persist_path:
                 self._save_index()
 
+    def keyword_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """BM25 keyword search over the Faiss document list."""
+        lookup = {
+            doc_id: self.documents[idx]
+            for doc_id, idx in self.doc_id_to_idx.items()
+            if self.documents[idx] is not None
+        }
+        return _keyword_results(self.keyword_index, lookup, query, top_k, filter_metadata)
+
     def get_documents(self, limit: int = 10, offset: int = 0) -> List[Document]:
         """Simple document retrieval for Faiss."""
         valid_docs = [d for d in self.documents if d is not None]
         return valid_docs[offset:offset + limit]
 
+    def get_documents_by_ids(self, document_ids: List[str]) -> List[Document]:
+        """Retrieve documents by ID from the Faiss document list."""
+        found = (self.documents[self.doc_id_to_idx[doc_id]] for doc_id in document_ids if doc_id in self.doc_id_to_idx)
+        return [doc for doc in found if doc is not None]
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get Faiss index statistics."""
         return {
@@ -514,6 +830,9 @@ class FaissVectorStore(VectorStore):
                 for d in docs_data
             ]
             self.doc_id_to_idx = {doc.id: i for i, doc in enumerate(self.documents)}
+            if len(self.keyword_index) != len(self.doc_id_to_idx):
+                self.keyword_index.clear()
+                self.keyword_index.add((doc.id, doc.text) for doc in self.documents)
             logger.info(f"Loaded Faiss index from {self.persist_path}")
 
 
@@ -521,13 +840,18 @@ class InMemoryVectorStore(VectorStore):
     """
     Simple in-memory vector store for testing.
     
-    Uses numpy for similarity computation.
+    Keeps a pre-normalized float32 embedding matrix (one row per document)
+    that is updated incrementally on add and delete, so a query is a single
+    matrix-vector product followed by ``np.argpartition`` top-k.
+    Metadata filters are evaluated once into boolean masks and cached.
     No persistence, suitable for small datasets only.
     """
 
     def __init__(self, embedding_function: Optional[Any] = None) -> None:
         self.documents: List[Document] = []
         self.embedding_function = embedding_function
+        self.keyword_index = BM25Index()
+        self._reset_index()
         logger.info("Initialized in-memory vector store")
 
     def add_documents(self, documents: List[Document]) -> None:
@@ -535,11 +859,15 @@ class InMemoryVectorStore(VectorStore):
         if not documents:
             return
 
-        # Generate embeddings if needed
-        for doc in documents:
-            if not doc.embedding and self.embedding_function:
-                doc.embedding = self.embedding_function([doc.text])[0]
-            self.documents.append(doc)
+        # Generate missing embeddings in one batch
+        missing = [doc for doc in documents if doc.embedding is None]
+        if missing and self.embedding_function:
+            for doc, emb in zip(missing, self.embedding_function([d.text for d in missing])):
+                doc.embedding = emb
+
+        self.documents.extend(documents)
+        self._append_rows(documents)
+        self.keyword_index.add((doc.id, doc.text) for doc in documents)
 
         logger.info(f"Added {len(documents)} documents to in-memory store")
 
@@ -557,55 +885,87 @@ class InMemoryVectorStore(VectorStore):
             raise ValueError("Embedding function required for search")
 
         # Generate query embedding
-        query_embedding = np.array(self.embedding_function([query])[0])
+        query_embedding = np.asarray(self.embedding_function([query])[0], dtype=np.float32)
 
-        # Compute similarities
-        similarities = []
-        for doc in self.documents:
-            # Apply metadata filter
-            if filter_metadata:
-                match = all(
-                    doc.metadata.get(k) == v
-                    for k, v in filter_metadata.items()
-                )
-                if not match:
-                    continue
-
-            if doc.embedding:
-                doc_embedding = np.array(doc.embedding)
-                # Cosine similarity
-                similarity = np.dot(query_embedding, doc_embedding) / (
-                    np.linalg.norm(query_embedding) * np.linalg.norm(doc_embedding)
-                )
-                similarities.append((similarity, doc))
-
-        # Sort by similarity
-        similarities.sort(key=lambda x: x[0], reverse=True)
-
-        # Convert to SearchResult objects
+        hits = self._search_vectors(query_embedding[None, :], top_k, filter_metadata)[0]
         return [
             SearchResult(
-                document=doc,
-                score=float(score),
+                document=self.documents[idx],
+                score=score,
                 rank=rank + 1
             )
-            for rank, (score, doc) in enumerate(similarities[:top_k])
+            for rank, (idx, score) in enumerate(hits)
         ]
 
+    def search_many(
+        self,
+        queries: List[str],
+        filters: Optional[Union[Dict[str, Any], List[Optional[Dict[str, Any]]]]] = None,
+        top_k: Union[int, List[int]] = 5,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[SearchResult]]:
+        """Embed all queries in one batch and score each filter group with one matmul."""
+        if not queries:
+            return []
+        filter_list, top_ks = _expand_batch_args(queries, filters, top_k)
+        vectors = _embed_queries(self.embedding_function, queries, query_embeddings)
+
+        batched: List[List[SearchResult]] = [[] for _ in queries]
+        for positions in _filter_groups(filter_list).values():
+            group_k = max(top_ks[i] for i in positions)
+            hits = self._search_vectors(vectors[positions], group_k, filter_list[positions[0]])
+            for i, query_hits in zip(positions, hits):
+                batched[i] = [
+                    SearchResult(document=self.documents[idx], score=score, rank=rank + 1)
+                    for rank, (idx, score) in enumerate(query_hits[:top_ks[i]])
+                ]
+        return batched
+
+    def keyword_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """BM25 keyword search over the in-memory inverted index."""
+        return _keyword_results(self.keyword_index, self._docs_by_id, query, top_k, filter_metadata)
+
     def delete_collection(self) -> None:
         """Clear in-memory store."""
         self.documents.clear()
+        self._reset_index()
+        self.keyword_index.clear()
         logger.info("Cleared in-memory vector store")
 
     def delete_document(self, document_id: str) -> None:
         """Delete from in-memory store."""
-        self.documents = [d for d in self.documents if d.id != document_id]
+        keep = np.fromiter(
+            (d.id != document_id for d in self.documents),
+            dtype=bool,
+            count=len(self.documents)
+        )
+        if keep.all():
+            return
+
+        self.documents = [d for d, k in zip(self.documents, keep) if k]
+        # No matrix yet while every stored document is un-embedded
+        if self._matrix is not None:
+            self._matrix = self._matrix[:len(keep)][keep]
+        if self._valid is not None:
+            self._valid = self._valid[:len(keep)][keep]
+        self._mask_cache = {key: mask[keep] for key, mask in self._mask_cache.items()}
+        self._docs_by_id.pop(document_id, None)
+        self.keyword_index.remove(document_id)
         logger.info(f"Deleted document {document_id} from in-memory store.")
 
     def get_documents(self, limit: int = 10, offset: int = 0) -> List[Document]:
         """Retrieve from in-memory store."""
         return self.documents[offset:offset + limit]
 
+    def get_documents_by_ids(self, document_ids: List[str]) -> List[Document]:
+        """Retrieve documents by ID from the in-memory store."""
+        return [self._docs_by_id[doc_id] for doc_id in document_ids if doc_id in self._docs_by_id]
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get store statistics."""
         return {
@@ -615,18 +975,155 @@ class InMemoryVectorStore(VectorStore):
 
     def check_content_exists(self, content_hash: str) -> bool:
         """Check if content hash exists in-memory."""
-        return any(d.metadata.get("content_hash") == content_hash for d in self.documents)
+        return bool(self._filter_mask({"content_hash": content_hash}).any())
+
+    # ------------------------------------------------------------------
+    # Matrix index
+    # ------------------------------------------------------------------
+
+    def _reset_index(self) -> None:
+        # Rows [0, len(self.documents)) are live; capacity may be larger
+        self._matrix: Optional[np.ndarray] = None
+        self._valid = np.zeros(0, dtype=bool)
+        self._mask_cache: Dict[Tuple[str, Any], np.ndarray] = {}
+        # Latest document per ID, for mapping keyword hits back to documents
+        self._docs_by_id: Dict[str, Document] = {}
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the matrix and masks from ``self.documents``."""
+        documents = self.documents
+        self.documents = []
+        self._reset_index()
+        self.documents = documents
+        self._append_rows(documents, start=0)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _append_rows(self, documents: List[Document], start: Optional[int] = None) -> None:
+        """Write normalized rows for ``documents`` (already in ``self.documents``)."""
+        n_new = len(documents)
+        start = len(self.documents) - n_new if start is None else start
+        end = start + n_new
+
+        valid = np.fromiter((d.embedding is not None for d in documents), dtype=bool, count=n_new)
+        if valid.any():
+            rows = np.asarray(
+                [np.asarray(d.embedding, dtype=np.float32) for d in documents if d.embedding is not None],
+                dtype=np.float32
+            )
+            if self._matrix is not None and self._matrix.shape[1] != rows.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {rows.shape[1]} does not match "
+                    f"store dimension {self._matrix.shape[1]}"
+                )
+            self._ensure_capacity(end, rows.shape[1])
+            block = np.zeros((n_new, rows.shape[1]), dtype=np.float32)
+            block[valid] = self._normalize(rows)
+            self._matrix[start:end] = block
+        elif self._matrix is not None:
+            self._ensure_capacity(end, self._matrix.shape[1])
+            self._matrix[start:end] = 0.0
+
+        self._valid = np.concatenate([self._valid[:start], valid])
+        self._docs_by_id.update((d.id, d) for d in documents)
+        for (key, value), mask in self._mask_cache.items():
+            new = np.fromiter(
+                (d.metadata.get(key) == value for d in documents), dtype=bool, count=n_new
+            )
+            self._mask_cache[(key, value)] = np.concatenate([mask[:start], new])
+
+    def _ensure_capacity(self, rows: int, dim: int) -> None:
+        capacity = self._matrix.shape[0] if self._matrix is not None else 0
+        if self._matrix is not None and rows <= capacity and self._matrix.flags.writeable:
+            return
+        new_capacity = max(rows, capacity * 2, 64)
+        grown = np.zeros((new_capacity, dim), dtype=np.float32)
+        live = len(self._valid)
+        if self._matrix is not None and live:
+            grown[:live] = self._matrix[:live]
+        self._matrix = grown
+
+    def _filter_mask(self, filter_metadata: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Boolean mask of documents matching all ``filter_metadata`` items."""
+        n = len(self.documents)
+        mask = np.ones(n, dtype=bool)
+        for key, value in (filter_metadata or {}).items():
+            try:
+                cache_key = (key, value)
+                hash(cache_key)
+            except TypeError:
+                cache_key = None
+
+            cached = self._mask_cache.get(cache_key) if cache_key else None
+            if cached is None:
+                cached = np.fromiter(
+                    (d.metadata.get(key) == value for d in self.documents), dtype=bool, count=n
+                )
+                if cache_key:
+                    self._mask_cache[cache_key] = cached
+            mask &= cached
+        return mask
+
+    def _search_vectors(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """Score a (q, dim) query matrix; return (row, score) hits per query."""
+        n = len(self.documents)
+        if self._matrix is None or n == 0 or top_k <= 0:
+            return [[] for _ in range(len(query_vectors))]
+
+        candidates = np.flatnonzero(self._valid[:n] & self._filter_mask(filter_metadata))
+        if candidates.size == 0:
+            return [[] for _ in range(len(query_vectors))]
+
+        matrix = self._matrix[:n]
+        if candidates.size < n:
+            matrix = matrix[candidates]
+        scores = self._normalize(query_vectors.astype(np.float32)) @ matrix.T
+
+        k = min(top_k, candidates.size)
+        hits = []
+        for row_scores in scores:
+            if k < candidates.size:
+                top = np.argpartition(-row_scores, k - 1)[:k]
+            else:
+                top = np.arange(candidates.size)
+            top = top[np.argsort(-row_scores[top], kind="stable")]
+            hits.append([(int(candidates[i]), float(row_scores[i])) for i in top])
+        return hits
 
 
 class SimplePersistentVectorStore(InMemoryVectorStore):
     """
-    Persistent vector store using JSON and NumPy.
-    
+    Persistent vector store backed by a binary float32 segment.
+
     Dependency-free (except numpy) alternative to ChromaDB.
     Suitable for environments where complex C-extensions or 
     specific dependency versions (like Pydantic v1) fail.
+
+    On-disk layout (per collection):
+    - ``<collection>.f32``: contiguous, append-only, L2-normalized float32
+      embedding rows, memory-mapped read-only on load and searched in place.
+    - ``<collection>.docs.jsonl``: append-only sidecar with one record per
+      document (id, text, metadata, row index) plus delete tombstones.
+    - ``<collection>.meta.json``: format version and embedding dimension.
+    - ``<collection>.bm25.jsonl``: append-only BM25 term-frequency log.
+
+    Appends never rewrite existing data; ``compact()`` rewrites the files
+    once tombstones pile up. Legacy ``<collection>.json`` stores are
+    migrated on first load.
     """
-    
+
+    FORMAT_VERSION = 1
+    COMPACT_TOMBSTONE_RATIO = 0.3
+
     def __init__(
         self, 
         collection_name: str,
@@ -636,56 +1133,293 @@ class SimplePersistentVectorStore(InMemoryVectorStore):
         super().__init__(embedding_function)
         self.collection_name = collection_name
         self.persist_directory = Path(persist_directory)
-        self.persist_path = self.persist_directory / f"{collection_name}.json"
-        
-        # Load if exists
-        if self.persist_path.exists():
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+
+        self.vectors_path = self.persist_directory / f"{collection_name}.f32"
+        self.docs_path = self.persist_directory / f"{collection_name}.docs.jsonl"
+        self.meta_path = self.persist_directory / f"{collection_name}.meta.json"
+        # Legacy single-file JSON format (pre-binary)
+        self.legacy_path = self.persist_directory / f"{collection_name}.json"
+        self.persist_path = self.docs_path
+        self.keyword_index = BM25Index(str(self.persist_directory / f"{collection_name}.bm25.jsonl"))
+
+        self.dimension: Optional[int] = None
+        self._row_count = 0
+        self._tombstones = 0
+
+        if self.legacy_path.exists() and not self.docs_path.exists():
+            self.migrate_legacy_json()
+        elif self.docs_path.exists():
             self.load()
-        else:
-            self.persist_directory.mkdir(parents=True, exist_ok=True)
-            
+
     def add_documents(self, documents: List[Document]) -> None:
-        """Add documents and persist immediately."""
+        """Add documents and append them to disk without rewriting."""
+        if not documents:
+            return
         super().add_documents(documents)
-        self.save()
-        
+        self._append(documents)
+
+    def delete_document(self, document_id: str) -> None:
+        """Delete a document and record a tombstone in the sidecar."""
+        before = len(self.documents)
+        super().delete_document(document_id)
+        removed = before - len(self.documents)
+        if not removed:
+            return
+
+        with self.docs_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "delete", "id": document_id}) + "\n")
+        self._tombstones += removed
+
+        if self._tombstones > self.COMPACT_TOMBSTONE_RATIO * max(self._row_count, 1):
+            self.compact()
+
     def save(self) -> None:
-        """Save documents to JSON file."""
-        data = [
-            {
-                "id": doc.id,
-                "text": doc.text,
-                "metadata": doc.metadata,
-                "embedding": doc.embedding
-            }
-            for doc in self.documents
-        ]
-        self.persist_path.write_text(json.dumps(data), encoding="utf-8")
-        logger.info(f"Saved {len(self.documents)} documents to {self.persist_path}")
-        
+        """Rewrite the collection from memory (same as ``compact``)."""
+        self.compact()
+
+    def compact(self) -> None:
+        """Rewrite vector and sidecar files, dropping deleted rows."""
+        docs = list(self.documents)
+        n = len(docs)
+        if self._matrix is not None and self._valid[:n].any():
+            matrix = np.ascontiguousarray(self._matrix[:n][self._valid[:n]])
+        else:
+            matrix = np.zeros((0, self.dimension or 0), dtype=np.float32)
+
+        # Materialize rows before the old mapping is replaced
+        embedded = [d for d in docs if d.embedding is not None]
+        for doc, row in zip(embedded, matrix):
+            doc.embedding = row
+
+        tmp_vectors = self.vectors_path.with_suffix(".f32.tmp")
+        tmp_docs = self.docs_path.with_suffix(".jsonl.tmp")
+        matrix.tofile(tmp_vectors)
+
+        row = 0
+        with tmp_docs.open("w", encoding="utf-8") as f:
+            for doc in docs:
+                record_row = None
+                if doc.embedding is not None:
+                    record_row = row
+                    row += 1
+                f.write(json.dumps(self._doc_record(doc, record_row)) + "\n")
+
+        tmp_vectors.replace(self.vectors_path)
+        tmp_docs.replace(self.docs_path)
+        self.keyword_index.compact()
+        self._row_count = row
+        self._tombstones = 0
+        if embedded:
+            self._write_meta(matrix.shape[1])
+        logger.info(f"Compacted {len(docs)} documents into {self.vectors_path}")
+
     def load(self) -> None:
-        """Load documents from JSON file."""
-        if not self.persist_path.exists():
+        """Load the sidecar and memory-map the embedding segment."""
+        if not self.docs_path.exists():
             return
-            
+
         try:
-            data = json.loads(self.persist_path.read_text(encoding="utf-8"))
-            self.documents = [
-                Document(
-                    id=d["id"],
-                    text=d["text"],
-                    metadata=d["metadata"],
-                    embedding=d.get("embedding") # May be None
-                )
-                for d in data
-            ]
-            logger.info(f"Loaded {len(self.documents)} documents from {self.persist_path}")
+            meta = {}
+            if self.meta_path.exists():
+                meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+                self.dimension = meta.get("dim")
+
+            matrix = self._map_vectors()
+            documents: Dict[str, List[Document]] = {}
+            order: List[Tuple[Document, int]] = []
+            self._tombstones = 0
+
+            with self.docs_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write at the tail of the sidecar
+                        logger.warning(f"Skipping corrupt record in {self.docs_path}")
+                        continue
+
+                    if record.get("op") == "delete":
+                        removed = documents.pop(record["id"], [])
+                        self._tombstones += len(removed)
+                        continue
+
+                    row = record.get("row")
+                    embedding = None
+                    if row is not None:
+                        if matrix is None or row >= matrix.shape[0]:
+                            # Vector append did not complete, drop the record
+                            continue
+                        embedding = matrix[row]
+
+                    doc = Document(
+                        id=record["id"],
+                        text=record["text"],
+                        metadata=record.get("metadata") or {},
+                        embedding=embedding
+                    )
+                    documents.setdefault(doc.id, []).append(doc)
+                    order.append((doc, -1 if row is None else row))
+
+            live = {id(d) for docs in documents.values() for d in docs}
+            order = [(d, row) for d, row in order if id(d) in live]
+            self.documents = [d for d, _ in order]
+            self._row_count = matrix.shape[0] if matrix is not None else 0
+            self._index_rows(matrix, np.array([row for _, row in order], dtype=np.int64), meta)
+            self._sync_keyword_index()
+            logger.info(f"Loaded {len(self.documents)} documents from {self.docs_path}")
         except Exception as e:
             logger.error(f"Failed to load persistent store: {e}")
 
+    def _index_rows(self, matrix: Optional[np.ndarray], rows: np.ndarray, meta: Dict[str, Any]) -> None:
+        """Point the search matrix at the mapped segment, copying only if needed."""
+        if matrix is None or not meta.get("normalized"):
+            # Pre-normalization segment: rebuild from document embeddings
+            self._rebuild_index()
+            return
+
+        self._reset_index()
+        valid = rows >= 0
+        if valid.all() and np.array_equal(rows, np.arange(matrix.shape[0])):
+            # Compacted layout: search straight off the memory map
+            self._matrix = matrix
+        else:
+            self._matrix = np.zeros((len(rows), matrix.shape[1]), dtype=np.float32)
+            self._matrix[valid] = matrix[rows[valid]]
+        self._valid = valid
+        self._docs_by_id = {d.id: d for d in self.documents}
+
+    def migrate_legacy_json(self) -> int:
+        """
+        One-shot migration from the legacy ``<collection>.json`` format.
+
+        The legacy file is renamed to ``<collection>.json.migrated`` once the
+        binary files are written. Returns the number of migrated documents.
+        """
+        try:
+            data = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.error(f"Failed to read legacy store {self.legacy_path}: {e}")
+            return 0
+
+        self.documents = [
+            Document(
+                id=d["id"],
+                text=d["text"],
+                metadata=d["metadata"],
+                embedding=d.get("embedding") # May be None
+            )
+            for d in data
+        ]
+        self._rebuild_index()
+        self._sync_keyword_index()
+        self.compact()
+        self.legacy_path.replace(self.legacy_path.with_suffix(".json.migrated"))
+        logger.info(f"Migrated {len(self.documents)} documents from {self.legacy_path}")
+        return len(self.documents)
+
     def delete_collection(self) -> None:
-        """Delete json file and clear memory."""
+        """Delete collection files and clear memory."""
         super().delete_collection()
-        if self.persist_path.exists():
-            self.persist_path.unlink()
+        for path in (self.vectors_path, self.docs_path, self.meta_path, self.legacy_path):
+            if path.exists():
+                path.unlink()
+        self.dimension = None
+        self._row_count = 0
+        self._tombstones = 0
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        """Get store statistics including on-disk layout."""
+        stats = super().get_collection_stats()
+        stats.update({
+            "type": "simple_persistent",
+            "name": self.collection_name,
+            "dimension": self.dimension,
+            "rows": self._row_count,
+            "tombstones": self._tombstones,
+            "persist_directory": str(self.persist_directory)
+        })
+        return stats
+
+    def _append(self, documents: List[Document]) -> None:
+        """Append normalized vectors and sidecar records for new documents."""
+        n = len(self.documents)
+        start = n - len(documents)
+        valid = self._valid[start:n]
+        records = []
+        row = self._row_count
+
+        if valid.any():
+            rows = np.ascontiguousarray(self._matrix[start:n][valid])
+            if self.dimension is None:
+                self._write_meta(rows.shape[1])
+            elif rows.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {rows.shape[1]} does not match "
+                    f"collection dimension {self.dimension}"
+                )
+            # A failed earlier append may have left a partial or unrecorded row
+            self._truncate_vectors(self._row_count)
+            # Vectors first: a sidecar record never points at a missing row
+            with self.vectors_path.open("ab") as f:
+                f.write(rows.tobytes())
+
+        for doc, has_row in zip(documents, valid):
+            record_row = None
+            if has_row:
+                record_row = row
+                row += 1
+            records.append(json.dumps(self._doc_record(doc, record_row)))
+
+        with self.docs_path.open("a", encoding="utf-8") as f:
+            f.write("\n".join(records) + "\n")
+
+        self._row_count = row
+        logger.info(f"Appended {len(documents)} documents to {self.docs_path}")
+
+    def _sync_keyword_index(self) -> None:
+        """Rebuild the BM25 log if it is missing or out of step with the sidecar."""
+        if len(self.keyword_index) == len(self._docs_by_id) and all(
+            doc_id in self.keyword_index for doc_id in self._docs_by_id
+        ):
+            return
+        logger.info(f"Rebuilding BM25 index for collection '{self.collection_name}'")
+        self.keyword_index.clear()
+        self.keyword_index.add((d.id, d.text) for d in self._docs_by_id.values())
+
+    def _map_vectors(self) -> Optional[np.ndarray]:
+        """Memory-map the vector segment read-only."""
+        if not self.dimension or not self.vectors_path.exists():
+            return None
+        rows = self.vectors_path.stat().st_size // (4 * self.dimension)
+        # A torn write leaves a partial row; later appends must start on a row boundary
+        self._truncate_vectors(rows)
+        if rows == 0:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension)
+        )
 
+    def _truncate_vectors(self, rows: int) -> None:
+        """Cut the vector segment back to ``rows`` rows if it holds more bytes than that."""
+        size = 4 * self.dimension * rows
+        if self.vectors_path.exists() and self.vectors_path.stat().st_size > size:
+            logger.warning(f"Truncating {self.vectors_path} to {rows} rows after an incomplete append")
+            with self.vectors_path.open("r+b") as f:
+                f.truncate(size)
+
+    def _write_meta(self, dimension: int) -> None:
+        self.dimension = int(dimension)
+        self.meta_path.write_text(json.dumps({
+            "version": self.FORMAT_VERSION,
+            "dim": self.dimension,
+            "dtype": "float32",
+            "normalized": True
+        }), encoding="utf-8")
+
+    @staticmethod
+    def _doc_record(doc: Document, row: Optional[int]) -> Dict[str, Any]:
+        return {"id": doc.id, "text": doc.text, "metadata": doc.metadata, "row": row}
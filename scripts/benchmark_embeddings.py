@@ -0,0 +1,185 @@
+"""
+Benchmark local embedding / reranker backends: sentence-transformers (torch)
+against ONNX Runtime fp32 and int8 (see scripts/export_onnx.py).
+
+Corpus: paragraphs of the Markdown files matched by --corpus; queries: their
+headings. The first backend that loads (normally torch) is the reference.
+Reported per backend:
+  - load time, corpus throughput (texts/s), single-query p50 latency
+  - recall@k: overlap of each query's top-k documents with the reference's
+  - agreement: mean cosine between the backend's and the reference's vectors
+With --rerank, the cross-encoder is scored the same way on the reference's
+top candidates (pairs/s and recall@k of the reranked order).
+
+Usage:
+    python scripts/benchmark_embeddings.py
+    python scripts/benchmark_embeddings.py --backends torch,onnx-int8 --rerank --json bench.json
+"""
+
+import argparse
+import glob
+import json
+import logging
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from rag.model_registry import model_registry
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def load_corpus(pattern: str, max_docs: int, max_queries: int, seed: int = 0):
+    documents, queries = [], set()
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        text = Path(path).read_text(encoding="utf-8", errors="ignore")
+        for block in re.split(r"\n\s*\n", text):
+            block = block.strip()
+            heading = re.match(r"#+\s+(.{8,})", block)
+            if heading:
+                queries.add(heading.group(1).strip())
+            elif len(block) >= 40:
+                documents.append(block[:1000])
+    rng = random.Random(seed)
+    documents = rng.sample(documents, min(max_docs, len(documents)))
+    queries = rng.sample(sorted(queries), min(max_queries, len(queries)))
+    return documents, queries
+
+
+def top_k(query_vectors: np.ndarray, doc_vectors: np.ndarray, k: int) -> np.ndarray:
+    scores = query_vectors @ doc_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def recall_at_k(candidate: np.ndarray, reference: np.ndarray) -> float:
+    """Mean fraction of each row's reference top-k that the candidate also ranks in its top-k."""
+    k = reference.shape[1]
+    return float(np.mean([len(set(c) & set(r)) / k for c, r in zip(candidate, reference)]))
+
+
+def unit(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+def bench_embeddings(args, documents: List[str], queries: List[str]) -> Tuple[List[Dict], Optional[Dict]]:
+    results, reference = [], None
+    for backend in args.backends:
+        start = time.perf_counter()
+        try:
+            model = model_registry.sentence_transformer(args.model, backend=backend)
+            model.encode(["warm up"])
+        except Exception as e:
+            results.append({"backend": backend, "error": str(e)})
+            continue
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        doc_vectors = unit(model.encode(documents, batch_size=args.batch_size))
+        corpus_seconds = time.perf_counter() - start
+        query_vectors = unit(model.encode(queries, batch_size=args.batch_size))
+        latencies = []
+        for query in queries[:50]:
+            t = time.perf_counter()
+            model.encode([query])
+            latencies.append(time.perf_counter() - t)
+
+        ranked = top_k(query_vectors, doc_vectors, args.k)
+        if reference is None:
+            reference = {"backend": backend, "docs": doc_vectors, "queries": query_vectors, "ranked": ranked}
+        results.append({
+            "backend": backend,
+            "load_seconds": round(load_seconds, 2),
+            "texts_per_second": round(len(documents) / corpus_seconds, 1),
+            "query_p50_ms": round(1000 * statistics.median(latencies), 2),
+            f"recall@{args.k}": round(recall_at_k(ranked, reference["ranked"]), 4),
+            "agreement": round(float(np.mean(np.sum(doc_vectors * reference["docs"], axis=1))), 4),
+            "reference": reference["backend"],
+        })
+        model_registry.unload(name=args.model)
+    return results, reference
+
+
+def bench_reranker(args, documents: List[str], queries: List[str], candidates: np.ndarray) -> List[Dict]:
+    pairs = [(q, documents[i]) for q, row in zip(queries, candidates) for i in row]
+    per_query = candidates.shape[1]
+    results, reference = [], None
+    for backend in args.backends:
+        start = time.perf_counter()
+        try:
+            model = model_registry.cross_encoder(args.reranker, backend=backend)
+            model.predict([("warm", "up")])
+        except Exception as e:
+            results.append({"backend": backend, "error": str(e)})
+            continue
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = np.asarray(model.predict(pairs, batch_size=args.batch_size), dtype=np.float32)
+        seconds = time.perf_counter() - start
+        ranked = np.argsort(-scores.reshape(len(queries), per_query), axis=1)[:, :args.k]
+        if reference is None:
+            reference = (backend, ranked)
+        results.append({
+            "backend": backend,
+            "load_seconds": round(load_seconds, 2),
+            "pairs_per_second": round(len(pairs) / seconds, 1),
+            f"recall@{args.k}": round(recall_at_k(ranked, reference[1]), 4),
+            "reference": reference[0],
+        })
+        model_registry.unload(name=args.reranker)
+    return results
+
+
+def print_table(title: str, rows: List[Dict]) -> None:
+    print(f"\n{title}")
+    columns = list(dict.fromkeys(c for row in rows for c in row if c != "backend"))
+    print("  " + "backend".ljust(12) + "".join(c.ljust(20) for c in columns))
+    for row in rows:
+        print("  " + row["backend"].ljust(12) + "".join(str(row.get(c, "")).ljust(20) for c in columns))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare torch / ONNX / int8 embedding backends")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--reranker", default="cross-encoder/ms-marco-MiniLM-L-6-v2")
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8", type=lambda s: s.split(","))
+    parser.add_argument("--corpus", default="docs/**/*.md", help="Glob of Markdown files")
+    parser.add_argument("--docs", type=int, default=2000, help="Max corpus paragraphs")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--rerank", action="store_true", help="Also benchmark the cross-encoder")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    documents, queries = load_corpus(args.corpus, args.docs, args.queries)
+    if not documents or not queries:
+        raise SystemExit(f"No paragraphs/headings found for {args.corpus}")
+    print(f"Corpus: {len(documents)} paragraphs, {len(queries)} queries, k={args.k}")
+
+    report = {"model": args.model, "documents": len(documents), "queries": len(queries)}
+    report["embeddings"], reference = bench_embeddings(args, documents, queries)
+    print_table(f"Embeddings ({args.model})", report["embeddings"])
+
+    if args.rerank and reference is not None:
+        candidates = top_k(reference["queries"], reference["docs"], max(args.k * 3, 20))
+        report["reranker"] = bench_reranker(args, documents, queries, candidates)
+        print_table(f"Reranker ({args.reranker})", report["reranker"])
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Export a sentence-transformer or cross-encoder to ONNX and quantize it to int8.
+
+Writes ``<output>/onnx/model.onnx`` (fp32) and ``<output>/onnx/model_int8.onnx``
+(dynamic int8 weights) next to the tokenizer and pooling config, the layout
+``rag.onnx_backend`` loads. Select the result with ``models.embedding_backend``
+/ ``models.reranker_backend`` in ``config/rag_hybrid_config.yaml``.
+
+Exporting needs torch and transformers (installed with sentence-transformers);
+quantizing needs the ``onnx`` package. Serving needs only onnxruntime.
+If the fp32 graph already exists, e.g. the one bundled with
+``rag/models/all-MiniLM-L6-v2`` after ``git lfs pull``, only quantization runs.
+
+Usage:
+    python scripts/export_onnx.py --model all-MiniLM-L6-v2
+    python scripts/export_onnx.py --model cross-encoder/ms-marco-MiniLM-L-6-v2 --kind cross_encoder
+"""
+
+import argparse
+import logging
+import shutil
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from rag.model_registry import CROSS_ENCODER, LOCAL_MODELS_DIR, SENTENCE_TRANSFORMER
+from rag.onnx_backend import FP32_FILE, INT8_FILE, OnnxCrossEncoder, OnnxSentenceEncoder, onnx_file
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# sentence-transformers metadata rag.onnx_backend reads for pooling/normalization
+ST_FILES = ["modules.json", "sentence_bert_config.json", "1_Pooling/config.json"]
+
+
+def has_graph(output: Path, quantized: bool = False) -> bool:
+    try:
+        onnx_file(output, quantized)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def has_weights(model_dir: Path) -> bool:
+    """True if the directory holds real weights, not just git-lfs pointers."""
+    for name in ("model.safetensors", "pytorch_model.bin"):
+        path = model_dir / name
+        if path.exists() and path.stat().st_size > 1024:
+            return True
+    return False
+
+
+def export_fp32(source: str, output: Path, kind: str, opset: int) -> None:
+    """Trace the Hugging Face model with torch and write the fp32 ONNX graph."""
+    import torch
+    from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model_cls = AutoModelForSequenceClassification if kind == CROSS_ENCODER else AutoModel
+    model = model_cls.from_pretrained(source).eval()
+
+    class FirstOutput(torch.nn.Module):
+        # last_hidden_state for encoders (pooling happens at inference), logits for cross-encoders
+        def __init__(self, wrapped):
+            super().__init__()
+            self.wrapped = wrapped
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.wrapped(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+            )[0]
+
+    sample = tokenizer(["an example query"], ["an example passage"], return_tensors="pt")
+    if "token_type_ids" not in sample:
+        sample["token_type_ids"] = torch.zeros_like(sample["input_ids"])
+    output_name = "logits" if kind == CROSS_ENCODER else "last_hidden_state"
+    target = output / FP32_FILE
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    with torch.no_grad():
+        torch.onnx.export(
+            FirstOutput(model),
+            (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+            str(target),
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=[output_name],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "token_type_ids": {0: "batch", 1: "sequence"},
+                output_name: {0: "batch"} if kind == CROSS_ENCODER else {0: "batch", 1: "sequence"},
+            },
+            opset_version=opset,
+        )
+    tokenizer.save_pretrained(str(output))
+    model.config.save_pretrained(str(output))
+    logger.info(f"Exported {source} -> {target}")
+
+
+def copy_sentence_transformer_files(source: str, output: Path) -> None:
+    source_dir = Path(source)
+    for name in ST_FILES:
+        target = output / name
+        if target.exists():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if source_dir.is_dir() and (source_dir / name).exists():
+            shutil.copy(source_dir / name, target)
+            continue
+        try:
+            from huggingface_hub import hf_hub_download
+            shutil.copy(hf_hub_download(source, name), target)
+        except Exception as e:
+            logger.warning(f"Could not fetch {name} ({e}); mean pooling without normalization will be used")
+
+
+def quantize(output: Path) -> None:
+    """Dynamic int8 quantization of the weights; activations stay float and are quantized per batch."""
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise SystemExit(f"Quantization needs onnxruntime and onnx (pip install onnx): {e}")
+    quantize_dynamic(
+        model_input=str(onnx_file(output)),
+        model_output=str(output / INT8_FILE),
+        weight_type=QuantType.QInt8,
+    )
+    logger.info(f"Quantized -> {output / INT8_FILE}")
+
+
+def verify(output: Path, kind: str, quantized: bool) -> None:
+    start = time.perf_counter()
+    if kind == CROSS_ENCODER:
+        scores = OnnxCrossEncoder(output, quantized=quantized).predict([("what is rag", "retrieval augmented generation")])
+        detail = f"score={float(scores[0]):.4f}"
+    else:
+        vectors = OnnxSentenceEncoder(output, quantized=quantized).encode(["what is rag"])
+        detail = f"dim={vectors.shape[1]}"
+    size_mb = (output / (INT8_FILE if quantized else FP32_FILE)).stat().st_size / 1e6
+    logger.info(f"{'int8' if quantized else 'fp32'}: {size_mb:.1f} MB, {detail}, "
+                f"load+infer {time.perf_counter() - start:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export a local embedding/reranker model to ONNX (+int8)")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="Hub name or local model directory")
+    parser.add_argument("--kind", choices=[SENTENCE_TRANSFORMER, CROSS_ENCODER], default=SENTENCE_TRANSFORMER)
+    parser.add_argument("--output", help="Target directory (default: rag/models/<model basename>)")
+    parser.add_argument("--no-quantize", action="store_true", help="Only write the fp32 graph")
+    parser.add_argument("--force", action="store_true", help="Re-export even if the fp32 graph exists")
+    parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else LOCAL_MODELS_DIR / args.model.rstrip("/").rsplit("/", 1)[-1]
+    source = args.model
+    if not Path(source).is_dir() and has_weights(output):
+        # Export from the local copy (e.g. the bundled model) rather than downloading it again
+        source = str(output)
+    if args.kind == SENTENCE_TRANSFORMER and "/" not in source and not Path(source).is_dir():
+        source = f"sentence-transformers/{source}"
+
+    if args.force or not has_graph(output):
+        export_fp32(source, output, args.kind, args.opset)
+    else:
+        logger.info(f"Using existing {output / FP32_FILE}")
+    if args.kind == SENTENCE_TRANSFORMER:
+        copy_sentence_transformer_files(source, output)
+    verify(output, args.kind, quantized=False)
+
+    if not args.no_quantize:
+        quantize(output)
+        verify(output, args.kind, quantized=True)
+
+    print(f"\nSUCCESS: ONNX model(s) written to {output / 'onnx'}")
+    print("Compare against sentence-transformers with: python scripts/benchmark_embeddings.py")
+
+
+if __name__ == "__main__":
+    main()
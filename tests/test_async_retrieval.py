@@ -0,0 +1,69 @@
+"""
+Tests for the bounded async retrieval pool.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from rag.async_retrieval import RetrievalExecutor
+
+
+def test_run_offloads_and_returns_result():
+    executor = RetrievalExecutor(max_workers=2)
+    main_thread = threading.get_ident()
+
+    def work(x, scale=1):
+        return threading.get_ident(), x * scale
+
+    thread_id, value = asyncio.run(executor.run(work, 3, scale=2))
+
+    assert value == 6
+    assert thread_id != main_thread
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+
+def test_concurrency_is_bounded_and_loop_stays_responsive():
+    executor = RetrievalExecutor(max_workers=2)
+    peak = []
+
+    def slow():
+        peak.append(executor.stats()["in_flight"])
+        time.sleep(0.05)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        tick_task = asyncio.create_task(ticker())
+        await asyncio.gather(*(executor.run(slow) for _ in range(6)))
+        tick_task.cancel()
+        return ticks
+
+    ticks = asyncio.run(main())
+
+    assert max(peak) <= 2
+    assert ticks > 5
+    stats = executor.stats()
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+    executor.shutdown()
+
+
+def test_failures_propagate_and_are_counted():
+    executor = RetrievalExecutor(max_workers=1)
+
+    def boom():
+        raise ValueError("bad query")
+
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(boom))
+    assert executor.stats()["failed"] == 1
+    executor.shutdown()
@@ -0,0 +1,142 @@
+"""
+Tests for the BM25 keyword index and hybrid (RRF) search.
+"""
+
+import sys
+import threading
+
+from rag.bm25_index import BM25Index, tokenize
+from rag.mock_embeddings import MockEmbeddingsProvider
+from rag.vector_store import Document, SimplePersistentVectorStore
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    tokens = tokenize("DynButton raised CS0246 in policy_holder")
+
+    assert "dynbutton" in tokens and "dyn" in tokens and "button" in tokens
+    assert "cs0246" in tokens
+    assert "policy_holder" in tokens and "holder" in tokens
+
+
+def test_exact_identifier_ranks_first():
+    index = BM25Index()
+    index.add([
+        ("a", "A generic button component with icons"),
+        ("b", "DynButton renders the primary action button"),
+        ("c", "Form layout grid and spacing"),
+    ])
+
+    hits = index.search("DynButton", top_k=2)
+
+    assert hits[0][0] == "b"
+    assert index.search("nonexistent", top_k=3) == []
+
+
+def test_remove_and_upsert():
+    index = BM25Index()
+    index.add([("a", "alpha beta"), ("b", "beta gamma")])
+    index.remove("a")
+    index.add([("b", "delta")])
+
+    assert index.search("beta") == []
+    assert [doc_id for doc_id, _ in index.search("delta")] == ["b"]
+
+
+def test_log_replay_and_compact(tmp_path):
+    path = tmp_path / "docs.bm25.jsonl"
+    index = BM25Index(str(path))
+    index.add([("a", "alpha"), ("b", "beta")])
+    index.remove("a")
+
+    reloaded = BM25Index(str(path))
+    assert len(reloaded) == 1
+    assert reloaded.search("alpha") == []
+
+    reloaded.compact()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    assert [doc_id for doc_id, _ in BM25Index(str(path)).search("beta")] == ["b"]
+
+
+def test_log_compacts_itself_once_mostly_stale(tmp_path):
+    path = tmp_path / "docs.bm25.jsonl"
+    index = BM25Index(str(path))
+    index.COMPACT_MIN_TOMBSTONES = 4
+    index.add([("a", "alpha"), ("b", "beta")])
+    for i in range(4):
+        index.add([("a", f"alpha {i}")])  # upserts supersede earlier records
+
+    # The fifth stale record crossed the threshold and the log was rewritten
+    index.remove("b")
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    assert [doc_id for doc_id, _ in BM25Index(str(path)).search("alpha")] == ["a"]
+
+
+def test_concurrent_writers_and_searches(tmp_path):
+    path = tmp_path / "docs.bm25.jsonl"
+    index = BM25Index(str(path))
+    index.COMPACT_MIN_TOMBSTONES = 50
+    errors = []
+
+    def write(worker):
+        for i in range(300):
+            doc_id = f"d{worker}_{i % 40}"
+            index.add([(doc_id, f"alpha beta worker{worker} item{i}")])
+            if i % 3 == 0:
+                index.remove(doc_id)
+
+    def read():
+        for _ in range(300):
+            index.search("alpha beta item7", top_k=5)
+
+    def guarded(target, *args):
+        try:
+            target(*args)
+        except Exception as e:  # surfaced by the assertion below
+            errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=guarded, args=(write, w)) for w in range(3)]
+        threads += [threading.Thread(target=guarded, args=(read,)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert not errors
+    # The log replays to exactly the live index
+    replayed = BM25Index(str(path))
+    assert len(replayed) == len(index)
+    assert dict(replayed.search("alpha", top_k=200)) == dict(index.search("alpha", top_k=200))
+
+
+def test_store_keyword_and_hybrid_search(tmp_path):
+    provider = MockEmbeddingsProvider()
+    store = SimplePersistentVectorStore(
+        collection_name="docs",
+        persist_directory=str(tmp_path),
+        embedding_function=provider.embed_texts,
+    )
+    store.add_documents([
+        Document(id="btn", text="DynButton component", metadata={"type": "ui_component"}),
+        Document(id="tok", text="DynButton color token", metadata={"type": "design_token"}),
+        Document(id="grid", text="Grid layout component", metadata={"type": "ui_component"}),
+    ])
+
+    hits = store.keyword_search("DynButton", top_k=5, filter_metadata={"type": "ui_component"})
+    assert [r.document.id for r in hits] == ["btn"]
+
+    hybrid = store.hybrid_search("DynButton", top_k=3)
+    assert hybrid[0].document.id in {"btn", "tok"}
+    assert {r.document.id for r in hybrid} == {"btn", "tok", "grid"}
+
+    store.delete_document("btn")
+    reloaded = SimplePersistentVectorStore(
+        collection_name="docs",
+        persist_directory=str(tmp_path),
+        embedding_function=provider.embed_texts,
+    )
+    assert [r.document.id for r in reloaded.keyword_search("DynButton")] == ["tok"]
@@ -0,0 +1,59 @@
+"""
+Tests for the tiered LLM response cache.
+"""
+
+import time
+
+from core.cache_manager import SQLiteCacheBackend, TieredResponseCache
+
+
+def make_cache(tmp_path, **kwargs):
+    return TieredResponseCache(SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")), **kwargs)
+
+
+def test_set_get_roundtrip_persists_after_flush(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("prompt", "gpt-5-mini", {"content": "hi"}, tier="tier_1_rules")
+
+    # Served from memory before the write-behind queue drains
+    assert cache.get("prompt", "gpt-5-mini", tier="tier_1_rules") == {"content": "hi"}
+    assert cache.get("prompt", "gpt-5-mini", tier="default") is None
+    cache.close()
+
+    reopened = make_cache(tmp_path)
+    assert reopened.get("prompt", "gpt-5-mini", tier="tier_1_rules") == {"content": "hi"}
+    stats = reopened.stats()
+    assert stats["hits"] == 1 and stats["disk_entries"] == 1
+    reopened.close()
+
+
+def test_tier_ttl_expires_entries(tmp_path):
+    cache = make_cache(tmp_path, tier_ttls={"short": 0.05})
+    cache.set("p", "m", "old", tier="short")
+    cache.set("p", "m", "kept", tier="default")
+    cache.flush()
+    time.sleep(0.1)
+
+    assert cache.get("p", "m", tier="short") is None
+    cache.sweep()
+    assert cache.stats()["disk_entries"] == 1
+    assert cache.get("p", "m", tier="default") == "kept"
+    cache.close()
+
+
+def test_lru_eviction_respects_entry_limit(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2, memory_entries=1)
+    cache.set("a", "m", "A")
+    cache.set("b", "m", "B")
+    cache.flush()
+    assert cache.get("a", "m") == "A"  # touch "a" so "b" is least recent
+    cache.flush()
+    cache.set("c", "m", "C")
+    cache.flush()
+
+    stats = cache.stats()
+    assert stats["disk_entries"] == 2
+    assert stats["evictions"] == 1
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == "A"
+    cache.close()
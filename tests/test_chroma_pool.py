@@ -0,0 +1,82 @@
+"""
+Tests for the process-wide Chroma client pool.
+"""
+
+import gc
+import threading
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from rag.chroma_pool import ChromaClientPool, chroma_pool
+from rag.mock_embeddings import MockEmbeddingsProvider
+from rag.vector_store import ChromaVectorStore, Document
+
+
+def test_pool_shares_clients_and_collections(tmp_path):
+    pool = ChromaClientPool()
+    first = pool.acquire_collection(str(tmp_path), "pooled_docs")
+    second = pool.acquire_collection(str(tmp_path), "pooled_docs")
+
+    assert first is second
+    assert pool.get_client(str(tmp_path)) is pool.get_client(str(tmp_path / "." ))
+    assert pool.stats()["active_references"] == 2
+    assert pool.stats()["collection_creations"] == 1
+
+
+def test_pool_evicts_only_idle_unreferenced_entries(tmp_path):
+    pool = ChromaClientPool(idle_timeout=0)
+    held = pool.acquire_collection(str(tmp_path), "held_docs")
+    idle = pool.acquire_collection(str(tmp_path), "idle_docs")
+    pool.release_collection(idle)
+
+    pool.get_client(str(tmp_path))
+
+    assert pool.stats()["collections"] == 1
+    assert pool.stats()["clients"] == 1
+    pool.release_collection(held)
+
+
+def test_vector_stores_release_references_when_collected(tmp_path):
+    provider = MockEmbeddingsProvider()
+    store = ChromaVectorStore("pool_store", str(tmp_path), embedding_function=provider.embed_texts)
+    store.add_documents([Document(id="a", text="DynButton", metadata={"type": "ui"})])
+    other = ChromaVectorStore("pool_store", str(tmp_path), embedding_function=provider.embed_texts)
+
+    assert other.collection is store.collection
+    assert [r.document.id for r in other.keyword_search("DynButton")] == ["a"]
+
+    entry = store._pooled
+    del store, other
+    gc.collect()
+    assert entry.refs == 0
+    chroma_pool.invalidate_collection(str(tmp_path), "pool_store")
+
+
+def test_cold_keyword_index_is_backfilled_once(tmp_path):
+    pool = ChromaClientPool()
+    entry = pool.acquire_collection(str(tmp_path), "cold_docs")
+    provider = MockEmbeddingsProvider()
+    texts = [f"component DynButton{i}" for i in range(50)]
+    entry.collection.add(
+        ids=[f"c{i}" for i in range(50)], documents=texts, embeddings=provider.embed_texts(texts)
+    )
+    log = tmp_path / "cold_docs.bm25.jsonl"
+    assert len(entry.keyword_index) == 0
+
+    start = threading.Barrier(4)
+
+    def backfill():
+        start.wait()
+        entry.ensure_keyword_index(page_size=5)
+
+    threads = [threading.Thread(target=backfill) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(entry.keyword_index) == 50
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 50
+    pool.release_collection(entry)
@@ -0,0 +1,83 @@
+"""
+Tests for micro-batched embedding calls.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from rag.embedding_batcher import EmbeddingBatcher
+from rag.embeddings_provider import BatchedEmbeddings, create_embeddings_provider
+
+
+def slow_encoder(calls, delay=0.02):
+    def encode(texts):
+        calls.append(list(texts))
+        time.sleep(delay)
+        return [[float(len(t)), float(i)] for i, t in enumerate(texts)]
+    return encode
+
+
+def test_concurrent_threads_share_encode_calls():
+    calls = []
+    batcher = EmbeddingBatcher(slow_encoder(calls), max_batch_size=64, max_wait_ms=20)
+    results = {}
+    texts = [f"query {i}" for i in range(12)] + ["query 0"] * 4
+    start = threading.Barrier(len(texts))
+
+    def worker(i, text):
+        start.wait()
+        results[i] = batcher.embed([text])
+
+    threads = [threading.Thread(target=worker, args=(i, t)) for i, t in enumerate(texts)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) < len(texts)
+    assert all(results[i][0][0] == float(len(text)) for i, text in enumerate(texts))
+    stats = batcher.stats()
+    assert stats["requests"] == 16 and stats["texts"] == 16 and stats["queue_depth"] == 0
+    # The repeated text is encoded once per batch it lands in
+    assert sum(len(c) for c in calls) == 16 - stats["deduplicated"] and stats["deduplicated"] > 0
+    assert sum(stats["batch_size_histogram"].values()) == len(calls)
+    batcher.close()
+
+
+def test_async_callers_errors_and_bulk_bypass():
+    calls = []
+    batcher = EmbeddingBatcher(slow_encoder(calls, delay=0), max_batch_size=4, max_wait_ms=10)
+
+    async def run():
+        return await asyncio.gather(*(batcher.aembed([f"t{i}"]) for i in range(3)))
+
+    singles = asyncio.run(run())
+    assert [r[0][0] for r in singles] == [2.0, 2.0, 2.0] and calls == [["t0", "t1", "t2"]]
+
+    # A request that already fills a batch is encoded directly
+    bulk = batcher.embed(["a", "bb", "ccc", "dddd", "eeeee"])
+    assert [v[0] for v in bulk] == [1, 2, 3, 4, 5] and batcher.stats()["bypassed"] == 1
+
+    def failing(texts):
+        raise RuntimeError("model crashed")
+
+    broken = EmbeddingBatcher(failing, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="model crashed"):
+        broken.embed(["x"])
+    assert broken.embed([]) == []
+    batcher.close()
+    broken.close()
+
+
+def test_providers_of_the_same_model_share_a_batcher():
+    first = create_embeddings_provider("mock", model="batch-test-model", use_cache=False, batching=True)
+    second = create_embeddings_provider("mock", model="batch-test-model", use_cache=False, batching=True)
+    plain = create_embeddings_provider("mock", model="batch-test-model", use_cache=False, batching=False)
+
+    assert isinstance(first, BatchedEmbeddings) and first.batcher is second.batcher
+    assert not isinstance(plain, BatchedEmbeddings)
+    assert first.embed_query("hello") == plain.embed_query("hello")
+    assert first.dimension == plain.dimension
@@ -0,0 +1,78 @@
+"""
+Tests for the sharded embedding cache.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+from rag.embedding_cache import ShardedEmbeddingCache
+from rag.embeddings_provider import CachedEmbeddings
+from rag.mock_embeddings import MockEmbeddingsProvider
+
+
+def _key(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def test_entries_are_sharded_and_appended(tmp_path):
+    cache = ShardedEmbeddingCache(str(tmp_path))
+    cache.put_many({_key("a"): [1.0, 2.0], _key("b"): [3.0, 4.0]})
+    shard = cache.shard_dir / f"{_key('a')[:2]}.bin"
+    size = shard.stat().st_size
+
+    cache.put_many({_key("a"): [9.0, 9.0]})
+
+    assert shard.stat().st_size == size
+    assert (cache.shard_dir / f"{_key('b')[:2]}.bin").exists()
+    np.testing.assert_array_equal(cache.get(_key("a")), np.array([1.0, 2.0], dtype=np.float32))
+
+
+def test_other_process_writes_become_visible(tmp_path):
+    reader = ShardedEmbeddingCache(str(tmp_path))
+    writer = ShardedEmbeddingCache(str(tmp_path))
+    assert reader.get(_key("x")) is None
+
+    writer.put_many({_key("x"): [0.5, 0.25]})
+
+    np.testing.assert_array_equal(reader.get(_key("x")), np.array([0.5, 0.25], dtype=np.float32))
+    assert len(reader) == 1
+
+
+def test_memory_layer_is_bounded(tmp_path):
+    cache = ShardedEmbeddingCache(str(tmp_path), max_memory_entries=2)
+    cache.put_many({_key(str(i)): [float(i)] for i in range(5)})
+
+    assert cache.stats()["memory_entries"] == 2
+    assert cache.get(_key("0"))[0] == 0.0
+
+
+def test_torn_tail_record_is_ignored_and_truncated(tmp_path):
+    cache = ShardedEmbeddingCache(str(tmp_path))
+    cache.put_many({_key("a"): [1.0, 2.0]})
+    shard = cache.shard_dir / f"{_key('a')[:2]}.bin"
+    with shard.open("ab") as f:
+        f.write(b"\x00" * 10)
+
+    fresh = ShardedEmbeddingCache(str(tmp_path))
+    assert fresh.get(_key("a")) is not None
+    fresh.put_many({_key("a")[:2] + "0" * 62: [3.0, 4.0]})
+    assert ShardedEmbeddingCache(str(tmp_path)).get(_key("a")[:2] + "0" * 62)[1] == 4.0
+
+
+def test_cached_embeddings_imports_legacy_json_once(tmp_path):
+    provider = MockEmbeddingsProvider()
+    legacy = tmp_path / "embeddings_cache.json"
+    legacy.write_text(json.dumps({_key("hello"): [0.1] * 384}))
+
+    cached = CachedEmbeddings(provider, str(legacy))
+    calls = []
+    provider.embed_texts = lambda texts: calls.append(texts) or MockEmbeddingsProvider().embed_texts(texts)
+
+    result = cached.embed_texts(["hello", "world", "world"])
+
+    assert calls == [["world"]]
+    assert np.allclose(result[0], 0.1)
+    assert result[1] == result[2]
+    assert (tmp_path / "embeddings_cache" / ".imported_json").exists()
@@ -0,0 +1,94 @@
+"""
+Tests for the signature-indexed Experience Database.
+"""
+
+import sqlite3
+
+import pytest
+
+from core.memory.experience_db import ExperienceDB, normalize_error
+
+INDEX_ERROR = 'Traceback (most recent call last):\n  File "{path}", line {line}, in run\nIndexError: list index out of range'
+
+
+def test_same_error_in_different_files_shares_one_experience(tmp_path):
+    db = ExperienceDB(str(tmp_path / "exp.db"))
+    assert ExperienceDB(str(tmp_path / "exp.db")) is db
+
+    db.record_fix(INDEX_ERROR.format(path="/srv/a.py", line=12), "Guard the index with len()")
+    db.record_fix(INDEX_ERROR.format(path="/home/me/b.py", line=3), "Guard the index with len()")
+
+    assert normalize_error("KeyError: 'user_42' at 0x7f3a in /srv/app.py") == "KeyError: <str> at <addr> in <path>"
+    [match] = db.find_similar_error(INDEX_ERROR.format(path="/tmp/c.py", line=99))
+    assert match["success_count"] == 2 and match["similarity"] > 0.99
+    assert match["signature"] == "IndexError: list index out of range"
+    db.close()
+
+
+def test_ranks_by_similarity_and_success_count(tmp_path):
+    db = ExperienceDB(str(tmp_path / "exp.db"))
+    db.record_fix("ModuleNotFoundError: No module named 'requests'", "pip install it")
+    for _ in range(4):
+        db.record_fix("ModuleNotFoundError: No module named 'requests'", "add it to requirements.txt")
+    db.record_fix("TypeError: unsupported operand type(s) for +: 'int' and 'str'", "cast to str")
+
+    fixes = db.find_similar_error("ModuleNotFoundError: No module named 'numpy'", top_k=5)
+
+    assert [f["fix_strategy"] for f in fixes] == ["add it to requirements.txt", "pip install it"]
+    assert fixes[0]["score"] > fixes[1]["score"]
+    assert db.find_similar_error("ModuleNotFoundError: No module named 'numpy'", top_k=1)[0]["success_count"] == 4
+    db.close()
+
+
+def test_migrates_legacy_rows_and_falls_back_to_keyword_search(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE experiences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, error_pattern TEXT NOT NULL, fix_strategy TEXT NOT NULL,
+            context_hash TEXT, timestamp TEXT, success_count INTEGER DEFAULT 1
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO experiences (error_pattern, fix_strategy, success_count) VALUES (?, ?, ?)",
+        [("ZeroDivisionError: division by zero at line 4", "check divisor", 2),
+         ("ZeroDivisionError: division by zero at line 80", "check divisor", 3)]
+    )
+    conn.commit()
+    conn.close()
+
+    db = ExperienceDB(str(path))
+    # Both legacy rows normalize to the same signature and are merged
+    [match] = db.find_similar_error("ZeroDivisionError: division by zero at line 7")
+    assert match["success_count"] == 5
+    db.close()
+
+    service = {"up": True}
+
+    def remote_embedder(texts):
+        if not service["up"]:
+            raise RuntimeError("embedding service down")
+        return [[1.0, 0.0] for _ in texts]
+
+    # A different embedder re-embeds stored rows; when it goes down, FTS5 answers
+    db = ExperienceDB(str(path), embedder=remote_embedder)
+    service["up"] = False
+    assert db.fts_enabled
+    [match] = db.find_similar_error("float division by zero in ratio()")
+    assert match["fix_strategy"] == "check divisor" and 0 < match["similarity"] < 1
+    db.close()
+
+
+def test_reopening_with_a_different_embedder_raises(tmp_path):
+    def embedder(texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    db = ExperienceDB(str(tmp_path / "exp.db"))
+    with pytest.raises(ValueError):
+        ExperienceDB(str(tmp_path / "exp.db"), embedder=embedder)
+    db.close()
+
+    db = ExperienceDB(str(tmp_path / "exp.db"), embedder=embedder)
+    assert ExperienceDB(str(tmp_path / "exp.db")) is db
+    assert ExperienceDB(str(tmp_path / "exp.db"), embedder=embedder) is db
+    db.close()
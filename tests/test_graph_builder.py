@@ -0,0 +1,68 @@
+"""
+Tests for incremental Knowledge Graph builds.
+"""
+
+import asyncio
+
+from core.graph.builder import GraphBuilder
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_rebuild_reingests_only_changed_and_deleted_files(tmp_path):
+    src = tmp_path / "src"
+    write(src / "a.py", "class A:\n    pass\n")
+    write(src / "b.py", "def b():\n    pass\n")
+    write(src / "node_modules" / "x.js", "function x() {}\n")
+    builder = GraphBuilder(max_workers=1)
+
+    async def run():
+        first = await builder.build(str(src))
+        snapshot = builder.graph
+
+        write(src / "a.py", "class A2:\n    pass\n")
+        (src / "b.py").unlink()
+        write(src / "c.ts", "export class C {}\n")
+        second = await builder.build(str(src))
+        return first, snapshot, second
+
+    first, snapshot, second = asyncio.run(run())
+
+    assert first["state"] == "completed" and first["files_changed"] == 2
+    assert second["files_changed"] == 2 and second["files_deleted"] == 1
+    a, c = str((src / "a.py").resolve()), str((src / "c.ts").resolve())
+    assert f"class:A2:{a}" in builder.graph.nodes and f"class:A:{a}" not in builder.graph.nodes
+    assert f"class:C:{c}" in builder.graph.nodes
+    assert not any(n.name == "b" for n in builder.graph.nodes.values())
+    # The first snapshot was never mutated: readers holding it saw a consistent graph
+    assert f"class:A:{a}" in snapshot.nodes and f"class:A2:{a}" not in snapshot.nodes
+    assert {e.target_id for e in builder.graph.edges if e.source_id == f"file:{a}"} == {f"class:A2:{a}"}
+
+
+def test_background_build_swaps_snapshot_and_persists_hashes(tmp_path):
+    src = tmp_path / "src"
+    for i in range(12):
+        write(src / f"m{i}.py", f"def f{i}():\n    pass\n")
+    swapped = []
+    builder = GraphBuilder(max_workers=2, inline_threshold=4, cache_dir=str(tmp_path / "cache"),
+                           on_swap=swapped.append)
+
+    async def run():
+        assert builder.start(str(src))
+        assert not builder.start(str(src))
+        assert builder.status["state"] == "running"
+        return await builder.wait()
+
+    status = asyncio.run(run())
+
+    assert status["state"] == "completed" and status["parsed"] == 12
+    assert swapped == [builder.graph] and len(builder.graph.nodes) == 24
+
+    # A new builder resumes from the cache: nothing needs re-parsing
+    restarted = GraphBuilder(cache_dir=str(tmp_path / "cache"))
+    assert len(restarted.graph.nodes) == 24
+    again = asyncio.run(restarted.build(str(src)))
+    assert again["files_changed"] == 0 and again["nodes"] == 24
@@ -0,0 +1,45 @@
+"""
+Tests for the shared LLM provider HTTP pools.
+"""
+
+import asyncio
+
+from core.http_pool import HTTPClientPool
+
+
+def test_client_is_reused_per_provider_and_loop():
+    pool = HTTPClientPool(config={"max_connections": 7, "providers": {"anthropic": {"max_connections": 3}}})
+
+    async def main():
+        first = pool.client("openai")
+        assert pool.client("openai") is first
+        assert pool.client("anthropic") is not first
+        return first
+
+    first = asyncio.run(main())
+    second = asyncio.run(main())
+
+    # A new event loop gets a fresh client
+    assert second is not first
+    assert pool.settings("openai")["max_connections"] == 7
+    assert pool.settings("anthropic")["max_connections"] == 3
+    assert pool.stats()["openai"]["clients_created"] == 2
+
+
+def test_track_reports_utilization_and_aclose_closes_clients():
+    pool = HTTPClientPool(config={"max_connections": 4})
+
+    async def main():
+        client = pool.client("openai")
+        with pool.track("openai"), pool.track("openai"):
+            stats = pool.stats()["openai"]
+            assert stats["in_flight"] == 2
+            assert stats["utilization"] == 0.5
+        await pool.aclose()
+        return client
+
+    client = asyncio.run(main())
+
+    assert client.is_closed
+    stats = pool.stats()["openai"]
+    assert stats["in_flight"] == 0 and stats["peak_in_flight"] == 2 and stats["requests"] == 2
@@ -0,0 +1,177 @@
+"""
+Tests for the streaming, incremental knowledge ingestion pipeline.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from api.event_bus import bus
+from rag.ingest_pipeline import IngestJob, IngestionPipeline
+from rag.vector_store import InMemoryVectorStore
+
+
+class RecordingStore(InMemoryVectorStore):
+    """In-memory store that records the size of every upsert batch."""
+
+    def __init__(self, delay=0.0):
+        super().__init__(embedding_function=lambda texts: [[float(len(t)), 1.0] for t in texts])
+        self.batches = []
+        self.delay = delay
+
+    def upsert_documents(self, documents):
+        self.batches.append(len(documents))
+        time.sleep(self.delay)  # stands in for embedding time
+        super().upsert_documents(documents)
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def pipeline_for(store, tmp_path, **kwargs):
+    return IngestionPipeline(store_factory=lambda name: store, manifest_dir=str(tmp_path / "manifests"), **kwargs)
+
+
+def files_in(store):
+    return sorted({doc.metadata["file"] for doc in store.documents})
+
+
+def test_rerun_processes_only_changed_and_deleted_files(tmp_path):
+    docs = tmp_path / "docs"
+    write(docs / "a.md", "# A\n\nalpha " * 20)
+    write(docs / "b.md", "# B\n\nbeta " * 20)
+    write(docs / "node_modules" / "x.md", "ignored")
+    store = RecordingStore()
+    pipeline = pipeline_for(store, tmp_path, max_workers=1)
+    job = lambda: IngestJob(collection="docs", path=str(docs), file_filter="*.md")
+
+    first = asyncio.run(pipeline.run(job()))
+    assert first["state"] == "completed" and first["files_changed"] == 2
+    assert files_in(store) == ["a.md", "b.md"]
+    b_ids = {doc.id for doc in store.documents if doc.metadata["file"] == "b.md"}
+
+    # Nothing changed: no reads beyond stat, no store writes
+    upserts = len(store.batches)
+    second = asyncio.run(pipeline.run(job()))
+    assert second["files_skipped"] == 2 and second["files_changed"] == 0 and len(store.batches) == upserts
+
+    # Touched but identical content is hashed and skipped
+    stat = os.stat(docs / "b.md")
+    os.utime(docs / "b.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    write(docs / "a.md", "# A2\n\nchanged")
+    write(docs / "c.md", "# C\n\ngamma")
+    (docs / "b.md").rename(tmp_path / "b.md")
+    third = asyncio.run(pipeline.run(job()))
+
+    assert third["files_changed"] == 2 and third["files_deleted"] == 1
+    assert files_in(store) == ["a.md", "c.md"]
+    assert not b_ids & {doc.id for doc in store.documents}
+    assert [doc.text for doc in store.documents if doc.metadata["file"] == "a.md"] == ["# A2\n\nchanged"]
+    manifest = json.loads((tmp_path / "manifests" / "docs.json").read_text())
+    assert sorted(os.path.basename(p) for p in manifest) == ["a.md", "c.md"]
+
+    # Different chunk settings re-ingest everything
+    fourth = asyncio.run(pipeline.run(IngestJob(collection="docs", path=str(docs), file_filter="*.md", tier=1)))
+    assert fourth["files_changed"] == 2
+
+
+def test_process_pool_chunks_in_bounded_batches_and_reports_progress(tmp_path):
+    docs = tmp_path / "docs"
+    for i in range(12):
+        write(docs / f"m{i}.py", "\n\n".join(f"def f{i}_{j}():\n    return {j}\n" for j in range(3)))
+    store = RecordingStore()
+    pipeline = pipeline_for(store, tmp_path, max_workers=2, inline_threshold=4, batch_size=5, max_in_flight=3)
+
+    async def run():
+        events = bus.subscribe()
+        try:
+            job = pipeline.start(IngestJob(collection="code", path=str(docs), file_filter="*.py"))
+            assert pipeline.start(IngestJob(collection="code", path=str(docs))) is job
+            assert job.status["state"] == "running"
+            status = await pipeline.wait(job.id)
+            published = []
+            while not events.empty():
+                published.append(events.get_nowait())
+            return job, status, published
+        finally:
+            bus.unsubscribe(events)
+
+    job, status, published = asyncio.run(run())
+
+    assert status["state"] == "completed" and status["files_changed"] == 12
+    assert status["chunks_upserted"] == len(store.documents) > 0
+    assert all(size <= 5 for size in store.batches) and status["batches"] == len(store.batches)
+    assert len(files_in(store)) == 12
+    progress = [e.content for e in published if e.task_id == job.id]
+    assert any("ETA" in message for message in progress) and "complete" in progress[-1]
+
+
+def test_cancelled_job_keeps_stored_files_and_next_run_resumes(tmp_path):
+    docs = tmp_path / "docs"
+    for i in range(6):
+        write(docs / f"d{i}.md", f"# Doc {i}\n\ncontent {i}")
+    store = RecordingStore(delay=0.1)
+    pipeline = pipeline_for(store, tmp_path, max_workers=1, batch_size=1, max_in_flight=1)
+    job = IngestJob(collection="docs", path=str(docs), file_filter="*.md")
+
+    async def run():
+        pipeline.start(job)
+        while job.status.get("chunks_upserted", 0) < 2:
+            await asyncio.sleep(0.01)
+        assert pipeline.cancel(job.id)
+        return await pipeline.wait(job.id)
+
+    status = asyncio.run(run())
+    assert status["state"] == "cancelled" and not pipeline.cancel(job.id)
+    manifest = json.loads((tmp_path / "manifests" / "docs.json").read_text())
+    assert 2 <= len(manifest) < 6
+
+    resumed = asyncio.run(pipeline.run(IngestJob(collection="docs", path=str(docs), file_filter="*.md")))
+    assert resumed["state"] == "completed" and resumed["files_skipped"] == len(manifest)
+    assert resumed["files_changed"] == 6 - len(manifest)
+    assert len(files_in(store)) == 6 and len(store.documents) == 6
+
+
+def test_first_run_replaces_chunks_stored_under_legacy_ids(tmp_path):
+    import hashlib
+
+    from core.chunking.engine import ChunkingEngine
+    from rag.vector_store import Document
+
+    docs = tmp_path / "docs"
+    write(docs / "a.md", "".join(f"## Section {i}\n\n" + f"alpha {i} " * 60 + "\n\n" for i in range(8)))
+    write(docs / "license.md", "# License\n\nMIT")
+    write(tmp_path / "vendor" / "license.md", "# License\n\nMIT")
+    store = RecordingStore()
+
+    def ingest_legacy(path, root):
+        # What the pre-pipeline handler stored: engine-default chunks under tier{t}_{category}_{md5(chunk)}
+        for chunk in ChunkingEngine().chunk_content(path.read_text(), file_path=str(path)):
+            store.upsert_documents([Document(
+                id=f"tier3_generic_{hashlib.md5(chunk.content.encode()).hexdigest()}",
+                text=chunk.content,
+                metadata={"file": str(path.relative_to(root)), "full_path": str(path)},
+            )])
+
+    ingest_legacy(docs / "a.md", docs)
+    legacy_a = {doc.id for doc in store.documents}
+    assert len((docs / "a.md").read_text()) > 1000 and len(legacy_a) > 1
+    ingest_legacy(docs / "license.md", docs)
+    # Identical boilerplate ingested later from elsewhere now owns the shared content-only ID
+    ingest_legacy(tmp_path / "vendor" / "license.md", tmp_path)
+    unrelated = Document(id="tier3_generic_manual", text="manual input", metadata={"file": "manual_input"})
+    store.add_documents([unrelated])
+
+    status = asyncio.run(pipeline_for(store, tmp_path, max_workers=1).run(
+        IngestJob(collection="docs", path=str(docs), file_filter="*.md")
+    ))
+
+    assert status["state"] == "completed"
+    ids = {doc.id for doc in store.documents}
+    assert not legacy_a & ids
+    assert files_in(store) == ["a.md", "license.md", "manual_input", "vendor/license.md"]
+    assert sum(doc.metadata["file"] == "a.md" for doc in store.documents) == status["chunks_upserted"] - 1
+    assert unrelated.id in ids
@@ -0,0 +1,69 @@
+"""
+Tests for the indexed KnowledgeGraph store and k-hop context expansion.
+"""
+
+import json
+
+from core.graph.retriever import GraphRetriever
+from core.graph.schema import EdgeType, GraphEdge, GraphNode, KnowledgeGraph, NodeType
+
+
+def make_graph():
+    graph = KnowledgeGraph()
+    for node_id, node_type in [
+        ("file:a.py", NodeType.FILE), ("class:Base:a.py", NodeType.CLASS),
+        ("class:Child:a.py", NodeType.CLASS), ("func:run:a.py", NodeType.FUNCTION),
+        ("func:helper:a.py", NodeType.FUNCTION),
+    ]:
+        graph.add_node(GraphNode(id=node_id, type=node_type, name=node_id.split(":")[1], file_path="a.py"))
+    graph.add_edge(GraphEdge("file:a.py", "class:Base:a.py", EdgeType.DEFINES))
+    graph.add_edge(GraphEdge("file:a.py", "class:Child:a.py", EdgeType.DEFINES))
+    graph.add_edge(GraphEdge("class:Child:a.py", "class:Base:a.py", EdgeType.INHERITS, {"lineno": 3}))
+    graph.add_edge(GraphEdge("func:run:a.py", "class:Child:a.py", EdgeType.INSTANTIATES))
+    graph.add_edge(GraphEdge("func:run:a.py", "func:helper:a.py", EdgeType.CALLS))
+    graph.add_edge(GraphEdge("func:helper:a.py", "module:os", EdgeType.CALLS))
+    return graph
+
+
+def test_typed_forward_and_reverse_neighbors():
+    graph = make_graph()
+
+    assert {n.id for n in graph.get_neighbors("file:a.py")} == {"class:Base:a.py", "class:Child:a.py"}
+    assert [n.id for n in graph.get_neighbors("class:Base:a.py", EdgeType.INHERITS, direction="in")] == [
+        "class:Child:a.py"
+    ]
+    assert graph.neighbor_ids("class:Base:a.py", direction="both") == {"file:a.py", "class:Child:a.py"}
+    # Edges to external targets are indexed, but only known nodes are returned
+    assert graph.neighbor_ids("func:helper:a.py", EdgeType.CALLS) == {"module:os"}
+    assert graph.get_neighbors("func:helper:a.py") == []
+    assert graph.adjacency["func:run:a.py"] == {"class:Child:a.py", "func:helper:a.py"}
+
+
+def test_k_hop_expansion_honors_hops_and_budget():
+    graph = make_graph()
+    retriever = GraphRetriever(graph)
+
+    assert graph.k_hop(["func:run:a.py"], hops=2) == {
+        "func:run:a.py": 0, "class:Child:a.py": 1, "func:helper:a.py": 1,
+        "class:Base:a.py": 2, "module:os": 2,
+    }
+    assert len(graph.k_hop(["func:run:a.py"], hops=3, max_nodes=2)) == 2
+
+    one_hop = {n.id for n in retriever.expand_context(["func:run:a.py"], hops=1)}
+    two_hops = {n.id for n in retriever.expand_context(["func:run:a.py"], hops=2)}
+    assert "class:Base:a.py" not in one_hop
+    assert "class:Base:a.py" in two_hops
+
+
+def test_binary_round_trip_and_legacy_json(tmp_path):
+    graph = make_graph()
+    path = tmp_path / "graph.kg"
+    graph.save(str(path))
+
+    loaded = KnowledgeGraph.load(str(path))
+    assert loaded.to_json() == graph.to_json()
+    assert loaded.neighbor_ids("class:Base:a.py", EdgeType.INHERITS, direction="in") == {"class:Child:a.py"}
+
+    legacy = tmp_path / "graph.json"
+    legacy.write_text(json.dumps(graph.to_json(), indent=2))
+    assert KnowledgeGraph.load(str(legacy)).to_json() == graph.to_json()
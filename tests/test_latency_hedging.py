@@ -0,0 +1,171 @@
+"""
+Tests for latency tracking, latency-aware failover and hedged LLM requests.
+"""
+
+import asyncio
+
+import core.llm_client_v2 as llm_module
+from core.cache_manager import SQLiteCacheBackend, TieredResponseCache
+from core.latency import HedgePolicy, LatencyTracker
+from core.llm_client_v2 import LLMClientV2, LLMProvider, LLMResponse
+from core.model_cascade_router import ModelCascadeRouter
+
+
+class DelayedProvider(LLMProvider):
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.cancelled = 0
+
+    async def complete(self, messages, model, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return LLMResponse(
+            content=f"from {model}", model=model, provider=self.name,
+            tokens_used={"prompt": 10, "completion": 10, "total": 20},
+            finish_reason="stop", metadata={}
+        )
+
+
+class NullCostManager:
+    def check_and_update(self, model, prompt_tokens, completion_tokens):
+        return {"cost_increment": 0.0}
+
+
+class NoPrefs:
+    def get_system_prompt_context(self):
+        return ""
+
+
+def make_client(tmp_path, monkeypatch, **providers):
+    monkeypatch.setattr(llm_module, "AUDIT_LOG_FILE", tmp_path / "audit.jsonl")
+    client = LLMClientV2.__new__(LLMClientV2)
+    client.cost_manager = NullCostManager()
+    client.user_prefs = NoPrefs()
+    client.cache_manager = TieredResponseCache(SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+    client.semantic_cache = None
+    client.providers = providers
+    return client
+
+
+def test_tracker_percentiles_drive_latency_failover():
+    tracker = LatencyTracker(window_size=50)
+    for seconds in range(1, 11):
+        tracker.record("openai", "gpt-5-mini", float(seconds))
+    assert tracker.percentile("openai", "gpt-5-mini", 50) == 5.0
+    assert tracker.percentile("openai", "gpt-5-mini", 95) == 10.0
+    assert tracker.percentile("openai", "gpt-5-mini", 95, min_samples=20) is None
+
+    router = ModelCascadeRouter()
+    router.latency = tracker
+    router.failover_p95_seconds = 5
+    chain = [cfg.model for cfg in router.get_cascade_chain("analyst")]
+    assert chain == ["gpt-5-mini", "claude-sonnet-4.5"]
+    assert router.select_model("analyst").model == "claude-sonnet-4.5"
+    assert router.latency_stats("openai", "gpt-5-mini")["p95"] == 10.0
+
+
+def test_hedge_wins_and_respects_budget(tmp_path, monkeypatch):
+    policy = HedgePolicy(
+        {"enabled": True, "default_delay_seconds": 0.02, "max_hedge_ratio": 1.0, "max_extra_cost_usd": 1.0},
+        LatencyTracker()
+    )
+    monkeypatch.setattr(llm_module, "hedge_policy", policy)
+    slow = DelayedProvider("openai", 0.5)
+    fast = DelayedProvider("anthropic", 0.01)
+    client = make_client(tmp_path, monkeypatch, openai=slow, anthropic=fast)
+
+    async def ask(prompt, **kwargs):
+        return await client.complete(
+            [{"role": "user", "content": prompt}], "gpt-5-mini",
+            temperature=0.3, hedge_model="claude-sonnet-4.5", **kwargs
+        )
+
+    response = asyncio.run(ask("hello"))
+    assert response.model == "claude-sonnet-4.5"
+    assert slow.cancelled == 1
+    assert policy.stats()["hedge_wins"] == 1
+
+    # Spend ceiling reached: the slow primary is awaited without a hedge
+    policy.config["max_extra_cost_usd"] = policy.window_cost
+    slow.delay = 0.05
+    response = asyncio.run(ask("hello again", max_tokens=1000))
+    assert response.model == "gpt-5-mini"
+    assert policy.stats()["skipped_budget"] == 1
+    client.cache_manager.close()
+
+
+def test_race_stream_relays_only_the_winner():
+    policy = HedgePolicy({"max_hedge_ratio": 1.0}, LatencyTracker())
+    closed = []
+
+    async def stream(name, first_delay):
+        try:
+            await asyncio.sleep(first_delay)
+            for i in range(3):
+                yield f"{name}{i}"
+        finally:
+            closed.append(name)
+
+    async def run():
+        return [item async for item in policy.race_stream(
+            stream("slow", 0.5), lambda: stream("fast", 0.0), delay=0.02
+        )]
+
+    assert asyncio.run(run()) == ["fast0", "fast1", "fast2"]
+    assert sorted(closed) == ["fast", "slow"]
+
+
+def test_calls_queued_in_the_limiter_are_not_counted_in_flight(tmp_path, monkeypatch):
+    from core.http_pool import HTTPClientPool
+    from core.rate_limiter import RateLimiter
+
+    pool = HTTPClientPool(config={"max_connections": 4})
+    monkeypatch.setattr(llm_module, "http_pool", pool)
+    monkeypatch.setattr(llm_module, "rate_limiter", RateLimiter({
+        "aimd": {"initial_concurrency": 1, "max_concurrency": 1},
+        "providers": {"openai": {}},
+    }))
+    client = make_client(tmp_path, monkeypatch, openai=DelayedProvider("openai", 0.02))
+
+    async def run():
+        return await asyncio.gather(*(
+            client.complete([{"role": "user", "content": f"q{i}"}], "gpt-5-mini", temperature=0.3)
+            for i in range(3)
+        ))
+
+    assert len(asyncio.run(run())) == 3
+    stats = pool.stats()["openai"]
+    # Concurrency 1: two calls waited in the limiter, never on the wire
+    assert stats["peak_in_flight"] == 1 and stats["requests"] == 3
+    client.cache_manager.close()
+
+
+def test_primary_cancelled_by_a_hedge_still_contributes_a_latency_sample(tmp_path, monkeypatch):
+    policy = HedgePolicy(
+        {"enabled": True, "default_delay_seconds": 0.05, "max_hedge_ratio": 1.0, "max_extra_cost_usd": 1.0},
+        LatencyTracker()
+    )
+    tracker = LatencyTracker()
+    monkeypatch.setattr(llm_module, "hedge_policy", policy)
+    monkeypatch.setattr(llm_module, "latency_tracker", tracker)
+    client = make_client(
+        tmp_path, monkeypatch, openai=DelayedProvider("openai", 0.5), anthropic=DelayedProvider("anthropic", 0.0)
+    )
+    kwargs = dict(temperature=0.3, hedge_model="claude-sonnet-4.5")
+
+    async def run():
+        response = await client.complete([{"role": "user", "content": "q1"}], "gpt-5-mini", **kwargs)
+        events = [e async for e in client.stream([{"role": "user", "content": "q2"}], "gpt-5-mini", **kwargs)]
+        return response, events[-1].response
+
+    response, streamed = asyncio.run(run())
+
+    assert response.model == streamed.model == "claude-sonnet-4.5"
+    # The losing primary's elapsed time is kept as a lower bound of its latency
+    assert tracker.percentile("openai", "gpt-5-mini", 100) >= 0.05
+    assert tracker.percentile("openai", "gpt-5-mini", 100, kind="ttft") >= 0.05
+    client.cache_manager.close()
@@ -0,0 +1,82 @@
+"""
+Tests for dependency-aware task scheduling inside lifecycle milestones.
+"""
+
+import asyncio
+import time
+
+from api.event_bus import Event, EventType, bus
+from core.lifecycle_orchestrator import LifecycleOrchestrator, Milestone, Task
+
+
+class StubErrorTracker:
+    def log_error(self, **kwargs):
+        return "err-1"
+
+
+def make_orchestrator(fail=()):
+    orch = LifecycleOrchestrator.__new__(LifecycleOrchestrator)
+    orch.state = {"analyst": "spec"}
+    orch.max_parallel_tasks = 4
+    orch.error_tracker = StubErrorTracker()
+    orch.seen_state = {}
+
+    async def execute_task(task, milestone, state=None, **kwargs):
+        orch.seen_state[task.id] = dict(state)
+        await bus.publish(Event(type=EventType.LOG, agent="Test", content=f"{task.id} start"))
+        await asyncio.sleep(0.1)
+        await bus.publish(Event(type=EventType.LOG, agent="Test", content=f"{task.id} end"))
+        if task.id in fail:
+            task.status = "failed"
+            return {"error": "boom"}
+        task.status = "completed"
+        task.result = f"{task.id}-output"
+        return task.result
+
+    orch.execute_task = execute_task
+    return orch
+
+
+def test_independent_tasks_run_concurrently_and_state_flows_downstream():
+    orch = make_orchestrator()
+    milestone = Milestone(id="m1", name="M1", tasks=[
+        Task(id="arch", description="design", phase="architect"),
+        Task(id="backend", description="backend", phase="implementation"),
+        Task(id="frontend", description="frontend", phase="implementation"),
+        Task(id="tests", description="test", phase="testing"),
+    ])
+    queue = bus.subscribe()
+
+    start = time.perf_counter()
+    results = asyncio.run(orch.execute_milestone(milestone))
+    elapsed = time.perf_counter() - start
+    bus.unsubscribe(queue)
+
+    # Critical path is arch -> implementation -> tests (3 x 0.1s), not 4 x 0.1s
+    assert elapsed < 0.38
+    assert list(results) == ["arch", "backend", "frontend", "tests"]
+    assert milestone.status == "completed"
+    assert orch.seen_state["backend"] == {"analyst": "spec", "architect": "arch-output"}
+    assert orch.seen_state["tests"]["implementation"] == "frontend-output"
+    assert orch.state["implementation"] == "frontend-output"
+
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    for task_id in ("backend", "frontend"):
+        own = [e.content for e in events if e.task_id == task_id]
+        assert own == [f"{task_id} start", f"{task_id} end"]
+
+
+def test_failure_stops_dependent_tasks():
+    orch = make_orchestrator(fail=("arch",))
+    milestone = Milestone(id="m1", name="M1", tasks=[
+        Task(id="arch", description="design", phase="architect"),
+        Task(id="backend", description="backend", phase="implementation", dependencies=["arch"]),
+    ])
+
+    result = asyncio.run(orch.execute_milestone(milestone))
+
+    assert result == {"error": "Task arch failed", "details": {"error": "boom"}}
+    assert milestone.status == "failed"
+    assert "backend" not in orch.seen_state
@@ -0,0 +1,122 @@
+"""
+Tests for token streaming through LLMClientV2 and onto the event bus.
+"""
+
+import asyncio
+import json
+
+import core.llm_client_v2 as llm_module
+from api.event_bus import EventType, bus
+from core.cache_manager import SQLiteCacheBackend, TieredResponseCache
+from core.llm_client_v2 import LLMClientV2, LLMProvider, LLMResponse, LLMStreamEvent
+
+
+class FakeProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = 0
+
+    async def complete(self, messages, model, **kwargs):
+        raise AssertionError("streaming calls must not fall back to complete")
+
+    async def stream(self, messages, model, **kwargs):
+        self.calls += 1
+        yield LLMStreamEvent(delta="planning...", kind="thinking")
+        for chunk in self.chunks:
+            yield LLMStreamEvent(delta=chunk)
+        yield LLMStreamEvent(response=LLMResponse(
+            content="".join(self.chunks),
+            model=model,
+            provider="openai",
+            tokens_used={"prompt": 12, "completion": len(self.chunks), "total": 12 + len(self.chunks)},
+            finish_reason="stop",
+            metadata={},
+            thinking="planning..."
+        ))
+
+
+class RecordingCostManager:
+    def __init__(self):
+        self.updates = []
+
+    def check_and_update(self, model, prompt_tokens, completion_tokens):
+        self.updates.append((model, prompt_tokens, completion_tokens))
+        return {"cost_increment": 0.01}
+
+
+class NoPrefs:
+    def get_system_prompt_context(self):
+        return ""
+
+
+def make_client(tmp_path, monkeypatch, provider):
+    monkeypatch.setattr(llm_module, "AUDIT_LOG_FILE", tmp_path / "audit.jsonl")
+    client = LLMClientV2.__new__(LLMClientV2)
+    client.cost_manager = RecordingCostManager()
+    client.user_prefs = NoPrefs()
+    client.cache_manager = TieredResponseCache(SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+    client.semantic_cache = None
+    client.providers = {"openai": provider}
+    return client
+
+
+def collect(client, **kwargs):
+    async def run():
+        return [e async for e in client.stream([{"role": "user", "content": "hi"}], "gpt-5-mini", **kwargs)]
+    return asyncio.run(run())
+
+
+def test_stream_yields_deltas_then_accounts_once(tmp_path, monkeypatch):
+    provider = FakeProvider(["Hel", "lo", "!"])
+    client = make_client(tmp_path, monkeypatch, provider)
+
+    events = collect(client)
+
+    assert [(e.kind, e.delta) for e in events[:-1]] == [
+        ("thinking", "planning..."), ("text", "Hel"), ("text", "lo"), ("text", "!")
+    ]
+    final = events[-1].response
+    assert final.content == "Hello!"
+    assert "time_to_first_token_sec" in final.metadata
+    # Budget pre-check plus one update with the streamed usage
+    assert client.cost_manager.updates == [("gpt-5-mini", 0, 0), ("gpt-5-mini", 12, 3)]
+    audit = [json.loads(line) for line in (tmp_path / "audit.jsonl").read_text().splitlines()]
+    assert len(audit) == 1 and audit[0]["response_content"] == "Hello!"
+
+    # Deterministic calls are cached and replayed without hitting the provider
+    replay = collect(client)
+    assert provider.calls == 1
+    assert "".join(e.delta for e in replay if e.kind == "text") == "Hello!"
+    assert replay[-1].response.content == "Hello!"
+    client.cache_manager.close()
+
+
+def test_complete_with_stream_to_publishes_chunks(tmp_path, monkeypatch):
+    client = make_client(tmp_path, monkeypatch, FakeProvider(["def f():", " pass"]))
+
+    async def run():
+        queue = bus.subscribe()
+        try:
+            response = await client.complete(
+                [{"role": "user", "content": "write f"}], "gpt-5-mini",
+                stream_to="Coder", stream_event=EventType.ARTIFACT
+            )
+        finally:
+            bus.unsubscribe(queue)
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return response, events
+
+    response, events = asyncio.run(run())
+
+    assert response.content == "def f(): pass"
+    assert all(e.agent == "Coder" and e.stream_id for e in events)
+    artifact = "".join(e.content for e in events if e.type == EventType.ARTIFACT)
+    thought = "".join(e.content for e in events if e.type == EventType.THOUGHT)
+    assert artifact == "def f(): pass"
+    assert thought == "planning..."
+    assert len({e.stream_id for e in events if e.type == EventType.ARTIFACT}) == 1
+    client.cache_manager.close()
@@ -0,0 +1,102 @@
+"""
+Tests for the shared, lazily loaded model registry.
+"""
+
+import threading
+import time
+
+import pytest
+
+import rag.reranker as reranker_module
+from rag.model_registry import CROSS_ENCODER, SENTENCE_TRANSFORMER, ModelRegistry
+from rag.reranker import CrossEncoderReranker
+
+
+class FakeTensor:
+    def __init__(self, n):
+        self.n = n
+
+    def numel(self):
+        return self.n
+
+    def element_size(self):
+        return 4
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+
+    def parameters(self):
+        return [FakeTensor(1000), FakeTensor(24)]
+
+    def predict(self, pairs):
+        return [float(len(doc)) for _, doc in pairs]
+
+
+def counting_loader(calls, delay=0.0):
+    def load(name, device):
+        calls.append(name)
+        time.sleep(delay)
+        return FakeModel(name)
+    return load
+
+
+def test_concurrent_first_use_loads_once_and_aliases_share_weights():
+    registry = ModelRegistry()
+    calls = []
+    registry.register_loader(SENTENCE_TRANSFORMER, counting_loader(calls, delay=0.05))
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda n=name: results.append(registry.sentence_transformer(n)))
+        for name in ["all-MiniLM-L6-v2", "sentence-transformers/all-MiniLM-L6-v2"] * 4
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["sentence-transformers/all-MiniLM-L6-v2"]
+    assert len({id(m) for m in results}) == 1
+    [stats] = registry.stats().values()
+    assert stats["resident_bytes"] == 4096 and stats["uses"] == 8
+
+
+def test_failures_are_cached_and_idle_models_unload():
+    registry = ModelRegistry(idle_timeout=60)
+    attempts = []
+
+    def broken(name, device):
+        attempts.append(name)
+        raise ImportError("torch missing")
+
+    registry.register_loader(CROSS_ENCODER, broken)
+    for _ in range(3):
+        with pytest.raises(ImportError):
+            registry.cross_encoder("ce")
+    assert attempts == ["ce"] and "torch missing" in registry.stats()["cross_encoder:ce@cpu"]["error"]
+
+    calls = []
+    registry.register_loader(CROSS_ENCODER, counting_loader(calls))
+    assert registry.unload(kind=CROSS_ENCODER) == 0  # nothing loaded, but the failure is forgotten
+    first = registry.cross_encoder("ce")
+    assert registry.unload_idle() == []
+    assert registry.unload_idle(max_idle=0) == ["ce"] and registry.stats() == {}
+    assert registry.cross_encoder("ce") is not first and calls == ["ce", "ce"]
+
+
+def test_rerankers_share_one_cross_encoder(monkeypatch):
+    registry = ModelRegistry()
+    calls = []
+    registry.register_loader(CROSS_ENCODER, counting_loader(calls))
+    monkeypatch.setattr(reranker_module, "model_registry", registry)
+
+    first, second = CrossEncoderReranker(), CrossEncoderReranker()
+    ranked = second.rerank("q", [{"id": "a", "text": "x"}, {"id": "b", "text": "xxx"}], top_k=2)
+
+    assert first.model is second.model and len(calls) == 1
+    assert [r.document_id for r in ranked] == ["b", "a"]
+    # Unloaded while idle: the next use reloads transparently
+    registry.unload()
+    assert first.model is not None and len(calls) == 2
@@ -0,0 +1,87 @@
+"""
+Tests for the ONNX Runtime embedding/reranker backend.
+
+The session is faked (the bundled .onnx files are git-lfs pointers in a
+plain checkout); tokenization uses the bundled tokenizer.json.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import rag.embeddings_provider as embeddings_module
+from rag.embeddings_provider import HuggingFaceEmbeddings
+from rag.model_registry import LOCAL_MODELS_DIR, ModelRegistry, SENTENCE_TRANSFORMER, model_kind
+from rag.onnx_backend import OnnxCrossEncoder, OnnxSentenceEncoder, onnx_file
+
+MINILM = LOCAL_MODELS_DIR / "all-MiniLM-L6-v2"
+
+
+class FakeSession:
+    """Hidden state of each token = [token id, 1, 0, ...]; logits = number of real tokens."""
+
+    def __init__(self, inputs=("input_ids", "attention_mask", "token_type_ids"), logits=False):
+        self.inputs, self.logits, self.feeds = inputs, logits, []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name=n) for n in self.inputs]
+
+    def run(self, _, feeds):
+        self.feeds.append(feeds)
+        ids, mask = feeds["input_ids"], feeds["attention_mask"]
+        if self.logits:
+            return [mask.sum(axis=1, keepdims=True).astype(np.float32) - 5]
+        hidden = np.zeros(ids.shape + (4,), dtype=np.float32)
+        hidden[..., 0], hidden[..., 1] = ids, 1.0
+        return [hidden]
+
+
+def test_sentence_encoder_mean_pools_real_tokens_and_normalizes():
+    session = FakeSession(inputs=("input_ids", "attention_mask"))
+    encoder = OnnxSentenceEncoder(MINILM, session=session)
+
+    vectors = encoder.encode(["hello world", "a much longer sentence here"], batch_size=2)
+    single = encoder.encode("hello world")
+
+    # [CLS] hello world [SEP] + padding: padding ids (0) must not dilute the mean
+    expected = np.array([(101 + 7592 + 2088 + 102) / 4, 1.0, 0, 0])
+    assert np.allclose(vectors[0], expected / np.linalg.norm(expected), atol=1e-6)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0) and np.allclose(single, vectors[0])
+    # Only the inputs the graph declares are fed
+    assert set(session.feeds[0]) == {"input_ids", "attention_mask"}
+    assert encoder.get_sentence_embedding_dimension() == 384 and encoder.max_length == 256
+
+
+def test_cross_encoder_scores_pairs_and_lfs_pointers_are_rejected(tmp_path):
+    scorer = OnnxCrossEncoder(MINILM, session=FakeSession(logits=True))
+    scores = scorer.predict([("q", "doc text"), ("q", "a much longer document text")])
+    assert scores.shape == (2,) and scores[1] > scores[0] and np.all((scores > 0) & (scores < 1))
+    assert np.allclose(scorer.predict([("q", "doc text")], apply_sigmoid=False), [1.0])
+
+    (tmp_path / "onnx").mkdir()
+    (tmp_path / "onnx" / "model.onnx").write_text("version https://git-lfs.github.com/spec/v1\noid sha256:x\n")
+    with pytest.raises(FileNotFoundError, match="git-lfs pointer"):
+        onnx_file(tmp_path)
+    with pytest.raises(FileNotFoundError, match="export_onnx.py"):
+        onnx_file(tmp_path, quantized=True)
+
+
+def test_embeddings_provider_selects_onnx_backend_from_the_registry(monkeypatch):
+    registry = ModelRegistry()
+    loaded = []
+
+    def load_int8(name, device):
+        loaded.append(name)
+        return OnnxSentenceEncoder(MINILM, quantized=True, session=FakeSession())
+
+    registry.register_loader(model_kind(SENTENCE_TRANSFORMER, "onnx-int8"), load_int8)
+    monkeypatch.setattr(embeddings_module, "model_registry", registry)
+
+    provider = HuggingFaceEmbeddings("all-MiniLM-L6-v2", backend="onnx-int8")
+    vectors = provider.embed_texts(["hello world", "hi"])
+
+    assert provider.backend == "onnx-int8" and provider.dimension == 384
+    assert len(vectors) == 2 and loaded == ["sentence-transformers/all-MiniLM-L6-v2"]
+    with pytest.raises(ValueError, match="Unknown model backend"):
+        model_kind(SENTENCE_TRANSFORMER, "tensorrt")
@@ -0,0 +1,95 @@
+"""
+Tests for the streaming ready-queue scheduler in ParallelExecutor.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.parallel_executor import DependencyCycleError, ParallelExecutor, Task, TaskStatus
+
+
+def sleeper(seconds, log=None, name=None):
+    async def run(**kwargs):
+        if log is not None:
+            log.append(name)
+        await asyncio.sleep(seconds)
+        return name
+    return run
+
+
+def test_tasks_start_when_their_own_dependencies_finish():
+    # a(0.05) -> c(0.2) and b(0.2) -> d(0.05): batches would take 0.4s, the DAG 0.25s
+    tasks = [
+        Task(id="a", name="a", executor=sleeper(0.05)),
+        Task(id="b", name="b", executor=sleeper(0.2)),
+        Task(id="c", name="c", executor=sleeper(0.2), dependencies=["a"]),
+        Task(id="d", name="d", executor=sleeper(0.05), dependencies=["b"]),
+    ]
+
+    streaming = asyncio.run(ParallelExecutor(max_concurrent=4).execute(tasks))
+    batched = asyncio.run(ParallelExecutor(max_concurrent=4, scheduler="batched").execute(tasks))
+
+    assert streaming.successful_tasks == 4
+    assert streaming.total_duration < 0.33 < batched.total_duration
+    assert streaming.critical_path in (["a", "c"], ["b", "d"])
+    assert 0.24 < streaming.critical_path_duration < streaming.total_duration + 0.01
+    assert streaming.idle_time < 0.05
+
+
+def test_priority_order_retries_and_skipping_dependents():
+    started = []
+    attempts = {"flaky": 0}
+
+    async def flaky(**kwargs):
+        attempts["flaky"] += 1
+        if attempts["flaky"] < 3:
+            raise RuntimeError("transient")
+        return "ok"
+
+    async def broken(**kwargs):
+        raise RuntimeError("boom")
+
+    tasks = [
+        Task(id="low", name="low", executor=sleeper(0.01, started, "low"), priority=0),
+        Task(id="high", name="high", executor=sleeper(0.01, started, "high"), priority=5),
+        Task(id="flaky", name="flaky", executor=flaky, max_retries=2, retry_backoff=0.01),
+        Task(id="broken", name="broken", executor=broken),
+        Task(id="child", name="child", executor=sleeper(0.01), dependencies=["broken"]),
+    ]
+
+    result = asyncio.run(ParallelExecutor(max_concurrent=1).execute(tasks))
+
+    assert started == ["high", "low"]
+    assert result.task_results["flaky"].status == TaskStatus.COMPLETED
+    assert result.task_results["flaky"].attempts == 3
+    assert result.task_results["broken"].status == TaskStatus.FAILED
+    assert result.task_results["child"].status == TaskStatus.SKIPPED
+    assert result.task_results["child"].error == "Dependency not completed: broken"
+
+
+def test_cycles_are_reported_and_fail_fast_cancels_running_tasks():
+    cyclic = [
+        Task(id="a", name="a", executor=sleeper(0), dependencies=["c"]),
+        Task(id="b", name="b", executor=sleeper(0), dependencies=["a"]),
+        Task(id="c", name="c", executor=sleeper(0), dependencies=["b"]),
+    ]
+    with pytest.raises(DependencyCycleError, match="a -> c -> b -> a"):
+        asyncio.run(ParallelExecutor().execute(cyclic))
+
+    async def broken(**kwargs):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    tasks = [
+        Task(id="broken", name="broken", executor=broken),
+        Task(id="slow", name="slow", executor=sleeper(5)),
+        Task(id="after", name="after", executor=sleeper(0), dependencies=["slow"]),
+    ]
+    start = time.perf_counter()
+    result = asyncio.run(ParallelExecutor().execute(tasks, fail_fast=True))
+
+    assert time.perf_counter() - start < 1
+    assert result.task_results["slow"].status == TaskStatus.CANCELLED
+    assert result.task_results["after"].status == TaskStatus.SKIPPED
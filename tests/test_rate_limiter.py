@@ -0,0 +1,77 @@
+"""
+Tests for the adaptive per-provider LLM rate limiter.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.rate_limiter import RateLimiter, TokenBucket, is_rate_limited, retry_after
+
+
+class RateLimitError(Exception):
+    def __init__(self, retry_after_s):
+        super().__init__("429")
+        self.status_code = 429
+        self.response = type("Resp", (), {"status_code": 429, "headers": {"retry-after": str(retry_after_s)}})()
+
+
+def make_limiter(**budget):
+    return RateLimiter({
+        "aimd": {"initial_concurrency": 2, "max_concurrency": 4, "decrease_cooldown_seconds": 0},
+        "providers": {"openai": {**budget, "models": {"gpt-4o": {"initial_concurrency": 1}}}},
+    })
+
+
+def test_token_bucket_paces_to_budget():
+    bucket = TokenBucket(per_minute=600, burst_seconds=0.1)   # 10/s, burst of 1
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.02)
+    bucket.pause(0.5)
+    assert bucket.reserve(1) >= 0.45
+
+
+def test_concurrency_limit_and_aimd():
+    limiter = make_limiter()
+    peak = 0
+    active = 0
+
+    async def call(model):
+        nonlocal peak, active
+        async with limiter.slot("openai", model, 10):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def run():
+        await asyncio.gather(*(call("gpt-5-mini") for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    mini = limiter.limiter("openai", "gpt-5-mini")
+    assert mini.governor.limit > 2            # additive increase after successes
+    assert limiter.limiter("openai", "gpt-4o").governor.limit == 1   # model override
+
+    before = mini.governor.limit
+    mini.on_throttle(0.0)
+    assert mini.governor.limit == pytest.approx(before / 2)   # multiplicative decrease
+    assert limiter.stats()["openai/gpt-5-mini"]["throttled"] == 1
+
+
+def test_429_pauses_queue_for_retry_after():
+    limiter = make_limiter(requests_per_minute=6000)
+    error = RateLimitError(0.2)
+    assert is_rate_limited(error) and retry_after(error) == 0.2
+
+    async def run():
+        with pytest.raises(RateLimitError):
+            async with limiter.slot("openai", "gpt-5-mini", 10):
+                raise error
+        start = time.monotonic()
+        async with limiter.slot("openai", "gpt-5-mini", 10):
+            pass
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.18
@@ -0,0 +1,107 @@
+"""
+Tests for single-flight coalescing of identical LLM calls.
+"""
+
+import asyncio
+
+import pytest
+
+import core.llm_client_v2 as llm_module
+from core.cache_manager import SQLiteCacheBackend, TieredResponseCache
+from core.llm_client_v2 import LLMClientV2, LLMProvider, LLMResponse
+from core.request_coalescer import RequestCoalescer
+
+
+class SlowProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def complete(self, messages, model, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return LLMResponse(
+            content=f"answer to {messages[-1]['content']}",
+            model=model,
+            provider="openai",
+            tokens_used={"prompt": 1000, "completion": 500, "total": 1500},
+            finish_reason="stop",
+            metadata={"id": f"resp-{self.calls}"}
+        )
+
+
+class NullCostManager:
+    def check_and_update(self, model, prompt_tokens, completion_tokens):
+        return {"cost_increment": 0.0}
+
+
+class NoPrefs:
+    def get_system_prompt_context(self):
+        return ""
+
+
+@pytest.fixture
+def coalescer(monkeypatch):
+    coalescer = RequestCoalescer()
+    monkeypatch.setattr(llm_module, "llm_coalescer", coalescer)
+    return coalescer
+
+
+def make_client(tmp_path, monkeypatch, provider):
+    monkeypatch.setattr(llm_module, "AUDIT_LOG_FILE", tmp_path / "audit.jsonl")
+    client = LLMClientV2.__new__(LLMClientV2)
+    client.cost_manager = NullCostManager()
+    client.user_prefs = NoPrefs()
+    client.cache_manager = TieredResponseCache(SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")))
+    client.semantic_cache = None
+    client.providers = {"openai": provider}
+    return client
+
+
+def ask(client, text="same prompt", **kwargs):
+    return client.complete([{"role": "user", "content": text}], "gpt-4o", **kwargs)
+
+
+def test_identical_concurrent_calls_share_one_upstream_call(tmp_path, monkeypatch, coalescer):
+    provider = SlowProvider()
+    client = make_client(tmp_path, monkeypatch, provider)
+
+    async def run():
+        return await asyncio.gather(ask(client), ask(client), ask(client), ask(client, "other prompt"))
+
+    same_a, same_b, same_c, other = asyncio.run(run())
+
+    assert provider.calls == 2
+    assert same_a.content == same_b.content == same_c.content == "answer to same prompt"
+    assert other.content == "answer to other prompt"
+    assert [r.metadata.get("cache", {}).get("type") for r in (same_a, same_b, same_c)].count("coalesced") == 2
+    stats = coalescer.stats()
+    assert stats["leaders"] == 2 and stats["coalesced"] == 2 and stats["in_flight"] == 0
+    assert stats["saved_tokens"] == 3000 and stats["saved_cost_usd"] > 0
+    client.cache_manager.close()
+
+
+def test_non_deterministic_calls_and_errors(tmp_path, monkeypatch, coalescer):
+    provider = SlowProvider(fail=True)
+    client = make_client(tmp_path, monkeypatch, provider)
+
+    async def run():
+        return await asyncio.gather(ask(client), ask(client), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert provider.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    provider.fail = False
+
+    async def run_sampled():
+        return await asyncio.gather(ask(client, temperature=0.7), ask(client, temperature=0.7))
+
+    asyncio.run(run_sampled())
+    assert provider.calls == 3
+    assert coalescer.stats()["coalesced"] == 1
+    client.cache_manager.close()
@@ -204,6 +204,35 @@ def test_collection_reset(retriever):
     assert stats["document_count"] == 0
 
 
+def test_keyword_index_is_pooled_and_backfilled(temp_db_dir, monkeypatch):
+    """Collections populated before the BM25 index existed still answer keyword queries."""
+    import core.retriever_v2 as retriever_module
+    from chromadb.api.types import EmbeddingFunction
+    from rag.vector_store import ChromaVectorStore
+
+    class LengthEmbedding(EmbeddingFunction):
+        def __init__(self, model_name=None):
+            pass
+
+        def __call__(self, input):
+            return [[float(len(text)), 1.0, 0.5] for text in input]
+
+        @staticmethod
+        def name():
+            return "length"
+
+    monkeypatch.setattr(retriever_module.embedding_functions, "SentenceTransformerEmbeddingFunction", LengthEmbedding)
+    monkeypatch.setattr(retriever_module, "DocumentChunker", lambda *args: None)
+
+    legacy = EnhancedRAGRetriever(collection_name="legacy_docs", persist_directory=temp_db_dir)
+    legacy.collection.add(ids=["c1"], documents=["DynButton renders a button"], metadatas=[{"k": "v"}])
+    assert len(legacy.keyword_index) == 0
+
+    assert [r.chunk_id for r in legacy.keyword_retrieve("DynButton")] == ["c1"]
+    store = ChromaVectorStore(collection_name="legacy_docs", persist_directory=temp_db_dir)
+    assert store.keyword_index is legacy.keyword_index and len(store.keyword_index) == 1
+
+
 def test_markdown_chunking(retriever):
     """Test markdown chunking strategy."""
     markdown = """
@@ -0,0 +1,98 @@
+"""
+Tests for the semantic (embedding-similarity) LLM response cache.
+"""
+
+import asyncio
+import re
+
+from core.semantic_cache import SemanticCache
+
+VOCAB = ["explain", "this", "function", "component", "button", "form", "please", "table", "the"]
+
+
+class BagOfWordsEmbeddings:
+    def embed_texts(self, texts):
+        return [
+            [float(re.findall(r"\w+", t.lower()).count(w)) + 0.01 for w in VOCAB]
+            for t in texts
+        ]
+
+
+def make_cache(tmp_path, **kwargs):
+    return SemanticCache(
+        persist_directory=str(tmp_path),
+        embedding_provider=BagOfWordsEmbeddings(),
+        **kwargs
+    )
+
+
+def messages(text, system="You are helpful."):
+    return [{"role": "system", "content": system}, {"role": "user", "content": text}]
+
+
+def test_similar_prompt_hits_with_similarity(tmp_path):
+    cache = make_cache(tmp_path, similarity_threshold=0.85)
+    stored = cache.prepare(messages("Explain this button component"), "gpt-5-mini", tier="default")
+    asyncio.run(cache.store_response(stored, {"content": "It renders a button."}))
+
+    query = cache.prepare(messages("Please explain this button component"), "gpt-5-mini", tier="default")
+    hit = asyncio.run(cache.lookup(query))
+
+    assert hit is not None
+    assert hit.response == {"content": "It renders a button."}
+    assert 0.85 <= hit.similarity < 1.0
+
+
+def test_system_prompt_model_and_thresholds_isolate_entries(tmp_path):
+    cache = make_cache(tmp_path, similarity_threshold=0.9, phase_thresholds={"implementation": 0.999})
+    stored = cache.prepare(messages("Explain this button component"), "gpt-5-mini", phase="implementation")
+    asyncio.run(cache.store_response(stored, {"content": "cached"}))
+
+    other_system = cache.prepare(messages("Explain this button component", system="Be terse."), "gpt-5-mini", phase="implementation")
+    other_model = cache.prepare(messages("Explain this button component"), "claude-sonnet-4.5", phase="implementation")
+    strict_phase = cache.prepare(messages("Please explain this button component"), "gpt-5-mini", phase="implementation")
+
+    assert asyncio.run(cache.lookup(other_system)) is None
+    assert asyncio.run(cache.lookup(other_model)) is None
+    assert asyncio.run(cache.lookup(strict_phase)) is None
+    assert cache.stats()["misses"] == 3
+
+
+def test_entries_persist_and_are_bounded(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    for text in ("explain the form", "explain the table", "explain the button"):
+        query = cache.prepare(messages(text), "gpt-5-mini")
+        asyncio.run(cache.store_response(query, {"content": text}))
+
+    reopened = make_cache(tmp_path)
+    assert reopened.stats()["entries"] == 2
+    hit = asyncio.run(reopened.lookup(reopened.prepare(messages("explain the button"), "gpt-5-mini")))
+    assert hit.response == {"content": "explain the button"}
+    # The oldest entry was dropped
+    assert asyncio.run(reopened.lookup(reopened.prepare(messages("explain the form"), "gpt-5-mini"))) is None
+
+
+class WindowedEmbeddings(BagOfWordsEmbeddings):
+    """Embeds only the first ``window`` words, like a model with a max sequence length."""
+    window = 8
+
+    def embed_texts(self, texts):
+        return super().embed_texts([" ".join(t.split()[:self.window]) for t in texts])
+
+    def truncates(self, text):
+        return len(text.split()) > self.window
+
+
+def test_dialogs_longer_than_the_model_window_are_not_cached(tmp_path):
+    cache = SemanticCache(persist_directory=str(tmp_path), embedding_provider=WindowedEmbeddings())
+    context = "the table form the table form the table form "
+    stored = cache.prepare(messages(context + "explain this button"), "gpt-5-mini")
+    asyncio.run(cache.store_response(stored, {"content": "about the button"}))
+
+    other = cache.prepare(messages(context + "explain this function"), "gpt-5-mini")
+    assert asyncio.run(cache.lookup(other)) is None
+
+    short = cache.prepare(messages("explain this button"), "gpt-5-mini")
+    asyncio.run(cache.store_response(short, {"content": "cached"}))
+    assert asyncio.run(cache.lookup(short)).response == {"content": "cached"}
+    assert cache.stats()["entries"] == 1 and cache.stats()["skipped"] == 1
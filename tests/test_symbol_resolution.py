@@ -0,0 +1,72 @@
+"""
+Tests for cross-file symbol resolution in the Knowledge Graph.
+"""
+
+import asyncio
+
+from core.graph.builder import GraphBuilder
+from core.graph.ingester import GraphIngester
+from core.graph.schema import EdgeType, KnowledgeGraph
+
+FILES = {
+    "pkg/__init__.py": "from .models import User\n",
+    "pkg/models.py": "class Base:\n    pass\n\nclass User(Base):\n    pass\n",
+    "app/service.py": (
+        "import pkg.models as m\n"
+        "from pkg import User\n\n"
+        "class Admin(m.Base):\n    pass\n\n"
+        "def make():\n    return User()\n\n"
+        "async def helper():\n    make()\n    print('x')\n"
+    ),
+}
+
+
+def edges_of(graph, edge_type):
+    return {
+        (e.source_id.split(":")[1], e.target_id.split(":")[1])
+        for e in graph.edges if e.type == edge_type and e.metadata.get("resolved")
+    }
+
+
+def test_imports_bases_and_calls_resolve_to_concrete_nodes(tmp_path):
+    graph = KnowledgeGraph()
+    ingester = GraphIngester(graph)
+    for name, content in FILES.items():
+        ingester.process_file(str(tmp_path / name), content)
+
+    assert ingester.resolve() > 0
+
+    assert edges_of(graph, EdgeType.INHERITS) == {("User", "Base"), ("Admin", "Base")}
+    assert edges_of(graph, EdgeType.INSTANTIATES) == {("make", "User")}
+    assert edges_of(graph, EdgeType.CALLS) == {("helper", "make")}
+    service = f"file:{tmp_path / 'app/service.py'}"
+    assert graph.neighbor_ids(service, EdgeType.IMPORTS) >= {
+        f"file:{tmp_path / 'pkg/models.py'}", f"file:{tmp_path / 'pkg/__init__.py'}", "module:pkg.models"
+    }
+    # Reverse lookups now answer "who inherits from Base"
+    base = f"class:Base:{tmp_path / 'pkg/models.py'}"
+    assert {n.name for n in graph.get_neighbors(base, EdgeType.INHERITS, direction="in")} == {"User", "Admin"}
+
+
+def test_changed_file_relinks_its_unchanged_importers(tmp_path):
+    for name, content in FILES.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(content)
+    builder = GraphBuilder(max_workers=1)
+
+    async def run():
+        await builder.build(str(tmp_path))
+        (tmp_path / "pkg/models.py").write_text("class Root:\n    pass\n\nclass User(Root):\n    pass\n")
+        return await builder.build(str(tmp_path))
+
+    status = asyncio.run(run())
+
+    assert status["files_changed"] == 1
+    # service.py was not re-parsed, but its Admin -> Base edge went away with Base
+    assert edges_of(builder.graph, EdgeType.INHERITS) == {("User", "Root")}
+    (tmp_path / "pkg/models.py").write_text(
+        "class Root:\n    pass\n\nclass Base(Root):\n    pass\n\nclass User(Base):\n    pass\n"
+    )
+    asyncio.run(builder.build(str(tmp_path)))
+    # ...and comes back when Base is defined again
+    assert edges_of(builder.graph, EdgeType.INHERITS) == {("User", "Base"), ("Base", "Root"), ("Admin", "Base")}
@@ -0,0 +1,92 @@
+"""
+Tests for the usage ledger rollups and the batched SQLite usage history.
+"""
+
+import json
+import time
+from datetime import datetime
+
+from core.cost_manager import CostManager
+from core.usage_ledger import UsageHistory
+
+
+def test_ledger_rollups_match_a_full_scan_and_ring_is_bounded(tmp_path):
+    manager = CostManager(history_dir=str(tmp_path), ledger_size=3, per_task_budget=100.0)
+    manager.start_task("t1", phase="analyst")
+    manager.track_usage("openai", "gpt-4o", {"prompt": 1000, "completion": 500})
+    manager.track_usage("anthropic", "claude-3-haiku", {"prompt": 2000, "completion": 100})
+    manager.start_task("t2", phase="architect")
+    for _ in range(3):
+        manager.track_usage("openai", "gpt-4o", {"prompt": 100, "completion": 100})
+
+    report = manager.generate_report()
+
+    assert len(manager.usage_records) == 3
+    assert report.num_calls == 5
+    assert report.by_model["gpt-4o"]["calls"] == 4
+    assert report.by_phase["architect"]["tokens"] == 600
+    assert abs(report.total_cost - sum(manager.get_cost_breakdown().values())) < 1e-12
+    assert abs(manager.ledger.rollups["task_id"]["t1"]["cost"] + manager.ledger.rollups["task_id"]["t2"]["cost"]
+               - report.total_cost) < 1e-12
+
+    # Windowed reports fall back to the buffered records
+    windowed = manager.generate_report(since=manager.usage_records[0].timestamp)
+    assert windowed.num_calls == 3 and set(windowed.by_phase) == {"architect"}
+
+
+def test_window_older_than_the_ring_is_answered_from_history(tmp_path):
+    manager = CostManager(history_dir=str(tmp_path), ledger_size=2, per_task_budget=100.0)
+    manager.track_usage("openai", "gpt-4o", {"prompt": 100, "completion": 0})
+    time.sleep(0.01)
+    since = time.time()
+    manager.start_task("t1", phase="qa")
+    for _ in range(4):
+        manager.track_usage("openai", "gpt-4o-mini", {"prompt": 100, "completion": 100})
+
+    windowed = manager.generate_report(since=since)
+    assert windowed.num_calls == 4 and not windowed.truncated
+    assert windowed.total_tokens == 800 and windowed.by_phase["qa"]["calls"] == 4
+    assert set(windowed.by_model) == {"gpt-4o-mini"}
+
+    # Without a history the ring can only give a partial answer, and says so
+    ring_only = CostManager(history_dir=str(tmp_path / "none"), enable_history=False, ledger_size=2)
+    ring_only.track_usage("openai", "gpt-4o", {"prompt": 100, "completion": 0})
+    time.sleep(0.01)
+    since = time.time()
+    for _ in range(4):
+        ring_only.track_usage("openai", "gpt-4o-mini", {"prompt": 100, "completion": 100})
+    partial = ring_only.generate_report(since=since)
+    assert partial.num_calls == 2 and partial.truncated
+
+
+def test_history_is_batched_and_seeds_todays_spend(tmp_path):
+    first = CostManager(history_dir=str(tmp_path))
+    first.track_usage("openai", "gpt-4o", {"prompt": 1_000_000, "completion": 0})
+    first.track_usage("openai", "gpt-4o-mini", {"prompt": 1_000_000, "completion": 0})
+
+    # A second process-level manager sees today's spend through the rollup table
+    second = CostManager(history_dir=str(tmp_path))
+    assert abs(second.day_cost - 2.65) < 1e-9
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    by_model = {row["key"]: row["calls"] for row in first.history.daily(today, today, dimension="model")}
+    assert by_model == {"gpt-4o": 1, "gpt-4o-mini": 1}
+    assert not list(tmp_path.glob("usage_*.jsonl"))
+
+
+def test_legacy_jsonl_with_literal_newlines_is_migrated(tmp_path):
+    now = time.time()
+    record = {
+        "timestamp": now, "model": "gpt-4o", "provider": "openai", "phase": "qa",
+        "tokens_input": 10, "tokens_output": 5, "tokens_total": 15, "cost_usd": 0.5, "task_id": None,
+    }
+    day = datetime.fromtimestamp(now).strftime("%Y-%m-%d")
+    legacy = tmp_path / f"usage_{day}.jsonl"
+    legacy.write_text(json.dumps(record) + "\\n" + json.dumps(record) + "\\n")
+
+    history = UsageHistory(str(tmp_path))
+    try:
+        assert history.day_total(day) == (1.0, 30, 2)
+        assert not legacy.exists() and legacy.with_name(legacy.name + ".migrated").exists()
+    finally:
+        history.close()
@@ -0,0 +1,195 @@
+"""
+Tests for the numpy-backed vector stores.
+"""
+
+import json
+
+import numpy as np
+
+from rag.mock_embeddings import MockEmbeddingsProvider
+from rag.vector_store import Document, InMemoryVectorStore, SimplePersistentVectorStore
+
+
+def _store(path, name="test_collection"):
+    provider = MockEmbeddingsProvider()
+    return SimplePersistentVectorStore(
+        collection_name=name,
+        persist_directory=str(path),
+        embedding_function=provider.embed_texts,
+    )
+
+
+def _docs(*texts, doc_type="documentation"):
+    return [
+        Document(id=f"doc{i}", text=text, metadata={"type": doc_type})
+        for i, text in enumerate(texts)
+    ]
+
+
+def test_persistent_store_appends_without_rewrite(tmp_path):
+    store = _store(tmp_path)
+    store.add_documents(_docs("alpha", "beta"))
+    first_size = store.vectors_path.stat().st_size
+
+    store.add_documents([Document(id="doc2", text="gamma", metadata={})])
+
+    assert store.vectors_path.stat().st_size == first_size * 3 // 2
+    lines = store.docs_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["row"] for line in lines] == [0, 1, 2]
+
+
+def test_persistent_store_drops_torn_vector_row_before_appending(tmp_path):
+    store = _store(tmp_path)
+    store.add_documents(_docs("alpha", "beta"))
+    row_bytes = store.vectors_path.stat().st_size // 2
+    # A crash mid-append: half a vector row, no sidecar record
+    with store.vectors_path.open("ab") as f:
+        f.write(b"\0" * (row_bytes // 2))
+
+    reloaded = _store(tmp_path)
+    assert reloaded.vectors_path.stat().st_size == 2 * row_bytes
+    reloaded.add_documents([Document(id="doc2", text="gamma", metadata={})])
+
+    again = _store(tmp_path)
+    expected = np.asarray(MockEmbeddingsProvider().embed_texts([d.text for d in again.documents]), dtype=np.float32)
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    assert np.allclose(np.stack([d.embedding for d in again.documents]), expected, atol=1e-6)
+    assert again.search("gamma", top_k=1)[0].document.id == "doc2"
+
+
+def test_persistent_store_reload_is_memory_mapped(tmp_path):
+    store = _store(tmp_path)
+    store.add_documents(_docs("alpha", "beta", "gamma"))
+
+    reloaded = _store(tmp_path)
+
+    assert [d.id for d in reloaded.documents] == ["doc0", "doc1", "doc2"]
+    assert isinstance(reloaded.documents[0].embedding, np.memmap)
+    assert isinstance(reloaded._matrix, np.memmap)
+    results = reloaded.search("beta", top_k=1)
+    assert results[0].document.id == "doc1"
+
+
+def test_persistent_store_delete_survives_reload(tmp_path):
+    store = _store(tmp_path)
+    store.add_documents(_docs("alpha", "beta", "gamma", "delta"))
+    store.delete_document("doc1")
+
+    reloaded = _store(tmp_path)
+
+    assert [d.id for d in reloaded.documents] == ["doc0", "doc2", "doc3"]
+    assert reloaded.search("gamma", top_k=1)[0].document.id == "doc2"
+
+
+def test_persistent_store_compact_drops_deleted_rows(tmp_path):
+    store = _store(tmp_path)
+    store.add_documents(_docs("alpha", "beta", "gamma"))
+    store.delete_document("doc0")
+    store.compact()
+
+    assert store.vectors_path.stat().st_size == 2 * 384 * 4
+    reloaded = _store(tmp_path)
+    assert reloaded.get_collection_stats()["tombstones"] == 0
+    assert reloaded.search("gamma", top_k=1)[0].document.id == "doc2"
+
+
+def test_persistent_store_migrates_legacy_json(tmp_path):
+    provider = MockEmbeddingsProvider()
+    legacy = [
+        {"id": "a", "text": "alpha", "metadata": {}, "embedding": provider.embed_query("alpha")},
+        {"id": "b", "text": "beta", "metadata": {}, "embedding": provider.embed_query("beta")},
+    ]
+    (tmp_path / "legacy.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    store = _store(tmp_path, name="legacy")
+
+    assert not (tmp_path / "legacy.json").exists()
+    assert (tmp_path / "legacy.json.migrated").exists()
+    assert store.search("beta", top_k=1)[0].document.id == "b"
+    assert [d.id for d in _store(tmp_path, name="legacy").documents] == ["a", "b"]
+
+
+def test_in_memory_search_matches_brute_force():
+    provider = MockEmbeddingsProvider()
+    store = InMemoryVectorStore(embedding_function=provider.embed_texts)
+    texts = [f"document number {i}" for i in range(50)]
+    store.add_documents(_docs(*texts))
+
+    results = store.search("document number 7", top_k=5)
+
+    query = np.asarray(provider.embed_query("document number 7"))
+    expected = sorted(
+        range(len(texts)),
+        key=lambda i: -float(np.dot(query, provider.embed_query(texts[i]))),
+    )[:5]
+    assert [r.document.id for r in results] == [f"doc{i}" for i in expected]
+    assert [r.rank for r in results] == [1, 2, 3, 4, 5]
+    assert results[0].score >= results[-1].score
+
+
+def test_in_memory_filter_mask_tracks_adds_and_deletes():
+    provider = MockEmbeddingsProvider()
+    store = InMemoryVectorStore(embedding_function=provider.embed_texts)
+    store.add_documents(_docs("alpha", "beta", doc_type="ui_component"))
+
+    assert len(store.search("alpha", top_k=5, filter_metadata={"type": "ui_component"})) == 2
+
+    store.add_documents([Document(id="tok", text="gamma", metadata={"type": "design_token"})])
+    store.add_documents([Document(id="btn", text="delta", metadata={"type": "ui_component"})])
+    store.delete_document("doc0")
+
+    hits = store.search("alpha", top_k=5, filter_metadata={"type": "ui_component"})
+    assert sorted(r.document.id for r in hits) == ["btn", "doc1"]
+    assert [r.document.id for r in store.search("x", top_k=5, filter_metadata={"type": "design_token"})] == ["tok"]
+    assert store.search("x", top_k=5, filter_metadata={"type": "missing"}) == []
+
+
+def test_in_memory_delete_without_embeddings():
+    store = InMemoryVectorStore()
+    store.add_documents([Document(id="a", text="hello", metadata={}), Document(id="b", text="world", metadata={})])
+
+    store.delete_document("a")
+
+    assert [d.id for d in store.documents] == ["b"]
+    assert [r.document.id for r in store.keyword_search("world")] == ["b"]
+    assert store.keyword_search("hello") == []
+
+
+def test_search_many_embeds_once_and_matches_search():
+    provider = MockEmbeddingsProvider()
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return provider.embed_texts(texts)
+
+    store = InMemoryVectorStore(embedding_function=embed)
+    store.add_documents(_docs("alpha", "beta", "gamma", doc_type="ui_component"))
+    store.add_documents([Document(id="tok", text="primary color", metadata={"type": "design_token"})])
+    calls.clear()
+
+    batched = store.search_many(
+        ["alpha", "alpha", "beta"],
+        filters=[{"type": "ui_component"}, {"type": "design_token"}, None],
+        top_k=[2, 5, 1],
+    )
+
+    assert calls == [["alpha", "beta"]]
+    expected = [
+        store.search("alpha", top_k=2, filter_metadata={"type": "ui_component"}),
+        store.search("alpha", top_k=5, filter_metadata={"type": "design_token"}),
+        store.search("beta", top_k=1),
+    ]
+    for got, want in zip(batched, expected):
+        assert [(r.document.id, r.rank) for r in got] == [(r.document.id, r.rank) for r in want]
+
+
+def test_search_many_accepts_precomputed_embeddings(tmp_path):
+    store = _store(tmp_path)
+    store.add_documents(_docs("alpha", "beta"))
+    vector = MockEmbeddingsProvider().embed_query("beta")
+    store.embedding_function = None
+
+    results = store.search_many(["beta"], top_k=1, query_embeddings=[vector])
+
+    assert results[0][0].document.id == "doc1"
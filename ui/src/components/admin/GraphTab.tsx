@@ -74,6 +74,13 @@ const GraphTab: React.FC = () => {
         try {
             const res = await fetch('/api/admin/graph/build', { method: 'POST' });
             if (!res.ok) throw new Error('Failed to build graph');
+            // Builds run in the background; poll until the new snapshot is swapped in
+            let build = (await res.json()).build;
+            while (build?.state === 'running') {
+                await new Promise(resolve => setTimeout(resolve, 1000));
+                build = await (await fetch('/api/admin/graph/build')).json();
+            }
+            if (build?.state === 'failed') throw new Error(build.error || 'Failed to build graph');
             await fetchGraph(); // Refresh after build
         } catch (err) {
             console.error(err);
@@ -27,7 +27,18 @@ export function useLogStream() {
             eventSource.onmessage = (event) => {
                 try {
                     const data: LogEvent = JSON.parse(event.data);
-                    setLogs((prev) => [...prev, data]);
+                    setLogs((prev) => {
+                        // Streamed LLM chunks extend the entry they belong to
+                        if (data.stream_id) {
+                            const idx = prev.findIndex((log) => log.stream_id === data.stream_id);
+                            if (idx !== -1) {
+                                const next = [...prev];
+                                next[idx] = { ...prev[idx], content: prev[idx].content + data.content };
+                                return next;
+                            }
+                        }
+                        return [...prev, data];
+                    });
 
                     // If it's a plan event, update the plan state
                     if (data.type === "plan" || (data.type === "done" && data.content.plan)) {
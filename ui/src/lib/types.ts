@@ -14,6 +14,8 @@ export interface LogEvent {
     content: string | any;
     agent: string;
     timestamp: string;
+    task_id?: string | null;
+    stream_id?: string | null;
 }
 
 export interface Task {